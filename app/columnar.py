@@ -0,0 +1,44 @@
+"""
+Columnar reads: fetch query results straight into NumPy arrays.
+
+Building ORM objects (or SQLAlchemy rows) for every record dominates the
+cost of reading large histories, so these helpers execute the compiled
+statement on the DBAPI cursor and copy each batch of tuples into float64
+arrays without intermediate objects.
+"""
+from itertools import chain
+
+import numpy as np
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from app.models.calculation import Calculation
+
+FETCH_SIZE = 100_000
+
+
+def fetch_columns(db: Session, statement: Select, fetch_size: int = FETCH_SIZE) -> list[np.ndarray]:
+    """Run a select of numeric, non-null columns and return one float64 array per column."""
+    width = len(statement.selected_columns)
+    compiled = statement.compile(dialect=db.get_bind().dialect)
+    parameters = compiled.params
+    if compiled.positional:
+        parameters = tuple(parameters[name] for name in compiled.positiontup)
+    cursor = db.connection().connection.cursor()
+    chunks = []
+    try:
+        cursor.execute(str(compiled), parameters)
+        while rows := cursor.fetchmany(fetch_size):
+            chunks.append(np.fromiter(chain.from_iterable(rows), dtype=np.float64, count=len(rows) * width))
+    finally:
+        cursor.close()
+    table = np.concatenate(chunks).reshape(-1, width) if chunks else np.empty((0, width))
+    return [np.ascontiguousarray(table[:, i]) for i in range(width)]
+
+
+def calculation_columns(db: Session, user_id: int, *columns: str, op_type: str = None) -> list[np.ndarray]:
+    """Columns (e.g. "a", "result") of a user's calculations, optionally of one operation type, in id order."""
+    statement = select(*(getattr(Calculation, name) for name in columns)).where(Calculation.user_id == user_id)
+    if op_type is not None:
+        statement = statement.where(Calculation.type == op_type)
+    return fetch_columns(db, statement.order_by(Calculation.id))
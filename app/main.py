@@ -5,7 +5,8 @@ from contextlib import asynccontextmanager
 
 from app.db import engine
 from app.models.base import Base
-from app.routes import calculations, users  # Import both routers
+from app.operations.parallel import shutdown_process_pool
+from app.routes import calculations, exports, functions, imports, matrices, numerics, signals, users, worksheets
 
 
 @asynccontextmanager
@@ -14,8 +15,8 @@ async def lifespan(app: FastAPI):
     # Startup: Create database tables
     Base.metadata.create_all(bind=engine)
     yield
-    # Shutdown: Clean up resources if needed
-    pass
+    # Shutdown: Stop batch worker processes
+    shutdown_process_pool()
 
 
 # Create FastAPI app with lifespan
@@ -37,7 +38,16 @@ app.add_middleware(
 
 # Include routers
 app.include_router(users.router)  # This adds /users/register and /users/login
+# numerics, functions and exports go before calculations so GET /calculations/plot,
+# /calculations/functions and /calculations/export are not taken for /{calculation_id}
+app.include_router(numerics.router)  # numerical analysis endpoints (sparse solve, ...)
+app.include_router(functions.router)  # user-defined functions
+app.include_router(imports.router)  # bulk import of calculation history
+app.include_router(exports.router)  # streaming export of calculation history
 app.include_router(calculations.router)  # This adds /calculations endpoints
+app.include_router(matrices.router)  # /calculations/matrix and stored payloads
+app.include_router(signals.router)  # FFT and filters over series
+app.include_router(worksheets.router)  # worksheets with incremental recalculation
 
 # Serve static frontend files (register.html, login.html, etc.)
 app.mount("/static", StaticFiles(directory="static"), name="static")
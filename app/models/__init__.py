@@ -1,4 +1,7 @@
 from app.models.calculation import Calculation
+from app.models.calculation_payload import CalculationPayload
 from app.models.user import User
+from app.models.user_function import UserFunction
+from app.models.worksheet_cell import WorksheetCell
 
-__all__ = ["Calculation", "User"]
\ No newline at end of file
+__all__ = ["Calculation", "CalculationPayload", "User", "UserFunction", "WorksheetCell"]
\ No newline at end of file
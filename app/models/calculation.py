@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, Integer, Float, String, DateTime, func, ForeignKey
+from sqlalchemy import Column, Integer, Float, String, Text, DateTime, func, ForeignKey
 from sqlalchemy.orm import relationship
 from app.models.base import Base  # ✅ Import from models.base, not db
 
@@ -12,7 +12,20 @@ class Calculation(Base):
     b = Column(Float, nullable=False)
     type = Column(String(50), nullable=False)
     result = Column(Float, nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Arbitrary-precision mode: significant digits requested and the exact decimal result
+    precision = Column(Integer, nullable=True)
+    result_text = Column(Text, nullable=True)
+    # Imaginary parts in the complex domain (a, b and result hold the real parts)
+    a_imag = Column(Float, nullable=True)
+    b_imag = Column(Float, nullable=True)
+    result_imag = Column(Float, nullable=True)
+    # Units of the operands and the result, for unit-aware calculations
+    a_unit = Column(String(50), nullable=True)
+    b_unit = Column(String(50), nullable=True)
+    result_unit = Column(String(50), nullable=True)
+    # Steps of one calculation program share a chain id
+    chain_id = Column(String(32), nullable=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     user = relationship("User", backref="calculations")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
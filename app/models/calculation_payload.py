@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, LargeBinary, ForeignKey
+from sqlalchemy.orm import relationship, backref
+from app.models.base import Base
+
+
+class CalculationPayload(Base):
+    """Compact binary data (e.g. a result matrix) attached to a Calculation row."""
+    __tablename__ = "calculation_payloads"
+
+    id = Column(Integer, primary_key=True, index=True)
+    calculation_id = Column(Integer, ForeignKey("calculations.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
+    kind = Column(String(20), nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    calculation = relationship(
+        "Calculation",
+        backref=backref("payload", uselist=False, cascade="all, delete-orphan")
+    )
+
+    def __repr__(self):
+        return f"<CalculationPayload(calculation_id={self.calculation_id}, kind='{self.kind}', bytes={len(self.data)})>"
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint, func
+from sqlalchemy.orm import relationship
+from app.models.base import Base
+
+
+class UserFunction(Base):
+    """A named function defined by a user, e.g. f(x, y) = x^2 + sqrt(y)."""
+    __tablename__ = "user_functions"
+    __table_args__ = (UniqueConstraint("user_id", "name", name="uq_user_function_name"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(String(50), nullable=False)  # same width as Calculation.type
+    # comma-separated parameter names, in call order
+    parameters = Column(Text, nullable=False)
+    body = Column(Text, nullable=False)
+    user = relationship("User", backref="functions")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<UserFunction(user_id={self.user_id}, name='{self.name}', parameters='{self.parameters}')>"
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, Float, String, Text, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship, backref
+from app.models.base import Base
+
+
+class WorksheetCell(Base):
+    """One cell of a worksheet; the worksheet itself is a Calculation row of type 'worksheet'."""
+    __tablename__ = "worksheet_cells"
+    __table_args__ = (UniqueConstraint("calculation_id", "name", name="uq_worksheet_cell_name"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    calculation_id = Column(Integer, ForeignKey("calculations.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(String(64), nullable=False)
+    formula = Column(Text, nullable=False)
+    # names of the cells the formula reads, space-separated, so the graph loads without parsing
+    refs = Column(Text, nullable=False, default="")
+    value = Column(Float, nullable=True)
+    error = Column(String(200), nullable=True)
+    calculation = relationship(
+        "Calculation",
+        backref=backref("cells", cascade="all, delete-orphan")
+    )
+
+    def __repr__(self):
+        return f"<WorksheetCell(calculation_id={self.calculation_id}, name='{self.name}', value={self.value})>"
@@ -1,29 +1,87 @@
-from typing import Union
+from typing import Optional, Union
+import math
+import numpy as np
 from fastapi import HTTPException
 
 Number = Union[int, float]
 
+COMPLEX_POWER_DETAIL = "A negative number to a fractional power is complex; use the complex domain"
+
+# Registry of operation instances keyed by every accepted (lowercase) name
+_OPERATIONS: dict[str, "Operation"] = {}
+
+
+def register_instance(operation: "Operation", *names: str) -> "Operation":
+    """Register an already constructed Operation under one or more names."""
+    for name in names:
+        _OPERATIONS[name.lower()] = operation
+    return operation
+
+
+def register_operation(*names: str):
+    """Class decorator that registers an Operation under one or more names."""
+    def decorator(cls):
+        register_instance(cls(), *names)
+        return cls
+    return decorator
+
 
 class Operation:
+    # operands consumed: unary operations ignore b
+    arity = 2
+    # approximate kernel for mode=fast (see app.operations.fast_math), if any
+    fast = None
+
     def compute(self, a: Number, b: Number) -> Number:
         raise NotImplementedError("Subclasses must implement compute()")
 
+    def compute_array(self, a: np.ndarray, b: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Vectorized kernel over float64 arrays.
+        Subclasses override this with a NumPy ufunc; the default loops over compute().
+        """
+        if out is None:
+            out = np.empty(len(a), dtype=np.float64)
+        for i, (x, y) in enumerate(zip(a.tolist(), b.tolist())):
+            out[i] = self.compute(x, y)
+        return out
+
+    def defined(self, a: np.ndarray, b: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Boolean mask of the cells compute_array accepts, for operations that can
+        tell in one vectorized pass; None when they cannot.
+        """
+        return None
 
+
+@register_operation("add")
 class AddOperation(Operation):
     def compute(self, a: Number, b: Number) -> Number:
         return a + b
 
+    def compute_array(self, a, b, out=None):
+        return np.add(a, b, out=out)
+
 
+@register_operation("sub", "subtract")
 class SubOperation(Operation):
     def compute(self, a: Number, b: Number) -> Number:
         return a - b
 
+    def compute_array(self, a, b, out=None):
+        return np.subtract(a, b, out=out)
 
+
+@register_operation("multiply")
 class MultiplyOperation(Operation):
     def compute(self, a: Number, b: Number) -> Number:
         return a * b
 
+    def compute_array(self, a, b, out=None):
+        return np.multiply(a, b, out=out)
+
 
+@register_operation("divide")
 class DivideOperation(Operation):
     def compute(self, a: Number, b: Number) -> float:
         if b == 0:
@@ -31,23 +89,89 @@ class DivideOperation(Operation):
             raise HTTPException(status_code=400, detail="Error: Cannot divide by zero!")
         return a / b
 
+    def compute_array(self, a, b, out=None):
+        if not np.all(b):
+            raise HTTPException(status_code=400, detail="Error: Cannot divide by zero!")
+        return np.divide(a, b, out=out)
+
+    def defined(self, a, b):
+        return b != 0
+
+
+@register_operation("power")
+class PowerOperation(Operation):
+    def compute(self, a: Number, b: Number) -> Number:
+        result = a ** b
+        if isinstance(result, complex):
+            raise HTTPException(status_code=400, detail=COMPLEX_POWER_DETAIL)
+        return result
+
+    def compute_array(self, a, b, out=None):
+        if np.any((a < 0) & (b != np.floor(b))):
+            raise HTTPException(status_code=400, detail=COMPLEX_POWER_DETAIL)
+        return np.power(a, b, out=out)
+
+    def defined(self, a, b):
+        return (a >= 0) | (b == np.floor(b))
+
+
+@register_operation("modulus")
+class ModulusOperation(Operation):
+    def compute(self, a: Number, b: Number) -> Number:
+        if b == 0:
+            raise HTTPException(status_code=400, detail="Cannot perform modulus with zero")
+        return a % b
+
+    def compute_array(self, a, b, out=None):
+        if not np.all(b):
+            raise HTTPException(status_code=400, detail="Cannot perform modulus with zero")
+        return np.mod(a, b, out=out)
+
+    def defined(self, a, b):
+        return b != 0
+
+
+@register_operation("sqrt")
+class SqrtOperation(Operation):
+    """Unary operation: b is ignored."""
+    arity = 1
+
+    def compute(self, a: Number, b: Number = 0) -> float:
+        if a < 0:
+            raise HTTPException(status_code=400, detail="Cannot calculate square root of negative number")
+        return math.sqrt(a)
+
+    def compute_array(self, a, b, out=None):
+        if np.any(a < 0):
+            raise HTTPException(status_code=400, detail="Cannot calculate square root of negative number")
+        return np.sqrt(a, out=out)
+
+    def defined(self, a, b):
+        return a >= 0
+
+
+# Registers the scientific function library (sin, log, gamma, ...), integer operations and distribution functions
+from app.operations import scientific, number_theory, distributions  # noqa: E402,F401
+
 
 # Factory function to get the right operation class
 def get_operation(op_type: str) -> Operation:
-    op_type = op_type.lower()
-    if op_type in ("add",):
-        return AddOperation()
-    elif op_type in ("sub", "subtract"):
-        return SubOperation()
-    elif op_type in ("multiply",):
-        return MultiplyOperation()
-    elif op_type in ("divide",):
-        return DivideOperation()
-    else:
+    operation = _OPERATIONS.get(op_type.lower())
+    if operation is None:
         raise ValueError("Invalid operation type")
+    return operation
+
+
+def available_operations() -> list[str]:
+    """Names accepted by get_operation()."""
+    return sorted(_OPERATIONS)
 
 
 # Convenience function to perform an operation directly
 def perform_operation(a: Number, b: Number, op_type: str) -> Number:
     operation = get_operation(op_type)
     return operation.compute(a, b)
+
+
+# Attaches the approximate kernels used by mode=fast
+from app.operations import fast_math  # noqa: E402,F401
@@ -0,0 +1,96 @@
+"""
+The complex domain: operations on complex operands with complex results.
+
+Opt-in per request. Every kernel is a vectorized NumPy complex128 function,
+so single calculations (length-1 arrays) and batches share one code path.
+Functions take their principal branch: ``sqrt(-4) = 2j``,
+``(-8) ** (1/3) = 1 + 1.732j``, ``ln(-1) = pi*j``.
+
+Integer operations, rounding and the probability distributions have no
+complex meaning and are rejected.
+"""
+from typing import Callable
+
+import numpy as np
+
+from app.operations.scientific import _lanczos_gamma
+
+NOT_FINITE = "Result is not a finite number"
+
+
+def _divide(a, b):
+    if not np.all(b):
+        raise ValueError("Cannot divide by zero")
+    return a / b
+
+
+def complex_gamma(z: np.ndarray) -> np.ndarray:
+    """Gamma on the complex plane: Lanczos for Re(z) >= 1/2, the reflection formula elsewhere."""
+    z = np.asarray(z, dtype=np.complex128)
+    result = np.empty_like(z)
+    upper = z.real >= 0.5
+    result[upper] = _lanczos_gamma(z[upper])
+    lower = ~upper
+    with np.errstate(all="ignore"):
+        result[lower] = np.pi / (np.sin(np.pi * z[lower]) * _lanczos_gamma(1.0 - z[lower]))
+    poles = (z.imag == 0) & (z.real <= 0) & (z.real == np.floor(z.real))
+    result[poles] = np.nan
+    return result
+
+
+def _unary(function: Callable) -> Callable:
+    return lambda a, b: function(a)
+
+
+# name(s) -> kernel(a, b) over complex128 arrays
+_KERNELS = [
+    (("add",), np.add),
+    (("sub", "subtract"), np.subtract),
+    (("multiply",), np.multiply),
+    (("divide",), _divide),
+    (("power",), np.power),
+    (("sqrt",), _unary(np.sqrt)),
+    (("exp",), _unary(np.exp)),
+    (("ln",), _unary(np.log)),
+    (("log", "log10"), _unary(np.log10)),
+    (("log2",), _unary(np.log2)),
+    (("sin",), _unary(np.sin)),
+    (("cos",), _unary(np.cos)),
+    (("tan",), _unary(np.tan)),
+    (("asin", "arcsin"), _unary(np.arcsin)),
+    (("acos", "arccos"), _unary(np.arccos)),
+    (("atan", "arctan"), _unary(np.arctan)),
+    (("sinh",), _unary(np.sinh)),
+    (("cosh",), _unary(np.cosh)),
+    (("tanh",), _unary(np.tanh)),
+    (("asinh", "arcsinh"), _unary(np.arcsinh)),
+    (("acosh", "arccosh"), _unary(np.arccosh)),
+    (("atanh", "arctanh"), _unary(np.arctanh)),
+    (("abs",), _unary(lambda a: np.abs(a).astype(np.complex128))),
+    (("gamma",), _unary(complex_gamma)),
+    (("factorial",), _unary(lambda a: complex_gamma(a + 1))),
+]
+COMPLEX_KERNELS: dict[str, Callable] = {name: kernel for names, kernel in _KERNELS for name in names}
+COMPLEX_OPERATIONS = sorted({names[0] for names, _ in _KERNELS})
+
+
+def compute_complex(op_type: str, a, b) -> np.ndarray:
+    """
+    Apply ``op_type`` element-wise over complex operand arrays (b is ignored
+    by unary functions). ValueError for unsupported operations, division by
+    zero and results that are not finite.
+    """
+    kernel = COMPLEX_KERNELS.get(op_type.lower())
+    if kernel is None:
+        raise ValueError(f"Operation '{op_type}' is not defined for complex numbers. Use one of: {COMPLEX_OPERATIONS}")
+    a = np.asarray(a, dtype=np.complex128)
+    b = np.asarray(b, dtype=np.complex128)
+    with np.errstate(all="ignore"):
+        result = np.asarray(kernel(a, b), dtype=np.complex128)
+    if not np.isfinite(result).all():
+        raise ValueError(NOT_FINITE)
+    return result
+
+
+def compute_complex_scalar(op_type: str, a: complex, b: complex = 0j) -> complex:
+    return complex(compute_complex(op_type, [a], [b])[0])
@@ -0,0 +1,170 @@
+"""
+High-precision mathematical constants with an on-disk digit cache.
+
+Each constant is computed once, to the largest precision requested so far,
+and written as ASCII text ("3.14159...") to ``CONSTANTS_CACHE_DIR``. The file
+is memory-mapped and lower precisions are served by truncating it, so after
+the first computation a request costs one slice of the mapping.
+"""
+import math
+import mmap
+import os
+import tempfile
+import threading
+from decimal import Decimal
+from typing import Callable
+
+CONSTANTS_CACHE_DIR = os.getenv(
+    "CONSTANTS_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "calculator_constants")
+)
+
+# Digits are computed in blocks of this size so that slowly growing
+# precisions do not trigger a recomputation each time.
+_BLOCK = 1000
+_GUARD_DIGITS = 10
+
+
+def _chudnovsky_pi(digits: int) -> int:
+    """pi * 10**digits via the Chudnovsky series with binary splitting."""
+    c3_over_24 = 640320 ** 3 // 24
+
+    def split(a: int, b: int):
+        if b - a == 1:
+            if a == 0:
+                p = q = 1
+            else:
+                p = (6 * a - 5) * (2 * a - 1) * (6 * a - 1)
+                q = a * a * a * c3_over_24
+            t = p * (13591409 + 545140134 * a)
+            return p, q, -t if a & 1 else t
+        m = (a + b) // 2
+        p1, q1, t1 = split(a, m)
+        p2, q2, t2 = split(m, b)
+        return p1 * p2, q1 * q2, q2 * t1 + p1 * t2
+
+    terms = digits // 14 + 2  # each term adds ~14.18 digits
+    _, q, t = split(0, terms)
+    one = 10 ** digits
+    return q * 426880 * math.isqrt(10005 * one * one) // t
+
+
+def _euler_e(digits: int) -> int:
+    """e * 10**digits from sum(1/k!) with binary splitting."""
+    def split(a: int, b: int):
+        if b - a == 1:
+            return 1, b
+        m = (a + b) // 2
+        p1, q1 = split(a, m)
+        p2, q2 = split(m, b)
+        return p1 * q2 + p2, q1 * q2
+
+    terms = 2
+    while math.lgamma(terms + 1) / math.log(10) < digits + 2:
+        terms *= 2
+    p, q = split(0, terms)
+    one = 10 ** digits
+    return one + p * one // q
+
+
+def _atanh_inverse(q: int, one: int) -> int:
+    """atanh(1/q) in fixed point."""
+    total = term = one // q
+    q2 = q * q
+    k = 3
+    while term:
+        term //= q2
+        total += term // k
+        k += 2
+    return total
+
+
+def _ln2(digits: int) -> int:
+    one = 10 ** digits
+    return 18 * _atanh_inverse(26, one) - 2 * _atanh_inverse(4801, one) + 8 * _atanh_inverse(8749, one)
+
+
+def _ln10(digits: int) -> int:
+    # ln 10 = 3 ln 2 + ln(5/4) and ln(5/4) = 2 atanh(1/9)
+    return 3 * _ln2(digits) + 2 * _atanh_inverse(9, 10 ** digits)
+
+
+def _sqrt2(digits: int) -> int:
+    one = 10 ** digits
+    return math.isqrt(2 * one * one)
+
+
+def _phi(digits: int) -> int:
+    one = 10 ** digits
+    return (one + math.isqrt(5 * one * one)) // 2
+
+
+# name -> function returning the constant scaled by 10**digits
+CONSTANTS: dict[str, Callable[[int], int]] = {
+    "pi": _chudnovsky_pi,
+    "e": _euler_e,
+    "ln2": _ln2,
+    "ln10": _ln10,
+    "sqrt2": _sqrt2,
+    "phi": _phi,
+}
+
+_lock = threading.Lock()
+_mapped: dict[str, mmap.mmap] = {}
+
+
+def _cache_path(name: str) -> str:
+    return os.path.join(CONSTANTS_CACHE_DIR, f"{name}.digits")
+
+
+def _map(path: str) -> mmap.mmap:
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _decimals(buffer: mmap.mmap) -> int:
+    return len(buffer) - buffer.find(b".") - 1
+
+
+def _compute_to_disk(name: str, digits: int) -> mmap.mmap:
+    fixed = CONSTANTS[name](digits + _GUARD_DIGITS) // 10 ** _GUARD_DIGITS
+    one = 10 ** digits
+    text = f"{fixed // one}.{fixed % one:0{digits}d}".encode("ascii")
+    os.makedirs(CONSTANTS_CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CONSTANTS_CACHE_DIR, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(text)
+    os.replace(tmp_path, _cache_path(name))  # atomic for concurrent workers
+    return _map(_cache_path(name))
+
+
+def constant_text(name: str, digits: int) -> str:
+    """The constant truncated to ``digits`` decimal places, as text."""
+    if name not in CONSTANTS:
+        raise ValueError(f"Unknown constant '{name}'. Must be one of: {sorted(CONSTANTS)}")
+    if digits < 0:
+        raise ValueError("digits must not be negative")
+    with _lock:
+        buffer = _mapped.get(name)
+        if buffer is None and os.path.exists(_cache_path(name)):
+            buffer = _mapped[name] = _map(_cache_path(name))
+        if buffer is None or _decimals(buffer) < digits:
+            if buffer is not None:
+                buffer.close()
+            target = -(-max(digits, 1) // _BLOCK) * _BLOCK
+            buffer = _mapped[name] = _compute_to_disk(name, target)
+        end = buffer.find(b".") + 1 + digits
+        return buffer[:end if digits else end - 1].decode("ascii")
+
+
+def get_constant(name: str, digits: int) -> Decimal:
+    """The constant truncated to ``digits`` decimal places."""
+    return Decimal(constant_text(name, digits))
+
+
+def clear_memory_cache() -> None:
+    """Unmap all cached constants (the files on disk are kept)."""
+    with _lock:
+        for buffer in _mapped.values():
+            buffer.close()
+        _mapped.clear()
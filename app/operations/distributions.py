@@ -0,0 +1,570 @@
+"""
+Probability distributions: density (mass for discrete distributions),
+cumulative distribution and quantile functions of the normal, Student's t,
+chi-square, exponential, Poisson and binomial distributions.
+
+Everything is vectorized over NumPy arrays, parameters included, so a
+million quantiles are a single call. erfc uses a Chebyshev table fitted once
+at import; the regularized incomplete gamma and beta functions use a power
+series or a Lentz continued fraction and keep iterating only the elements
+that have not converged yet. Continuous quantiles invert the cdf by Newton's
+method from a closed-form starting point, safeguarded by bisection.
+
+Distributions with at most one parameter are also registered as operations
+(``normal_cdf``, ``t_quantile``, ``poisson_pmf``, ...) with ``a`` the point
+or probability and ``b`` the parameter, so /calculations/batch evaluates them
+over whole arrays.
+"""
+import math
+from typing import Callable, Optional
+
+import numpy as np
+from fastapi import HTTPException
+
+from app.operations import Operation, register_instance
+from app.operations.scientific import log_gamma_array
+
+MAX_ITERATIONS = 10_000
+# Shape parameters (degrees of freedom, Poisson mean, binomial trials) above this
+# need more series terms than MAX_ITERATIONS and lose accuracy in log-gamma
+MAX_SHAPE = 1e7
+_TOLERANCE = 4 * np.finfo(np.float64).eps
+_NEWTON_FINAL_STEP = 1e-9
+_TINY = 1e-300
+_SQRT2 = math.sqrt(2.0)
+_SQRT2PI = math.sqrt(2 * math.pi)
+
+
+def _erfcx_scalar(z: float) -> float:
+    """exp(z^2) * erfc(z) for z >= 0, to full precision (used to build the table)."""
+    if z < 3:
+        # split z so that exp(z^2) does not inherit the rounding error of z * z
+        high = math.floor(z * 4096) / 4096
+        low = z - high
+        return math.exp(high * high) * math.exp(low * (high + z)) * math.erfc(z)
+    # Laplace continued fraction, evaluated backwards
+    fraction = z
+    for k in range(200, 0, -1):
+        fraction = z + k / 2 / fraction
+    return 1 / (math.sqrt(math.pi) * fraction)
+
+
+def _fit_erfc_table(degree: int = 32) -> np.ndarray:
+    """
+    Chebyshev coefficients c with erfc(z) = t * exp(-z^2 + sum c_k T_k(2t - 1))
+    for z >= 0, where t = 2 / (2 + z) maps [0, inf) onto (0, 1].
+    """
+    def g(y):
+        t = (y + 1) / 2
+        z = 2 / t - 2
+        return math.log(_erfcx_scalar(z) / t) if t > 0 else math.log(1 / (2 * math.sqrt(math.pi)))
+
+    coefficients = np.polynomial.chebyshev.chebinterpolate(np.vectorize(g), degree)
+    # coefficients beyond ~24 are below the noise of the sampled values
+    return np.polynomial.chebyshev.chebtrim(coefficients, 1e-15)
+
+
+_ERFC_TABLE = _fit_erfc_table()
+# Taylor coefficients of erf(x) / x in powers of x^2, for |x| < 0.5
+_ERF_TABLE = np.array([
+    2 / math.sqrt(math.pi) * (-1) ** n / (math.factorial(n) * (2 * n + 1)) for n in range(14)
+])[::-1]
+
+# Acklam's rational approximation of the normal quantile (relative error 1.15e-9)
+_ACKLAM_A = np.array([
+    -3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+    1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00,
+])
+_ACKLAM_B = np.array([
+    -5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+    6.680131188771972e+01, -1.328068155288572e+01, 1.0,
+])
+_ACKLAM_C = np.array([
+    -7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+    -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00,
+])
+_ACKLAM_D = np.array([
+    7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+    3.754408661907416e+00, 1.0,
+])
+_ACKLAM_LOW = 0.02425
+
+
+def erfc(x) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    z = np.abs(x)
+    t = 2 / (2 + z)
+    high = np.floor(z * 4096) / 4096
+    with np.errstate(over="ignore", under="ignore", invalid="ignore"):
+        series = np.polynomial.chebyshev.chebval(2 * t - 1, _ERFC_TABLE)
+        result = t * np.exp(series - (z - high) * (high + z)) * np.exp(-high * high)
+    result[np.isinf(z)] = 0.0
+    return np.where(x < 0, 2 - result, result)
+
+
+def erf(x) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    small = np.abs(x) < 0.5
+    series = x * np.polyval(_ERF_TABLE, x * x)
+    return np.where(small, series, np.sign(x) * (1 - erfc(np.abs(x))))
+
+
+def _until_converged(update: Callable[[dict, int], np.ndarray], state: dict, key: str) -> np.ndarray:
+    """
+    Iterate ``update(state, n)`` for n = 1, 2, ... over a dict of equal-length
+    arrays. ``update`` mutates the state and returns which elements have
+    converged; those are dropped from later iterations. Returns the final
+    ``state[key]`` of every element, in the original order.
+    """
+    size = len(state[key])
+    result = np.empty(size)
+    active = np.arange(size)
+    for n in range(1, MAX_ITERATIONS + 1):
+        if not len(active):
+            break
+        done = update(state, n)
+        if n == MAX_ITERATIONS:
+            done[:] = True
+        if done.any():
+            result[active[done]] = state[key][done]
+            keep = ~done
+            active = active[keep]
+            state = {name: value[keep] for name, value in state.items()}
+    return result
+
+
+def _gamma_series_step(s: dict, n: int) -> np.ndarray:
+    s["ap"] += 1
+    s["term"] *= s["x"] / s["ap"]
+    s["sum"] += s["term"]
+    return np.abs(s["term"]) <= np.abs(s["sum"]) * _TOLERANCE
+
+
+def _gamma_fraction_step(s: dict, n: int) -> np.ndarray:
+    an = -n * (n - s["a"])
+    s["b"] += 2
+    s["d"] = an * s["d"] + s["b"]
+    s["d"][np.abs(s["d"]) < _TINY] = _TINY
+    s["c"] = s["b"] + an / s["c"]
+    s["c"][np.abs(s["c"]) < _TINY] = _TINY
+    s["d"] = 1 / s["d"]
+    delta = s["d"] * s["c"]
+    s["h"] *= delta
+    return np.abs(delta - 1) <= _TOLERANCE
+
+
+def regularized_gamma(a, x) -> tuple[np.ndarray, np.ndarray]:
+    """Lower and upper regularized incomplete gamma functions P(a, x), Q(a, x) for a > 0, x >= 0."""
+    a, x = (np.array(v, dtype=np.float64).ravel() for v in np.broadcast_arrays(a, x))
+    lower, upper = np.empty_like(x), np.empty_like(x)
+    with np.errstate(divide="ignore", invalid="ignore", under="ignore"):
+        prefactor = np.exp(a * np.log(x) - x - log_gamma_array(a))
+
+    series = x < a + 1
+    sa, sx = a[series], x[series]
+    lower[series] = prefactor[series] * _until_converged(
+        _gamma_series_step, {"x": sx, "ap": sa.copy(), "term": 1 / sa, "sum": 1 / sa}, "sum"
+    )
+    upper[series] = 1 - lower[series]
+
+    fraction = ~series & np.isfinite(x)
+    fa, fx = a[fraction], x[fraction]
+    b = fx + 1 - fa
+    with np.errstate(divide="ignore"):
+        d = 1 / b
+    upper[fraction] = prefactor[fraction] * _until_converged(
+        _gamma_fraction_step, {"a": fa, "b": b, "c": np.full_like(fa, 1 / _TINY), "d": d, "h": d.copy()}, "h"
+    )
+    lower[fraction] = 1 - upper[fraction]
+    lower[np.isinf(x)], upper[np.isinf(x)] = 1.0, 0.0
+    return lower, upper
+
+
+def _beta_fraction_step(s: dict, m: int) -> np.ndarray:
+    a, b, x = s["a"], s["b"], s["x"]
+    for aa in (
+        m * (b - m) * x / ((a - 1 + 2 * m) * (a + 2 * m)),
+        -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 1 + 2 * m)),
+    ):
+        s["d"] = 1 + aa * s["d"]
+        s["d"][np.abs(s["d"]) < _TINY] = _TINY
+        s["c"] = 1 + aa / s["c"]
+        s["c"][np.abs(s["c"]) < _TINY] = _TINY
+        s["d"] = 1 / s["d"]
+        delta = s["d"] * s["c"]
+        s["h"] *= delta
+    return np.abs(delta - 1) <= _TOLERANCE
+
+
+def regularized_beta(a, b, x, y=None) -> np.ndarray:
+    """
+    Regularized incomplete beta function I_x(a, b) for a, b > 0 and 0 <= x <= 1.
+    ``y`` is 1 - x; pass it when the caller can compute it without cancellation.
+    """
+    if y is None:
+        y = 1 - np.asarray(x, dtype=np.float64)
+    a, b, x, y = (np.array(v, dtype=np.float64).ravel() for v in np.broadcast_arrays(a, b, x, y))
+    # the continued fraction converges fast for x < (a + 1) / (a + b + 2); use symmetry otherwise
+    flip = x > (a + 1) / (a + b + 2)
+    a, b, x, y = np.where(flip, b, a), np.where(flip, a, b), np.where(flip, y, x), np.where(flip, x, y)
+    with np.errstate(divide="ignore", invalid="ignore", under="ignore"):
+        front = np.exp(
+            log_gamma_array(a + b) - log_gamma_array(a) - log_gamma_array(b) + a * np.log(x) + b * np.log(y)
+        )
+        d = 1 - (a + b) * x / (a + 1)
+        d[np.abs(d) < _TINY] = _TINY
+        d = 1 / d
+        fraction = _until_converged(
+            _beta_fraction_step, {"a": a, "b": b, "x": x, "c": np.ones_like(x), "d": d, "h": d.copy()}, "h"
+        )
+        value = np.where(x == 0, 0.0, front * fraction / a)
+    return np.where(flip, 1 - value, value)
+
+
+def normal_quantile(p) -> np.ndarray:
+    """Standard normal quantile: Acklam's approximation refined by one Halley step."""
+    p = np.asarray(p, dtype=np.float64)
+    r = np.minimum(p, 1 - p)  # solve in the lower half, where p is represented exactly
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q = r - 0.5
+        s = q * q
+        central = q * np.polyval(_ACKLAM_A, s) / np.polyval(_ACKLAM_B, s)
+        u = np.sqrt(-2 * np.log(r))
+        tail = np.polyval(_ACKLAM_C, u) / np.polyval(_ACKLAM_D, u)
+        x = np.where(r < _ACKLAM_LOW, tail, central)
+        error = 0.5 * erfc(-x / _SQRT2) - r
+        step = error * _SQRT2PI * np.exp(x * x / 2)
+        x = np.where(r > 0, x - step / (1 + x * step / 2), -np.inf)
+        x[r == 0.5] = 0.0
+    return np.where(p > 0.5, -x, x)
+
+
+def _invert(cdf: Callable, pdf: Callable, p: np.ndarray, x0: np.ndarray, params: dict, lower: float = -np.inf) -> np.ndarray:
+    """
+    Solve cdf(x, **params) = p for 0 < p < 1 by Newton's method. Every cdf
+    evaluation narrows a bracket around the root; steps that leave it fall back
+    to bisection, or to doubling the distance while one side is still open.
+    """
+    def step(s: dict, n: int) -> np.ndarray:
+        sub = {name: s[name] for name in params}
+        x = s["x"]
+        below = cdf(x, **sub) - s["target"]
+        s["lo"] = np.where(below < 0, x, s["lo"])
+        s["hi"] = np.where(below < 0, s["hi"], x)
+        newton = x - below / pdf(x, **sub)
+        # convergence is quadratic, so the error after a step this small is negligible
+        done = (np.abs(newton - x) <= _NEWTON_FINAL_STEP * np.abs(x) + _TINY) | (below == 0)
+        done |= s["hi"] - s["lo"] <= _TOLERANCE * np.abs(x)
+        outside = ~((newton > s["lo"]) & (newton < s["hi"]))
+        reach = np.maximum(1.0, np.abs(x))
+        fallback = np.where(
+            np.isinf(s["hi"]), x + reach,
+            np.where(np.isinf(s["lo"]), x - reach, s["lo"] + (s["hi"] - s["lo"]) / 2),
+        )
+        s["x"] = np.where(outside & ~done, fallback, newton)
+        return done | ~np.isfinite(s["x"])
+
+    state = {
+        "x": np.maximum(x0, lower), "target": p,
+        "lo": np.full_like(p, lower), "hi": np.full_like(p, np.inf), **params,
+    }
+    return _until_converged(step, state, "x")
+
+
+def _discrete_quantile(cdf: Callable, p: np.ndarray, k0: np.ndarray, params: dict) -> np.ndarray:
+    """
+    Smallest integer k >= 0 with cdf(k) >= p. A bracket (lo, hi] is widened
+    from the estimate k0 in doubling steps until both sides are known, then
+    halved, so a poor estimate costs a logarithmic number of cdf evaluations.
+    """
+    def step(s: dict, n: int) -> np.ndarray:
+        sub = {name: s[name] for name in params}
+        reached = cdf(s["k"], **sub) >= s["target"]
+        s["hi"] = np.where(reached, s["k"], s["hi"])
+        s["lo"] = np.where(reached, s["lo"], s["k"])
+        # cdf(-1) = 0 < p, so the search never goes below -1
+        s["k"] = np.where(
+            np.isinf(s["hi"]), s["lo"] + s["step"],
+            np.where(np.isinf(s["lo"]), np.maximum(s["hi"] - s["step"], -1.0), np.floor((s["lo"] + s["hi"]) / 2)),
+        )
+        s["step"] = 2 * s["step"]
+        return s["hi"] - s["lo"] <= 1
+
+    state = {
+        "k": np.maximum(k0, 0.0), "lo": np.full_like(p, -np.inf), "hi": np.full_like(p, np.inf),
+        "step": np.ones_like(p), "target": p, **params,
+    }
+    return _until_converged(step, state, "hi")
+
+
+class Distribution:
+    """
+    Vectorized pdf/cdf/quantile. Points and parameters are 1-D float64 arrays
+    of one length; ``evaluate_distribution`` validates and broadcasts them.
+    """
+    parameters: tuple[str, ...] = ()
+    defaults: dict[str, float] = {}
+    discrete = False
+    # lower end of the support: the quantile at p = 0
+    minimum = -np.inf
+    # (condition on the parameters, error detail)
+    requirement: tuple[Callable[..., np.ndarray], str] = (lambda **params: True, "")
+
+    def maximum(self, **params) -> np.ndarray:
+        """Upper end of the support: the quantile at p = 1."""
+        return np.full(len(next(iter(params.values()), [0])), np.inf)
+
+    def pdf(self, x, **params):
+        raise NotImplementedError
+
+    def cdf(self, x, **params):
+        raise NotImplementedError
+
+    def quantile(self, p, **params):
+        raise NotImplementedError
+
+
+class Normal(Distribution):
+    parameters = ("mean", "sd")
+    defaults = {"mean": 0.0, "sd": 1.0}
+    requirement = (lambda mean, sd: np.isfinite(mean) & (sd > 0) & np.isfinite(sd), "normal needs a finite mean and sd > 0")
+
+    def pdf(self, x, mean, sd):
+        z = (x - mean) / sd
+        return np.exp(-z * z / 2) / (sd * _SQRT2PI)
+
+    def cdf(self, x, mean, sd):
+        return 0.5 * erfc((mean - x) / (sd * _SQRT2))
+
+    def quantile(self, p, mean, sd):
+        return mean + sd * normal_quantile(p)
+
+
+class StudentT(Distribution):
+    parameters = ("df",)
+    requirement = (lambda df: (df > 0) & (df <= MAX_SHAPE), f"t needs 0 < df <= {MAX_SHAPE:g}")
+
+    def pdf(self, x, df):
+        log_norm = log_gamma_array((df + 1) / 2) - log_gamma_array(df / 2) - 0.5 * np.log(df * np.pi)
+        return np.exp(log_norm - (df + 1) / 2 * np.log1p(x * x / df))
+
+    def cdf(self, x, df):
+        ratio = x * x / df
+        tail = regularized_beta(df / 2, 0.5, 1 / (1 + ratio), 1 / (1 + 1 / ratio)) / 2
+        return np.where(x > 0, 1 - tail, tail)
+
+    def quantile(self, p, df):
+        r = np.minimum(p, 1 - p)
+        z = normal_quantile(r)
+        # Cornish-Fisher expansion about the normal quantile, and the power-law tail for small df
+        expansion = z + (z ** 3 + z) / (4 * df) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+        log_k = log_gamma_array((df + 1) / 2) - log_gamma_array(df / 2) - 0.5 * np.log(df * np.pi)
+        tail = -np.exp((log_k + (df - 1) / 2 * np.log(df) - np.log(r)) / df)
+        x0 = np.where(r < 0.05, np.minimum(expansion, tail), expansion)
+        x = _invert(self.cdf, self.pdf, r, x0, {"df": df})
+        return np.where(p > 0.5, -x, x)
+
+
+class ChiSquare(Distribution):
+    parameters = ("df",)
+    minimum = 0.0
+    requirement = (lambda df: (df > 0) & (df <= MAX_SHAPE), f"chi2 needs 0 < df <= {MAX_SHAPE:g}")
+
+    def pdf(self, x, df):
+        k = df / 2
+        density = np.exp((k - 1) * np.log(x) - x / 2 - k * math.log(2) - log_gamma_array(k))
+        return np.where(x < 0, 0.0, np.where((x == 0) & (k == 1), 0.5, density))
+
+    def cdf(self, x, df):
+        return regularized_gamma(df / 2, np.maximum(x, 0.0) / 2)[0]
+
+    def quantile(self, p, df):
+        # Wilson-Hilferty, or the small-x power law where it goes negative
+        h = 2 / (9 * df)
+        wilson = df * (1 - h + normal_quantile(p) * np.sqrt(h)) ** 3
+        power = 2 * np.exp((np.log(p) + log_gamma_array(df / 2 + 1)) / (df / 2))
+        x0 = np.where(wilson > 0, wilson, power)
+        return _invert(self.cdf, self.pdf, p, x0, {"df": df}, lower=0.0)
+
+
+class Exponential(Distribution):
+    parameters = ("rate",)
+    minimum = 0.0
+    defaults = {"rate": 1.0}
+    requirement = (lambda rate: (rate > 0) & np.isfinite(rate), "exponential needs a finite rate > 0")
+
+    def pdf(self, x, rate):
+        return np.where(x < 0, 0.0, rate * np.exp(-rate * x))
+
+    def cdf(self, x, rate):
+        return np.where(x < 0, 0.0, -np.expm1(-rate * x))
+
+    def quantile(self, p, rate):
+        return -np.log1p(-p) / rate
+
+
+class Poisson(Distribution):
+    parameters = ("mean",)
+    minimum = 0.0
+    discrete = True
+    requirement = (lambda mean: (mean > 0) & (mean <= MAX_SHAPE), f"poisson needs 0 < mean <= {MAX_SHAPE:g}")
+
+    def pdf(self, x, mean):
+        mass = np.exp(x * np.log(mean) - mean - log_gamma_array(np.maximum(x, 0) + 1))
+        return np.where((x >= 0) & (x == np.floor(x)), mass, 0.0)
+
+    def cdf(self, x, mean):
+        k = np.floor(x)
+        return np.where(k < 0, 0.0, regularized_gamma(np.maximum(k, 0) + 1, mean)[1])
+
+    def quantile(self, p, mean):
+        z = normal_quantile(p)
+        k0 = np.floor(mean + np.sqrt(mean) * z + (z * z - 1) / 6)
+        k = _discrete_quantile(self.cdf, p, np.nan_to_num(k0), {"mean": mean})
+        return np.where(p == 1, np.inf, k)
+
+
+class Binomial(Distribution):
+    parameters = ("n", "p")
+    minimum = 0.0
+    discrete = True
+    requirement = (
+        lambda n, p: (n >= 0) & (n == np.floor(n)) & (n <= MAX_SHAPE) & (p >= 0) & (p <= 1),
+        f"binomial needs a whole number of trials 0 <= n <= {MAX_SHAPE:g} and 0 <= p <= 1",
+    )
+
+    def maximum(self, n, p):
+        return n.copy()
+
+    def pdf(self, x, n, p):
+        k = np.clip(x, 0, n)
+        log_choose = log_gamma_array(n + 1) - log_gamma_array(k + 1) - log_gamma_array(n - k + 1)
+        # 0 * log(0) counts as 0 when p is 0 or 1
+        successes = np.where(k == 0, 0.0, k * np.log(p))
+        failures = np.where(k == n, 0.0, (n - k) * np.log1p(-p))
+        mass = np.exp(log_choose + successes + failures)
+        return np.where((x >= 0) & (x <= n) & (x == np.floor(x)), mass, 0.0)
+
+    def cdf(self, x, n, p):
+        k = np.clip(np.floor(x), 0, n)
+        # P(X <= k) = I_{1-p}(n - k, k + 1) for k < n
+        partial = regularized_beta(np.maximum(n - k, 1), k + 1, 1 - p, p)
+        return np.where(x < 0, 0.0, np.where(k >= n, 1.0, partial))
+
+    def quantile(self, q, n, p):
+        k0 = np.floor(n * p + np.sqrt(n * p * (1 - p)) * normal_quantile(q) + 0.5)
+        return _discrete_quantile(self.cdf, q, np.clip(np.nan_to_num(k0), 0, n), {"n": n, "p": p})
+
+
+DISTRIBUTIONS: dict[str, Distribution] = {
+    "normal": Normal(),
+    "t": StudentT(),
+    "chi2": ChiSquare(),
+    "exponential": Exponential(),
+    "poisson": Poisson(),
+    "binomial": Binomial(),
+}
+DISTRIBUTION_FUNCTIONS = ("pdf", "pmf", "cdf", "quantile")
+
+
+def evaluate_distribution(name: str, function: str, x, parameters: Optional[dict] = None) -> np.ndarray:
+    """
+    pdf (or pmf), cdf or quantile of a distribution at every point of ``x``;
+    parameters may be scalars or arrays broadcastable against ``x``.
+    Raises ValueError on unknown names or invalid parameters.
+    """
+    distribution = DISTRIBUTIONS.get(name.lower())
+    if distribution is None:
+        raise ValueError(f"Invalid distribution '{name}'. Must be one of: {sorted(DISTRIBUTIONS)}")
+    if function not in DISTRIBUTION_FUNCTIONS:
+        raise ValueError(f"Invalid function '{function}'. Must be one of: {list(DISTRIBUTION_FUNCTIONS)}")
+    parameters = {**distribution.defaults, **(parameters or {})}
+    unknown = set(parameters) - set(distribution.parameters)
+    if unknown:
+        raise ValueError(f"Unknown parameters for {name}: {sorted(unknown)}")
+    missing = [p for p in distribution.parameters if p not in parameters]
+    if missing:
+        raise ValueError(f"{name} needs parameters: {missing}")
+
+    x = np.asarray(x, dtype=np.float64)
+    arrays = np.broadcast_arrays(x, *(np.asarray(parameters[p], dtype=np.float64) for p in distribution.parameters))
+    shape = arrays[0].shape
+    x, *values = (array.ravel() for array in arrays)
+    params = dict(zip(distribution.parameters, values))
+    condition, detail = distribution.requirement
+    with np.errstate(invalid="ignore"):
+        if not np.all(condition(**params)):
+            raise ValueError(detail)
+    if np.isnan(x).any():
+        raise ValueError("Points must be numbers")
+
+    with np.errstate(all="ignore"):
+        if function == "quantile":
+            if np.any((x < 0) | (x > 1)):
+                raise ValueError("Quantile probabilities must be between 0 and 1")
+            result = np.empty_like(x)
+            inside = (x > 0) & (x < 1)
+            result[inside] = distribution.quantile(x[inside], **{k: v[inside] for k, v in params.items()})
+            at_edge = x == 0
+            result[at_edge] = distribution.minimum
+            at_edge = x == 1
+            result[at_edge] = distribution.maximum(**{k: v[at_edge] for k, v in params.items()})
+        elif function == "cdf":
+            result = distribution.cdf(x, **params)
+        else:
+            result = distribution.pdf(x, **params)
+    return result.reshape(shape)
+
+
+class DistributionOperation(Operation):
+    """``a`` is the point (or probability for quantiles); ``b`` the parameter, ignored if there is none."""
+
+    def __init__(self, distribution: str, function: str):
+        self.distribution = distribution
+        self.function = function
+        self.parameter = next(iter(DISTRIBUTIONS[distribution].parameters), None)
+        if distribution == "normal":
+            self.parameter = None  # standard normal, like the unary functions
+        self.arity = 2 if self.parameter else 1
+
+    def compute_array(self, a, b, out=None):
+        parameters = {self.parameter: b} if self.parameter else None
+        try:
+            result = evaluate_distribution(self.distribution, self.function, a, parameters)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if np.isinf(result).any():
+            # quantiles at p = 0 or 1 of an unbounded support
+            raise HTTPException(status_code=400, detail="The quantile at this probability is infinite")
+        if out is None:
+            return result
+        out[...] = result
+        return out
+
+    def defined(self, a, b):
+        distribution = DISTRIBUTIONS[self.distribution]
+        parameters = {self.parameter: b} if self.parameter else {}
+        condition, _ = distribution.requirement
+        with np.errstate(invalid="ignore"):
+            valid = ~np.isnan(a) & np.broadcast_to(condition(**{**distribution.defaults, **parameters}), a.shape)
+        if self.function == "quantile":
+            valid &= (a >= 0) & (a <= 1)
+            # only the probabilities 0 and 1 can give infinite quantiles
+            edge = valid & ((a == 0) | (a == 1))
+            if edge.any():
+                edge_parameters = {name: value[edge] for name, value in parameters.items()}
+                valid[edge] = np.isfinite(evaluate_distribution(self.distribution, "quantile", a[edge], edge_parameters))
+        return valid
+
+    def compute(self, a, b=0) -> float:
+        return float(self.compute_array(np.array([a], dtype=np.float64), np.array([b], dtype=np.float64))[0])
+
+
+DISTRIBUTION_OPERATIONS = []
+for _name in ("normal", "t", "chi2", "exponential", "poisson"):
+    for _function in ("pdf", "cdf", "quantile"):
+        _names = [f"{_name}_{_function}"]
+        if _function == "pdf" and DISTRIBUTIONS[_name].discrete:
+            _names.insert(0, f"{_name}_pmf")
+        register_instance(DistributionOperation(_name, _function), *_names)
+        DISTRIBUTION_OPERATIONS.append(_names[0])
@@ -0,0 +1,122 @@
+"""
+Streaming export of calculation history.
+
+Rows arrive in batches (lists of tuples in ``EXPORT_COLUMNS`` order, e.g.
+the partitions of a ``yield_per`` query) and each encoder turns every batch
+into bytes as soon as it arrives, so an export of any size is held in memory
+one batch at a time. Optional gzip compresses the byte stream incrementally;
+Parquet files are compressed internally by the writer instead.
+
+Parquet needs ``pyarrow``, which is optional: without it only CSV and NDJSON
+are available.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Sequence
+
+EXPORT_COLUMNS = (
+    "id", "a", "b", "type", "result", "precision", "result_text", "a_imag", "b_imag", "result_imag",
+    "a_unit", "b_unit", "result_unit", "chain_id", "created_at", "updated_at",
+)
+FORMATS = ("csv", "ndjson", "parquet")
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson", "parquet": "application/vnd.apache.parquet"}
+
+Batch = Sequence[tuple]
+
+
+def _text(value) -> object:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def encode_csv(batches: Iterable[Batch]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in batches:
+        writer.writerows([[_text(value) for value in row] for row in batch])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def encode_ndjson(batches: Iterable[Batch]) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, map(_text, row)))) + "\n" for row in batch
+        ).encode()
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _Drain(io.RawIOBase):
+    """Write-only file whose contents are taken (and cleared) after every write by the encoder."""
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def take(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+def encode_parquet(batches: Iterable[Batch], compression: str = "snappy") -> Iterator[bytes]:
+    """One Parquet row group per batch; the footer is written after the last."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.int64()), ("a", pa.float64()), ("b", pa.float64()), ("type", pa.string()),
+        ("result", pa.float64()), ("precision", pa.int64()), ("result_text", pa.string()),
+        ("a_imag", pa.float64()), ("b_imag", pa.float64()), ("result_imag", pa.float64()),
+        ("a_unit", pa.string()), ("b_unit", pa.string()), ("result_unit", pa.string()),
+        ("chain_id", pa.string()),
+        ("created_at", pa.timestamp("us", tz="UTC")), ("updated_at", pa.timestamp("us", tz="UTC")),
+    ])
+    sink = _Drain()
+    with pq.ParquetWriter(sink, schema, compression=compression) as writer:
+        for batch in batches:
+            columns = list(zip(*batch)) if batch else [[] for _ in EXPORT_COLUMNS]
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=schema.field(i).type) for i, column in enumerate(columns)], schema=schema
+            ))
+            yield sink.take()
+    yield sink.take()
+
+
+def gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
+
+
+def encode(format: str, batches: Iterable[Batch], compression: Optional[str] = None) -> Iterator[bytes]:
+    """Encoded bytes of the batches; ``compression="gzip"`` compresses CSV and NDJSON, and Parquet pages."""
+    if format == "parquet":
+        return encode_parquet(batches, compression=compression or "snappy")
+    chunks = encode_csv(batches) if format == "csv" else encode_ndjson(batches)
+    return gzip_stream(chunks) if compression == "gzip" else chunks
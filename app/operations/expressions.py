@@ -0,0 +1,225 @@
+"""
+Safe compilation of user expressions into vectorized NumPy functions.
+
+An expression such as ``x^2 + sin(a*x)`` is parsed with ``ast``, checked
+against a whitelist (numbers, names, arithmetic and calls to known
+functions), and compiled once into a Python function whose body applies
+NumPy ufuncs. Calling it with arrays evaluates all points in one pass.
+Compiled expressions are cached by source text.
+
+``^`` means power. ``log`` is base 10 and ``ln`` is natural, as for the
+calculation operations. Domain errors produce nan/inf rather than raising;
+callers decide how to report them.
+"""
+import ast
+import keyword
+from functools import lru_cache
+from typing import Callable, Mapping, Optional
+
+import numpy as np
+
+from app.operations.constants import get_constant
+from app.operations.scientific import factorial_array, gamma_array
+
+MAX_EXPRESSION_LENGTH = 2000
+# nesting of operators and calls; deeper trees exhaust the recursion limit of the validator and compiler
+MAX_EXPRESSION_DEPTH = 200
+
+FUNCTIONS: dict[str, Callable] = {
+    "sin": np.sin, "cos": np.cos, "tan": np.tan,
+    "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan, "atan2": np.arctan2,
+    "sinh": np.sinh, "cosh": np.cosh, "tanh": np.tanh,
+    "asinh": np.arcsinh, "acosh": np.arccosh, "atanh": np.arctanh,
+    "sqrt": np.sqrt, "exp": np.exp, "ln": np.log, "log": np.log10, "log10": np.log10, "log2": np.log2,
+    "abs": np.abs, "floor": np.floor, "ceil": np.ceil, "sign": np.sign,
+    "min": np.minimum, "max": np.maximum, "hypot": np.hypot, "pow": np.power,
+    "gamma": lambda x: gamma_array(np.atleast_1d(np.asarray(x, dtype=np.float64))).reshape(np.shape(x)),
+    "factorial": lambda x: factorial_array(np.atleast_1d(np.asarray(x, dtype=np.float64))).reshape(np.shape(x)),
+}
+
+# arguments each function takes; calls are checked against it, since a ufunc given an extra argument
+# takes it as its ``out`` buffer
+ARITIES: dict[str, int] = {
+    **{name: function.nin for name, function in FUNCTIONS.items() if isinstance(function, np.ufunc)},
+    "gamma": 1, "factorial": 1,
+}
+
+CONSTANTS: dict[str, float] = {
+    "pi": float(get_constant("pi", 20)),
+    "e": float(get_constant("e", 20)),
+}
+
+_BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod)
+_UNARY_OPERATORS = (ast.UAdd, ast.USub)
+
+
+class CompiledExpression:
+    """A compiled expression: call it with one value or array per variable, in order."""
+
+    def __init__(self, source: str, variables: tuple[str, ...], function: Callable):
+        self.source = source
+        self.variables = variables
+        self._function = function
+
+    def __call__(self, *values):
+        with np.errstate(all="ignore"):
+            return self._function(*values)
+
+    def evaluate(self, values: dict):
+        """Evaluate with variables given by name (scalars or broadcastable arrays)."""
+        missing = [name for name in self.variables if name not in values]
+        if missing:
+            raise ValueError(f"Missing value for variable(s): {', '.join(missing)}")
+        return self(*(values[name] for name in self.variables))
+
+    def bind(self, variable: str, parameters: Optional[dict] = None) -> Callable:
+        """One-argument function of ``variable`` with every other variable fixed from ``parameters``."""
+        parameters = parameters or {}
+        if variable in parameters:
+            raise ValueError(f"'{variable}' cannot also be a parameter")
+        missing = [name for name in self.variables if name != variable and name not in parameters]
+        if missing:
+            raise ValueError(f"Missing value for variable(s): {', '.join(missing)}")
+        values = dict(parameters)
+
+        def function(x):
+            values[variable] = x
+            result = self.evaluate(values)
+            return np.broadcast_to(result, np.shape(x)) if np.ndim(result) < np.ndim(x) else result
+        return function
+
+
+class _Validator(ast.NodeVisitor):
+    def __init__(self, functions: Mapping[str, Optional[int]]):
+        self.functions = functions
+        self.names: list[str] = []
+        self.depth = 0
+
+    def visit(self, node):
+        self.depth += 1
+        if self.depth > MAX_EXPRESSION_DEPTH:
+            raise ValueError(f"Expressions are limited to {MAX_EXPRESSION_DEPTH} levels of nesting")
+        try:
+            return super().visit(node)
+        finally:
+            self.depth -= 1
+
+    def generic_visit(self, node):
+        raise ValueError(f"Unsupported syntax in expression: {type(node).__name__}")
+
+    def visit_Expression(self, node):
+        self.visit(node.body)
+
+    def visit_BinOp(self, node):
+        if not isinstance(node.op, _BINARY_OPERATORS):
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        self.visit(node.left)
+        self.visit(node.right)
+
+    def visit_UnaryOp(self, node):
+        if not isinstance(node.op, _UNARY_OPERATORS):
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        self.visit(node.operand)
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError("Only numeric literals are allowed")
+
+    def visit_Name(self, node):
+        if node.id.startswith("_"):
+            raise ValueError(f"Invalid name '{node.id}'")
+        if node.id in self.functions:
+            raise ValueError(f"'{node.id}' is a function and must be called")
+        if node.id not in CONSTANTS and node.id not in self.names:
+            self.names.append(node.id)
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in self.functions:
+            name = node.func.id if isinstance(node.func, ast.Name) else "expression"
+            raise ValueError(f"Unknown function '{name}'")
+        if node.keywords:
+            raise ValueError("Keyword arguments are not supported")
+        arity = self.functions[node.func.id]
+        if arity is not None and len(node.args) != arity:
+            raise ValueError(f"{node.func.id}() takes {arity} argument(s), got {len(node.args)}")
+        for argument in node.args:
+            if isinstance(argument, ast.Starred):
+                raise ValueError("Unsupported syntax in expression: Starred")
+            self.visit(argument)
+
+
+class _LiteralsToFloat(ast.NodeTransformer):
+    """Bind numeric literals to float64 globals so huge powers overflow to inf instead of running as big ints."""
+
+    def __init__(self):
+        self.literals: dict[str, np.float64] = {}
+
+    def visit_Constant(self, node):
+        name = f"_c{len(self.literals)}"
+        self.literals[name] = np.float64(node.value)
+        return ast.copy_location(ast.Name(id=name, ctx=ast.Load()), node)
+
+
+def parse(source: str, functions: Mapping[str, Optional[int]] = ARITIES) -> tuple[ast.Expression, list[str]]:
+    """
+    Parse and validate an expression; returns the tree and its free variable names in order of appearance.
+    ``functions`` maps the callable names to their number of arguments (None: not checked).
+    """
+    if len(source) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"Expressions are limited to {MAX_EXPRESSION_LENGTH} characters")
+    try:
+        tree = ast.parse(source.replace("^", "**").strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression: {e.msg}")
+    except (RecursionError, MemoryError):
+        raise ValueError("Invalid expression: too deeply nested")
+    validator = _Validator(functions)
+    validator.visit(tree)
+    return tree, validator.names
+
+
+def check_variable_name(name: str, functions: Mapping[str, Optional[int]] = ARITIES) -> None:
+    """Raise ValueError unless ``name`` can be used as a variable."""
+    if not name.isidentifier() or keyword.iskeyword(name) or name.startswith("_"):
+        raise ValueError(f"Invalid variable name '{name}'")
+    if name in functions or name in CONSTANTS:
+        raise ValueError(f"'{name}' is reserved and cannot be a variable")
+
+
+def build(
+    source: str,
+    variables: Optional[tuple[str, ...]] = None,
+    functions: Optional[dict[str, Callable]] = None,
+) -> CompiledExpression:
+    """
+    Compile without caching; ``functions`` adds callables (e.g. user-defined functions),
+    whose calls are checked against their ``arity`` attribute when they have one.
+    """
+    namespace_functions = {**FUNCTIONS, **(functions or {})}
+    arities = {**ARITIES, **{name: getattr(function, "arity", None) for name, function in (functions or {}).items()}}
+    tree, names = parse(source, arities)
+    if variables is None:
+        variables = tuple(names)
+    else:
+        for name in variables:
+            check_variable_name(name, arities)
+        unknown = [name for name in names if name not in variables]
+        if unknown:
+            raise ValueError(f"Unknown variable(s): {', '.join(unknown)}")
+        variables = tuple(variables)
+    transformer = _LiteralsToFloat()
+    body = transformer.visit(tree).body
+    arguments = ast.arguments(
+        posonlyargs=[], args=[ast.arg(arg=name) for name in variables],
+        kwonlyargs=[], kw_defaults=[], defaults=[]
+    )
+    lambda_tree = ast.fix_missing_locations(ast.Expression(body=ast.Lambda(args=arguments, body=body)))
+    namespace = {"__builtins__": {}, **namespace_functions, **CONSTANTS, **transformer.literals}
+    function = eval(compile(lambda_tree, "<expression>", "eval"), namespace)
+    return CompiledExpression(source, variables, function)
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(source: str, variables: Optional[tuple[str, ...]] = None) -> CompiledExpression:
+    """Compile an expression, reusing the cached result for the same source and variables."""
+    return build(source, variables)
@@ -0,0 +1,187 @@
+"""
+Bulk import of calculation history from CSV or NDJSON.
+
+Input arrives as a stream of byte blocks. ``LineSplitter`` cuts it into
+lines without buffering more than one partial line, and the importer turns
+each chunk of lines into columns, checks every row and recomputes its result
+with the operation's vectorized kernel, one call per operation type in the
+chunk. Invalid rows are counted and sampled, never fatal; only a malformed
+CSV header stops an import.
+
+Rows need ``a``, ``type`` and usually ``b`` (empty or missing means 0, as
+for unary operations). An optional ``result`` is checked against the
+recomputed value.
+"""
+import csv
+import json
+import math
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from app.operations import get_operation
+from app.operations.sweep import compute_defined
+
+CHUNK_ROWS = 50_000
+MAX_ERROR_SAMPLES = 100
+MAX_LINE_LENGTH = 1 << 16
+FORMATS = ("csv", "ndjson")
+REQUIRED_COLUMNS = ("a", "type")
+# stored and recomputed results may differ by rounding in the legacy system
+RESULT_TOLERANCE = 1e-9
+
+
+class LineSplitter:
+    """Incremental splitting of a byte stream into lines."""
+
+    def __init__(self):
+        self._partial = b""
+
+    def feed(self, data: bytes) -> list[bytes]:
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        if len(self._partial) > MAX_LINE_LENGTH:
+            raise ValueError(f"Lines are limited to {MAX_LINE_LENGTH} bytes")
+        return lines
+
+    def close(self) -> list[bytes]:
+        partial, self._partial = self._partial, b""
+        return [partial] if partial else []
+
+
+@dataclass
+class ImportChunk:
+    """Valid rows of one chunk as columns, and the (line, message) of each invalid row."""
+    a: np.ndarray
+    b: np.ndarray
+    types: list[str]
+    results: np.ndarray
+    errors: list[tuple[int, str]] = field(default_factory=list)
+    rows: int = 0  # non-blank data lines read
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+
+@dataclass
+class _Rows:
+    lines: list[int] = field(default_factory=list)
+    a: list = field(default_factory=list)
+    b: list = field(default_factory=list)
+    types: list[str] = field(default_factory=list)
+    results: list = field(default_factory=list)
+
+
+def _number(value, name: str, default: Optional[float] = None) -> float:
+    if value is None or value == "":
+        if default is None:
+            raise ValueError(f"missing {name}")
+        return default
+    if isinstance(value, bool):
+        raise ValueError(f"{name} must be a number")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number")
+    if not math.isfinite(number) and name != "result":
+        raise ValueError(f"{name} must be finite")
+    return number
+
+
+class CalculationImporter:
+    """Parses and computes chunks of one upload; keeps the CSV header and the line count between chunks."""
+
+    def __init__(self, format: str):
+        if format not in FORMATS:
+            raise ValueError(f"Unsupported format '{format}'. Must be one of: {list(FORMATS)}")
+        self.format = format
+        self.columns: Optional[dict[str, int]] = None
+        self.line = 0
+
+    def _read_header(self, text: str):
+        names = [name.strip().lower() for name in next(csv.reader([text]))]
+        missing = [name for name in REQUIRED_COLUMNS if name not in names]
+        if missing:
+            raise ValueError(f"CSV header is missing column(s): {', '.join(missing)}")
+        self.columns = {name: names.index(name) for name in ("a", "b", "type", "result") if name in names}
+
+    def _fields(self, text: str) -> dict:
+        if self.format == "ndjson":
+            record = json.loads(text)
+            if not isinstance(record, dict):
+                raise ValueError("each line must be a JSON object")
+            return record
+        values = next(csv.reader([text]))
+        return {name: values[index] if index < len(values) else None for name, index in self.columns.items()}
+
+    def parse(self, lines: list[bytes], errors: list[tuple[int, str]]) -> _Rows:
+        rows = _Rows()
+        for raw in lines:
+            self.line += 1
+            text = raw.rstrip(b"\r")
+            if not text.strip():
+                continue
+            if self.format == "csv" and self.columns is None:
+                self._read_header(text.decode("utf-8", errors="replace").lstrip("\ufeff"))
+                continue
+            try:
+                record = self._fields(text.decode("utf-8"))
+                op_type = record.get("type")
+                if not isinstance(op_type, str) or not op_type.strip():
+                    raise ValueError("missing type")
+                a = _number(record.get("a"), "a")
+                b = _number(record.get("b"), "b", default=0.0)
+                result = _number(record.get("result"), "result", default=math.nan)
+            except UnicodeDecodeError:
+                errors.append((self.line, "line is not valid UTF-8"))
+                continue
+            except (ValueError, csv.Error) as e:  # json.JSONDecodeError is a ValueError
+                errors.append((self.line, str(e)))
+                continue
+            rows.lines.append(self.line)
+            rows.a.append(a)
+            rows.b.append(b)
+            rows.types.append(op_type.strip().lower())
+            rows.results.append(result)
+        return rows
+
+    def process(self, lines: list[bytes]) -> ImportChunk:
+        """Parse, validate and compute one chunk of lines."""
+        errors: list[tuple[int, str]] = []
+        rows = self.parse(lines, errors)
+        parsed = len(rows.lines) + len(errors)
+        a, b = np.array(rows.a, dtype=np.float64), np.array(rows.b, dtype=np.float64)
+        stored = np.array(rows.results, dtype=np.float64)
+        results = np.full(len(a), np.nan)
+        messages: dict[int, str] = {}
+
+        groups: dict[str, list[int]] = {}
+        for index, op_type in enumerate(rows.types):
+            groups.setdefault(op_type, []).append(index)
+        for op_type, indices in groups.items():
+            try:
+                operation = get_operation(op_type)
+            except ValueError:
+                messages.update((i, f"invalid operation type '{op_type}'") for i in indices)
+                continue
+            with np.errstate(all="ignore"):
+                results[indices] = compute_defined(operation, a[indices], b[indices])
+
+        finite = np.isfinite(results)
+        for i in np.flatnonzero(~finite).tolist():
+            messages.setdefault(
+                i, f"{rows.types[i]} is undefined for a={rows.a[i]!r}, b={rows.b[i]!r}"
+                if np.isnan(results[i]) else "result is not a finite number"
+            )
+        mismatch = finite & ~np.isnan(stored) & ~np.isclose(stored, results, rtol=RESULT_TOLERANCE, atol=0)
+        for i in np.flatnonzero(mismatch).tolist():
+            messages[i] = f"stored result {rows.results[i]!r} does not match computed {float(results[i])!r}"
+
+        errors.extend((rows.lines[i], message) for i, message in messages.items())
+        errors.sort()
+        kept = np.flatnonzero(finite & ~mismatch)
+        return ImportChunk(
+            a=a[kept], b=b[kept], types=[rows.types[i] for i in kept.tolist()], results=results[kept],
+            errors=errors, rows=parsed,
+        )
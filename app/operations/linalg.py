@@ -0,0 +1,140 @@
+"""
+Matrix and linear-algebra operations.
+
+All work is done by NumPy's BLAS/LAPACK routines, which are already
+cache-blocked and multi-threaded. Large inputs are run in the shared process
+pool so that an API worker is never tied up by a single big solve.
+
+Binary payload format (little-endian), used for uploads, downloads and the
+persisted payload of a matrix calculation: for each matrix, a uint32 row
+count, a uint32 column count, then rows * cols float64 values in row-major
+order.
+"""
+import struct
+from typing import Callable
+
+import numpy as np
+
+from app.operations.parallel import get_process_pool
+
+# Inputs with more elements than this (all matrices together) run in the process pool
+POOL_THRESHOLD = 250_000
+MAX_ELEMENTS = 25_000_000
+
+_HEADER = struct.Struct("<II")
+
+
+def pack_matrices(matrices: list[np.ndarray]) -> bytes:
+    parts = []
+    for matrix in matrices:
+        matrix = np.atleast_2d(np.asarray(matrix, dtype="<f8"))
+        parts.append(_HEADER.pack(*matrix.shape))
+        parts.append(matrix.tobytes(order="C"))
+    return b"".join(parts)
+
+
+def unpack_matrices(data: bytes) -> list[np.ndarray]:
+    matrices, offset = [], 0
+    while offset < len(data):
+        if offset + _HEADER.size > len(data):
+            raise ValueError("Truncated matrix header")
+        rows, cols = _HEADER.unpack_from(data, offset)
+        offset += _HEADER.size
+        size = rows * cols * 8
+        if offset + size > len(data):
+            raise ValueError("Truncated matrix data")
+        matrices.append(np.frombuffer(data, dtype="<f8", count=rows * cols, offset=offset).reshape(rows, cols))
+        offset += size
+    return matrices
+
+
+def _square(matrix: np.ndarray, name: str) -> np.ndarray:
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError(f"{name} requires a square matrix")
+    return matrix
+
+
+def _multiply(*matrices):
+    if len(matrices) < 2:
+        raise ValueError("multiply requires at least two matrices")
+    for left, right in zip(matrices, matrices[1:]):
+        if left.shape[1] != right.shape[0]:
+            raise ValueError(f"Cannot multiply {left.shape[0]}x{left.shape[1]} by {right.shape[0]}x{right.shape[1]}")
+    # multi_dot picks the cheapest parenthesization for chains
+    return matrices[0] @ matrices[1] if len(matrices) == 2 else np.linalg.multi_dot(matrices)
+
+
+def _transpose(matrix):
+    return np.ascontiguousarray(matrix.T)
+
+
+def _inverse(matrix):
+    return np.linalg.inv(_square(matrix, "inverse"))
+
+
+def _determinant(matrix):
+    return np.array([[np.linalg.det(_square(matrix, "determinant"))]])
+
+
+def _solve(matrix, rhs):
+    _square(matrix, "solve")
+    if rhs.shape[0] != matrix.shape[0]:
+        raise ValueError("b must have as many rows as A")
+    return np.linalg.solve(matrix, rhs)
+
+
+def _eigenvalues(matrix):
+    """Eigenvalues as a 2 x n matrix: real parts, then imaginary parts."""
+    _square(matrix, "eigenvalues")
+    if np.array_equal(matrix, matrix.T):
+        values = np.linalg.eigvalsh(matrix)
+        return np.vstack([values, np.zeros_like(values)])
+    values = np.linalg.eigvals(matrix)
+    return np.vstack([values.real, values.imag])
+
+
+# name -> (function, number of matrices it takes; None for two or more)
+MATRIX_OPERATIONS: dict[str, tuple[Callable[..., np.ndarray], int | None]] = {
+    "multiply": (_multiply, None),
+    "transpose": (_transpose, 1),
+    "inverse": (_inverse, 1),
+    "determinant": (_determinant, 1),
+    "solve": (_solve, 2),
+    "eigenvalues": (_eigenvalues, 1),
+}
+
+
+def _apply(op_type: str, matrices: list[np.ndarray]) -> np.ndarray:
+    function, _ = MATRIX_OPERATIONS[op_type]
+    try:
+        return function(*matrices)
+    except np.linalg.LinAlgError as e:
+        raise ValueError(f"Matrix is singular or ill-conditioned: {e}")
+
+
+def compute_matrix(op_type: str, matrices: list) -> np.ndarray:
+    """
+    Run a matrix operation. Matrices may be nested lists or arrays; a 1-D
+    operand is treated as a column vector. Raises ValueError on bad input.
+    """
+    op_type = op_type.lower()
+    if op_type not in MATRIX_OPERATIONS:
+        raise ValueError(f"Invalid matrix operation '{op_type}'. Must be one of: {sorted(MATRIX_OPERATIONS)}")
+    arrays = []
+    for matrix in matrices:
+        array = np.asarray(matrix, dtype=np.float64)
+        if array.ndim == 1:
+            array = array.reshape(-1, 1)
+        if array.ndim != 2 or array.size == 0:
+            raise ValueError("Each matrix must be a non-empty two-dimensional array")
+        arrays.append(array)
+    _, arity = MATRIX_OPERATIONS[op_type]
+    if arity is not None and len(arrays) != arity:
+        raise ValueError(f"{op_type} takes exactly {arity} matri{'x' if arity == 1 else 'ces'}")
+
+    elements = sum(array.size for array in arrays)
+    if elements > MAX_ELEMENTS:
+        raise ValueError(f"Matrices are limited to {MAX_ELEMENTS} elements in total")
+    if elements > POOL_THRESHOLD:
+        return get_process_pool().submit(_apply, op_type, arrays).result()
+    return _apply(op_type, arrays)
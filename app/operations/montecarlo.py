@@ -0,0 +1,197 @@
+"""
+Monte Carlo simulation: evaluate an expression over random draws of its
+variables and summarize the results.
+
+Samples are generated in fixed-size chunks, and chunk i draws from the i-th
+``SeedSequence`` spawned from the run's seed, so a seeded run produces the
+same numbers however many processes share the work. Each chunk is reduced to
+a mergeable summary (count, mean, sum of squared deviations, extremes and a
+quantile sketch) and summaries are merged in chunk order, so no more than one
+chunk of samples is ever held per process.
+"""
+import math
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+import numpy as np
+
+from app.operations.distributions import DISTRIBUTIONS, normal_quantile
+from app.operations.expressions import compile_expression
+from app.operations.parallel import cpu_count, get_process_pool
+
+CHUNK_SIZE = 1_000_000
+MAX_SAMPLES = 1_000_000_000
+MAX_VARIABLES = 20
+
+# Probabilities at which every chunk records its empirical quantiles: a
+# uniform 0.0002 grid in the body and geometric grids into both tails
+_TAIL = np.geomspace(1e-7, 1e-2, 101)[:-1]
+SKETCH_PROBABILITIES = np.r_[0.0, _TAIL, np.linspace(0.01, 0.99, 4901), 1 - _TAIL[::-1], 1.0]
+
+# name -> (parameters, defaults, draw(rng, size, **parameters))
+SAMPLERS = {
+    "normal": (("mean", "sd"), {"mean": 0.0, "sd": 1.0}, lambda rng, size, mean, sd: rng.normal(mean, sd, size)),
+    "uniform": (("low", "high"), {"low": 0.0, "high": 1.0}, lambda rng, size, low, high: rng.uniform(low, high, size)),
+    "t": (("df",), {}, lambda rng, size, df: rng.standard_t(df, size)),
+    "chi2": (("df",), {}, lambda rng, size, df: rng.chisquare(df, size)),
+    "exponential": (("rate",), {"rate": 1.0}, lambda rng, size, rate: rng.exponential(1 / rate, size)),
+    "poisson": (("mean",), {}, lambda rng, size, mean: rng.poisson(mean, size).astype(np.float64)),
+    "binomial": (("n", "p"), {}, lambda rng, size, n, p: rng.binomial(int(n), p, size).astype(np.float64)),
+}
+
+
+def sampler_parameters(distribution: str, parameters: dict) -> dict[str, float]:
+    """Validated parameters of a sampling distribution, with defaults filled in."""
+    if distribution not in SAMPLERS:
+        raise ValueError(f"Invalid distribution '{distribution}'. Must be one of: {sorted(SAMPLERS)}")
+    names, defaults, _ = SAMPLERS[distribution]
+    values = {**defaults, **parameters}
+    unknown = set(values) - set(names)
+    if unknown:
+        raise ValueError(f"Unknown parameters for {distribution}: {sorted(unknown)}")
+    missing = [name for name in names if name not in values]
+    if missing:
+        raise ValueError(f"{distribution} needs parameters: {missing}")
+    values = {name: float(values[name]) for name in names}
+    if distribution == "uniform":
+        if not (math.isfinite(values["low"]) and math.isfinite(values["high"]) and values["low"] < values["high"]):
+            raise ValueError("uniform needs finite low < high")
+    else:
+        condition, detail = DISTRIBUTIONS[distribution].requirement
+        if not np.all(condition(**{name: np.array([value]) for name, value in values.items()})):
+            raise ValueError(detail)
+    return values
+
+
+@dataclass
+class SampleSummary:
+    """Mergeable summary of a set of samples; non-finite results are only counted."""
+    count: int
+    mean: float
+    m2: float
+    minimum: float
+    maximum: float
+    non_finite: int
+    sketch: np.ndarray  # empirical quantiles at SKETCH_PROBABILITIES
+
+    @classmethod
+    def of(cls, values: np.ndarray) -> "SampleSummary":
+        finite = values[np.isfinite(values)]
+        if not len(finite):
+            return cls(0, 0.0, 0.0, math.inf, -math.inf, len(values), np.full(len(SKETCH_PROBABILITIES), np.nan))
+        mean = float(finite.mean())
+        return cls(
+            len(finite), mean, float(np.square(finite - mean).sum()),
+            float(finite.min()), float(finite.max()), len(values) - len(finite),
+            np.quantile(finite, SKETCH_PROBABILITIES),
+        )
+
+    def merge(self, other: "SampleSummary") -> "SampleSummary":
+        if not other.count or not self.count:
+            kept = self if self.count else other
+            return SampleSummary(
+                kept.count, kept.mean, kept.m2, kept.minimum, kept.maximum,
+                self.non_finite + other.non_finite, kept.sketch,
+            )
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        # Chan et al.'s pairwise update of the mean and squared deviations
+        return SampleSummary(
+            count,
+            self.mean + delta * other.count / count,
+            self.m2 + other.m2 + delta * delta * self.count * other.count / count,
+            min(self.minimum, other.minimum),
+            max(self.maximum, other.maximum),
+            self.non_finite + other.non_finite,
+            _merge_sketches(self.sketch, self.count, other.sketch, other.count),
+        )
+
+    @property
+    def sd(self) -> float:
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    @property
+    def standard_error(self) -> float:
+        return self.sd / math.sqrt(self.count) if self.count else math.nan
+
+    def confidence_interval(self, confidence: float) -> tuple[float, float]:
+        """Normal-approximation interval for the mean."""
+        half = float(normal_quantile(np.array([(1 + confidence) / 2]))[0]) * self.standard_error
+        return self.mean - half, self.mean + half
+
+    def quantiles(self, probabilities) -> np.ndarray:
+        """Approximate quantiles, read off the sketch; for large runs the error is well below the sampling error."""
+        return np.interp(probabilities, SKETCH_PROBABILITIES, self.sketch)
+
+
+def _merge_sketches(a: np.ndarray, a_count: int, b: np.ndarray, b_count: int) -> np.ndarray:
+    """
+    Quantile sketch of the union: the mixture of the two piecewise-linear
+    distribution functions is piecewise linear between their breakpoints, so
+    it is inverted exactly by interpolation.
+    """
+    points = np.union1d(a, b)
+    cdf = (a_count * _sketch_cdf(points, a) + b_count * _sketch_cdf(points, b)) / (a_count + b_count)
+    return np.interp(SKETCH_PROBABILITIES, cdf, points)
+
+
+def _sketch_cdf(x: np.ndarray, sketch: np.ndarray) -> np.ndarray:
+    # repeated values (discrete results) take the largest probability at the value
+    return np.interp(x, sketch, SKETCH_PROBABILITIES, left=0.0, right=1.0)
+
+
+def _simulate_chunk(expression: str, variables: tuple, seed: np.random.SeedSequence, size: int) -> SampleSummary:
+    """Worker entry point: draw ``size`` samples of every variable and summarize the expression."""
+    rng = np.random.default_rng(seed)
+    names = tuple(name for name, _, _ in variables)
+    draws = {name: SAMPLERS[distribution][2](rng, size, **parameters) for name, distribution, parameters in variables}
+    values = np.broadcast_to(compile_expression(expression, names).evaluate(draws), (size,))
+    return SampleSummary.of(np.asarray(values, dtype=np.float64))
+
+
+def iterate_simulation(
+    expression: str,
+    variables: dict[str, tuple[str, dict]],
+    samples: int,
+    seed: int,
+    chunk_size: int = CHUNK_SIZE,
+    workers: Optional[int] = None,
+) -> Iterator[SampleSummary]:
+    """
+    Yield the running summary after each chunk. ``variables`` maps each name to
+    (distribution, parameters). Chunks run across ``workers`` processes
+    (default: all cores) but are merged in order, so the result depends only on
+    the seed, ``samples`` and ``chunk_size``.
+    """
+    if not 1 <= samples <= MAX_SAMPLES:
+        raise ValueError(f"samples must be between 1 and {MAX_SAMPLES}")
+    if not variables:
+        raise ValueError("At least one random variable is needed")
+    if len(variables) > MAX_VARIABLES:
+        raise ValueError(f"At most {MAX_VARIABLES} random variables are supported")
+    specs = tuple(
+        (name, distribution, sampler_parameters(distribution, parameters))
+        for name, (distribution, parameters) in variables.items()
+    )
+    compile_expression(expression, tuple(variables))  # reject bad expressions before any work starts
+
+    sizes = [min(chunk_size, samples - start) for start in range(0, samples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = min(workers or cpu_count(), len(sizes))
+    if workers <= 1:
+        chunks = (_simulate_chunk(expression, specs, child, size) for child, size in zip(seeds, sizes))
+        futures = []
+    else:
+        pool = get_process_pool()
+        futures = [pool.submit(_simulate_chunk, expression, specs, child, size) for child, size in zip(seeds, sizes)]
+        chunks = (future.result() for future in futures)
+
+    try:
+        summary = None
+        for chunk in chunks:
+            summary = chunk if summary is None else summary.merge(chunk)
+            yield summary
+    finally:
+        for future in futures:
+            future.cancel()
+
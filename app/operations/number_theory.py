@@ -0,0 +1,487 @@
+"""
+Exact big-integer number theory.
+
+Everything here works on Python ints, so results are exact at any size.
+Factorial and binomial use prime factorizations (Luschny's prime-swing for
+factorial, Kummer's theorem for binomial) over a prime table that is sieved
+in segments, cached in memory and extended lazily.
+"""
+import math
+import random
+import threading
+from decimal import Decimal
+from typing import Optional
+
+import numpy as np
+from fastapi import HTTPException
+
+from app.operations import Number, Operation, register_operation
+from app.operations.scientific import log_gamma_array
+
+_SEGMENT_SIZE = 1 << 18
+# Keep single requests interactive: converting the digits of n! to text
+# dominates, and 30000! (121288 digits) already takes ~0.3 s
+MAX_FACTORIAL_N = 30_000
+MAX_BINOMIAL_N = 10_000_000
+# Largest integer n for which float(n) is exact
+_FLOAT_EXACT = 2 ** 53
+# Natural log of the largest float, with a margin for the rounding of lgamma differences
+_LOG_FLOAT_MAX = math.log(1.7976931348623157e308) + 1e-6
+# Binomials with k below this use math.comb and need no prime table
+_SMALL_BINOMIAL_K = 50
+
+
+class PrimeTable:
+    """Primes below ``limit``, extended on demand with a segmented sieve."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.limit = 2
+        self.primes = np.array([], dtype=np.int64)
+
+    def primes_up_to(self, n: int) -> np.ndarray:
+        """All primes <= n."""
+        if n >= self.limit:
+            with self._lock:
+                if n >= self.limit:
+                    # at least double so slowly growing requests sieve rarely
+                    self._extend(max(n + 1, 2 * self.limit))
+        return self.primes[:np.searchsorted(self.primes, n, side="right")]
+
+    def _extend(self, new_limit: int) -> None:
+        root = math.isqrt(new_limit) + 1
+        if root >= self.limit:
+            base = _simple_sieve(root)
+        else:
+            base = self.primes[:np.searchsorted(self.primes, root, side="right")]
+        segments = [self.primes]
+        for low in range(self.limit, new_limit, _SEGMENT_SIZE):
+            high = min(low + _SEGMENT_SIZE, new_limit)
+            is_prime = np.ones(high - low, dtype=bool)
+            for p in base.tolist():
+                if p * p >= high:
+                    break
+                start = max(p * p, -(-low // p) * p)
+                is_prime[start - low::p] = False
+            segments.append(np.flatnonzero(is_prime).astype(np.int64) + low)
+        self.primes = np.concatenate(segments)
+        self.limit = new_limit
+
+
+def _simple_sieve(n: int) -> np.ndarray:
+    is_prime = np.ones(n, dtype=bool)
+    is_prime[:2] = False
+    for p in range(2, math.isqrt(n - 1) + 1):
+        if is_prime[p]:
+            is_prime[p * p::p] = False
+    return np.flatnonzero(is_prime).astype(np.int64)
+
+
+PRIME_TABLE = PrimeTable()
+
+
+def _product(values: list[int]) -> int:
+    """Balanced product tree: much faster than a running product for big ints."""
+    if not values:
+        return 1
+    while len(values) > 1:
+        paired = [values[i] * values[i + 1] for i in range(0, len(values) - 1, 2)]
+        if len(values) % 2:
+            paired.append(values[-1])
+        values = paired
+    return values[0]
+
+
+def _odd_swing(n: int, odd_primes: list[int]) -> int:
+    """Odd part of n! / ((n // 2)!)**2 from its prime factorization."""
+    root = math.isqrt(n)
+    factors = []
+    for p in odd_primes:
+        if p > n:
+            break
+        if p > n // 2:
+            factors.append(p)
+        elif p > n // 3:
+            continue
+        elif p > root:
+            if (n // p) & 1:
+                factors.append(p)
+        else:
+            q, power = n, 1
+            while True:
+                q //= p
+                if q == 0:
+                    break
+                if q & 1:
+                    power *= p
+            if power > 1:
+                factors.append(power)
+    return _product(factors)
+
+
+def factorial(n: int) -> int:
+    """n! by the prime-swing algorithm."""
+    if n < 0:
+        raise ValueError("Factorial requires a non-negative integer")
+    if n < 20:
+        return math.factorial(n)
+    odd_primes = PRIME_TABLE.primes_up_to(n)[1:].tolist()
+
+    def odd_factorial(m: int) -> int:
+        if m < 2:
+            return 1
+        return odd_factorial(m // 2) ** 2 * _odd_swing(m, odd_primes)
+
+    return odd_factorial(n) << (n - bin(n).count("1"))
+
+
+def binomial(n: int, k: int) -> int:
+    """n choose k from its prime factorization (Kummer's theorem)."""
+    if k < 0 or k > n:
+        return 0
+    k = min(k, n - k)
+    if k < _SMALL_BINOMIAL_K:
+        return math.comb(n, k)
+    factors = []
+    for p in PRIME_TABLE.primes_up_to(n).tolist():
+        if p > n - k:
+            factors.append(p)
+        elif p > n // 2:
+            continue
+        else:
+            # exponent of p = number of carries when adding k and n - k in base p
+            a, b, carry, power = k, n - k, 0, 1
+            while a or b:
+                carry = 1 if a % p + b % p + carry >= p else 0
+                if carry:
+                    power *= p
+                a //= p
+                b //= p
+            if power > 1:
+                factors.append(power)
+    return _product(factors)
+
+
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+# The bases above give a deterministic answer for n below this bound
+_MR_DETERMINISTIC_BOUND = 3317044064679887385961981
+
+
+def _jacobi(a: int, n: int) -> int:
+    """Jacobi symbol (a/n) for odd positive n."""
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def _is_strong_lucas_probable_prime(n: int) -> bool:
+    """Strong Lucas test with Selfridge's parameters (P = 1, Q = (1 - D) / 4), for odd n > 2."""
+    if math.isqrt(n) ** 2 == n:
+        return False  # no suitable D exists for squares
+    d = 5
+    while True:
+        jacobi = _jacobi(d, n)
+        if jacobi == -1:
+            break
+        if jacobi == 0 and abs(d) != n:
+            return False
+        d = -d - 2 if d > 0 else -d + 2
+    q = (1 - d) // 4
+    k, s = n + 1, 0
+    while k % 2 == 0:
+        k //= 2
+        s += 1
+    # U_m, V_m and Q^m for m = 1, built up over the bits of k
+    u, v, q_m = 1, 1, q % n
+    for bit in bin(k)[3:]:
+        u, v, q_m = u * v % n, (v * v - 2 * q_m) % n, q_m * q_m % n
+        if bit == "1":
+            u, v = u + v, (d * u + v) % n
+            u, v = (u + n if u % 2 else u) // 2 % n, (v + n if v % 2 else v) // 2 % n
+            q_m = q_m * q % n
+    if u == 0 or v == 0:
+        return True
+    for _ in range(s - 1):
+        v, q_m = (v * v - 2 * q_m) % n, q_m * q_m % n
+        if v == 0:
+            return True
+    return False
+
+
+def is_prime(n: int) -> bool:
+    """
+    Miller-Rabin primality test, deterministic for n < 3.3e24. Larger n get
+    the Baillie-PSW test (a base-2 Miller-Rabin round and a strong Lucas
+    test): "not prime" is always right, and no composite is known to pass.
+    """
+    if n < 2:
+        return False
+    for p in _MR_BASES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    bases = _MR_BASES if n < _MR_DETERMINISTIC_BOUND else (2,)
+    for a in bases:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return n < _MR_DETERMINISTIC_BOUND or _is_strong_lucas_probable_prime(n)
+
+
+def _pollard_brent(n: int, max_iterations: int) -> Optional[int]:
+    """A non-trivial factor of composite n (Brent's variant of Pollard rho), or None."""
+    if n % 2 == 0:
+        return 2
+    rng = random.Random(n)
+    iterations = 0
+    while iterations < max_iterations:
+        y, c, m = rng.randrange(1, n), rng.randrange(1, n), 128
+        g = r = q = 1
+        x = ys = y
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+            iterations += r
+            if iterations >= max_iterations:
+                break
+        if g == n:
+            # batch overshot: step back one value at a time
+            while True:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+                if g > 1:
+                    break
+        if 1 < g < n:
+            return g
+    return None
+
+
+def factorize(n: int, max_iterations: int = 5_000_000) -> dict[int, int]:
+    """Prime factorization {prime: exponent} by trial division then Pollard rho."""
+    if n < 1:
+        raise ValueError("Factorization requires a positive integer")
+    factors: dict[int, int] = {}
+    for p in PRIME_TABLE.primes_up_to(1000).tolist():
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if is_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+            continue
+        root = math.isqrt(m)
+        if root * root == m:
+            stack += [root, root]
+            continue
+        divisor = _pollard_brent(m, max_iterations)
+        if divisor is None:
+            raise HTTPException(status_code=400, detail="Factorization did not finish within the iteration limit")
+        stack += [divisor, m // divisor]
+    return dict(sorted(factors.items()))
+
+
+def mod_inverse(a: int, m: int) -> int:
+    if m == 0:
+        raise ValueError("Modulus must be non-zero")
+    try:
+        return pow(a, -1, m)
+    except ValueError:
+        raise ValueError(f"{a} has no inverse modulo {m}")
+
+
+def crt(residues: list[int], moduli: list[int]) -> tuple[int, int]:
+    """
+    Solve x = r_i (mod m_i) for all i. Returns (x, lcm of moduli).
+    Moduli need not be coprime; inconsistent systems raise ValueError.
+    """
+    if len(residues) != len(moduli) or not moduli:
+        raise ValueError("residues and moduli must be non-empty and of equal length")
+    x, m = 0, 1
+    for r, n in zip(residues, moduli):
+        if n <= 0:
+            raise ValueError("Moduli must be positive")
+        g = math.gcd(m, n)
+        if (r - x) % g:
+            raise ValueError("The congruences have no common solution")
+        # x + m * t = r (mod n)  =>  t = (r - x) / g * inverse(m / g) mod n / g
+        step = (r - x) // g * pow(m // g, -1, n // g) % (n // g)
+        x += m * step
+        m = m // g * n
+        x %= m
+    return x, m
+
+
+def to_text(value: int) -> str:
+    """Decimal text of an int of any size (str() is capped at 4300 digits)."""
+    return format(Decimal(value), "f")
+
+
+class IntegerOperation(Operation):
+    """Binary operation on integral operands with an exact int result."""
+    def exact(self, a: int, b: int) -> int:
+        raise NotImplementedError("Subclasses must implement exact()")
+
+    def compute(self, a: Number, b: Number) -> Number:
+        if not (math.isfinite(a) and math.isfinite(b)) or a != int(a) or b != int(b):
+            raise HTTPException(status_code=400, detail="This operation requires integer operands")
+        try:
+            result = self.exact(int(a), int(b))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if abs(result) > 1.7976931348623157e308:
+            raise HTTPException(
+                status_code=400,
+                detail="Result exceeds the floating point range; use POST /calculations/integer"
+            )
+        return result
+
+    def defined(self, a, b):
+        return np.isfinite(a) & np.isfinite(b) & (a == np.floor(a)) & (b == np.floor(b))
+
+
+@register_operation("gcd")
+class GcdOperation(IntegerOperation):
+    def exact(self, a, b):
+        return math.gcd(a, b)
+
+    def compute_array(self, a, b, out=None):
+        if np.all(np.abs(a) < _FLOAT_EXACT) and np.all(np.abs(b) < _FLOAT_EXACT):
+            if np.any(a != np.floor(a)) or np.any(b != np.floor(b)):
+                raise HTTPException(status_code=400, detail="This operation requires integer operands")
+            return np.gcd(a.astype(np.int64), b.astype(np.int64)).astype(np.float64, copy=False)
+        return super().compute_array(a, b, out)
+
+
+@register_operation("lcm")
+class LcmOperation(IntegerOperation):
+    def exact(self, a, b):
+        return math.lcm(a, b)
+
+
+@register_operation("modinv")
+class ModInverseOperation(IntegerOperation):
+    """Inverse of a modulo b."""
+    def exact(self, a, b):
+        return mod_inverse(a, b)
+
+    def defined(self, a, b):
+        valid = super().defined(a, b) & (b != 0)
+        exact = valid & (np.abs(a) < _FLOAT_EXACT) & (np.abs(b) < _FLOAT_EXACT)
+        valid[exact] = np.gcd(a[exact].astype(np.int64), b[exact].astype(np.int64)) == 1
+        return valid
+
+
+@register_operation("binomial", "ncr")
+class BinomialOperation(IntegerOperation):
+    """a choose b."""
+    def exact(self, a, b):
+        if a < 0:
+            raise ValueError("Binomial requires a non-negative n")
+        if 0 <= b <= a:
+            # reject results too large for a float before sieving primes up to a
+            if math.lgamma(a + 1) - math.lgamma(b + 1) - math.lgamma(a - b + 1) > _LOG_FLOAT_MAX:
+                raise ValueError("Result exceeds the floating point range; use POST /calculations/integer")
+            if a > MAX_BINOMIAL_N and min(b, a - b) >= _SMALL_BINOMIAL_K:
+                raise ValueError(f"binomial is limited to n <= {MAX_BINOMIAL_N} unless k or n - k is below {_SMALL_BINOMIAL_K}")
+        return binomial(a, b)
+
+    def defined(self, a, b):
+        valid = super().defined(a, b) & (a >= 0)
+        inside = valid & (b >= 0) & (b <= a)
+        n, k = a[inside], b[inside]
+        valid[inside] = (
+            (log_gamma_array(n + 1) - log_gamma_array(k + 1) - log_gamma_array(n - k + 1) <= _LOG_FLOAT_MAX)
+            & ((n <= MAX_BINOMIAL_N) | (np.minimum(k, n - k) < _SMALL_BINOMIAL_K))
+        )
+        return valid
+
+
+@register_operation("isprime")
+class IsPrimeOperation(IntegerOperation):
+    """Unary: 1 if a is prime, else 0."""
+    arity = 1
+
+    def exact(self, a, b=0):
+        return int(is_prime(a))
+
+
+def _check_arity(name: str, operands: list[int], count: int) -> None:
+    if len(operands) != count:
+        raise ValueError(f"{name} takes exactly {count} operand(s)")
+
+
+def evaluate_integer(op_type: str, operands: list[int], moduli: Optional[list[int]] = None):
+    """
+    Exact evaluation for POST /calculations/integer.
+    Returns an int, a bool (isprime) or a {prime: exponent} dict (factorize).
+    """
+    op_type = op_type.lower()
+    if op_type in ("gcd", "lcm"):
+        if not operands:
+            raise ValueError(f"{op_type} takes at least one operand")
+        return math.gcd(*operands) if op_type == "gcd" else math.lcm(*operands)
+    elif op_type == "modpow":
+        _check_arity(op_type, operands, 3)
+        base, exponent, modulus = operands
+        if modulus == 0:
+            raise ValueError("Modulus must be non-zero")
+        if exponent < 0:
+            base = mod_inverse(base, modulus)
+        return pow(base, abs(exponent), modulus)
+    elif op_type == "modinv":
+        _check_arity(op_type, operands, 2)
+        return mod_inverse(*operands)
+    elif op_type == "crt":
+        return crt(operands, moduli or [])[0]
+    elif op_type == "isprime":
+        _check_arity(op_type, operands, 1)
+        return is_prime(operands[0])
+    elif op_type == "factorize":
+        _check_arity(op_type, operands, 1)
+        return factorize(operands[0])
+    elif op_type == "factorial":
+        _check_arity(op_type, operands, 1)
+        if operands[0] > MAX_FACTORIAL_N:
+            raise ValueError(f"factorial is limited to n <= {MAX_FACTORIAL_N}")
+        return factorial(operands[0])
+    elif op_type in ("binomial", "ncr"):
+        _check_arity(op_type, operands, 2)
+        if operands[0] > MAX_BINOMIAL_N:
+            raise ValueError(f"binomial is limited to n <= {MAX_BINOMIAL_N}")
+        if operands[0] < 0:
+            raise ValueError("Binomial requires a non-negative n")
+        return binomial(*operands)
+    raise ValueError(f"Invalid integer operation type '{op_type}'")
+
+
+INTEGER_OPERATIONS = ["gcd", "lcm", "modpow", "modinv", "crt", "isprime", "factorize", "factorial", "binomial"]
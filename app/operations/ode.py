@@ -0,0 +1,308 @@
+"""
+Initial value problems dy/dt = f(t, y) for systems written as expressions.
+
+Each component of f is a compiled expression (see ``expressions``), so the
+right-hand side is evaluated for a whole state vector at once, and for many
+state vectors at once when building a finite-difference Jacobian.
+
+Two adaptive steppers are provided:
+
+* ``rk45``: explicit Dormand-Prince 5(4) with FSAL, for non-stiff systems.
+* ``rosenbrock``: the linearly implicit, L-stable two-stage Rosenbrock
+  method ROS2 with an embedded first-order error estimate, for stiff systems.
+
+Steppers are generators of accepted steps; ``iterate_ode`` turns them into
+samples (every step, or the requested times by cubic Hermite interpolation)
+and ``solve_ode`` collects them, handing long integrations to the process pool.
+"""
+import math
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+import numpy as np
+
+from app.operations.expressions import compile_expression
+from app.operations.parallel import get_process_pool
+
+MAX_EQUATIONS = 100
+# Accepted steps computed in the request thread before the rest moves to the worker pool
+INLINE_STEPS = 2_000
+
+# Dormand-Prince 5(4) tableau
+_DP_C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1])
+_DP_A = np.array([
+    [0, 0, 0, 0, 0, 0],
+    [1 / 5, 0, 0, 0, 0, 0],
+    [3 / 40, 9 / 40, 0, 0, 0, 0],
+    [44 / 45, -56 / 15, 32 / 9, 0, 0, 0],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729, 0, 0],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656, 0],
+    [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+])
+# fifth-order minus embedded fourth-order weights
+_DP_E = np.array([71 / 57600, 0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40])
+
+_ROS2_GAMMA = 1 + 1 / math.sqrt(2)
+
+
+class ODESystem:
+    """Right-hand side built from one expression per state variable."""
+
+    def __init__(self, equations, state, time: str = "t", parameters: Optional[dict] = None):
+        equations, state = list(equations), list(state)
+        parameters = dict(parameters or {})
+        if not equations or len(equations) != len(state):
+            raise ValueError("Provide exactly one equation per state variable")
+        if len(state) > MAX_EQUATIONS:
+            raise ValueError(f"Systems are limited to {MAX_EQUATIONS} equations")
+        if len(set(state)) != len(state) or time in state:
+            raise ValueError("State variable names must be distinct from each other and from the time variable")
+        if set(parameters) & (set(state) | {time}):
+            raise ValueError("Parameters cannot reuse state or time variable names")
+        self.equations = equations
+        self.state = state
+        self.time = time
+        self.parameters = parameters
+        names = sorted(parameters)
+        variables = (time, *state, *names)
+        self._functions = [compile_expression(equation, variables) for equation in equations]
+        self._parameter_values = [parameters[name] for name in names]
+
+    def __reduce__(self):
+        # compiled functions are not picklable; workers rebuild (and cache) them
+        return ODESystem, (self.equations, self.state, self.time, self.parameters)
+
+    def __len__(self):
+        return len(self.state)
+
+    def __call__(self, t: float, y: np.ndarray) -> np.ndarray:
+        """f(t, y) for a state vector, or for every column of an (n, m) array of states."""
+        shape = np.shape(y)[1:]
+        return np.array(
+            [np.broadcast_to(f(t, *y, *self._parameter_values), shape) for f in self._functions],
+            dtype=np.float64,
+        )
+
+    def jacobian(self, t: float, y: np.ndarray, f0: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Forward-difference Jacobian df/dy and time derivative df/dt. The n
+        perturbed states and the perturbed time are evaluated in one call.
+        """
+        epsilon = math.sqrt(np.finfo(np.float64).eps)
+        step = epsilon * np.maximum(1.0, np.abs(y))
+        time_step = epsilon * max(1.0, abs(t))
+        times = np.r_[np.full(len(y), t), t + time_step]
+        states = np.c_[y[:, None] + np.diag(step), y]
+        differences = self(times, states) - f0[:, None]
+        return differences[:, :-1] / step, differences[:, -1] / time_step
+
+
+@dataclass
+class ODEStep:
+    index: int
+    t: float
+    y: np.ndarray
+    dy: np.ndarray
+    h: float  # size proposed for the next step
+    evaluations: int
+
+
+@dataclass
+class ODESolution:
+    t: np.ndarray
+    y: np.ndarray  # one row per time point
+    steps: int
+    evaluations: int
+
+
+def _error_norm(error, y, y_new, rtol, atol) -> float:
+    scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+    return float(np.sqrt(np.mean((error / scale) ** 2)))
+
+
+def _initial_step(t, t_end, y, f, rtol, atol) -> float:
+    scale = atol + rtol * np.abs(y)
+    d0, d1 = np.sqrt(np.mean((y / scale) ** 2)), np.sqrt(np.mean((f / scale) ** 2))
+    h = 0.01 * d0 / d1 if d0 > 1e-5 and d1 > 1e-5 else 1e-6
+    return min(h, t_end - t)
+
+
+def _next_step(h, norm, order) -> float:
+    if norm == 0:
+        return h * 5.0
+    return h * min(5.0, max(0.2, 0.9 * norm ** (-1.0 / order)))
+
+
+def _check_step(t, h, y_new):
+    if not np.all(np.isfinite(y_new)):
+        raise ValueError(f"The solution is not finite near t = {t:g}")
+    if h < 1e-12 * max(1.0, abs(t)):
+        raise ValueError(f"Step size underflow at t = {t:g}; the system may be stiff or singular")
+
+
+def dormand_prince(system, t, t_end, y, rtol, atol, h=None) -> Iterator[ODEStep]:
+    f = system(t, y)
+    evaluations = 1
+    h = h or _initial_step(t, t_end, y, f, rtol, atol)
+    index = 0
+    yield ODEStep(index, t, y, f, h, evaluations)
+    k = np.empty((7, len(y)))
+    while t < t_end:
+        h = min(h, t_end - t)
+        k[0] = f
+        for i in range(1, 7):
+            stage = y + h * (_DP_A[i, :i] @ k[:i])
+            k[i] = system(t + _DP_C[i] * h, stage)
+        evaluations += 6
+        y_new = stage  # the last stage is the fifth-order solution (FSAL)
+        norm = _error_norm(h * (_DP_E @ k), y, y_new, rtol, atol) if np.all(np.isfinite(k)) else np.inf
+        if norm <= 1:
+            t, y, f = t + h, y_new, k[6].copy()
+            index += 1
+            h = _next_step(h, norm, 5)
+            yield ODEStep(index, t, y, f, h, evaluations)
+        else:
+            h = _next_step(h, norm, 5)
+            _check_step(t, h, y)
+
+
+def rosenbrock(system, t, t_end, y, rtol, atol, h=None) -> Iterator[ODEStep]:
+    f = system(t, y)
+    evaluations = 1
+    h = h or _initial_step(t, t_end, y, f, rtol, atol)
+    index = 0
+    yield ODEStep(index, t, y, f, h, evaluations)
+    identity = np.eye(len(y))
+    jacobian = None
+    while t < t_end:
+        h = min(h, t_end - t)
+        if jacobian is None:
+            jacobian, f_t = system.jacobian(t, y, f)
+            evaluations += 1
+        w = identity - _ROS2_GAMMA * h * jacobian
+        try:
+            k1 = np.linalg.solve(w, f + _ROS2_GAMMA * h * f_t)
+            k2 = np.linalg.solve(w, system(t + h, y + h * k1) - _ROS2_GAMMA * h * f_t - 2 * k1)
+        except np.linalg.LinAlgError:
+            k1 = k2 = np.full_like(y, np.nan)
+        evaluations += 1
+        y_new = y + h * (1.5 * k1 + 0.5 * k2)
+        finite = np.all(np.isfinite(y_new))
+        norm = _error_norm(0.5 * h * (k1 + k2), y, y_new, rtol, atol) if finite else np.inf
+        if norm <= 1:
+            t, y = t + h, y_new
+            f = system(t, y)
+            evaluations += 1
+            jacobian = None
+            index += 1
+            h = _next_step(h, norm, 2)
+            yield ODEStep(index, t, y, f, h, evaluations)
+        else:
+            h = _next_step(h, norm, 2)
+            _check_step(t, h, y)
+
+
+ODE_METHODS = {
+    "rk45": dormand_prince,
+    "rosenbrock": rosenbrock,
+}
+
+
+def _hermite(start: ODEStep, end: ODEStep, times: np.ndarray) -> np.ndarray:
+    """Cubic Hermite interpolation between two accepted steps; one row per time."""
+    h = end.t - start.t
+    s = ((times - start.t) / h)[:, None]
+    s2, s3 = s * s, s * s * s
+    return (
+        (2 * s3 - 3 * s2 + 1) * start.y + (s3 - 2 * s2 + s) * h * start.dy
+        + (3 * s2 - 2 * s3) * end.y + (s3 - s2) * h * end.dy
+    )
+
+
+def iterate_ode(
+    system: ODESystem,
+    t_span: tuple[float, float],
+    y0,
+    method: str = "rk45",
+    t_eval=None,
+    rtol: float = 1e-6,
+    atol: float = 1e-9,
+    max_steps: int = 100_000,
+    first_step: Optional[float] = None,
+) -> Iterator[tuple[np.ndarray, np.ndarray, ODEStep]]:
+    """
+    Yield ``(times, states, step)`` after every accepted step. Without ``t_eval``
+    the samples are the step points themselves; with it, the requested times
+    that the step covers (possibly none).
+    """
+    if method not in ODE_METHODS:
+        raise ValueError(f"Invalid ODE method '{method}'. Must be one of: {sorted(ODE_METHODS)}")
+    t0, t1 = map(float, t_span)
+    if not (math.isfinite(t0) and math.isfinite(t1)) or t1 <= t0:
+        raise ValueError("t_span must be two finite times with start < end")
+    y0 = np.asarray(y0, dtype=np.float64)
+    if y0.shape != (len(system),):
+        raise ValueError("y0 must have one value per state variable")
+    if t_eval is not None:
+        t_eval = np.asarray(t_eval, dtype=np.float64)
+        if np.any(np.diff(t_eval) < 0) or (len(t_eval) and (t_eval[0] < t0 or t_eval[-1] > t1)):
+            raise ValueError("t_eval must be sorted and lie within t_span")
+
+    previous = None
+    sampled = 0
+    for step in ODE_METHODS[method](system, t0, t1, y0, rtol, atol, first_step):
+        if step.index > max_steps:
+            raise ValueError(f"Exceeded {max_steps} steps before reaching t = {t1:g}")
+        if t_eval is None:
+            times, states = np.array([step.t]), step.y[None, :]
+        else:
+            stop = np.searchsorted(t_eval, step.t, side="right")
+            times = t_eval[sampled:stop]
+            states = np.tile(step.y, (len(times), 1)) if previous is None else _hermite(previous, step, times)
+            sampled = stop
+        yield times, states, step
+        previous = step
+
+
+def solve_ode(
+    system: ODESystem,
+    t_span: tuple[float, float],
+    y0,
+    method: str = "rk45",
+    t_eval=None,
+    rtol: float = 1e-6,
+    atol: float = 1e-9,
+    max_steps: int = 100_000,
+    first_step: Optional[float] = None,
+    inline_steps: Optional[int] = INLINE_STEPS,
+) -> ODESolution:
+    """
+    Integrate to the end of ``t_span``. After ``inline_steps`` accepted steps
+    the remainder of the integration continues in the process pool from the
+    current state (``None`` keeps everything in this process).
+    """
+    times, states = [], []
+    step = None
+    for chunk_times, chunk_states, step in iterate_ode(
+        system, t_span, y0, method, t_eval, rtol, atol, max_steps, first_step
+    ):
+        times.append(chunk_times)
+        states.append(chunk_states)
+        if inline_steps is not None and step.index >= inline_steps and step.t < t_span[1]:
+            remaining = None
+            if t_eval is not None:
+                remaining = np.asarray(t_eval, dtype=np.float64)
+                remaining = remaining[np.searchsorted(remaining, step.t, side="right"):]
+            rest = get_process_pool().submit(
+                solve_ode, system, (step.t, t_span[1]), step.y, method, remaining,
+                rtol, atol, max_steps - step.index, step.h, None
+            ).result()
+            skip = 1 if t_eval is None else 0  # the worker's first sample repeats this step
+            times.append(rest.t[skip:])
+            states.append(rest.y[skip:])
+            return ODESolution(
+                np.concatenate(times), np.concatenate(states),
+                step.index + rest.steps, step.evaluations + rest.evaluations,
+            )
+    return ODESolution(np.concatenate(times), np.concatenate(states), step.index, step.evaluations)
+
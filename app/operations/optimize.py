@@ -0,0 +1,352 @@
+"""
+Root finding and minimization of vectorized functions.
+
+Every method takes a batch of starting points (or brackets) and advances all
+of them in lockstep: each iteration evaluates the new points of every
+unfinished start in one call of the function, so a compiled expression is
+evaluated for the whole batch with a single NumPy pass.
+"""
+import math
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+from app.operations.expressions import compile_expression
+
+MAX_STARTS = 10_000
+MAX_POLYNOMIAL_DEGREE = 1_000
+INV_PHI = (math.sqrt(5) - 1) / 2
+
+
+@dataclass
+class RootFindResult:
+    roots: np.ndarray  # nan where a start did not converge
+    converged: np.ndarray
+    iterations: int
+    evaluations: int
+
+
+@dataclass
+class MinimizationResult:
+    points: np.ndarray  # one row per start
+    values: np.ndarray
+    converged: np.ndarray
+    iterations: int
+    evaluations: int
+
+
+class _Counted:
+    """
+    Wrap a vectorized function and count the points evaluated. With
+    ``vector=True`` the last axis of the input holds the coordinates of a point.
+    """
+
+    def __init__(self, function: Callable, vector: bool = False, nan_as_inf: bool = False):
+        self.function = function
+        self.vector = vector
+        self.nan_as_inf = nan_as_inf
+        self.evaluations = 0
+
+    def __call__(self, points: np.ndarray) -> np.ndarray:
+        shape = points.shape[:-1] if self.vector else points.shape
+        result = np.broadcast_to(np.asarray(self.function(points), dtype=np.float64), shape)
+        self.evaluations += int(np.prod(shape))
+        if self.nan_as_inf:
+            # points outside the function's domain count as worse than any real value
+            result = np.where(np.isnan(result), np.inf, result)
+        return result
+
+
+def expression_function(
+    source: str, variables, parameters: Optional[dict] = None, compiler: Callable = compile_expression
+) -> Callable:
+    """
+    Vectorized function of an (..., n) array of points, one column per
+    variable, compiled (and cached) from an expression by ``compiler``.
+    """
+    variables, parameters = tuple(variables), dict(parameters or {})
+    clash = set(variables) & set(parameters)
+    if clash:
+        raise ValueError(f"'{sorted(clash)[0]}' cannot be both a variable and a parameter")
+    names = sorted(parameters)
+    compiled = compiler(source, (*variables, *names))
+    values = [parameters[name] for name in names]
+
+    def function(points):
+        return compiled(*np.moveaxis(np.asarray(points, dtype=np.float64), -1, 0), *values)
+    return function
+
+
+def _batch(values, width: Optional[int] = None, name: str = "starting points") -> np.ndarray:
+    array = np.asarray(values, dtype=np.float64)
+    array = array.reshape(len(array), -1) if width is None else array.reshape(-1, width)
+    if not 0 < len(array) <= MAX_STARTS:
+        raise ValueError(f"Provide between 1 and {MAX_STARTS} {name}")
+    if not np.all(np.isfinite(array)):
+        raise ValueError(f"All {name} must be finite")
+    return array
+
+
+def brent(f: Callable, brackets, tol: float = 1e-12, max_iterations: int = 200) -> RootFindResult:
+    """Brent's method (inverse quadratic / secant steps guarded by bisection) for each [a, b] bracket."""
+    f = _Counted(f)
+    brackets = _batch(brackets, 2, "brackets")
+    a, b = brackets[:, 0].copy(), brackets[:, 1].copy()
+    fa, fb = np.split(f(np.r_[a, b]), 2)
+    if not (np.all(np.isfinite(fa)) and np.all(np.isfinite(fb))):
+        raise ValueError("The function is not finite at a bracket end")
+    if np.any(np.sign(fa) * np.sign(fb) > 0):
+        raise ValueError("Each bracket must contain a sign change: f(a) and f(b) have the same sign")
+    swap = np.abs(fa) < np.abs(fb)
+    a, b, fa, fb = np.where(swap, b, a), np.where(swap, a, b), np.where(swap, fb, fa), np.where(swap, fa, fb)
+    c, fc, d = a.copy(), fa.copy(), a.copy()
+    bisected = np.ones(len(a), dtype=bool)
+    iterations = 0
+    while True:
+        delta = tol * np.maximum(1.0, np.abs(b))
+        active = np.flatnonzero((fb != 0) & (np.abs(b - a) > 2 * delta))
+        if not len(active) or iterations >= max_iterations:
+            break
+        iterations += 1
+        A, B, C, D = a[active], b[active], c[active], d[active]
+        FA, FB, FC, M, tiny = fa[active], fb[active], fc[active], bisected[active], delta[active]
+        with np.errstate(all="ignore"):
+            quadratic = (
+                A * FB * FC / ((FA - FB) * (FA - FC))
+                + B * FA * FC / ((FB - FA) * (FB - FC))
+                + C * FA * FB / ((FC - FA) * (FC - FB))
+            )
+            secant = B - FB * (B - A) / (FB - FA)
+        s = np.where((FA != FC) & (FB != FC), quadratic, secant)
+        quarter = (3 * A + B) / 4
+        bisect = (
+            ~((s - quarter) * (s - B) < 0)
+            | (M & (np.abs(s - B) >= np.abs(B - C) / 2))
+            | (~M & (np.abs(s - B) >= np.abs(C - D) / 2))
+            | (M & (np.abs(B - C) < tiny))
+            | (~M & (np.abs(C - D) < tiny))
+        )
+        s = np.where(bisect, (A + B) / 2, s)
+        fs = f(s)
+        if not np.all(np.isfinite(fs)):
+            raise ValueError("The function is not finite inside a bracket")
+        D, C, FC = C, B, FB
+        left = np.sign(FA) * np.sign(fs) < 0
+        B, FB, A, FA = np.where(left, s, B), np.where(left, fs, FB), np.where(left, A, s), np.where(left, FA, fs)
+        swap = np.abs(FA) < np.abs(FB)
+        A, B, FA, FB = np.where(swap, B, A), np.where(swap, A, B), np.where(swap, FB, FA), np.where(swap, FA, FB)
+        a[active], b[active], c[active], d[active] = A, B, C, D
+        fa[active], fb[active], fc[active], bisected[active] = FA, FB, FC, bisect
+    converged = (fb == 0) | (np.abs(b - a) <= 2 * tol * np.maximum(1.0, np.abs(b)))
+    return RootFindResult(np.where(converged, b, np.nan), converged, iterations, f.evaluations)
+
+
+def newton(f: Callable, starts, tol: float = 1e-12, max_iterations: int = 100) -> RootFindResult:
+    """Newton's method with a central-difference derivative, from each starting point."""
+    f = _Counted(f)
+    x = _batch(starts, 1)[:, 0]
+    converged = np.zeros(len(x), dtype=bool)
+    failed = np.zeros(len(x), dtype=bool)
+    iterations = 0
+    while iterations < max_iterations:
+        active = np.flatnonzero(~converged & ~failed)
+        if not len(active):
+            break
+        iterations += 1
+        xi = x[active]
+        h = 6e-6 * np.maximum(1.0, np.abs(xi))
+        fx, forward, backward = np.split(f(np.r_[xi, xi + h, xi - h]), 3)
+        with np.errstate(all="ignore"):
+            step = np.where(fx == 0, 0.0, fx / ((forward - backward) / (2 * h)))
+        bad = ~np.isfinite(step)
+        x[active] = np.where(bad, xi, xi - step)
+        failed[active[bad]] = True
+        converged[active[~bad & (np.abs(step) <= tol * np.maximum(1.0, np.abs(xi)))]] = True
+    return RootFindResult(np.where(converged, x, np.nan), converged, iterations, f.evaluations)
+
+
+def polynomial_roots(coefficients) -> np.ndarray:
+    """All complex roots of a polynomial (highest degree first) as eigenvalues of its companion matrix."""
+    c = np.trim_zeros(np.asarray(coefficients, dtype=np.float64), "f")
+    if not len(c):
+        raise ValueError("The zero polynomial has no isolated roots")
+    if not np.all(np.isfinite(c)):
+        raise ValueError("Coefficients must be finite")
+    trimmed = np.trim_zeros(c, "b")
+    zero_roots = np.zeros(len(c) - len(trimmed), dtype=np.complex128)
+    degree = len(trimmed) - 1
+    if degree > MAX_POLYNOMIAL_DEGREE:
+        raise ValueError(f"Polynomials are limited to degree {MAX_POLYNOMIAL_DEGREE}")
+    if degree == 0:
+        return zero_roots
+    companion = np.zeros((degree, degree))
+    companion[0] = -trimmed[1:] / trimmed[0]
+    companion[1:, :-1] = np.eye(degree - 1)
+    return np.r_[np.linalg.eigvals(companion).astype(np.complex128), zero_roots]
+
+
+def golden_section(f: Callable, brackets, tol: float = 1e-10, max_iterations: int = 200) -> MinimizationResult:
+    """Golden-section search for a minimum of a one-variable function inside each [a, b] bracket."""
+    f = _Counted(f, nan_as_inf=True)
+    brackets = np.sort(_batch(brackets, 2, "brackets"), axis=1)
+    a, b = brackets[:, 0].copy(), brackets[:, 1].copy()
+    c, d = b - INV_PHI * (b - a), a + INV_PHI * (b - a)
+    fc, fd = np.split(f(np.r_[c, d]), 2)
+    iterations = 0
+    while iterations < max_iterations:
+        active = np.flatnonzero(b - a > tol * (1.0 + np.abs(a) + np.abs(b)))
+        if not len(active):
+            break
+        iterations += 1
+        A, B, C, D, FC, FD = a[active], b[active], c[active], d[active], fc[active], fd[active]
+        left = FC < FD
+        A, B = np.where(left, A, C), np.where(left, D, B)
+        point = np.where(left, B - INV_PHI * (B - A), A + INV_PHI * (B - A))
+        value = f(point)
+        c[active], fc[active] = np.where(left, point, D), np.where(left, value, FD)
+        d[active], fd[active] = np.where(left, C, point), np.where(left, FC, value)
+        a[active], b[active] = A, B
+    better = fc < fd
+    converged = b - a <= tol * (1.0 + np.abs(a) + np.abs(b))
+    return MinimizationResult(
+        np.where(better, c, d)[:, None], np.where(better, fc, fd), converged, iterations, f.evaluations
+    )
+
+
+def nelder_mead(F: Callable, starts, tol: float = 1e-8, max_iterations: int = 5_000) -> MinimizationResult:
+    """Nelder-Mead simplex search from each starting point (rows of ``starts``)."""
+    starts = _batch(starts)
+    m, n = starts.shape
+    F = _Counted(F, vector=True, nan_as_inf=True)
+    simplex = np.repeat(starts[:, None, :], n + 1, axis=1)
+    offsets = np.where(starts != 0, 0.05 * starts, 0.00025)
+    simplex[:, np.arange(1, n + 1), np.arange(n)] += offsets
+    values = F(simplex)
+    converged = np.zeros(m, dtype=bool)
+    iterations = 0
+    while True:
+        order = np.argsort(values, axis=1)
+        simplex = np.take_along_axis(simplex, order[:, :, None], axis=1)
+        values = np.take_along_axis(values, order, axis=1)
+        with np.errstate(invalid="ignore"):
+            spread_f = values[:, -1] - values[:, 0]
+        spread_x = np.abs(simplex[:, 1:] - simplex[:, :1]).max(axis=(1, 2))
+        # unbounded below: the simplex runs off to infinity; stop and report it unconverged
+        diverged = np.isneginf(values[:, 0]) | ~np.isfinite(simplex).all(axis=(1, 2))
+        converged = (spread_f <= tol * np.maximum(1.0, np.abs(values[:, 0]))) & (
+            spread_x <= tol * np.maximum(1.0, np.abs(simplex[:, 0]).max(axis=1))
+        ) & ~diverged
+        active = np.flatnonzero(~converged & ~diverged)
+        if not len(active) or iterations >= max_iterations:
+            break
+        iterations += 1
+        S, V = simplex[active], values[active]
+        best, worst = S[:, 0], S[:, -1]
+        centroid = S[:, :-1].mean(axis=1)
+        reflected = 2 * centroid - worst
+        f_reflected = F(reflected)
+        f_best, f_second, f_worst = V[:, 0], V[:, -2], V[:, -1]
+        accept = (f_reflected >= f_best) & (f_reflected < f_second)
+        # at most one more point per start: expansion, outside or inside contraction
+        expand = f_reflected < f_best
+        outside = ~expand & (f_reflected < f_worst)
+        candidate = np.where(
+            expand[:, None], 3 * centroid - 2 * worst,
+            np.where(outside[:, None], (centroid + reflected) / 2, (centroid + worst) / 2),
+        )
+        f_candidate = np.full(len(active), np.inf)
+        need = ~accept
+        if need.any():
+            f_candidate[need] = F(candidate[need])
+        take_candidate = need & np.where(
+            expand, f_candidate < f_reflected,
+            np.where(outside, f_candidate <= f_reflected, f_candidate < f_worst),
+        )
+        take_reflected = accept | (expand & ~take_candidate)
+        S[:, -1] = np.where(take_candidate[:, None], candidate, np.where(take_reflected[:, None], reflected, worst))
+        V[:, -1] = np.where(take_candidate, f_candidate, np.where(take_reflected, f_reflected, f_worst))
+        shrink = ~take_candidate & ~take_reflected
+        if shrink.any():
+            S[shrink, 1:] = best[shrink, None] + 0.5 * (S[shrink, 1:] - best[shrink, None])
+            V[shrink, 1:] = F(S[shrink, 1:])
+        simplex[active], values[active] = S, V
+    return MinimizationResult(simplex[:, 0].copy(), values[:, 0].copy(), converged, iterations, F.evaluations)
+
+
+def _gradient(F: _Counted, X: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """Central-difference gradients of every row of X, one-sided where a bound is in the way."""
+    n = X.shape[1]
+    h = 6e-6 * np.maximum(1.0, np.abs(X))
+    forward = np.minimum(X[:, None, :] + np.eye(n) * h[:, None, :], upper)
+    backward = np.maximum(X[:, None, :] - np.eye(n) * h[:, None, :], lower)
+    values = F(np.concatenate([forward, backward], axis=1))
+    spacing = np.diagonal(forward - backward, axis1=1, axis2=2)
+    return (values[:, :n] - values[:, n:]) / spacing
+
+
+def bfgs(
+    F: Callable, starts, bounds=None, tol: float = 1e-6, max_iterations: int = 1_000,
+) -> MinimizationResult:
+    """
+    Projected BFGS with box bounds: variables held at a bound by the gradient
+    are frozen for the step, and a backtracking Armijo line search tries all
+    step lengths for all starts in one call.
+    """
+    starts = _batch(starts)
+    m, n = starts.shape
+    F = _Counted(F, vector=True, nan_as_inf=True)
+    if bounds is None:
+        lower, upper = np.full(n, -np.inf), np.full(n, np.inf)
+    else:
+        bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 2)
+        if len(bounds) != n or np.any(bounds[:, 0] >= bounds[:, 1]):
+            raise ValueError("bounds must give one [lower, upper] pair with lower < upper per variable")
+        lower, upper = bounds[:, 0], bounds[:, 1]
+    X = np.clip(starts, lower, upper)
+    values = F(X)
+    if not np.all(np.isfinite(values)):
+        raise ValueError("The function is not finite at every starting point")
+    gradient = _gradient(F, X, lower, upper)
+    inverse_hessian = np.repeat(np.eye(n)[None], m, axis=0)
+    steps = 0.5 ** np.arange(30)
+    converged = np.zeros(m, dtype=bool)
+    stalled = np.zeros(m, dtype=bool)
+    iterations = 0
+    while iterations < max_iterations:
+        pinned = ((X <= lower) & (gradient > 0)) | ((X >= upper) & (gradient < 0))
+        projected = np.where(pinned, 0.0, gradient)
+        converged = np.abs(projected).max(axis=1) <= tol * np.maximum(1.0, np.abs(values))
+        active = np.flatnonzero(~converged & ~stalled)
+        if not len(active):
+            break
+        iterations += 1
+        x, g, pg, H, fx = X[active], gradient[active], projected[active], inverse_hessian[active], values[active]
+        direction = np.where(pinned[active], 0.0, -np.einsum("kij,kj->ki", H, pg))
+        uphill = np.einsum("ki,ki->k", direction, pg) >= 0
+        direction[uphill] = -pg[uphill]
+        H[uphill] = np.eye(n)
+        trial = np.clip(x[:, None, :] + steps[None, :, None] * direction[:, None, :], lower, upper)
+        f_trial = F(trial)
+        armijo = f_trial <= fx[:, None] + 1e-4 * np.einsum("ksi,ki->ks", trial - x[:, None, :], g)
+        found = armijo.any(axis=1)
+        choice = np.argmax(armijo, axis=1)
+        x_new = np.where(found[:, None], trial[np.arange(len(active)), choice], x)
+        f_new = np.where(found, f_trial[np.arange(len(active)), choice], fx)
+        g_new = g.copy()
+        if found.any():
+            g_new[found] = _gradient(F, x_new[found], lower, upper)
+        s, y = x_new - x, g_new - g
+        sy = np.einsum("ki,ki->k", s, y)
+        update = found & (sy > 1e-12 * np.linalg.norm(s, axis=1) * np.linalg.norm(y, axis=1))
+        if update.any():
+            rho = 1.0 / sy[update]
+            left = np.eye(n) - rho[:, None, None] * s[update, :, None] * y[update, None, :]
+            H[update] = left @ H[update] @ left.transpose(0, 2, 1) + rho[:, None, None] * s[update, :, None] * s[update, None, :]
+        stalled[active[~found | (np.abs(fx - f_new) <= 1e-15 * np.maximum(1.0, np.abs(fx)))]] = True
+        X[active], values[active], gradient[active], inverse_hessian[active] = x_new, f_new, g_new, H
+    return MinimizationResult(X, values, converged, iterations, F.evaluations)
+
+
+ROOT_METHODS = ("brent", "newton", "polynomial")
+MINIMIZE_METHODS = ("nelder-mead", "golden", "bfgs")
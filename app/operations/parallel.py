@@ -0,0 +1,127 @@
+"""
+Chunked parallel execution of operation kernels.
+
+Large batches are copied once into ``multiprocessing.shared_memory`` blocks.
+Worker processes attach to those blocks by name, run the vectorized kernel on
+their slice and write straight into a shared output block, so no chunk of
+operands or results is ever pickled between processes.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+from fastapi import HTTPException
+
+from app.operations import get_operation
+from app.operations.fast_math import compute_fast
+
+# Batches smaller than this are computed inline; process start-up and
+# shared-memory setup cost more than they save below ~1M rows.
+PARALLEL_THRESHOLD = 1_000_000
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def cpu_count() -> int:
+    return os.cpu_count() or 1
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared worker pool, starting it on first use."""
+    global _pool
+    if _pool is None:
+        # spawn: forking a process that already runs server threads is unsafe
+        _pool = ProcessPoolExecutor(
+            max_workers=cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_process_pool() -> None:
+    """Stop the worker pool (called on application shutdown)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+def _run_chunks(
+    op_type: str, a_name: str, b_name: str, out_name: str, n: int, ranges: list[tuple[int, int]], fast: bool = False
+) -> Optional[str]:
+    """Worker entry point: compute each [start, stop) range of rows in place. Returns an error detail or None."""
+    blocks = [shared_memory.SharedMemory(name=name) for name in (a_name, b_name, out_name)]
+    try:
+        a, b, out = (np.ndarray((n,), dtype=np.float64, buffer=block.buf) for block in blocks)
+        try:
+            for start, stop in ranges:
+                if fast:
+                    out[start:stop] = compute_fast(op_type, a[start:stop], b[start:stop])[0]
+                else:
+                    get_operation(op_type).compute_array(a[start:stop], b[start:stop], out=out[start:stop])
+        except HTTPException as exc:
+            return exc.detail
+        finally:
+            # views must be released before the block can be closed
+            del a, b, out
+        return None
+    finally:
+        for block in blocks:
+            block.close()
+
+
+def _shared_copy(array: np.ndarray) -> shared_memory.SharedMemory:
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=np.float64, buffer=block.buf)[:] = array
+    return block
+
+
+def compute_batch(
+    op_type: str,
+    a,
+    b,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    threshold: int = PARALLEL_THRESHOLD,
+    fast: bool = False,
+) -> np.ndarray:
+    """
+    Apply an operation element-wise over two operand arrays.
+
+    Batches of at least ``threshold`` rows are split into ``chunk_size`` slices
+    and processed by at most ``workers`` processes of the shared pool at a
+    time (default: all cores); each worker task takes every ``workers``-th chunk.
+    ``fast`` uses the operation's approximate kernel where it has one.
+    """
+    operation = get_operation(op_type)
+    a = np.ascontiguousarray(a, dtype=np.float64)
+    b = np.ascontiguousarray(b, dtype=np.float64)
+    if a.shape != b.shape or a.ndim != 1:
+        raise ValueError("Operands must be one-dimensional arrays of equal length")
+
+    n = len(a)
+    workers = min(workers or cpu_count(), -(-n // chunk_size) if n else 1)
+    if n < threshold or workers <= 1:
+        return compute_fast(op_type, a, b)[0] if fast else operation.compute_array(a, b)
+
+    blocks = [_shared_copy(a), _shared_copy(b), shared_memory.SharedMemory(create=True, size=a.nbytes)]
+    try:
+        pool = get_process_pool()
+        names = [block.name for block in blocks]
+        ranges = [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+        futures = [
+            pool.submit(_run_chunks, op_type.lower(), *names, n, ranges[worker::workers], fast)
+            for worker in range(workers)
+        ]
+        errors = [error for error in (future.result() for future in futures) if error]
+        if errors:
+            raise HTTPException(status_code=400, detail=errors[0])
+        return np.ndarray((n,), dtype=np.float64, buffer=blocks[2].buf).copy()
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
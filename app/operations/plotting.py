@@ -0,0 +1,134 @@
+"""
+Adaptive sampling of a function of one variable for plotting.
+
+Sampling starts from a coarse uniform grid and repeatedly bisects the
+intervals whose midpoint lies more than half a pixel off the chord between
+their endpoints, so points concentrate where the curve bends. Every round
+evaluates all midpoints in one vectorized call. Distances are measured in
+pixels of the target chart, which bounds both the useful resolution and the
+number of points: at most ``POINTS_PER_PIXEL`` per horizontal pixel.
+
+Intervals refined down to ``MIN_WIDTH`` pixels that still rise by more than
+a pixel without being straight are reported as discontinuities. Points
+where the function is undefined (NaN or infinite) are kept as gaps, and
+domain edges are located the same way as bends.
+"""
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+POINTS_PER_PIXEL = 2
+INITIAL_SPACING = 4  # pixels between the points of the starting grid
+TOLERANCE = 0.5  # pixels
+MIN_WIDTH = 1 / 64  # pixels
+MAX_PIXELS = 10_000
+
+
+@dataclass
+class PlotSamples:
+    """Sorted sample points, with the discontinuities found and a y range that ignores outliers."""
+    x: np.ndarray
+    y: np.ndarray  # NaN where the function is undefined
+    discontinuities: np.ndarray
+    y_range: tuple[float, float]
+
+
+def _y_range(y: np.ndarray) -> tuple[float, float]:
+    finite = y[np.isfinite(y)]
+    if not len(finite):
+        return -1.0, 1.0
+    low, high = float(finite.min()), float(finite.max())
+    trimmed_low, trimmed_high = (float(v) for v in np.percentile(finite, [1, 99]))
+    if high - low > 10 * (trimmed_high - trimmed_low):
+        # outliers near poles (tan, 1/x) would flatten the rest of the curve
+        low, high = trimmed_low, trimmed_high
+    if high <= low:
+        spread = max(abs(low), 1.0)
+        low, high = low - spread, high + spread
+    if not np.isfinite(high - low):
+        raise ValueError("The function's values span more than the floating point range")
+    return low, high
+
+
+def sample_adaptively(
+    function: Callable[[np.ndarray], np.ndarray],
+    x0: float,
+    x1: float,
+    width: int = 800,
+    height: int = 400,
+) -> PlotSamples:
+    """Sample ``function`` on [x0, x1] for a chart of ``width`` x ``height`` pixels."""
+    if not (np.isfinite(x0) and np.isfinite(x1) and x0 < x1):
+        raise ValueError("x0 and x1 must be finite with x0 < x1")
+    if not np.isfinite(x1 - x0):
+        raise ValueError("x1 - x0 exceeds the floating point range")
+    if not (1 <= width <= MAX_PIXELS and 1 <= height <= MAX_PIXELS):
+        raise ValueError(f"Chart size must be between 1 and {MAX_PIXELS} pixels")
+
+    def evaluate(x):
+        with np.errstate(all="ignore"):
+            return np.asarray(np.broadcast_to(function(x), x.shape), dtype=np.float64)
+
+    budget = POINTS_PER_PIXEL * width
+    x = np.linspace(x0, x1, max(2, min(budget, width // INITIAL_SPACING + 1)))
+    y = evaluate(x)
+    y_range = _y_range(y)
+    x_pixel = (x1 - x0) / width
+    y_pixel = (y_range[1] - y_range[0]) / height
+    min_width = MIN_WIDTH * x_pixel
+
+    active = np.ones(len(x) - 1, dtype=bool)
+    while len(x) < budget:
+        candidates = np.flatnonzero(active)
+        if not len(candidates):
+            break
+        left, right = x[candidates], x[candidates + 1]
+        mid = left + (right - left) / 2  # (left + right) / 2 overflows near the float range
+        y_mid = evaluate(mid)
+        y_left, y_right = y[candidates], y[candidates + 1]
+        finite = np.isfinite(y_left) & np.isfinite(y_right)
+        with np.errstate(invalid="ignore"):
+            deviation = np.abs(y_mid - (y_left + y_right) / 2) / y_pixel
+        deviation[np.isnan(deviation)] = 0.0
+        # a domain edge: one end defined, the other not
+        deviation[np.isfinite(y_left) != np.isfinite(y_right)] = np.inf
+        deviation[finite & ~np.isfinite(y_mid)] = np.inf
+        split = deviation > TOLERANCE
+        if split.sum() > budget - len(x):
+            # spend what is left on the worst intervals
+            keep = np.argsort(deviation)[::-1][:budget - len(x)]
+            split = np.zeros_like(split)
+            split[keep] = True
+        if not split.any():
+            break
+        positions = candidates[split] + 1
+        x = np.insert(x, positions, mid[split])
+        y = np.insert(y, positions, y_mid[split])
+        inserted = positions + np.arange(len(positions))
+        active = np.zeros(len(x) - 1, dtype=bool)
+        halves = (right[split] - left[split]) / 2 > min_width
+        active[inserted - 1] = halves
+        active[inserted] = halves
+
+    return PlotSamples(x, y, _discontinuities(evaluate, x, y, 2 * min_width, y_pixel), y_range)
+
+
+def _discontinuities(evaluate, x: np.ndarray, y: np.ndarray, narrow: float, y_pixel: float) -> np.ndarray:
+    """
+    Midpoints of the narrow intervals that rise more than a pixel and whose
+    midpoint value sits near one end rather than on the chord: a steep but
+    smooth curve is straight at this scale, a jump is not.
+    """
+    with np.errstate(invalid="ignore"):
+        rise = np.abs(np.diff(y))
+        suspects = np.flatnonzero((np.diff(x) <= narrow) & (rise > y_pixel))
+    if not len(suspects):
+        return np.empty(0)
+    mid = x[suspects] + (x[suspects + 1] - x[suspects]) / 2
+    off_chord = np.abs(evaluate(mid) - (y[suspects] + y[suspects + 1]) / 2)
+    with np.errstate(invalid="ignore"):
+        jumped = ~(off_chord <= rise[suspects] / 4)  # NaN midpoints count as jumps
+    # a pole shows up in the two intervals either side of it: report it once
+    jumped[1:] &= ~(jumped[:-1] & (np.diff(suspects) == 1))
+    return mid[jumped]
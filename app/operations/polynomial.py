@@ -0,0 +1,101 @@
+"""
+Polynomial arithmetic and least-squares fitting.
+
+Coefficients are ordered highest degree first, as for polynomial roots.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+# Below this many coefficients in the shorter factor, direct convolution beats the FFT
+FFT_THRESHOLD = 64
+MAX_FIT_DEGREE = 20
+
+
+def _coefficients(values, name: str = "coefficients") -> np.ndarray:
+    array = np.asarray(values, dtype=np.float64)
+    if array.ndim != 1 or not len(array):
+        raise ValueError(f"{name} must be a non-empty list of numbers")
+    if not np.all(np.isfinite(array)):
+        raise ValueError(f"{name} must be finite")
+    return array
+
+
+def evaluate(coefficients, x) -> np.ndarray:
+    """Horner's rule at every point of ``x`` at once (one multiply-add pass per coefficient)."""
+    coefficients = _coefficients(coefficients)
+    x = np.asarray(x, dtype=np.float64)
+    result = np.full(x.shape, coefficients[0])
+    with np.errstate(over="ignore", invalid="ignore"):
+        for c in coefficients[1:]:
+            result *= x
+            result += c
+    return result
+
+
+def multiply(p, q) -> np.ndarray:
+    """Product of two polynomials; high-degree factors are multiplied with a real FFT."""
+    p, q = _coefficients(p), _coefficients(q)
+    if min(len(p), len(q)) < FFT_THRESHOLD:
+        return np.convolve(p, q)
+    n = len(p) + len(q) - 1
+    size = 1 << (n - 1).bit_length()
+    return np.fft.irfft(np.fft.rfft(p, size) * np.fft.rfft(q, size), size)[:n]
+
+
+def derivative(coefficients) -> np.ndarray:
+    coefficients = _coefficients(coefficients)
+    degree = len(coefficients) - 1
+    if degree == 0:
+        return np.zeros(1)
+    return coefficients[:-1] * np.arange(degree, 0, -1)
+
+
+def integral(coefficients, constant: float = 0.0) -> np.ndarray:
+    """Antiderivative with the given constant term."""
+    coefficients = _coefficients(coefficients)
+    return np.r_[coefficients / np.arange(len(coefficients), 0, -1), constant]
+
+
+@dataclass
+class PolynomialFit:
+    coefficients: np.ndarray
+    count: int
+    rms_error: float
+    r_squared: float
+
+
+def fit(x, y, degree: int) -> PolynomialFit:
+    """
+    Least-squares polynomial of the given degree through (x, y). The fit is
+    solved in x scaled to [-1, 1], which keeps the Vandermonde matrix well
+    conditioned, and the result is expanded back into powers of x.
+    """
+    if not 0 <= degree <= MAX_FIT_DEGREE:
+        raise ValueError(f"degree must be between 0 and {MAX_FIT_DEGREE}")
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    if x.shape != y.shape or x.ndim != 1:
+        raise ValueError("x and y must be one-dimensional and the same length")
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    if len(x) <= degree:
+        raise ValueError(f"A degree {degree} fit needs at least {degree + 1} finite points")
+    low, high = x.min(), x.max()
+    shift, scale = (high + low) / 2, (high - low) / 2 or 1.0
+    vandermonde = np.vander((x - shift) / scale, degree + 1)
+    solution, *_ = np.linalg.lstsq(vandermonde, y, rcond=None)
+    residual = y - vandermonde @ solution
+
+    # Horner composition of solution(t) with t = (x - shift) / scale
+    coefficients = solution[:1].copy()
+    for c in solution[1:]:
+        coefficients = np.convolve(coefficients, [1 / scale, -shift / scale])
+        coefficients[-1] += c
+    total = np.sum((y - y.mean()) ** 2)
+    squared_error = float(residual @ residual)
+    return PolynomialFit(
+        coefficients=coefficients,
+        count=len(x),
+        rms_error=float(np.sqrt(squared_error / len(x))),
+        r_squared=1.0 - squared_error / total if total > 0 else 1.0,
+    )
@@ -0,0 +1,126 @@
+"""
+Arbitrary-precision evaluation of the calculator operations.
+
+Operands are converted from their shortest float repr (so 0.1 means 0.1, not
+its binary expansion) and evaluated with ``decimal`` or exact integer
+arithmetic. ``precision`` is the number of significant digits in the result.
+"""
+from decimal import Context, Decimal, InvalidOperation, Overflow, ROUND_HALF_EVEN, localcontext
+from functools import lru_cache
+import math
+
+from fastapi import HTTPException
+
+MAX_PRECISION = 10_000
+PRECISE_OPERATIONS = ("add", "sub", "subtract", "multiply", "divide", "power", "modulus", "sqrt")
+
+
+@lru_cache(maxsize=64)
+def get_context(precision: int) -> Context:
+    """Decimal context for a precision, built once and reused."""
+    return Context(prec=precision, rounding=ROUND_HALF_EVEN, Emax=999_999_999, Emin=-999_999_999)
+
+
+@lru_cache(maxsize=64)
+def _guard_scale(precision: int) -> int:
+    """10 ** (2 * (precision + guard digits)): fixed-point scale used by sqrt."""
+    return 10 ** (2 * (precision + 10))
+
+
+def to_decimal(value) -> Decimal:
+    if isinstance(value, float):
+        return Decimal(repr(value))
+    return Decimal(value)
+
+
+def _as_int(value: Decimal):
+    """The value as an int when it is integral, otherwise None."""
+    return int(value) if value == value.to_integral_value() else None
+
+
+def _sqrt(a: Decimal, precision: int) -> Decimal:
+    if a < 0:
+        raise HTTPException(status_code=400, detail="Cannot calculate square root of negative number")
+    ctx = get_context(precision)
+    exact = _as_int(a)
+    if exact is not None:
+        root = math.isqrt(exact)
+        if root * root == exact:
+            return ctx.plus(Decimal(root))
+    # Integer Newton iteration (math.isqrt) on a fixed-point scaling of a
+    scale = _guard_scale(precision)
+    sign, digits, exponent = a.as_tuple()
+    mantissa = int("".join(map(str, digits)))
+    if exponent % 2:
+        mantissa *= 10
+        exponent -= 1
+    root = math.isqrt(mantissa * scale)
+    return ctx.plus(Decimal(root).scaleb(exponent // 2 - (precision + 10), ctx))
+
+
+def _power(a: Decimal, b: Decimal, precision: int) -> Decimal:
+    ctx = get_context(precision)
+    base, exponent = _as_int(a), _as_int(b)
+    if base is not None and exponent is not None and exponent >= 0:
+        # exact integer power while the result stays a reasonable size
+        digits = exponent * math.log10(abs(base)) if abs(base) > 1 else 0
+        if digits <= 4 * precision:
+            return ctx.plus(Decimal(base ** exponent))
+    if a == 0 and b < 0:
+        raise HTTPException(status_code=400, detail="Cannot raise zero to a negative power")
+    try:
+        result = ctx.power(a, b)
+    except Overflow:
+        raise HTTPException(status_code=400, detail="Result exceeds the decimal exponent range")
+    except InvalidOperation:
+        raise HTTPException(status_code=400, detail="Power of a negative number requires an integer exponent")
+    # underflow rounds to zero at the smallest exponent (0E-1000000008); report it as plain 0
+    return Decimal(0) if result.is_zero() else result
+
+
+def _modulus(a: Decimal, b: Decimal, precision: int) -> Decimal:
+    if b == 0:
+        raise HTTPException(status_code=400, detail="Cannot perform modulus with zero")
+    x, y = _as_int(a), _as_int(b)
+    if x is not None and y is not None:
+        return get_context(precision).plus(Decimal(x % y))
+    # Decimal's remainder takes the dividend's sign; match Python's float %
+    with localcontext(get_context(max(precision, a.adjusted() - b.adjusted() + precision + 2))) as ctx:
+        remainder = ctx.remainder(a, b)
+        if remainder and (remainder < 0) != (b < 0):
+            remainder = ctx.add(remainder, b)
+    return get_context(precision).plus(remainder)
+
+
+def compute_precise(op_type: str, a, b, precision: int) -> Decimal:
+    """Evaluate an operation to ``precision`` significant digits."""
+    if not 1 <= precision <= MAX_PRECISION:
+        raise ValueError(f"precision must be between 1 and {MAX_PRECISION}")
+    op_type = op_type.lower()
+    ctx = get_context(precision)
+    a, b = to_decimal(a), to_decimal(b)
+    if op_type == "add":
+        return ctx.add(a, b)
+    elif op_type in ("sub", "subtract"):
+        return ctx.subtract(a, b)
+    elif op_type == "multiply":
+        return ctx.multiply(a, b)
+    elif op_type == "divide":
+        if b == 0:
+            raise HTTPException(status_code=400, detail="Cannot divide by zero")
+        return ctx.divide(a, b)
+    elif op_type == "power":
+        return _power(a, b, precision)
+    elif op_type == "modulus":
+        return _modulus(a, b, precision)
+    elif op_type == "sqrt":
+        return _sqrt(a, precision)
+    raise ValueError("Invalid operation type")
+
+
+def to_float(value: Decimal) -> float:
+    """Float approximation for the result column; rejects values outside float range."""
+    result = float(value)
+    if math.isinf(result):
+        raise HTTPException(status_code=400, detail="Result exceeds the floating point range")
+    return result
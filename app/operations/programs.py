@@ -0,0 +1,100 @@
+"""
+Calculation programs: a list of steps run on a stack, RPN style.
+
+A step is a number (pushed), ``"push <number>"``, a stack instruction
+(``dup``, ``swap``, ``drop``) or the name of a registered operation, which
+pops its operands and pushes the result: ``[3, 4, "power", 2, "divide"]``
+computes (3 ^ 4) / 2. Binary operations take the second-from-top item as
+``a`` and the top as ``b``; unary ones take the top as ``a`` with ``b`` = 0,
+exactly as a single calculation would be stored.
+"""
+import math
+from dataclasses import dataclass
+from typing import Sequence, Union
+
+from fastapi import HTTPException
+
+from app.operations import get_operation
+
+MAX_STEPS = 10_000
+STACK_INSTRUCTIONS = ("push", "dup", "swap", "drop")
+
+Step = Union[float, int, str]
+
+
+@dataclass
+class ExecutedStep:
+    """One operation of a program and its operands; stack instructions are not recorded."""
+    index: int
+    type: str
+    a: float
+    b: float
+    result: float
+
+
+@dataclass
+class ProgramRun:
+    steps: list[ExecutedStep]
+    stack: list[float]
+
+
+def _number(text: str, index: int) -> float:
+    try:
+        value = float(text)
+    except ValueError:
+        raise ValueError(f"Step {index}: '{text}' is not a number")
+    if not math.isfinite(value):
+        raise ValueError(f"Step {index}: pushed values must be finite")
+    return value
+
+
+def _pop(stack: list[float], count: int, index: int, name: str) -> list[float]:
+    if len(stack) < count:
+        raise ValueError(f"Step {index} ({name}): needs {count} value(s) on the stack, found {len(stack)}")
+    operands = stack[-count:]
+    del stack[-count:]
+    return operands
+
+
+def run_program(steps: Sequence[Step]) -> ProgramRun:
+    """Execute ``steps``; ValueError naming the failing step for any invalid step or result."""
+    if not 1 <= len(steps) <= MAX_STEPS:
+        raise ValueError(f"A program has between 1 and {MAX_STEPS} steps")
+    stack: list[float] = []
+    executed: list[ExecutedStep] = []
+    for index, step in enumerate(steps):
+        if isinstance(step, bool):
+            raise ValueError(f"Step {index}: expected a number or an instruction")
+        if isinstance(step, (int, float)):
+            stack.append(_number(repr(float(step)), index))
+            continue
+        name, _, argument = step.strip().partition(" ")
+        name, argument = name.lower(), argument.strip()
+        if name == "push":
+            stack.append(_number(argument, index))
+            continue
+        if argument:
+            raise ValueError(f"Step {index}: only push takes an argument")
+        if name == "dup":
+            stack.extend(_pop(stack, 1, index, name) * 2)
+        elif name == "swap":
+            stack.extend(reversed(_pop(stack, 2, index, name)))
+        elif name == "drop":
+            _pop(stack, 1, index, name)
+        else:
+            try:
+                operation = get_operation(name)
+            except ValueError:
+                raise ValueError(f"Step {index}: unknown instruction or operation '{name}'")
+            a, b = (*_pop(stack, operation.arity, index, name), 0.0)[:2]
+            try:
+                result = float(operation.compute(a, b))
+            except HTTPException as e:
+                raise ValueError(f"Step {index} ({name}): {e.detail}")
+            except (ValueError, ArithmeticError) as e:
+                raise ValueError(f"Step {index} ({name}): {e}")
+            if not math.isfinite(result):
+                raise ValueError(f"Step {index} ({name}): result is not a finite number")
+            executed.append(ExecutedStep(index=index, type=name, a=a, b=b, result=result))
+            stack.append(result)
+    return ProgramRun(steps=executed, stack=stack)
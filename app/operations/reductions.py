@@ -0,0 +1,95 @@
+"""
+N-ary operations: reductions of any number of operands to one value.
+
+Sums are correctly rounded (``math.fsum``), so a long vector of mixed
+magnitudes sums as accurately as a short one; mean divides that sum once.
+Products multiply mantissas and add exponents separately (``frexp``), so
+intermediate products neither overflow nor underflow when the final result
+is representable. ``hypot`` uses ``math.hypot``, which scales to avoid
+overflow and is accurate for many arguments.
+
+Operands of a stored n-ary calculation are kept as one payload: the raw
+little-endian float64 values, in order.
+"""
+import math
+from typing import Callable
+
+import numpy as np
+
+MAX_OPERANDS = 10_000_000
+OVERFLOW_DETAIL = "Result exceeds the floating point range"
+
+# mantissas are in [0.5, 1), so a block of this many cannot underflow before renormalizing
+_PRODUCT_BLOCK = 1000
+
+
+def pack_operands(values) -> bytes:
+    return np.asarray(values, dtype="<f8").tobytes()
+
+
+def unpack_operands(data: bytes) -> np.ndarray:
+    if len(data) % 8:
+        raise ValueError("Operand data must be a whole number of float64 values")
+    return np.frombuffer(data, dtype="<f8")
+
+
+def _sum(values: np.ndarray) -> float:
+    try:
+        return math.fsum(values.tolist())
+    except OverflowError:
+        raise ValueError(OVERFLOW_DETAIL)
+
+
+def _mean(values: np.ndarray) -> float:
+    try:
+        return math.fsum(values.tolist()) / len(values)
+    except OverflowError:
+        pass
+    # the sum overflows but the mean may not: scale by a power of two (exact) so the largest operand is below 1
+    exponent = math.frexp(float(np.abs(values).max()))[1]
+    mean = math.fsum(np.ldexp(values, -exponent).tolist()) / len(values)
+    try:
+        return math.ldexp(mean, exponent)
+    except OverflowError:
+        raise ValueError(OVERFLOW_DETAIL)
+
+
+def _product(values: np.ndarray) -> float:
+    mantissas, exponents = np.frexp(values)
+    mantissa, exponent = 1.0, int(exponents.sum(dtype=np.int64))
+    for start in range(0, len(values), _PRODUCT_BLOCK):
+        mantissa, shift = math.frexp(mantissa * float(np.prod(mantissas[start:start + _PRODUCT_BLOCK])))
+        exponent += shift
+    try:
+        return math.ldexp(mantissa, exponent)
+    except OverflowError:
+        raise ValueError(OVERFLOW_DETAIL)
+
+
+def _hypot(values: np.ndarray) -> float:
+    return math.hypot(*values.tolist())
+
+
+REDUCTIONS: dict[str, Callable[[np.ndarray], float]] = {
+    "sum": _sum,
+    "product": _product,
+    "mean": _mean,
+    "min": lambda values: float(values.min()),
+    "max": lambda values: float(values.max()),
+    "hypot": _hypot,
+}
+
+
+def reduce_operands(op_type: str, operands) -> float:
+    """Apply the n-ary operation ``op_type`` to all operands; ValueError for bad input."""
+    if op_type not in REDUCTIONS:
+        raise ValueError(f"Invalid n-ary operation '{op_type}'. Must be one of: {sorted(REDUCTIONS)}")
+    values = np.asarray(operands, dtype=np.float64).ravel()
+    if not 1 <= len(values) <= MAX_OPERANDS:
+        raise ValueError(f"Provide between 1 and {MAX_OPERANDS} operands")
+    if not np.isfinite(values).all():
+        raise ValueError("Operands must be finite numbers")
+    result = REDUCTIONS[op_type](values)
+    if not math.isfinite(result):
+        raise ValueError(OVERFLOW_DETAIL)
+    return result
@@ -1,13 +1,24 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional, Union
 
 
 class CalculationCreate(BaseModel):
     """Schema for creating a new calculation"""
     a: float = Field(..., description="First number")
     b: float = Field(..., description="Second number (optional for unary operations)")
-    type: str = Field(..., description="Operation type: add, subtract, multiply, divide, power, modulus, sqrt")
+    type: str = Field(..., description="Operation type: add, subtract, multiply, divide, power, modulus, sqrt, "
+                                        "or a unary scientific function such as sin, log, exp, gamma")
+    precision: Optional[int] = Field(
+        None, ge=1, le=10000,
+        description="Opt-in arbitrary-precision mode: significant digits of the result"
+    )
+    a_unit: Optional[str] = Field(None, max_length=50, description="Unit of a, e.g. km or kg*m/s^2")
+    b_unit: Optional[str] = Field(None, max_length=50, description="Unit of b")
+    result_unit: Optional[str] = Field(None, max_length=50, description="Unit to express the result in")
+    domain: Literal["real", "complex"] = Field("real", description="complex: operands and result are complex")
+    a_imag: float = Field(0.0, description="Imaginary part of a (complex domain)")
+    b_imag: float = Field(0.0, description="Imaginary part of b (complex domain)")
     
     class Config:
         json_schema_extra = {
@@ -26,6 +37,15 @@ class CalculationRead(BaseModel):
     b: float
     type: str
     result: float
+    precision: Optional[int] = None
+    result_text: Optional[str] = None
+    a_unit: Optional[str] = None
+    b_unit: Optional[str] = None
+    result_unit: Optional[str] = None
+    a_imag: Optional[float] = None
+    b_imag: Optional[float] = None
+    result_imag: Optional[float] = None
+    chain_id: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     
@@ -33,6 +53,157 @@ class CalculationRead(BaseModel):
         from_attributes = True
 
 
+class CalculationBatch(BaseModel):
+    """Schema for applying one operation element-wise over many operand pairs"""
+    type: str = Field(..., description="Operation type applied to every (a, b) pair")
+    a: list[float] = Field(..., description="First operands")
+    b: list[float] = Field(..., description="Second operands (same length as a)")
+    mode: Literal["exact", "fast"] = Field(
+        "exact", description="fast: approximate kernel with a declared maximum error, where the operation has one"
+    )
+    domain: Literal["real", "complex"] = "real"
+    a_imag: Optional[list[float]] = Field(None, description="Imaginary parts of a (complex domain; default 0)")
+    b_imag: Optional[list[float]] = Field(None, description="Imaginary parts of b (complex domain; default 0)")
+
+    @model_validator(mode="after")
+    def validate_lengths(self):
+        if len(self.a) != len(self.b):
+            raise ValueError("a and b must have the same length")
+        for imag in (self.a_imag, self.b_imag):
+            if imag is not None and len(imag) != len(self.a):
+                raise ValueError("Imaginary parts must have the same length as a")
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "type": "multiply",
+                "a": [1.0, 2.0, 3.0],
+                "b": [4.0, 5.0, 6.0]
+            }
+        }
+
+
+class CalculationBatchResult(BaseModel):
+    """Schema for batch computation results"""
+    type: str
+    count: int
+    results: list[float]
+    mode: Literal["exact", "fast"] = Field("exact", description="Kernel actually used")
+    max_error: Optional[float] = Field(None, description="Declared maximum error of the fast kernel")
+    error_kind: Optional[Literal["absolute", "relative"]] = None
+    results_imag: Optional[list[float]] = Field(None, description="Imaginary parts (complex domain)")
+
+
+class NaryCalculation(BaseModel):
+    """Schema for an n-ary operation over any number of operands"""
+    type: str = Field(..., description="sum, product, mean, min, max or hypot")
+    operands: list[float] = Field(..., min_length=1, max_length=1_000_000)
+    persist: bool = Field(True, description="Store as one calculation with the operands packed in its payload")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "type": "sum",
+                "operands": [0.1, 0.2, 0.3, 1e16, -1e16]
+            }
+        }
+
+
+class NaryResult(BaseModel):
+    """Schema for the result of an n-ary operation"""
+    type: str
+    count: int
+    result: float
+    calculation_id: Optional[int] = None
+
+
+class CalculationProgram(BaseModel):
+    """Schema for a multi-step program run on a stack (RPN)"""
+    steps: list[Union[float, str]] = Field(
+        ..., min_length=1, max_length=10_000,
+        description="Numbers are pushed; 'push x', 'dup', 'swap', 'drop' or an operation name"
+    )
+    persist: bool = Field(True, description="Store every operation step as a calculation sharing one chain id")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "steps": [3, 4, "power", 2, "divide", "sqrt"]
+            }
+        }
+
+
+class ProgramStep(BaseModel):
+    """One executed operation of a program"""
+    index: int
+    type: str
+    a: float
+    b: float
+    result: float
+    calculation_id: Optional[int] = None
+
+
+class ProgramResult(BaseModel):
+    """Schema for the outcome of a program: every intermediate and the final stack"""
+    chain_id: Optional[str] = None
+    steps: list[ProgramStep]
+    stack: list[float]
+    result: Optional[float] = Field(None, description="Top of the final stack")
+
+
+class UnitConversion(BaseModel):
+    """Schema for converting a value between compatible units"""
+    value: float
+    from_unit: str = Field(..., max_length=50)
+    to_unit: str = Field(..., max_length=50)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "value": 100.0,
+                "from_unit": "km/h",
+                "to_unit": "m/s"
+            }
+        }
+
+
+class UnitConversionResult(BaseModel):
+    value: float
+    from_unit: str
+    to_unit: str
+    result: float
+    factor: float
+
+
+class ConstantRead(BaseModel):
+    """Schema for a mathematical constant at a requested precision"""
+    name: str
+    digits: int
+    value: str
+
+
+class IntegerCalculation(BaseModel):
+    """Schema for exact big-integer number theory (operands may be JSON numbers or digit strings)"""
+    type: str = Field(..., description="gcd, lcm, modpow, modinv, crt, isprime, factorize, factorial, binomial")
+    operands: list[int] = Field(..., description="Integer operands; for crt, the residues")
+    moduli: Optional[list[int]] = Field(None, description="Moduli for crt")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "type": "modpow",
+                "operands": [3, "1000000000000000000000", 1000000007]
+            }
+        }
+
+
+class IntegerCalculationResult(BaseModel):
+    """Exact result: decimal digits, a primality flag, or {prime: exponent} for factorize"""
+    type: str
+    result: Union[bool, str, dict[str, int]]
+
+
 # Backwards compatibility aliases
 CalculationRequest = CalculationCreate
 CalculationResponse = CalculationRead
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Union
+
+
+class FunctionDefine(BaseModel):
+    """Schema for defining (or redefining) a named function"""
+    definition: str = Field(..., min_length=1, max_length=2100, description="name(parameters) = expression")
+
+    class Config:
+        json_schema_extra = {"example": {"definition": "f(x, y) = x^2 + sqrt(y)"}}
+
+
+class FunctionRead(BaseModel):
+    """Schema for a stored function"""
+    name: str
+    parameters: list[str]
+    body: str
+
+
+class FunctionEvaluate(BaseModel):
+    """Schema for calling a function; arrays are evaluated element-wise in one pass"""
+    arguments: list[Union[float, list[float]]] = Field(..., min_length=1, max_length=10)
+
+    class Config:
+        json_schema_extra = {"example": {"arguments": [[1, 2, 3], 4]}}
+
+
+class FunctionEvaluation(BaseModel):
+    """Schema for function values; null where the result is not a finite number"""
+    name: str
+    values: list[Optional[float]]
@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from typing import Literal
+
+
+class ImportRowError(BaseModel):
+    """A row that was not imported"""
+    line: int
+    error: str
+
+
+class ImportStatus(BaseModel):
+    """Progress, or the outcome, of a bulk import"""
+    import_id: str
+    status: Literal["running", "done", "failed"]
+    bytes_read: int = 0
+    rows: int = Field(0, description="Data rows read so far")
+    imported: int = 0
+    errors: int = Field(0, description="Rows rejected so far")
+    error_samples: list[ImportRowError] = Field(default_factory=list, description="The first rejected rows")
+    detail: str = ""
@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Union
+
+
+class MatrixCalculation(BaseModel):
+    """Schema for a matrix operation on nested-list matrices"""
+    type: str = Field(..., description="multiply, transpose, inverse, determinant, solve, eigenvalues")
+    matrices: list[Union[list[list[float]], list[float]]] = Field(
+        ..., description="Operand matrices as row lists; a flat list is a column vector (e.g. b in solve)"
+    )
+    persist: bool = Field(False, description="Store the result as a calculation with a binary payload")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "type": "solve",
+                "matrices": [[[3, 1], [1, 2]], [9, 8]],
+                "persist": False
+            }
+        }
+
+
+class MatrixResult(BaseModel):
+    """Result matrix; for eigenvalues, row 0 holds real parts and row 1 imaginary parts"""
+    type: str
+    rows: int
+    cols: int
+    result: list[list[float]]
+    calculation_id: Optional[int] = None
@@ -0,0 +1,449 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Annotated, Literal, Optional
+
+# rows or columns of a sparse matrix; solvers keep several vectors of this length
+SparseDimension = Annotated[int, Field(ge=1, le=1_000_000)]
+# floats held by the per-start state of a batched minimization (simplices or inverse Hessians)
+MAX_MINIMIZE_STATE = 10_000_000
+# coefficient-point products (Horner steps) in one polynomial evaluation
+MAX_POLYNOMIAL_WORK = 100_000_000
+
+
+class SparseSolveRequest(BaseModel):
+    """Schema for solving a sparse system Ax = b given in COO or CSR form"""
+    format: Literal["coo", "csr"] = "coo"
+    shape: tuple[SparseDimension, SparseDimension] = Field(..., description="(rows, cols) of A")
+    values: list[float] = Field(..., description="Nonzero values")
+    rows: Optional[list[int]] = Field(None, description="Row index of each value (COO)")
+    cols: Optional[list[int]] = Field(None, description="Column index of each value (COO)")
+    indices: Optional[list[int]] = Field(None, description="Column index of each value (CSR)")
+    indptr: Optional[list[int]] = Field(None, description="Row pointers, length rows + 1 (CSR)")
+    b: list[float]
+    method: Literal["cg", "gmres"] = "cg"
+    preconditioner: Literal["none", "jacobi"] = "none"
+    tol: float = Field(1e-8, gt=0, description="Relative residual ||b - Ax|| / ||b|| to stop at")
+    max_iterations: int = Field(10_000, ge=1, le=1_000_000)
+    restart: int = Field(30, ge=1, le=500, description="GMRES restart length")
+    stream: bool = Field(False, description="Stream residual progress as NDJSON")
+
+    @model_validator(mode="after")
+    def validate_format_fields(self):
+        if self.format == "coo" and (self.rows is None or self.cols is None):
+            raise ValueError("COO input needs rows and cols")
+        if self.format == "csr" and (self.indices is None or self.indptr is None):
+            raise ValueError("CSR input needs indices and indptr")
+        rows, cols = self.shape
+        if len(self.b) != rows:
+            raise ValueError("b must have one entry per matrix row")
+        if self.format == "coo":
+            if any(not 0 <= i < rows for i in self.rows) or any(not 0 <= j < cols for j in self.cols):
+                raise ValueError("Coordinate out of range")
+        else:
+            if len(self.indptr) != rows + 1:
+                raise ValueError("indptr must have rows + 1 entries")
+            if any(not 0 <= j < cols for j in self.indices):
+                raise ValueError("Column index out of range")
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "format": "coo",
+                "shape": [3, 3],
+                "rows": [0, 0, 1, 1, 1, 2, 2],
+                "cols": [0, 1, 0, 1, 2, 1, 2],
+                "values": [4, -1, -1, 4, -1, -1, 4],
+                "b": [3, 2, 3],
+                "method": "cg",
+                "preconditioner": "jacobi"
+            }
+        }
+
+
+class SparseSolveResult(BaseModel):
+    """Schema for the solution of a sparse system"""
+    converged: bool
+    iterations: int
+    residual: Optional[float] = Field(None, description="Relative residual; null if it overflowed")
+    x: list[Optional[float]]
+
+
+class IntegrateRequest(BaseModel):
+    """Schema for a definite integral of an expression; bounds may be "inf" or "-inf" """
+    expression: str = Field(..., min_length=1, max_length=2000)
+    variable: str = "x"
+    lower: float
+    upper: float
+    parameters: dict[str, float] = Field(default_factory=dict, description="Values of the other variables")
+    method: Literal["gauss-kronrod", "simpson"] = "gauss-kronrod"
+    tol: float = Field(1e-10, gt=0, le=1, description="Absolute and relative tolerance")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "expression": "exp(-a*x^2)",
+                "variable": "x",
+                "lower": "-inf",
+                "upper": "inf",
+                "parameters": {"a": 1}
+            }
+        }
+
+
+class IntegrateResult(BaseModel):
+    """Schema for the value of a definite integral"""
+    value: float
+    error: float
+    evaluations: int
+    converged: bool
+
+
+class DifferentiateRequest(BaseModel):
+    """Schema for derivatives of an expression at one or more points"""
+    expression: str = Field(..., min_length=1, max_length=2000)
+    variable: str = "x"
+    points: list[float] = Field(..., min_length=1, max_length=100_000)
+    order: Literal[1, 2] = 1
+    parameters: dict[str, float] = Field(default_factory=dict, description="Values of the other variables")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "expression": "sin(x)",
+                "points": [0, 1, 2],
+                "order": 1
+            }
+        }
+
+
+class DifferentiateResult(BaseModel):
+    """Schema for derivatives at each requested point"""
+    values: list[float]
+    errors: list[float]
+    evaluations: int
+
+
+class ODERequest(BaseModel):
+    """Schema for integrating dy/dt = f(t, y), one expression per state variable"""
+    equations: list[str] = Field(..., min_length=1, max_length=100)
+    state: list[str] = Field(..., min_length=1, max_length=100, description="State variable names, in equation order")
+    time: str = "t"
+    t_span: tuple[float, float]
+    y0: list[float]
+    parameters: dict[str, float] = Field(default_factory=dict)
+    method: Literal["rk45", "rosenbrock"] = Field("rk45", description="rosenbrock is the stiff (linearly implicit) solver")
+    t_eval: Optional[list[float]] = Field(None, max_length=100_000, description="Sorted output times; default is every step")
+    rtol: float = Field(1e-6, gt=0, le=1)
+    atol: float = Field(1e-9, gt=0)
+    max_steps: int = Field(100_000, ge=1, le=1_000_000)
+    stream: bool = Field(False, description="Stream {t, y} samples as NDJSON")
+
+    @model_validator(mode="after")
+    def validate_lengths(self):
+        if len(self.equations) != len(self.state) or len(self.y0) != len(self.state):
+            raise ValueError("equations, state and y0 must have the same length")
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "equations": ["v", "-k*x"],
+                "state": ["x", "v"],
+                "t_span": [0, 10],
+                "y0": [1, 0],
+                "parameters": {"k": 4},
+                "t_eval": [0, 2.5, 5, 7.5, 10]
+            }
+        }
+
+
+class ODEResult(BaseModel):
+    """Schema for a sampled ODE trajectory"""
+    t: list[float]
+    y: list[list[float]] = Field(..., description="State vector at each time")
+    steps: int
+    evaluations: int
+
+
+class SolveRequest(BaseModel):
+    """Schema for finding roots of f(x) = 0 from a batch of brackets or starting points"""
+    method: Literal["brent", "newton", "polynomial"] = "brent"
+    expression: Optional[str] = Field(None, min_length=1, max_length=2000)
+    variable: str = "x"
+    parameters: dict[str, float] = Field(default_factory=dict)
+    brackets: Optional[list[tuple[float, float]]] = Field(None, max_length=10_000, description="[a, b] with a sign change (brent)")
+    starts: Optional[list[float]] = Field(None, max_length=10_000, description="Starting points (newton)")
+    coefficients: Optional[list[float]] = Field(None, max_length=1001, description="Highest degree first (polynomial)")
+    tol: float = Field(1e-12, gt=0, le=1)
+    max_iterations: int = Field(200, ge=1, le=10_000)
+
+    @model_validator(mode="after")
+    def validate_method_fields(self):
+        if self.method == "polynomial":
+            if not self.coefficients:
+                raise ValueError("polynomial needs coefficients")
+        elif self.expression is None:
+            raise ValueError(f"{self.method} needs an expression")
+        elif self.method == "brent" and not self.brackets:
+            raise ValueError("brent needs brackets")
+        elif self.method == "newton" and not self.starts:
+            raise ValueError("newton needs starts")
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "method": "brent",
+                "expression": "cos(x) - x",
+                "brackets": [[0, 1]]
+            }
+        }
+
+
+class SolveResult(BaseModel):
+    """Schema for roots found by a solver; roots are null where a start did not converge"""
+    method: str
+    roots: list[Optional[float]]
+    converged: list[bool]
+    iterations: int
+    evaluations: int
+    complex_roots: Optional[list[tuple[float, float]]] = Field(None, description="(real, imaginary) pairs (polynomial)")
+
+
+class MinimizeRequest(BaseModel):
+    """Schema for minimizing an expression from a batch of starting points or brackets"""
+    method: Literal["nelder-mead", "golden", "bfgs"] = "nelder-mead"
+    expression: str = Field(..., min_length=1, max_length=2000)
+    variables: list[str] = Field(["x"], min_length=1, max_length=100)
+    parameters: dict[str, float] = Field(default_factory=dict)
+    starts: Optional[list[list[float]]] = Field(None, max_length=10_000, description="One point per start (nelder-mead, bfgs)")
+    brackets: Optional[list[tuple[float, float]]] = Field(None, max_length=10_000, description="[a, b] intervals (golden)")
+    bounds: Optional[list[tuple[float, float]]] = Field(None, description="[lower, upper] per variable (bfgs)")
+    tol: Optional[float] = Field(None, gt=0, le=1)
+    max_iterations: Optional[int] = Field(None, ge=1, le=100_000)
+
+    @model_validator(mode="after")
+    def validate_method_fields(self):
+        if self.method == "golden":
+            if not self.brackets or len(self.variables) != 1:
+                raise ValueError("golden needs brackets and exactly one variable")
+        elif not self.starts or any(len(start) != len(self.variables) for start in self.starts):
+            raise ValueError(f"{self.method} needs starts with one coordinate per variable")
+        else:
+            n = len(self.variables)
+            if len(self.starts) * (n + 1) * n > MAX_MINIMIZE_STATE:
+                raise ValueError(
+                    f"starts x (variables + 1) x variables must be at most {MAX_MINIMIZE_STATE}; use fewer starts"
+                )
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "method": "bfgs",
+                "expression": "(1 - x)^2 + 100*(y - x^2)^2",
+                "variables": ["x", "y"],
+                "starts": [[-1.2, 1], [2, 2]],
+                "bounds": [[-2, 2], [-2, 2]]
+            }
+        }
+
+
+class MinimizeResult(BaseModel):
+    """Schema for the minimum reached from each start; best is the index of the lowest finite value, null marks divergence"""
+    method: str
+    points: list[list[Optional[float]]]
+    values: list[Optional[float]]
+    converged: list[bool]
+    best: int
+    iterations: int
+    evaluations: int
+
+
+class PolynomialRequest(BaseModel):
+    """Schema for polynomial operations; coefficients are highest degree first"""
+    type: Literal["evaluate", "multiply", "derivative", "integral"]
+    coefficients: list[float] = Field(..., min_length=1, max_length=1_000_000)
+    other: Optional[list[float]] = Field(None, min_length=1, max_length=1_000_000, description="Second factor (multiply)")
+    points: Optional[list[float]] = Field(None, max_length=1_000_000, description="Where to evaluate (evaluate)")
+    constant: float = Field(0.0, description="Constant of integration (integral)")
+
+    @model_validator(mode="after")
+    def validate_type_fields(self):
+        if self.type == "multiply" and self.other is None:
+            raise ValueError("multiply needs other")
+        if self.type == "evaluate" and self.points is None:
+            raise ValueError("evaluate needs points")
+        if self.type == "evaluate" and len(self.coefficients) * len(self.points) > MAX_POLYNOMIAL_WORK:
+            raise ValueError(f"coefficients x points must be at most {MAX_POLYNOMIAL_WORK}")
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "type": "evaluate",
+                "coefficients": [1, -3, 2],
+                "points": [0, 1, 2, 3]
+            }
+        }
+
+
+class PolynomialResult(BaseModel):
+    """Schema for a polynomial result: new coefficients, or values at the requested points; null where not finite"""
+    type: str
+    coefficients: Optional[list[Optional[float]]] = None
+    values: Optional[list[Optional[float]]] = None
+
+
+class PolynomialFitRequest(BaseModel):
+    """Schema for fitting result ≈ p(a) over the current user's stored calculations"""
+    degree: int = Field(..., ge=0, le=20)
+    type: Optional[str] = Field(None, description="Only use calculations of this operation type")
+
+
+class PolynomialFitResult(BaseModel):
+    """Schema for a least-squares polynomial fit; null where a number overflowed"""
+    degree: int
+    coefficients: list[Optional[float]]
+    count: int
+    rms_error: Optional[float]
+    r_squared: Optional[float]
+
+
+class DistributionRequest(BaseModel):
+    """Schema for evaluating a probability distribution at many points"""
+    distribution: Literal["normal", "t", "chi2", "exponential", "poisson", "binomial"]
+    function: Literal["pdf", "pmf", "cdf", "quantile"] = "cdf"
+    x: list[float] = Field(..., min_length=1, max_length=1_000_000, description="Points, or probabilities for quantile")
+    parameters: dict[str, float] = Field(
+        default_factory=dict,
+        description="normal: mean, sd; t, chi2: df; exponential: rate; poisson: mean; binomial: n, p",
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "distribution": "t",
+                "function": "quantile",
+                "x": [0.9, 0.95, 0.975, 0.99],
+                "parameters": {"df": 10}
+            }
+        }
+
+
+class DistributionResult(BaseModel):
+    """Schema for distribution values, one per point"""
+    distribution: str
+    function: str
+    values: list[Optional[float]]
+
+
+class RandomVariable(BaseModel):
+    """Schema for the distribution a simulation variable is drawn from"""
+    distribution: Literal["normal", "uniform", "t", "chi2", "exponential", "poisson", "binomial"]
+    parameters: dict[str, float] = Field(
+        default_factory=dict,
+        description="normal: mean, sd; uniform: low, high; t, chi2: df; exponential: rate; poisson: mean; binomial: n, p",
+    )
+
+
+class SimulationRequest(BaseModel):
+    """Schema for a Monte Carlo simulation of an expression over random variables"""
+    expression: str = Field(..., min_length=1, max_length=2000)
+    variables: dict[str, RandomVariable] = Field(..., min_length=1, max_length=20)
+    samples: int = Field(1_000_000, ge=1, le=1_000_000_000)
+    seed: Optional[int] = Field(None, ge=0, description="Fixes the result; a random seed is chosen and returned otherwise")
+    confidence: float = Field(0.95, gt=0, lt=1, description="Level of the confidence interval for the mean")
+    quantiles: list[float] = Field([0.05, 0.5, 0.95], max_length=100)
+    stream: bool = Field(False, description="Stream running estimates as NDJSON")
+
+    @model_validator(mode="after")
+    def validate_quantiles(self):
+        if any(not 0 <= q <= 1 for q in self.quantiles):
+            raise ValueError("quantiles must be between 0 and 1")
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "expression": "max(price * (1 + growth) - 100, 0)",
+                "variables": {
+                    "price": {"distribution": "normal", "parameters": {"mean": 100, "sd": 15}},
+                    "growth": {"distribution": "uniform", "parameters": {"low": -0.1, "high": 0.2}}
+                },
+                "samples": 10000000,
+                "seed": 42,
+                "quantiles": [0.01, 0.5, 0.99]
+            }
+        }
+
+
+class SimulationResult(BaseModel):
+    """Schema for simulation statistics; count excludes non-finite results"""
+    samples: int
+    seed: int
+    count: int
+    non_finite: int
+    mean: Optional[float]
+    sd: Optional[float]
+    standard_error: Optional[float]
+    confidence: float
+    interval: list[Optional[float]] = Field(..., description="Confidence interval for the mean")
+    minimum: Optional[float]
+    maximum: Optional[float]
+    probabilities: list[float]
+    quantiles: list[Optional[float]]
+
+
+class SweepAxis(BaseModel):
+    """Schema for the values of one sweep variable: a list, or num points from start to stop"""
+    values: Optional[list[float]] = Field(None, max_length=1_000_000)
+    start: Optional[float] = None
+    stop: Optional[float] = None
+    num: Optional[int] = Field(None, ge=1, le=1_000_000)
+
+    @model_validator(mode="after")
+    def validate_form(self):
+        spaced = [value is not None for value in (self.start, self.stop, self.num)]
+        listed = self.values is not None
+        if not ((listed and not any(spaced)) or (not listed and all(spaced))):
+            raise ValueError("Give either values or start, stop and num")
+        return self
+
+
+class SweepRequest(BaseModel):
+    """Schema for evaluating an operation or expression over the Cartesian grid of its variables"""
+    type: Optional[str] = Field(None, description="Operation over variables a and b")
+    expression: Optional[str] = Field(None, min_length=1, max_length=2000)
+    variables: dict[str, SweepAxis] = Field(
+        ..., min_length=1, max_length=8, description="Grid axes in row-major order: the last varies fastest"
+    )
+    format: Literal["ndjson", "binary"] = Field(
+        "ndjson", description="ndjson: one line per row of the last variable; binary: raw little-endian float64"
+    )
+
+    @model_validator(mode="after")
+    def validate_target(self):
+        if (self.type is None) == (self.expression is None):
+            raise ValueError("Give either type or expression")
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "expression": "a * sin(b) / (1 + a)",
+                "variables": {
+                    "a": {"start": 0, "stop": 10, "num": 1000},
+                    "b": {"values": [1, 2, 3, 5, 8, 13]}
+                },
+                "format": "binary"
+            }
+        }
+
+
+class PlotResult(BaseModel):
+    """Schema for adaptive plot samples; y is null where the curve is broken"""
+    x: list[float]
+    y: list[Optional[float]]
+    discontinuities: list[float]
+    y_range: list[float] = Field(..., description="Suggested y axis range, ignoring outliers near poles")
@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Union
+
+
+class SeriesCalculation(BaseModel):
+    """Schema for a series operation (FFT, power spectrum, convolution, moving-window filter)"""
+    type: str = Field(..., description="fft, ifft, power_spectrum, convolve, moving_average, moving_median, moving_min, moving_max")
+    series: list[float] = Field(..., min_length=1, max_length=1_000_000, description="For ifft: interleaved (real, imaginary) pairs")
+    kernel: Optional[list[float]] = Field(None, min_length=1, max_length=100_000, description="Convolution kernel (convolve)")
+    window: Optional[int] = Field(None, ge=1, description="Window length (moving_*)")
+    n: Optional[int] = Field(None, ge=1, description="Output length (ifft)")
+    persist: bool = Field(False, description="Store the result as a calculation with a binary payload")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "type": "moving_average",
+                "series": [1, 2, 3, 4, 5, 6],
+                "window": 3
+            }
+        }
+
+
+class SeriesResult(BaseModel):
+    """Result series; complex results (fft) are (real, imaginary) pairs"""
+    type: str
+    length: int
+    result: Union[list[float], list[tuple[float, float]]]
+    calculation_id: Optional[int] = None
@@ -0,0 +1,50 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Union
+
+
+class WorksheetCreate(BaseModel):
+    """Schema for a new worksheet: each cell holds a number or an expression over other cells"""
+    cells: dict[str, Union[float, str]] = Field(
+        ..., max_length=100_000, description="Cell name -> number or expression (a leading '=' is allowed)"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "cells": {"price": 120, "quantity": 3, "discount": 0.1, "total": "=price * quantity * (1 - discount)"}
+            }
+        }
+
+
+class WorksheetUpdate(BaseModel):
+    """Schema for editing cells; null deletes a cell"""
+    cells: dict[str, Optional[Union[float, str]]] = Field(..., min_length=1, max_length=100_000)
+
+    class Config:
+        json_schema_extra = {"example": {"cells": {"quantity": 5, "discount": None}}}
+
+
+class CellState(BaseModel):
+    """Value of a cell, or why it has none"""
+    value: Optional[float]
+    error: Optional[str]
+
+
+class CellRead(CellState):
+    formula: str
+
+
+class WorksheetRead(BaseModel):
+    """Schema for a whole worksheet"""
+    calculation_id: int
+    version: int
+    cells: dict[str, CellRead]
+
+
+class WorksheetDelta(BaseModel):
+    """Schema for the outcome of an edit: only the cells whose value or error changed"""
+    calculation_id: int
+    version: int
+    recalculated: int = Field(..., description="Cells evaluated for this edit")
+    changed: dict[str, CellState]
+    deleted: list[str]
@@ -0,0 +1,202 @@
+"""
+Scientific function library: trigonometric, hyperbolic, logarithmic and
+special functions. All are unary (``b`` is ignored, as for sqrt) and have a
+scalar kernel from ``math`` and a vectorized NumPy kernel.
+"""
+import math
+from typing import Callable, Optional
+
+import numpy as np
+from fastapi import HTTPException
+
+from app.operations import Number, Operation, register_instance
+
+OVERFLOW_DETAIL = "Result exceeds the floating point range"
+
+
+class UnaryOperation(Operation):
+    """
+    Function of ``a`` alone.
+    ``domain`` returns whether each input is valid; ``error`` is the HTTP 400 detail otherwise.
+    """
+    arity = 1
+
+    def __init__(
+        self,
+        scalar: Callable[[float], float],
+        vector: Callable[..., np.ndarray],
+        domain: Optional[Callable] = None,
+        error: str = "",
+        may_overflow: bool = False,
+    ):
+        self.scalar = scalar
+        self.vector = vector
+        self.domain = domain
+        self.error = error
+        self.may_overflow = may_overflow
+
+    def compute(self, a: Number, b: Number = 0) -> float:
+        if self.domain is not None and not self.domain(a):
+            raise HTTPException(status_code=400, detail=self.error)
+        try:
+            return self.scalar(a)
+        except OverflowError:
+            raise HTTPException(status_code=400, detail=OVERFLOW_DETAIL)
+
+    def compute_array(self, a, b, out=None):
+        if self.domain is not None and not np.all(self.domain(a)):
+            raise HTTPException(status_code=400, detail=self.error)
+        with np.errstate(over="ignore"):
+            result = self.vector(a, out=out)
+        if self.may_overflow and np.isinf(result).any():
+            raise HTTPException(status_code=400, detail=OVERFLOW_DETAIL)
+        return result
+
+    def defined(self, a, b):
+        valid = np.ones(len(a), dtype=bool) if self.domain is None else self.domain(a)
+        if self.may_overflow:
+            with np.errstate(all="ignore"):
+                valid &= np.isfinite(self.vector(np.where(valid, a, 0.0)))
+        return valid
+
+
+def _ufunc(func):
+    """Adapt a NumPy expression without an ``out`` argument to the kernel signature."""
+    def kernel(a, out=None):
+        result = func(a)
+        if out is None:
+            return result
+        out[...] = result
+        return out
+    return kernel
+
+
+# Factorials that fit in a float64 (170! is the largest)
+_FACTORIALS = np.array([float(math.factorial(n)) for n in range(171)])
+
+# Lanczos approximation, g = 7, n = 9
+_LANCZOS_G = 7.0
+_LANCZOS = np.array([
+    0.99999999999980993, 676.5203681218851, -1259.1392167224028,
+    771.32342877765313, -176.61502916214059, 12.507343278686905,
+    -0.13857109526572012, 9.9843695780195716e-6, 1.5056327351493116e-7,
+])
+
+
+def _lanczos_gamma(x: np.ndarray) -> np.ndarray:
+    """Gamma for x >= 0.5."""
+    x = x - 1.0
+    series = np.full_like(x, _LANCZOS[0])
+    for i in range(1, len(_LANCZOS)):
+        series += _LANCZOS[i] / (x + i)
+    t = x + _LANCZOS_G + 0.5
+    # split t**(x + 0.5) so it does not overflow before exp(-t) scales it back
+    half = np.power(t, (x + 0.5) / 2)
+    return math.sqrt(2 * math.pi) * series * half * np.exp(-t) * half
+
+
+def gamma_array(a: np.ndarray) -> np.ndarray:
+    a = np.asarray(a, dtype=np.float64)
+    result = np.empty_like(a)
+    integral = (a == np.floor(a)) & (a >= 1) & (a <= 171)
+    result[integral] = _FACTORIALS[a[integral].astype(np.intp) - 1]
+    upper = ~integral & (a >= 0.5)
+    result[upper] = _lanczos_gamma(a[upper])
+    lower = ~integral & (a < 0.5)
+    # reflection formula
+    with np.errstate(divide="ignore"):
+        result[lower] = np.pi / (np.sin(np.pi * a[lower]) * _lanczos_gamma(1.0 - a[lower]))
+    result[(a <= 0) & (a == np.floor(a))] = np.nan  # poles
+    return result
+
+
+def _lanczos_log_gamma(x: np.ndarray) -> np.ndarray:
+    """log(Gamma(x)) for x >= 0.5."""
+    x = x - 1.0
+    series = np.full_like(x, _LANCZOS[0])
+    for i in range(1, len(_LANCZOS)):
+        series += _LANCZOS[i] / (x + i)
+    t = x + _LANCZOS_G + 0.5
+    return 0.5 * math.log(2 * math.pi) + (x + 0.5) * np.log(t) - t + np.log(series)
+
+
+def log_gamma_array(a: np.ndarray) -> np.ndarray:
+    """log(Gamma(a)) for a > 0, without overflow for large a."""
+    a = np.asarray(a, dtype=np.float64)
+    result = np.empty_like(a)
+    upper = a >= 0.5
+    result[upper] = _lanczos_log_gamma(a[upper])
+    lower = ~upper
+    # reflection formula
+    with np.errstate(divide="ignore"):
+        result[lower] = np.log(np.pi / np.sin(np.pi * a[lower])) - _lanczos_log_gamma(1.0 - a[lower])
+    return result
+
+
+def _factorial_scalar(a: Number) -> float:
+    if a > 170:
+        raise OverflowError
+    return float(math.factorial(int(a)))
+
+
+def factorial_array(a: np.ndarray) -> np.ndarray:
+    """n! by table lookup; inf above 170 and nan for non-integers or negatives."""
+    a = np.asarray(a, dtype=np.float64)
+    valid = (a >= 0) & (a == np.floor(a))
+    result = np.full(a.shape, np.nan)
+    small = valid & (a <= 170)
+    result[small] = _FACTORIALS[a[small].astype(np.intp)]
+    result[valid & (a > 170)] = np.inf
+    return result
+
+
+def _within_unit(a):
+    return (a >= -1) & (a <= 1)
+
+
+def _positive(a):
+    return a > 0
+
+
+def _non_negative_integer(a):
+    return (a >= 0) & (a == np.floor(a))
+
+
+def _not_pole(a):
+    return (a > 0) | (a != np.floor(a))
+
+
+LOG_DETAIL = "Cannot take logarithm of a non-positive number"
+
+# name(s) -> (scalar, vector, domain, error, may_overflow)
+_FUNCTIONS = [
+    (("sin",), math.sin, np.sin, None, "", False),
+    (("cos",), math.cos, np.cos, None, "", False),
+    (("tan",), math.tan, np.tan, None, "", False),
+    (("asin", "arcsin"), math.asin, np.arcsin, _within_unit, "asin input must be between -1 and 1", False),
+    (("acos", "arccos"), math.acos, np.arccos, _within_unit, "acos input must be between -1 and 1", False),
+    (("atan", "arctan"), math.atan, np.arctan, None, "", False),
+    (("sinh",), math.sinh, np.sinh, None, "", True),
+    (("cosh",), math.cosh, np.cosh, None, "", True),
+    (("tanh",), math.tanh, np.tanh, None, "", False),
+    (("asinh", "arcsinh"), math.asinh, np.arcsinh, None, "", False),
+    (("acosh", "arccosh"), math.acosh, np.arccosh, lambda a: a >= 1, "acosh input must be at least 1", False),
+    (("atanh", "arctanh"), math.atanh, np.arctanh, lambda a: (a > -1) & (a < 1),
+     "atanh input must be strictly between -1 and 1", False),
+    (("log", "log10"), math.log10, np.log10, _positive, LOG_DETAIL, False),
+    (("ln",), math.log, np.log, _positive, LOG_DETAIL, False),
+    (("log2",), math.log2, np.log2, _positive, LOG_DETAIL, False),
+    (("exp",), math.exp, np.exp, None, "", True),
+    (("abs",), abs, np.abs, None, "", False),
+    (("floor",), math.floor, np.floor, None, "", False),
+    (("ceil",), math.ceil, np.ceil, None, "", False),
+    (("factorial",), _factorial_scalar, _ufunc(factorial_array), _non_negative_integer,
+     "Factorial requires a non-negative integer", True),
+    (("gamma",), math.gamma, _ufunc(gamma_array), _not_pole,
+     "Gamma is undefined for zero and negative integers", True),
+]
+
+for names, scalar, vector, domain, error, may_overflow in _FUNCTIONS:
+    register_instance(UnaryOperation(scalar, vector, domain, error, may_overflow), *names)
+
+UNARY_OPERATIONS = [names[0] for names, *_ in _FUNCTIONS] + ["sqrt"]
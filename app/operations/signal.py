@@ -0,0 +1,314 @@
+"""
+Signal processing over numeric series: FFT, inverse FFT, power spectrum,
+convolution and moving-window filters.
+
+Series operations are registered by name, like the scalar operations.
+Filters (convolution and moving windows) are streaming: they consume a
+series block by block, convolving by overlap-add, so their working memory is
+bounded by the block size however long the input is. Transforms need the
+whole series.
+
+Complex results (the FFT) are returned as interleaved (real, imaginary)
+float64 pairs, which is also the input format of the inverse FFT.
+"""
+import json
+from typing import Optional
+
+import numpy as np
+
+MAX_SERIES_LENGTH = 16_000_000
+MAX_KERNEL_LENGTH = 100_000
+BLOCK_SIZE = 1 << 16
+# Kernels shorter than this are convolved directly; the FFT pays off above it
+DIRECT_KERNEL_SIZE = 64
+SERIES_FORMATS = ("binary", "ndjson")
+
+# Registry of series operations keyed by every accepted (lowercase) name
+_SERIES_OPERATIONS: dict[str, "SeriesOperation"] = {}
+
+
+def register_series_operation(*names: str):
+    """Class decorator that registers a SeriesOperation under one or more names."""
+    def decorator(cls):
+        operation = cls()
+        for name in names:
+            _SERIES_OPERATIONS[name.lower()] = operation
+        return cls
+    return decorator
+
+
+def get_series_operation(op_type: str) -> "SeriesOperation":
+    operation = _SERIES_OPERATIONS.get(op_type.lower())
+    if operation is None:
+        raise ValueError(f"Invalid series operation '{op_type}'. Must be one of: {available_series_operations()}")
+    return operation
+
+
+def available_series_operations() -> list[str]:
+    return sorted(_SERIES_OPERATIONS)
+
+
+class OverlapAdd:
+    """
+    Streaming linear convolution with a fixed kernel. ``valid=True`` keeps only
+    outputs where the kernel fully overlaps the series (a trailing window).
+    """
+
+    def __init__(self, kernel, block_size: int = BLOCK_SIZE, valid: bool = False):
+        self.kernel = np.asarray(kernel, dtype=np.float64)
+        self.block_size = block_size
+        self.size = 1 << (block_size + len(self.kernel) - 2).bit_length()
+        self.kernel_fft = np.fft.rfft(self.kernel, self.size) if len(self.kernel) >= DIRECT_KERNEL_SIZE else None
+        self.pending = np.empty(0)
+        self.tail = np.zeros(len(self.kernel) - 1)
+        self.valid = valid
+        self.skip = len(self.kernel) - 1 if valid else 0
+        self.count = 0
+
+    def _convolve_block(self, block: np.ndarray) -> np.ndarray:
+        if self.kernel_fft is None:
+            full = np.convolve(block, self.kernel)
+        else:
+            full = np.fft.irfft(np.fft.rfft(block, self.size) * self.kernel_fft, self.size)[:len(block) + len(self.tail)]
+        full[:len(self.tail)] += self.tail
+        self.tail = full[len(block):].copy()
+        return full[:len(block)]
+
+    def _emit(self, output: np.ndarray) -> np.ndarray:
+        if self.skip:
+            dropped = min(self.skip, len(output))
+            output, self.skip = output[dropped:], self.skip - dropped
+        return output
+
+    def feed(self, samples: np.ndarray) -> np.ndarray:
+        self.count += len(samples)
+        self.pending = np.concatenate([self.pending, samples])
+        blocks = []
+        while len(self.pending) >= self.block_size:
+            blocks.append(self._convolve_block(self.pending[:self.block_size]))
+            self.pending = self.pending[self.block_size:]
+        return self._emit(np.concatenate(blocks) if blocks else np.empty(0))
+
+    def finish(self) -> np.ndarray:
+        if self.valid and self.count < len(self.kernel):
+            raise ValueError("The series is shorter than the window")
+        output = self._convolve_block(self.pending) if len(self.pending) else np.empty(0)
+        self.pending = np.empty(0)
+        if not self.valid:
+            output = np.r_[output, self.tail]
+        return self._emit(output)
+
+
+class MovingWindow:
+    """Streaming trailing-window reduction (median, min, max) over ``window`` samples."""
+
+    def __init__(self, reduce, window: int, block_size: int = BLOCK_SIZE):
+        self.reduce = reduce
+        self.window = window
+        self.block_size = block_size
+        self.carry = np.empty(0)
+        self.count = 0
+
+    def feed(self, samples: np.ndarray) -> np.ndarray:
+        self.count += len(samples)
+        data = np.concatenate([self.carry, samples])
+        if len(data) < self.window:
+            self.carry = data
+            return np.empty(0)
+        views = np.lib.stride_tricks.sliding_window_view(data, self.window)
+        # reduce in slices of about block_size values so the temporary copies stay bounded
+        rows = max(1, self.block_size // self.window)
+        output = np.concatenate([
+            self.reduce(views[start:start + rows], axis=1)
+            for start in range(0, len(views), rows)
+        ])
+        self.carry = data[len(data) - self.window + 1:]
+        return output
+
+    def finish(self) -> np.ndarray:
+        if self.count < self.window:
+            raise ValueError("The series is shorter than the window")
+        return np.empty(0)
+
+
+class SeriesOperation:
+    streaming = False
+    complex_output = False
+
+    def compute(self, series: np.ndarray, **options) -> np.ndarray:
+        """Result for a whole series; streaming operations run their filter over it."""
+        stream = self.stream(**options)
+        return np.concatenate([stream.feed(series), stream.finish()])
+
+    def stream(self, **options):
+        raise NotImplementedError("Only streaming operations implement stream()")
+
+
+def _window(window: Optional[int]) -> int:
+    if window is None or window < 1:
+        raise ValueError("This operation needs a positive window")
+    if window > MAX_KERNEL_LENGTH:
+        raise ValueError(f"Windows are limited to {MAX_KERNEL_LENGTH} values")
+    return window
+
+
+@register_series_operation("fft")
+class FFTOperation(SeriesOperation):
+    """Spectrum of a real series (n // 2 + 1 complex bins)."""
+    complex_output = True
+
+    def compute(self, series, **options):
+        return np.fft.rfft(series)
+
+
+@register_series_operation("ifft")
+class InverseFFTOperation(SeriesOperation):
+    """Real series from interleaved (real, imaginary) bins; ``n`` defaults to 2 * (bins - 1)."""
+
+    def compute(self, series, n: Optional[int] = None, **options):
+        if len(series) % 2:
+            raise ValueError("ifft input must be interleaved (real, imaginary) pairs")
+        spectrum = series.view(np.complex128) if series.flags.c_contiguous else series.copy().view(np.complex128)
+        if n is not None and not 0 < n <= MAX_SERIES_LENGTH:
+            raise ValueError("n must be a positive length")
+        return np.fft.irfft(spectrum, n)
+
+
+@register_series_operation("power_spectrum", "psd")
+class PowerSpectrumOperation(SeriesOperation):
+    """Periodogram |X_k|^2 / n of a real series."""
+
+    def compute(self, series, **options):
+        spectrum = np.fft.rfft(series)
+        return (spectrum.real ** 2 + spectrum.imag ** 2) / len(series)
+
+
+@register_series_operation("convolve", "convolution")
+class ConvolveOperation(SeriesOperation):
+    """Full linear convolution with a kernel (length n + m - 1)."""
+    streaming = True
+
+    def stream(self, kernel=None, **options):
+        if kernel is None or not len(kernel):
+            raise ValueError("convolve needs a kernel")
+        if len(kernel) > MAX_KERNEL_LENGTH:
+            raise ValueError(f"Kernels are limited to {MAX_KERNEL_LENGTH} values")
+        return OverlapAdd(kernel)
+
+
+@register_series_operation("moving_average")
+class MovingAverageOperation(SeriesOperation):
+    """Mean of each full trailing window (length n - window + 1)."""
+    streaming = True
+
+    def stream(self, window=None, **options):
+        window = _window(window)
+        return OverlapAdd(np.full(window, 1.0 / window), valid=True)
+
+
+@register_series_operation("moving_median")
+class MovingMedianOperation(SeriesOperation):
+    streaming = True
+
+    def stream(self, window=None, **options):
+        return MovingWindow(np.median, _window(window))
+
+
+@register_series_operation("moving_min")
+class MovingMinOperation(SeriesOperation):
+    streaming = True
+
+    def stream(self, window=None, **options):
+        return MovingWindow(np.min, _window(window))
+
+
+@register_series_operation("moving_max")
+class MovingMaxOperation(SeriesOperation):
+    streaming = True
+
+    def stream(self, window=None, **options):
+        return MovingWindow(np.max, _window(window))
+
+
+def compute_series(op_type: str, series, **options) -> np.ndarray:
+    """Run a series operation; raises ValueError on bad input."""
+    operation = get_series_operation(op_type)
+    series = np.ascontiguousarray(series, dtype=np.float64)
+    if series.ndim != 1 or not len(series):
+        raise ValueError("The series must be a non-empty list of numbers")
+    if len(series) > MAX_SERIES_LENGTH:
+        raise ValueError(f"Series are limited to {MAX_SERIES_LENGTH} values")
+    if not np.all(np.isfinite(series)):
+        raise ValueError("The series must be finite")
+    if options.get("kernel") is not None:
+        options["kernel"] = np.asarray(options["kernel"], dtype=np.float64)
+    return operation.compute(series, **options)
+
+
+class SeriesDecoder:
+    """
+    Incremental decoder for uploaded series: raw little-endian float64
+    ("binary") or one JSON number or list of numbers per line ("ndjson").
+    Chunks may split values or lines anywhere.
+    """
+
+    def __init__(self, format: str):
+        if format not in SERIES_FORMATS:
+            raise ValueError(f"format must be one of {SERIES_FORMATS}")
+        self.format = format
+        self.remainder = b""
+        self.count = 0
+
+    def _check(self, values: np.ndarray) -> np.ndarray:
+        self.count += len(values)
+        if self.count > MAX_SERIES_LENGTH:
+            raise ValueError(f"Series are limited to {MAX_SERIES_LENGTH} values")
+        if not np.all(np.isfinite(values)):
+            raise ValueError("The series must be finite")
+        return values
+
+    def _lines(self, lines: list[bytes]) -> np.ndarray:
+        values = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                value = json.loads(line)
+            except ValueError:
+                raise ValueError("Each NDJSON line must be a number or a list of numbers")
+            values.extend(value if isinstance(value, list) else [value])
+        try:
+            return np.array(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ValueError("Each NDJSON line must be a number or a list of numbers")
+
+    def feed(self, chunk: bytes) -> np.ndarray:
+        data = self.remainder + chunk
+        if self.format == "binary":
+            usable = len(data) - len(data) % 8
+            self.remainder = data[usable:]
+            return self._check(np.frombuffer(data[:usable], dtype="<f8").astype(np.float64))
+        lines = data.split(b"\n")
+        self.remainder = lines.pop()
+        return self._check(self._lines(lines))
+
+    def finish(self) -> np.ndarray:
+        remainder, self.remainder = self.remainder, b""
+        if self.format == "binary":
+            if remainder:
+                raise ValueError("Binary series length must be a multiple of 8 bytes")
+            return np.empty(0)
+        return self._check(self._lines([remainder]))
+
+
+def encode_series(values: np.ndarray, format: str) -> bytes:
+    """Encode a result; complex values become (real, imaginary) pairs."""
+    if format == "binary":
+        if np.iscomplexobj(values):
+            values = np.ascontiguousarray(values, dtype=np.complex128).view(np.float64)
+        return np.ascontiguousarray(values, dtype="<f8").tobytes()
+    if np.iscomplexobj(values):
+        rows = np.column_stack([values.real, values.imag]).tolist()
+    else:
+        rows = values.tolist()
+    return "".join(json.dumps(row) + "\n" for row in rows).encode()
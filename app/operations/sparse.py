@@ -0,0 +1,227 @@
+"""
+Sparse linear systems solved with iterative methods.
+
+Matrices are held in CSR form (values, column indices, row pointers) plus
+the expanded row index of each nonzero, so memory is proportional to the
+number of nonzeros. The matrix-vector product is one gather and one
+``np.bincount`` per iteration.
+
+Solvers are generators: they yield a ``SolverState`` every ``report_every``
+iterations (for streaming progress) and always yield a final state that
+carries the solution.
+"""
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+
+
+class CSRMatrix:
+    def __init__(self, values: np.ndarray, indices: np.ndarray, indptr: np.ndarray, shape: tuple[int, int]):
+        rows, cols = shape
+        if len(indptr) != rows + 1 or indptr[0] != 0 or indptr[-1] != len(values) or len(indices) != len(values):
+            raise ValueError("Inconsistent CSR arrays")
+        if np.any(np.diff(indptr) < 0):
+            raise ValueError("indptr must be non-decreasing")
+        if len(indices) and (indices.min() < 0 or indices.max() >= cols):
+            raise ValueError("Column index out of range")
+        self.values = values
+        self.indices = indices
+        self.indptr = indptr
+        self.shape = shape
+        self.row_ids = np.repeat(np.arange(rows, dtype=indices.dtype), np.diff(indptr))
+
+    @classmethod
+    def from_csr(cls, values, indices, indptr, shape) -> "CSRMatrix":
+        return cls(
+            np.asarray(values, dtype=np.float64),
+            np.asarray(indices, dtype=np.int64),
+            np.asarray(indptr, dtype=np.int64),
+            tuple(shape),
+        )
+
+    @classmethod
+    def from_coo(cls, rows, cols, values, shape) -> "CSRMatrix":
+        """Build from coordinate triplets; duplicate entries are summed."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        if not len(rows) == len(cols) == len(values):
+            raise ValueError("rows, cols and values must have the same length")
+        n_rows, n_cols = shape
+        if len(rows) and (rows.min() < 0 or rows.max() >= n_rows or cols.min() < 0 or cols.max() >= n_cols):
+            raise ValueError("Coordinate out of range")
+        order = np.lexsort((cols, rows))
+        rows, cols, values = rows[order], cols[order], values[order]
+        if len(rows):
+            starts = np.flatnonzero(np.r_[True, (np.diff(rows) != 0) | (np.diff(cols) != 0)])
+            values = np.add.reduceat(values, starts)
+            rows, cols = rows[starts], cols[starts]
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+        return cls(values, cols, indptr, (n_rows, n_cols))
+
+    @property
+    def nnz(self) -> int:
+        return len(self.values)
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        return np.bincount(self.row_ids, weights=self.values * x[self.indices], minlength=self.shape[0])
+
+    def diagonal(self) -> np.ndarray:
+        diagonal = np.zeros(min(self.shape))
+        on_diagonal = self.row_ids == self.indices
+        diagonal[self.row_ids[on_diagonal]] = self.values[on_diagonal]
+        return diagonal
+
+
+@dataclass
+class SolverState:
+    iteration: int
+    residual: float
+    done: bool = False
+    converged: bool = False
+    x: Optional[np.ndarray] = None
+
+
+def jacobi_preconditioner(matrix: CSRMatrix) -> Callable[[np.ndarray], np.ndarray]:
+    diagonal = matrix.diagonal()
+    if np.any(diagonal == 0):
+        raise ValueError("Jacobi preconditioning needs a nonzero diagonal")
+    inverse = 1.0 / diagonal
+    return lambda r: inverse * r
+
+
+def _identity(r: np.ndarray) -> np.ndarray:
+    return r
+
+
+def conjugate_gradient(
+    matrix: CSRMatrix, b: np.ndarray, tol: float, max_iterations: int,
+    preconditioner: Callable = _identity, report_every: int = 10,
+) -> Iterator[SolverState]:
+    """Preconditioned conjugate gradient for symmetric positive definite systems."""
+    b_norm = np.linalg.norm(b) or 1.0
+    x = np.zeros_like(b)
+    r = b.copy()
+    z = preconditioner(r)
+    p = z.copy()
+    rz = r @ z
+    residual = np.linalg.norm(r) / b_norm
+    iteration = 0
+    while residual > tol and iteration < max_iterations:
+        ap = matrix.matvec(p)
+        curvature = p @ ap
+        if curvature <= 0:
+            raise ValueError("Matrix is not positive definite; use gmres")
+        alpha = rz / curvature
+        x += alpha * p
+        r -= alpha * ap
+        z = preconditioner(r)
+        rz, rz_old = r @ z, rz
+        p *= rz / rz_old
+        p += z
+        iteration += 1
+        residual = np.linalg.norm(r) / b_norm
+        if iteration % report_every == 0:
+            yield SolverState(iteration, residual)
+    yield SolverState(iteration, residual, done=True, converged=residual <= tol, x=x)
+
+
+def gmres(
+    matrix: CSRMatrix, b: np.ndarray, tol: float, max_iterations: int,
+    preconditioner: Callable = _identity, report_every: int = 10, restart: int = 30,
+) -> Iterator[SolverState]:
+    """Restarted GMRES(restart) with right preconditioning, for general square systems."""
+    n = len(b)
+    b_norm = np.linalg.norm(b) or 1.0
+    x = np.zeros_like(b)
+    restart = max(1, min(restart, n))
+    iteration = 0
+    r = b - matrix.matvec(x)
+    residual = np.linalg.norm(r) / b_norm
+    while residual > tol and iteration < max_iterations:
+        beta = np.linalg.norm(r)
+        basis = np.zeros((restart + 1, n))
+        hessenberg = np.zeros((restart + 1, restart))
+        cs, sn = np.zeros(restart), np.zeros(restart)
+        g = np.zeros(restart + 1)
+        g[0] = beta
+        basis[0] = r / beta
+        steps = 0
+        for j in range(restart):
+            w = matrix.matvec(preconditioner(basis[j]))
+            # modified Gram-Schmidt
+            for i in range(j + 1):
+                hessenberg[i, j] = w @ basis[i]
+                w -= hessenberg[i, j] * basis[i]
+            hessenberg[j + 1, j] = np.linalg.norm(w)
+            if hessenberg[j + 1, j] > 0:
+                basis[j + 1] = w / hessenberg[j + 1, j]
+            # apply previous Givens rotations, then eliminate the new subdiagonal
+            for i in range(j):
+                upper, lower = hessenberg[i, j], hessenberg[i + 1, j]
+                hessenberg[i, j] = cs[i] * upper + sn[i] * lower
+                hessenberg[i + 1, j] = -sn[i] * upper + cs[i] * lower
+            denominator = np.hypot(hessenberg[j, j], hessenberg[j + 1, j])
+            if denominator == 0:
+                raise ValueError("GMRES broke down: the matrix is singular")
+            cs[j], sn[j] = hessenberg[j, j] / denominator, hessenberg[j + 1, j] / denominator
+            hessenberg[j, j] = denominator
+            hessenberg[j + 1, j] = 0.0
+            g[j + 1] = -sn[j] * g[j]
+            g[j] *= cs[j]
+            steps = j + 1
+            iteration += 1
+            residual = abs(g[j + 1]) / b_norm
+            if iteration % report_every == 0:
+                yield SolverState(iteration, residual)
+            if residual <= tol or iteration >= max_iterations:
+                break
+        y = np.linalg.solve(np.triu(hessenberg[:steps, :steps]), g[:steps])
+        x += preconditioner(y @ basis[:steps])
+        r = b - matrix.matvec(x)
+        residual = np.linalg.norm(r) / b_norm
+    yield SolverState(iteration, residual, done=True, converged=residual <= tol, x=x)
+
+
+SPARSE_SOLVERS = {
+    "cg": conjugate_gradient,
+    "gmres": gmres,
+}
+
+
+def iterate_sparse_solve(
+    matrix: CSRMatrix,
+    b,
+    method: str = "cg",
+    preconditioner: Optional[str] = None,
+    tol: float = 1e-8,
+    max_iterations: int = 10_000,
+    report_every: int = 10,
+    **options,
+) -> Iterator[SolverState]:
+    """Validate inputs and return the chosen solver's progress iterator."""
+    method = method.lower()
+    if method not in SPARSE_SOLVERS:
+        raise ValueError(f"Invalid solver '{method}'. Must be one of: {sorted(SPARSE_SOLVERS)}")
+    if matrix.shape[0] != matrix.shape[1]:
+        raise ValueError("The matrix must be square")
+    b = np.asarray(b, dtype=np.float64)
+    if b.shape != (matrix.shape[0],):
+        raise ValueError("b must have one entry per matrix row")
+    if preconditioner in (None, "none"):
+        apply = _identity
+    elif preconditioner == "jacobi":
+        apply = jacobi_preconditioner(matrix)
+    else:
+        raise ValueError("preconditioner must be 'none' or 'jacobi'")
+    return SPARSE_SOLVERS[method](matrix, b, tol, max_iterations, apply, max(1, report_every), **options)
+
+
+def solve_sparse(matrix: CSRMatrix, b, **kwargs) -> SolverState:
+    """Run a solver to completion and return its final state."""
+    state = None
+    for state in iterate_sparse_solve(matrix, b, **kwargs):
+        pass
+    return state
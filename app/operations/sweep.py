@@ -0,0 +1,154 @@
+"""
+Parameter sweeps: evaluate one operation or expression over the Cartesian
+grid of per-variable value lists.
+
+The grid is never materialized cell by cell. It is walked in row-major order
+(the last variable varies fastest) in chunks of whole rows, and each chunk is
+evaluated by broadcasting a column of leading-axis values against the row of
+last-axis values, so a chunk costs one vectorized call and one float64 array.
+"""
+import math
+from typing import Callable, Iterator, Optional, Sequence
+
+import numpy as np
+from fastapi import HTTPException
+
+from app.operations import Operation, get_operation
+from app.operations.expressions import compile_expression
+
+CHUNK_SIZE = 1 << 20
+MAX_CELLS = 100_000_000
+MAX_AXIS_LENGTH = 1_000_000
+MAX_VARIABLES = 8
+
+
+def axis_values(
+    values: Optional[Sequence[float]] = None,
+    start: Optional[float] = None,
+    stop: Optional[float] = None,
+    num: Optional[int] = None,
+) -> np.ndarray:
+    """Values of one sweep variable: an explicit list, or ``num`` evenly spaced points from start to stop."""
+    if values is not None:
+        axis = np.asarray(values, dtype=np.float64)
+    else:
+        if start is None or stop is None or num is None:
+            raise ValueError("A sweep variable needs either values or start, stop and num")
+        axis = np.linspace(start, stop, int(num))
+    if not 1 <= axis.size <= MAX_AXIS_LENGTH:
+        raise ValueError(f"A sweep variable must have between 1 and {MAX_AXIS_LENGTH} values")
+    if not np.isfinite(axis).all():
+        raise ValueError("Sweep values must be finite numbers")
+    return axis.ravel()
+
+
+# failing blocks this small are evaluated cell by cell instead of bisected further
+_SCALAR_BLOCK = 64
+
+
+def compute_defined(operation, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    ``operation.compute_array`` with cells outside the operation's domain set
+    to NaN. Cells the operation's ``defined`` mask rules out are skipped in
+    one pass; whatever still fails (e.g. overflow, or operations without a
+    mask) is bisected, and small failing blocks are finished cell by cell.
+    """
+    mask = operation.defined(a, b)
+    if mask is None:
+        return _compute_bisected(operation, a, b)
+    result = np.full(len(a), np.nan)
+    if mask.any():
+        result[mask] = _compute_bisected(operation, a[mask], b[mask])
+    return result
+
+
+def _compute_bisected(operation, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    try:
+        return np.asarray(operation.compute_array(a, b), dtype=np.float64)
+    except HTTPException:
+        # without a vectorized kernel compute_array is already a loop over cells, so bisecting only repeats it
+        if len(a) <= _SCALAR_BLOCK or type(operation).compute_array is Operation.compute_array:
+            return np.array([_compute_scalar(operation, x, y) for x, y in zip(a.tolist(), b.tolist())])
+    middle = len(a) // 2
+    return np.concatenate([
+        _compute_bisected(operation, a[:middle], b[:middle]),
+        _compute_bisected(operation, a[middle:], b[middle:]),
+    ])
+
+
+def _compute_scalar(operation, a: float, b: float) -> float:
+    try:
+        return float(operation.compute_array(np.array([a]), np.array([b]))[0])
+    except HTTPException:
+        return np.nan
+
+
+class ParameterSweep:
+    """
+    A grid of ``axes`` (name -> 1-D values) and what to evaluate on it: either
+    an ``expression`` over the axis names or a registered operation
+    ``op_type`` over axes ``a`` and optionally ``b`` (default 0, which unary
+    operations ignore). Cells where the result is undefined are NaN.
+    ``compiler`` compiles the expression (e.g. a user's function library).
+    """
+
+    def __init__(
+        self,
+        axes: dict[str, np.ndarray],
+        expression: Optional[str] = None,
+        op_type: Optional[str] = None,
+        compiler: Callable = compile_expression,
+    ):
+        if (expression is None) == (op_type is None):
+            raise ValueError("Give either an expression or an operation type")
+        if not 1 <= len(axes) <= MAX_VARIABLES:
+            raise ValueError(f"A sweep needs between 1 and {MAX_VARIABLES} variables")
+        self.names = tuple(axes)
+        self.axes = tuple(np.asarray(axes[name], dtype=np.float64) for name in self.names)
+        self.shape = tuple(len(axis) for axis in self.axes)
+        self.size = math.prod(self.shape)
+        if self.size > MAX_CELLS:
+            raise ValueError(f"The sweep grid has {self.size} cells; at most {MAX_CELLS} are allowed")
+        if expression is not None:
+            self._expression = compiler(expression, self.names)
+            self._operation = None
+        else:
+            unknown = set(self.names) - {"a", "b"}
+            if "a" not in self.names or unknown:
+                raise ValueError("Operation sweeps take variables a and, optionally, b")
+            self._expression = None
+            self._operation = get_operation(op_type)
+
+    @property
+    def row_length(self) -> int:
+        return self.shape[-1]
+
+    @property
+    def rows(self) -> int:
+        return self.size // self.row_length
+
+    def leading_values(self, row_start: int, row_stop: int) -> list[np.ndarray]:
+        """Values of every variable but the last for rows [row_start, row_stop)."""
+        if len(self.shape) == 1:
+            return []
+        indices = np.unravel_index(np.arange(row_start, row_stop), self.shape[:-1])
+        return [axis[index] for axis, index in zip(self.axes[:-1], indices)]
+
+    def evaluate_rows(self, row_start: int, row_stop: int) -> np.ndarray:
+        """Results for rows [row_start, row_stop) as a (rows, row_length) array."""
+        columns = [values[:, None] for values in self.leading_values(row_start, row_stop)]
+        grid = dict(zip(self.names, [*columns, self.axes[-1][None, :]]))
+        shape = (row_stop - row_start, self.row_length)
+        if self._expression is not None:
+            result = np.asarray(self._expression.evaluate(grid), dtype=np.float64)
+            return np.broadcast_to(result, shape)
+        a = np.broadcast_to(grid["a"], shape).ravel()
+        b = np.broadcast_to(grid.get("b", 0.0), shape).ravel()
+        with np.errstate(all="ignore"):
+            return compute_defined(self._operation, a, b).reshape(shape)
+
+    def chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[int, np.ndarray]]:
+        """Yield (first row, results) for consecutive blocks of about ``chunk_size`` cells."""
+        step = max(1, chunk_size // self.row_length)
+        for row_start in range(0, self.rows, step):
+            yield row_start, self.evaluate_rows(row_start, min(row_start + step, self.rows))
@@ -0,0 +1,292 @@
+"""
+Units of measure: parsing, dimensional analysis and conversion.
+
+Every named unit is defined against a neighbour (``km = 1000 m``,
+``ft = 12 in``) or, for the roots of the graph, by its dimension and SI
+factor (``N = kg*m/s^2``). At import the definition graph is compiled once
+into a dense index: each unit's position, its dimension vector and SI factor,
+and a table of conversion factors between every pair of units of the same
+dimension, multiplied along the shortest path of definitions. Converting
+between two named units is then a table lookup and a multiply; compound units
+(``km/h``, ``kg*m/s^2``) are parsed once (cached) and convert through their
+SI factors.
+
+Only multiplicative units are supported: temperatures are in kelvin, since
+affine scales (degC, degF) do not compose under multiplication.
+"""
+import math
+import re
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from app.operations import get_operation
+from app.operations.scientific import OVERFLOW_DETAIL
+
+MAX_UNIT_LENGTH = 50
+# largest |exponent| of one unit in an expression; beyond it SI factors leave the float range
+MAX_UNIT_EXPONENT = 12
+BASE_DIMENSIONS = ("length", "mass", "time", "current", "temperature", "amount", "luminosity")
+
+Dimension = tuple[int, ...]
+# (unit name, exponent) pairs, numerator first
+Terms = tuple[tuple[str, int], ...]
+
+# name, SI factor, definition in earlier roots; roots start new components of the graph
+_BASE_ROOTS = ("m", "kg", "s", "A", "K", "mol", "cd")
+_DERIVED_ROOTS = [
+    ("rad", 1.0, ""),
+    ("N", 1.0, "kg*m/s^2"),
+    ("J", 1.0, "N*m"),
+    ("W", 1.0, "J/s"),
+    ("Pa", 1.0, "N/m^2"),
+    ("Hz", 1.0, "1/s"),
+    ("C", 1.0, "A*s"),
+    ("V", 1.0, "W/A"),
+    ("ohm", 1.0, "V/A"),
+    ("L", 0.001, "m^3"),
+    ("ha", 1e4, "m^2"),
+    ("knot", 1852 / 3600, "m/s"),
+]
+
+# name, factor, reference unit: 1 name = factor reference
+_DEFINITIONS = [
+    ("km", 1000.0, "m"), ("cm", 0.01, "m"), ("mm", 0.001, "m"), ("um", 0.001, "mm"), ("nm", 0.001, "um"),
+    ("in", 2.54, "cm"), ("ft", 12.0, "in"), ("yd", 3.0, "ft"), ("mi", 1760.0, "yd"), ("nmi", 1852.0, "m"),
+    ("au", 149597870700.0, "m"),
+    ("g", 0.001, "kg"), ("mg", 0.001, "g"), ("t", 1000.0, "kg"), ("lb", 0.45359237, "kg"), ("oz", 1 / 16, "lb"),
+    ("st", 14.0, "lb"),
+    ("ms", 0.001, "s"), ("us", 0.001, "ms"), ("ns", 0.001, "us"), ("min", 60.0, "s"), ("h", 60.0, "min"),
+    ("day", 24.0, "h"), ("week", 7.0, "day"), ("yr", 365.25, "day"),
+    ("mA", 0.001, "A"), ("mmol", 0.001, "mol"),
+    ("deg", math.pi / 180, "rad"), ("rev", 360.0, "deg"),
+    ("kN", 1000.0, "N"), ("lbf", 4.4482216152605, "N"),
+    ("kJ", 1000.0, "J"), ("MJ", 1000.0, "kJ"), ("cal", 4.184, "J"), ("kcal", 1000.0, "cal"), ("Wh", 3600.0, "J"),
+    ("kWh", 1000.0, "Wh"), ("eV", 1.602176634e-19, "J"),
+    ("kW", 1000.0, "W"), ("MW", 1000.0, "kW"), ("hp", 745.69987158227022, "W"),
+    ("kPa", 1000.0, "Pa"), ("MPa", 1000.0, "kPa"), ("bar", 1e5, "Pa"), ("atm", 101325.0, "Pa"),
+    ("psi", 6894.757293168361, "Pa"), ("mmHg", 133.322387415, "Pa"),
+    ("kHz", 1000.0, "Hz"), ("MHz", 1000.0, "kHz"), ("GHz", 1000.0, "MHz"),
+    ("mV", 0.001, "V"), ("kV", 1000.0, "V"), ("kohm", 1000.0, "ohm"),
+    ("mL", 0.001, "L"), ("gal", 3.785411784, "L"), ("acre", 0.40468564224, "ha"),
+]
+
+_TERM = re.compile(r"^([A-Za-z_]+)(?:\^(-?\d+))?$")
+
+
+class UnitRegistry:
+    """The compiled unit graph: dense index, dimensions, SI factors and pairwise conversion table."""
+
+    def __init__(self, base_roots, derived_roots, definitions):
+        self.names: list[str] = []
+        self.index: dict[str, int] = {}
+        dimensions, si_factors = [], []
+        for position, name in enumerate(base_roots):
+            self._add(name)
+            dimensions.append(tuple(int(i == position) for i in range(len(BASE_DIMENSIONS))))
+            si_factors.append(1.0)
+        self.dimensions, self.si_factors = dimensions, si_factors
+        for name, factor, definition in derived_roots:
+            dimension, si_factor = self._combine(_parse_terms(definition))
+            self._add(name)
+            dimensions.append(dimension)
+            si_factors.append(factor * si_factor)
+        roots = len(self.names)
+
+        edges: list[list[tuple[int, float]]] = [[] for _ in range(roots)]
+        for name, factor, reference in definitions:
+            if reference not in self.index:
+                raise ValueError(f"Unit '{name}' is defined by unknown unit '{reference}'")
+            self._add(name)
+            edges.append([])
+            i, j = self.index[name], self.index[reference]
+            edges[i].append((j, factor))
+            edges[j].append((i, 1 / factor))
+
+        n = len(self.names)
+        self.table = np.full((n, n), np.nan)
+        for start in range(n):
+            # breadth-first: the fewest definitions, so the fewest roundings, between two units
+            self.table[start, start] = 1.0
+            queue = deque([start])
+            while queue:
+                current = queue.popleft()
+                for neighbour, factor in edges[current]:
+                    if np.isnan(self.table[start, neighbour]):
+                        self.table[start, neighbour] = self.table[start, current] * factor
+                        queue.append(neighbour)
+        for i in range(roots, n):
+            root = next(r for r in range(roots) if not np.isnan(self.table[i, r]))
+            dimensions.append(dimensions[root])
+            si_factors.append(self.table[i, root] * si_factors[root])
+
+    def _add(self, name: str):
+        if name in self.index:
+            raise ValueError(f"Unit '{name}' is defined twice")
+        self.index[name] = len(self.names)
+        self.names.append(name)
+
+    def _combine(self, terms: Terms) -> tuple[Dimension, float]:
+        dimension = [0] * len(BASE_DIMENSIONS)
+        si_factor = 1.0
+        for name, exponent in terms:
+            i = self.index.get(name)
+            if i is None:
+                raise ValueError(f"Unknown unit '{name}'")
+            dimension = [d + exponent * u for d, u in zip(dimension, self.dimensions[i])]
+            si_factor *= float(self.si_factors[i]) ** exponent
+        if not (math.isfinite(si_factor) and si_factor):
+            raise ValueError("The size of this unit in SI units exceeds the floating point range")
+        return tuple(dimension), si_factor
+
+    def factor(self, source: str, target: str) -> Optional[float]:
+        """Conversion factor between two named units, or None if their dimensions differ."""
+        factor = self.table[self.index[source], self.index[target]]
+        return None if np.isnan(factor) else float(factor)
+
+
+def _parse_terms(text: str) -> Terms:
+    """``kg*m/s^2`` -> (("kg", 1), ("m", 1), ("s", -2)); each '/' divides by the next factor only."""
+    text = re.sub(r"(?<=[\w])\s+(?=[A-Za-z])", "*", text.strip().replace("**", "^"))
+    if not text:
+        return ()
+    exponents: dict[str, int] = {}
+    parts = re.split(r"\s*([*/])\s*", text)
+    for position in range(0, len(parts), 2):
+        sign = -1 if position and parts[position - 1] == "/" else 1
+        if parts[position] == "1" and position == 0:
+            continue
+        match = _TERM.match(parts[position])
+        if not match:
+            raise ValueError(f"Invalid unit '{text}'")
+        name, exponent = match.group(1), int(match.group(2) or 1)
+        exponents[name] = exponents.get(name, 0) + sign * exponent
+    return _normalize(exponents)
+
+
+def _normalize(exponents: dict[str, int]) -> Terms:
+    terms = [(name, exponent) for name, exponent in exponents.items() if exponent]
+    if any(abs(exponent) > MAX_UNIT_EXPONENT for _, exponent in terms):
+        raise ValueError(f"Unit exponents are limited to {MAX_UNIT_EXPONENT}")
+    return tuple(sorted(terms, key=lambda term: term[1] < 0))
+
+
+registry = UnitRegistry(_BASE_ROOTS, _DERIVED_ROOTS, _DEFINITIONS)
+
+
+@dataclass(frozen=True)
+class Unit:
+    """A parsed unit expression: its factors, dimension and size in SI units."""
+    terms: Terms
+    dimension: Dimension
+    si_factor: float
+
+    @property
+    def dimensionless(self) -> bool:
+        return not any(self.dimension)
+
+    def __str__(self) -> str:
+        text = ""
+        for name, exponent in self.terms:
+            power = abs(exponent)
+            term = name if power == 1 else f"{name}^{power}"
+            if exponent > 0:
+                text = f"{text}*{term}" if text else term
+            else:
+                text = f"{text or '1'}/{term}"
+        return text
+
+
+@lru_cache(maxsize=1024)
+def parse_unit(text: Optional[str]) -> Unit:
+    """Parse a unit expression; empty or None is a plain number. ValueError if it is invalid or unknown."""
+    if text is None:
+        return Unit((), (0,) * len(BASE_DIMENSIONS), 1.0)
+    if len(text) > MAX_UNIT_LENGTH:
+        raise ValueError(f"Units are at most {MAX_UNIT_LENGTH} characters")
+    terms = _parse_terms(text)
+    dimension, si_factor = registry._combine(terms)
+    return Unit(terms, dimension, si_factor)
+
+
+def _describe(dimension: Dimension) -> str:
+    parts = [f"{name}^{power}" if power != 1 else name for name, power in zip(BASE_DIMENSIONS, dimension) if power]
+    return "*".join(parts) or "dimensionless"
+
+
+def conversion_factor(source: Unit, target: Unit) -> float:
+    """Multiplier taking values in ``source`` to ``target``; ValueError if the dimensions differ."""
+    if source.dimension != target.dimension:
+        raise ValueError(
+            f"Cannot convert {source or '1'} ({_describe(source.dimension)}) "
+            f"to {target or '1'} ({_describe(target.dimension)})"
+        )
+    if source.terms == target.terms:
+        return 1.0
+    if len(source.terms) == len(target.terms) == 1 and source.terms[0][1] == target.terms[0][1] == 1:
+        return registry.factor(source.terms[0][0], target.terms[0][0])
+    return source.si_factor / target.si_factor
+
+
+def convert(value: float, source: str, target: str) -> float:
+    return value * conversion_factor(parse_unit(source), parse_unit(target))
+
+
+@dataclass(frozen=True)
+class Quantity:
+    value: float
+    unit: Unit
+
+
+def _unit_from_terms(exponents: dict[str, int]) -> Unit:
+    terms = _normalize(exponents)
+    dimension, si_factor = registry._combine(terms)
+    return Unit(terms, dimension, si_factor)
+
+
+def _plain(quantity: Quantity, op_type: str) -> float:
+    """The value of a dimensionless quantity as a plain number (angles in radians)."""
+    if not quantity.unit.dimensionless:
+        raise ValueError(f"{op_type} needs a dimensionless operand, not {quantity.unit}")
+    return quantity.value * quantity.unit.si_factor
+
+
+def compute_with_units(op_type: str, a: Quantity, b: Quantity) -> Quantity:
+    """
+    Apply an operation to quantities, checking dimensions. Addition, subtraction
+    and modulus convert b to a's unit; multiplication and division combine
+    units; power and sqrt scale exponents; every other operation takes
+    dimensionless operands and gives a plain number. ValueError on a dimension
+    mismatch; the operation's own errors propagate.
+    """
+    op_type = op_type.lower()
+    operation = get_operation(op_type)
+    exponents = dict(a.unit.terms)
+    if op_type in ("add", "sub", "subtract", "modulus"):
+        b_value = b.value * conversion_factor(b.unit, a.unit)
+        return Quantity(operation.compute(a.value, b_value), a.unit)
+    if op_type in ("multiply", "divide"):
+        sign = 1 if op_type == "multiply" else -1
+        for name, exponent in b.unit.terms:
+            exponents[name] = exponents.get(name, 0) + sign * exponent
+        return Quantity(operation.compute(a.value, b.value), _unit_from_terms(exponents))
+    if op_type == "power":
+        power = _plain(b, op_type)
+        if a.unit.terms and power != int(power):
+            raise ValueError("A quantity with units can only be raised to an integer power")
+        # check the unit before the value, so an out of range exponent is not reported as overflow
+        unit = _unit_from_terms({name: e * int(power) for name, e in exponents.items()}) if exponents else a.unit
+        try:
+            result = operation.compute(a.value, power)
+        except OverflowError:
+            raise ValueError(OVERFLOW_DETAIL)
+        return Quantity(result, unit)
+    if op_type == "sqrt":
+        if any(exponent % 2 for exponent in exponents.values()):
+            raise ValueError(f"The square root of {a.unit} has no whole-exponent unit")
+        return Quantity(operation.compute(a.value, 0), _unit_from_terms({n: e // 2 for n, e in exponents.items()}))
+    b_value = _plain(b, op_type) if operation.arity == 2 else 0.0
+    return Quantity(operation.compute(_plain(a, op_type), b_value), parse_unit(None))
@@ -0,0 +1,200 @@
+"""
+User-defined functions: ``f(x, y) = x^2 + sqrt(y)`` defined once and called
+by name from calculations and expressions.
+
+A user's definitions form a ``FunctionLibrary``. The library compiles every
+definition to a closure the first time any of them is needed (in dependency
+order, so a function may call the user's other functions) and keeps its own
+LRU of expressions compiled against them. Libraries are cached per user and
+dropped whenever that user defines, redefines or deletes a function, so
+repeated calls neither re-parse definitions nor the expressions using them.
+"""
+import ast
+import keyword
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from app.operations import available_operations
+from app.operations.expressions import (
+    ARITIES, CONSTANTS, FUNCTIONS, CompiledExpression, build, check_variable_name, compile_expression, parse,
+)
+
+MAX_NAME_LENGTH = 50
+MAX_PARAMETERS = 10
+MAX_FUNCTIONS = 200
+EXPRESSION_CACHE_SIZE = 256
+LIBRARY_CACHE_SIZE = 256
+
+_DEFINITION = re.compile(r"^\s*([A-Za-z_]\w*)\s*\(([^()]*)\)\s*=(.+)$", re.DOTALL)
+
+# name -> (parameters, body)
+Definitions = dict[str, tuple[tuple[str, ...], str]]
+
+
+def parse_definition(text: str) -> tuple[str, tuple[str, ...], str]:
+    """Split ``name(p1, p2) = body`` into its parts."""
+    match = _DEFINITION.match(text)
+    if not match:
+        raise ValueError("A definition looks like f(x, y) = x^2 + sqrt(y)")
+    name, parameters, body = match.groups()
+    parameters = tuple(p.strip() for p in parameters.split(",")) if parameters.strip() else ()
+    return name, parameters, body.strip()
+
+
+def _calls(tree: ast.AST, names) -> set[str]:
+    return {
+        node.func.id for node in ast.walk(tree)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in names
+    }
+
+
+def _called(body: str, names: set[str]) -> set[str]:
+    """Which of ``names`` a stored (already validated) body calls."""
+    return _calls(parse(body, dict.fromkeys(set(FUNCTIONS) | names))[0], names)
+
+
+def check_definition(name: str, parameters: tuple[str, ...], body: str, others: Definitions) -> None:
+    """
+    Raise ValueError unless ``name(parameters) = body`` is a valid definition
+    alongside the user's ``others`` (which it replaces if the name exists):
+    the name is free, the parameters are valid and distinct, the body uses
+    only its parameters and known functions, and no call cycle is formed.
+    """
+    if not name.isidentifier() or keyword.iskeyword(name) or name.startswith("_") or len(name) > MAX_NAME_LENGTH:
+        raise ValueError(f"Invalid function name '{name}'")
+    if name in FUNCTIONS or name in CONSTANTS or name in available_operations():
+        raise ValueError(f"'{name}' is a built-in and cannot be redefined")
+    if not 1 <= len(parameters) <= MAX_PARAMETERS:
+        raise ValueError(f"A function takes between 1 and {MAX_PARAMETERS} parameters")
+    if len(set(parameters)) != len(parameters):
+        raise ValueError("Parameter names must be distinct")
+    for parameter in parameters:
+        check_variable_name(parameter)
+    if parameter_clash := set(parameters) & (set(others) | {name}):
+        raise ValueError(f"Parameter names clash with function names: {sorted(parameter_clash)}")
+    if name not in others and len(others) >= MAX_FUNCTIONS:
+        raise ValueError(f"At most {MAX_FUNCTIONS} functions can be defined")
+
+    user_names = set(others) | {name}
+    arities = {**ARITIES, **{other: len(other_parameters) for other, (other_parameters, _) in others.items()}}
+    tree, variables = parse(body, {**arities, name: len(parameters)})
+    unknown = [v for v in variables if v not in parameters]
+    if unknown:
+        raise ValueError(f"Unknown variable(s): {', '.join(unknown)}")
+
+    calls = {other: _called(other_body, user_names) for other, (_, other_body) in others.items() if other != name}
+    calls[name] = _calls(tree, user_names)
+    # a cycle through the new definition means it can reach itself
+    stack, seen = list(calls[name]), set()
+    while stack:
+        current = stack.pop()
+        if current == name:
+            raise ValueError(f"'{name}' would call itself")
+        if current not in seen:
+            seen.add(current)
+            stack.extend(calls.get(current, ()))
+
+
+def callers(name: str, definitions: Definitions) -> list[str]:
+    """Functions whose bodies call ``name``."""
+    names = set(definitions)
+    return sorted(other for other, (_, body) in definitions.items() if other != name and name in _called(body, names))
+
+
+class FunctionLibrary:
+    """One user's functions, compiled on first use."""
+
+    def __init__(self, definitions: Definitions):
+        self.definitions = dict(definitions)
+        self._functions: Optional[dict[str, Callable]] = None
+        self._expressions: "OrderedDict[tuple, CompiledExpression]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def functions(self) -> dict[str, Callable]:
+        """Callables for every definition, checking their argument count."""
+        if self._functions is None:
+            with self._lock:
+                if self._functions is None:
+                    self._functions = self._compile_all()
+        return self._functions
+
+    def _compile_all(self) -> dict[str, Callable]:
+        compiled: dict[str, Callable] = {}
+        names = set(self.definitions)
+
+        def visit(name: str):
+            if name in compiled:
+                return
+            parameters, body = self.definitions[name]
+            for callee in _called(body, names):
+                visit(callee)  # definitions are acyclic, checked when stored
+            compiled[name] = _checked(name, build(body, parameters, functions=compiled))
+
+        for name in self.definitions:
+            visit(name)
+        return compiled
+
+    def compile(self, source: str, variables: Optional[tuple[str, ...]] = None) -> CompiledExpression:
+        """Compile an expression that may call the user's functions, caching the result."""
+        if not self.definitions:
+            return compile_expression(source, variables)
+        key = (source, variables)
+        with self._lock:
+            compiled = self._expressions.get(key)
+            if compiled is not None:
+                self._expressions.move_to_end(key)
+                return compiled
+        compiled = build(source, variables, functions=self.functions)
+        with self._lock:
+            self._expressions[key] = compiled
+            while len(self._expressions) > EXPRESSION_CACHE_SIZE:
+                self._expressions.popitem(last=False)
+        return compiled
+
+
+def _checked(name: str, compiled: CompiledExpression) -> Callable:
+    arity = len(compiled.variables)
+
+    def function(*arguments):
+        if len(arguments) != arity:
+            raise ValueError(f"{name}() takes {arity} argument(s), got {len(arguments)}")
+        return compiled(*arguments)
+    function.arity = arity
+    return function
+
+
+class LibraryCache:
+    """LRU of users' function libraries, keyed by user id."""
+
+    def __init__(self, maxsize: int = LIBRARY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._libraries: "OrderedDict[int, FunctionLibrary]" = OrderedDict()
+        # bumped by invalidate, so a library loaded before a redefinition is not cached after it
+        self._generations: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int, load: Callable[[], Definitions]) -> FunctionLibrary:
+        with self._lock:
+            library = self._libraries.get(user_id)
+            if library is not None:
+                self._libraries.move_to_end(user_id)
+                return library
+            generation = self._generations.get(user_id, 0)
+        library = FunctionLibrary(load())
+        with self._lock:
+            if self._generations.get(user_id, 0) == generation:
+                self._libraries[user_id] = library
+                while len(self._libraries) > self.maxsize:
+                    self._libraries.popitem(last=False)
+        return library
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._libraries.pop(user_id, None)
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+
+libraries = LibraryCache()
@@ -0,0 +1,202 @@
+"""
+Worksheets: named cells holding constants or expressions over other cells,
+kept as a dependency graph so an edit only recalculates what it affects.
+
+``WorksheetGraph`` holds every cell's formula, the cells it references and,
+in reverse, the cells that reference it. Changing a set of cells marks them
+and everything downstream of them dirty; only the dirty cells are
+re-evaluated, in topological order (Kahn's algorithm restricted to the dirty
+subgraph), and a dirty cell is skipped when none of its inputs changed value,
+so an edit costs time proportional to what it touches rather than to the
+size of the sheet. A change that would close a cycle is rejected and
+leaves the graph as it was.
+
+Formulas are compiled lazily, the first time a cell is evaluated, so a sheet
+loaded with its stored values costs no parsing until it is edited. Cell
+references are replaced by positional placeholders before compiling, so a
+formula filled down a column (``A1 + 1``, ``A2 + 1``, ...) compiles once and
+is shared through the expression cache.
+"""
+import re
+from collections import defaultdict, deque
+from typing import Iterable, Optional, Union
+
+from app.operations.expressions import CompiledExpression, check_variable_name, compile_expression, parse
+
+MAX_CELLS = 100_000
+NOT_FINITE = "Result is not a finite number"
+
+# (value, error): exactly one is None
+CellState = tuple[Optional[float], Optional[str]]
+
+
+def normalize_formula(formula: Union[float, int, str]) -> str:
+    """Formula text for a cell: numbers as their repr, expressions without a leading '='."""
+    if isinstance(formula, bool):
+        raise ValueError("Cell formulas must be numbers or expressions")
+    if isinstance(formula, (int, float)):
+        return repr(float(formula))
+    text = formula.strip()
+    return text[1:].strip() if text.startswith("=") else text
+
+
+def _constant(formula: str) -> Optional[float]:
+    try:
+        return float(formula)
+    except ValueError:
+        return None
+
+
+def references(formula: str) -> tuple[str, ...]:
+    """Cells a formula reads, in order of first appearance; validates the expression."""
+    if _constant(formula) is not None:
+        return ()
+    _, names = parse(formula)
+    return tuple(names)
+
+
+_NAME = re.compile(r"\b[A-Za-z_]\w*\b")
+
+
+def _compile(formula: str, refs: tuple[str, ...]) -> CompiledExpression:
+    placeholders = {ref: f"x{i}" for i, ref in enumerate(refs)}
+    template = _NAME.sub(lambda match: placeholders.get(match.group(), match.group()), formula)
+    return compile_expression(template, tuple(placeholders.values()))
+
+
+class CycleError(ValueError):
+    pass
+
+
+class WorksheetGraph:
+    """In-memory dependency graph and values of one worksheet."""
+
+    def __init__(self):
+        self.formulas: dict[str, str] = {}
+        self.references: dict[str, tuple[str, ...]] = {}
+        self.dependents: dict[str, set[str]] = defaultdict(set)
+        self.states: dict[str, CellState] = {}
+        self._compiled: dict[str, CompiledExpression] = {}
+
+    @classmethod
+    def load(cls, cells: Iterable[tuple[str, str, tuple[str, ...], Optional[float], Optional[str]]]) -> "WorksheetGraph":
+        """Rebuild from stored (name, formula, references, value, error) rows without recalculating."""
+        graph = cls()
+        for name, formula, refs, value, error in cells:
+            graph.formulas[name] = formula
+            graph.references[name] = refs
+            for ref in refs:
+                graph.dependents[ref].add(name)
+            graph.states[name] = (value, error)
+        return graph
+
+    def _link(self, name: str, formula: Optional[str], refs: tuple[str, ...]):
+        for ref in self.references.pop(name, ()):
+            self.dependents[ref].discard(name)
+        self._compiled.pop(name, None)
+        if formula is None:
+            self.formulas.pop(name, None)
+            return
+        self.formulas[name] = formula
+        self.references[name] = refs
+        for ref in refs:
+            self.dependents[ref].add(name)
+
+    def _downstream(self, names: Iterable[str]) -> set[str]:
+        dirty = set(names)
+        queue = deque(dirty)
+        while queue:
+            for dependent in self.dependents.get(queue.popleft(), ()):
+                if dependent not in dirty:
+                    dirty.add(dependent)
+                    queue.append(dependent)
+        return dirty
+
+    def _order(self, dirty: set[str]) -> list[str]:
+        """Topological order of the dirty cells that still exist; CycleError if they are not acyclic."""
+        cells = [name for name in dirty if name in self.formulas]
+        waiting = {name: sum(ref in dirty and ref in self.formulas for ref in self.references[name]) for name in cells}
+        queue = deque(name for name, count in waiting.items() if not count)
+        order = []
+        while queue:
+            name = queue.popleft()
+            order.append(name)
+            for dependent in self.dependents.get(name, ()):
+                if dependent in waiting:
+                    waiting[dependent] -= 1
+                    if not waiting[dependent]:
+                        queue.append(dependent)
+        if len(order) < len(cells):
+            stuck = sorted(name for name, count in waiting.items() if count)
+            raise CycleError(f"Circular reference among cells: {', '.join(stuck[:10])}")
+        return order
+
+    def _evaluate(self, name: str) -> CellState:
+        formula = self.formulas[name]
+        constant = _constant(formula)
+        if constant is not None:
+            return (constant, None) if constant == constant and abs(constant) != float("inf") else (None, NOT_FINITE)
+        arguments = []
+        for ref in self.references[name]:
+            if ref not in self.formulas:
+                return None, f"Unknown cell '{ref}'"
+            value, error = self.states[ref]
+            if error is not None:
+                return None, f"Cell '{ref}' has an error"
+            arguments.append(value)
+        compiled = self._compiled.get(name)
+        if compiled is None:
+            compiled = self._compiled[name] = _compile(formula, self.references[name])
+        try:
+            value = float(compiled(*arguments))
+        except ArithmeticError:  # e.g. a / b on two float cells raises rather than giving inf
+            return None, NOT_FINITE
+        if value != value or abs(value) == float("inf"):
+            return None, NOT_FINITE
+        return value, None
+
+    def update(self, changes: dict[str, Optional[str]]) -> tuple[dict[str, CellState], int]:
+        """
+        Apply {name: formula text, or None to delete}. Returns the cells whose
+        value or error changed (deleted cells excluded) and how many were
+        recalculated.
+        Raises ValueError for invalid names or formulas and CycleError for
+        circular references; the graph is unchanged when it raises.
+        """
+        parsed = {}
+        for name, formula in changes.items():
+            check_variable_name(name)
+            parsed[name] = None if formula is None else (formula, references(formula))
+            if formula is not None and name in parsed[name][1]:
+                raise CycleError(f"Cell '{name}' refers to itself")
+        added = sum(name not in self.formulas for name, entry in parsed.items() if entry is not None)
+        if len(self.formulas) + added > MAX_CELLS:
+            raise ValueError(f"A worksheet holds at most {MAX_CELLS} cells")
+
+        previous = {name: (self.formulas.get(name), self.references.get(name, ())) for name in parsed}
+        for name, entry in parsed.items():
+            self._link(name, *(entry if entry is not None else (None, ())))
+        dirty = self._downstream(parsed)
+        try:
+            order = self._order(dirty)
+        except CycleError:
+            for name, (formula, refs) in previous.items():
+                self._link(name, formula, refs)
+            raise
+
+        changed = {}
+        moved = {name for name, entry in parsed.items() if entry is None}  # cells whose state differs
+        for name in moved:
+            self.states.pop(name, None)
+        recalculated = 0
+        for name in order:
+            # a dependent whose inputs all came out the same needs no recalculation
+            if name not in parsed and not any(ref in moved for ref in self.references[name]):
+                continue
+            recalculated += 1
+            state = self._evaluate(name)
+            if self.states.get(name) != state:
+                self.states[name] = state
+                changed[name] = state
+                moved.add(name)
+        return changed, recalculated
@@ -1,14 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, Security
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Security
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
+from sqlalchemy import func, insert
+from typing import List, Literal, Optional
 import math
+import uuid
+import numpy as np
 
 from app.db import get_db
 from app.models.calculation import Calculation
+from app.models.calculation_payload import CalculationPayload
 from app.models.user import User
-from app.operations.schemas.calculation_schemas import CalculationCreate, CalculationRead, CalculationStatistics
+from app.models.user_function import UserFunction
+from app.operations import available_operations, get_operation
+from app.operations.complex_domain import compute_complex, compute_complex_scalar
+from app.operations.constants import constant_text
+from app.operations.fast_math import fast_kernel
+from app.operations.number_theory import evaluate_integer, to_text
+from app.operations.parallel import compute_batch
+from app.operations.programs import run_program
+from app.operations.units import Quantity, compute_with_units, conversion_factor, parse_unit
+from app.operations.reductions import pack_operands, reduce_operands, unpack_operands
+from app.operations.scientific import OVERFLOW_DETAIL
+from app.operations.precision import MAX_PRECISION, PRECISE_OPERATIONS, compute_precise, to_float
+from app.operations.user_functions import FunctionLibrary, libraries
+from app.operations.schemas.calculation_schemas import (
+    CalculationCreate, CalculationRead, CalculationStatistics, CalculationBatch, CalculationBatchResult,
+    ConstantRead, IntegerCalculation, IntegerCalculationResult, NaryCalculation, NaryResult,
+    CalculationProgram, ProgramResult, ProgramStep, UnitConversion, UnitConversionResult
+)
 from app.security import decode_access_token
 
 # HTTP bearer security for extracting JWT
@@ -32,17 +53,33 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Security(securi
         raise HTTPException(status_code=401, detail="User not found")
     return user
 
+
+def load_definitions(db: Session, user_id: int) -> dict:
+    rows = db.query(UserFunction.name, UserFunction.parameters, UserFunction.body).filter(UserFunction.user_id == user_id)
+    return {name: (tuple(parameters.split(",")), body) for name, parameters, body in rows}
+
+
+def get_user_functions(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)) -> FunctionLibrary:
+    """Dependency: the current user's function library, from the per-user cache when possible."""
+    return libraries.get(current_user.id, lambda: load_definitions(db, current_user.id))
+
 # IMPORTANT: Use /calculations (plural) not /calculate
 router = APIRouter(prefix="/calculations", tags=["calculations"])
 
 
 @router.get("", response_model=List[CalculationRead])
-def browse_calculations(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def browse_calculations(
+    chain_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
     """
-    BROWSE: Get all calculations (GET /calculations)
+    BROWSE: Get all calculations (GET /calculations), or the steps of one program (?chain_id=)
     """
-    calculations = db.query(Calculation).filter(Calculation.user_id == current_user.id).all()
-    return calculations
+    query = db.query(Calculation).filter(Calculation.user_id == current_user.id)
+    if chain_id is not None:
+        query = query.filter(Calculation.chain_id == chain_id).order_by(Calculation.id)
+    return query.all()
 
 
 @router.get("/{calculation_id}", response_model=CalculationRead)
@@ -57,13 +94,42 @@ def read_calculation(calculation_id: int, db: Session = Depends(get_db), current
 
 
 @router.post("", response_model=CalculationRead, status_code=200)
-def add_calculation(calc: CalculationCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def add_calculation(
+    calc: CalculationCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    functions: FunctionLibrary = Depends(get_user_functions)
+):
     """
     ADD: Create a new calculation (POST /calculations)
-    Supports: add, subtract, multiply, divide, power, modulus, sqrt
+    Supports: add, subtract, multiply, divide, power, modulus, sqrt and the scientific
+    functions (sin, cos, tan, asin, ..., log, ln, log2, exp, abs, floor, ceil, factorial, gamma),
+    and your own functions of one or two parameters (called as f(a) or f(a, b)).
+    With a_unit / b_unit / result_unit, dimensions are checked and units converted.
+    domain=complex takes a + a_imag*i and b + b_imag*i and stores the result's real and imaginary parts.
     """
+    if calc.type in functions.definitions:
+        return _add_user_function_calculation(calc, db, current_user, functions)
+    if calc.domain == "complex":
+        result, imag = _compute_complex(calc)
+        new_calc = Calculation(
+            a=calc.a, b=calc.b, a_imag=calc.a_imag, b_imag=calc.b_imag, type=calc.type.lower(),
+            result=result, result_imag=imag, user_id=current_user.id
+        )
+        db.add(new_calc)
+        db.commit()
+        db.refresh(new_calc)
+        return new_calc
+    if _has_units(calc):
+        result, units = _compute_with_units(calc)
+        new_calc = Calculation(a=calc.a, b=calc.b, type=calc.type.lower(), result=result, user_id=current_user.id, **units)
+        db.add(new_calc)
+        db.commit()
+        db.refresh(new_calc)
+        return new_calc
+
     # Validate operation type
-    valid_types = ["add", "subtract", "multiply", "divide", "power", "modulus", "sqrt"]
+    valid_types = available_operations()
     if calc.type.lower() not in valid_types:
         raise HTTPException(
             status_code=422, 
@@ -73,102 +139,418 @@ def add_calculation(calc: CalculationCreate, db: Session = Depends(get_db), curr
     # Perform calculation
     op_type = calc.type.lower()
     
+    result_text = None
+    if calc.precision is not None:
+        if op_type not in PRECISE_OPERATIONS:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Precision mode supports: {list(PRECISE_OPERATIONS)}"
+            )
+        precise = compute_precise(op_type, calc.a, calc.b, calc.precision)
+        result_text = str(precise)
+        result = to_float(precise)
+    else:
+        result = _compute_real(op_type, calc.a, calc.b)
+    
+    # Save to database
+    new_calc = Calculation(
+        a=calc.a,
+        b=calc.b,
+        type=op_type,
+        result=result,
+        precision=calc.precision,
+        result_text=result_text,
+        user_id=current_user.id
+    )
+    db.add(new_calc)
+    db.commit()
+    db.refresh(new_calc)
+    
+    return new_calc
+
+
+def _compute_real(op_type: str, a: float, b: float) -> float:
+    """Result of a plain (real, unitless, float) calculation; 400 if it is undefined or out of range."""
     try:
         if op_type == "add":
-            result = calc.a + calc.b
+            result = a + b
         elif op_type == "subtract":
-            result = calc.a - calc.b
+            result = a - b
         elif op_type == "multiply":
-            result = calc.a * calc.b
+            result = a * b
         elif op_type == "divide":
-            if calc.b == 0:
+            if b == 0:
                 raise HTTPException(status_code=400, detail="Cannot divide by zero")
-            result = calc.a / calc.b
+            result = a / b
         elif op_type == "power":
-            result = calc.a ** calc.b
+            result = get_operation("power").compute(a, b)
         elif op_type == "modulus":
-            if calc.b == 0:
+            if b == 0:
                 raise HTTPException(status_code=400, detail="Cannot perform modulus with zero")
-            result = calc.a % calc.b
+            result = a % b
         elif op_type == "sqrt":
-            if calc.a < 0:
+            if a < 0:
                 raise HTTPException(status_code=400, detail="Cannot calculate square root of negative number")
-            result = math.sqrt(calc.a)
-            # For sqrt, we store 'b' as 0 or as provided
+            result = math.sqrt(a)
         else:
-            raise HTTPException(status_code=422, detail="Invalid operation type")
+            # Scientific functions (sin, log, gamma, ...) from the operation registry
+            result = get_operation(op_type).compute(a, b)
     except ZeroDivisionError:
         raise HTTPException(status_code=400, detail="Cannot divide by zero")
+    except OverflowError:
+        raise HTTPException(status_code=400, detail=OVERFLOW_DETAIL)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    
-    # Save to database
-    new_calc = Calculation(
-        a=calc.a,
-        b=calc.b,
-        type=op_type,
-        result=result,
-        user_id=current_user.id
-    )
+    if not math.isfinite(result):
+        raise HTTPException(status_code=400, detail=OVERFLOW_DETAIL if math.isinf(result) else "Result is not a finite number")
+    return result
+
+
+def _compute_complex(calc: CalculationCreate) -> tuple[float, float]:
+    """Real and imaginary parts of a complex-domain calculation."""
+    if calc.precision is not None or _has_units(calc):
+        raise HTTPException(status_code=422, detail="The complex domain does not support precision mode or units")
+    try:
+        result = compute_complex_scalar(calc.type, complex(calc.a, calc.a_imag), complex(calc.b, calc.b_imag))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return result.real, result.imag
+
+
+def _has_units(calc: CalculationCreate) -> bool:
+    return any(unit is not None for unit in (calc.a_unit, calc.b_unit, calc.result_unit))
+
+
+def _compute_with_units(calc: CalculationCreate) -> tuple[float, dict]:
+    """Result of a unit-aware calculation and the unit columns to store with it."""
+    op_type = calc.type.lower()
+    if op_type not in available_operations():
+        raise HTTPException(status_code=422, detail=f"Invalid operation type '{calc.type}'")
+    if calc.precision is not None:
+        raise HTTPException(status_code=422, detail="Precision mode does not support units")
+    try:
+        a = Quantity(calc.a, parse_unit(calc.a_unit))
+        b = Quantity(calc.b, parse_unit(calc.b_unit))
+        quantity = compute_with_units(op_type, a, b)
+        result, unit = quantity.value, quantity.unit
+        if calc.result_unit is not None:
+            target = parse_unit(calc.result_unit)
+            result, unit = result * conversion_factor(unit, target), target
+    except (ValueError, ArithmeticError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not math.isfinite(result):
+        raise HTTPException(status_code=400, detail="Result is not a finite number")
+    return result, dict(a_unit=calc.a_unit, b_unit=calc.b_unit, result_unit=str(unit) or None)
+
+
+def _compute_user_function(calc: CalculationCreate, functions: FunctionLibrary) -> float:
+    parameters, _ = functions.definitions[calc.type]
+    if len(parameters) > 2:
+        raise HTTPException(status_code=422, detail=f"'{calc.type}' takes {len(parameters)} arguments; calculations pass at most two")
+    if calc.precision is not None:
+        raise HTTPException(status_code=422, detail="Precision mode does not support user-defined functions")
+    if calc.domain == "complex":
+        raise HTTPException(status_code=422, detail="The complex domain does not support user-defined functions")
+    if _has_units(calc):
+        raise HTTPException(status_code=422, detail="Units are not supported for user-defined functions")
+    arguments = (calc.a, calc.b)[:len(parameters)]
+    call = f"{calc.type}({', '.join(map(str, arguments))})"
+    try:
+        # float64 arguments: division by zero gives inf, as in expressions, rather than raising
+        result = float(functions.functions[calc.type](*map(np.float64, arguments)))
+    except (ArithmeticError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"{call} cannot be evaluated: {e}")
+    if not math.isfinite(result):
+        raise HTTPException(status_code=400, detail=f"{call} is not a finite number")
+    return result
+
+
+def _add_user_function_calculation(calc: CalculationCreate, db: Session, user: User, functions: FunctionLibrary) -> Calculation:
+    result = _compute_user_function(calc, functions)
+    new_calc = Calculation(a=calc.a, b=calc.b, type=calc.type, result=result, user_id=user.id)
     db.add(new_calc)
     db.commit()
     db.refresh(new_calc)
-    
     return new_calc
 
 
+def _validate_batch_type(op_type: str) -> str:
+    try:
+        get_operation(op_type)
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"Invalid operation type '{op_type}'")
+    return op_type.lower()
+
+
+@router.post("/batch", response_model=CalculationBatchResult)
+def batch_calculation(batch: CalculationBatch, current_user: User = Depends(get_current_user)):
+    """
+    BATCH: Apply one operation element-wise over many (a, b) pairs (POST /calculations/batch)
+    Results are returned, not stored. Large batches are split across all cores.
+    mode=fast uses the operation's approximate kernel and reports its maximum error.
+    """
+    op_type = _validate_batch_type(batch.type)
+    if batch.domain == "complex":
+        a = np.array(batch.a) + 1j * np.array(batch.a_imag or 0.0)
+        b = np.array(batch.b) + 1j * np.array(batch.b_imag or 0.0)
+        try:
+            results = compute_complex(op_type, a, b)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return CalculationBatchResult(
+            type=op_type, count=len(results), results=results.real.tolist(), results_imag=results.imag.tolist()
+        )
+    kernel = fast_kernel(op_type) if batch.mode == "fast" else None
+    results = compute_batch(op_type, batch.a, batch.b, fast=kernel is not None)
+    # catches overflow on either path, and replaces the domain checks fast kernels skip
+    if not np.isfinite(results).all():
+        raise HTTPException(status_code=400, detail="Some results are undefined or out of range")
+    if kernel is None:
+        return CalculationBatchResult(type=op_type, count=len(results), results=results.tolist())
+    return CalculationBatchResult(
+        type=op_type, count=len(results), results=results.tolist(),
+        mode="fast", max_error=kernel.max_error, error_kind=kernel.error_kind
+    )
+
+
+@router.post("/batch/binary")
+async def batch_calculation_binary(
+    type: str,
+    request: Request,
+    mode: Literal["exact", "fast"] = "exact",
+    domain: Literal["real", "complex"] = "real",
+    current_user: User = Depends(get_current_user)
+):
+    """
+    BATCH (binary): body is a raw little-endian float64 array holding all a values followed by all b values.
+    Responds with the float64 results in the same encoding. With mode=fast, rows outside the
+    operation's domain are NaN and the kernel's maximum error is in X-Max-Error / X-Error-Kind.
+    With domain=complex, operands and results are complex128 (interleaved real, imaginary).
+    """
+    op_type = _validate_batch_type(type)
+    body = await request.body()
+    dtype = "<c16" if domain == "complex" else "<f8"
+    if len(body) % (2 * np.dtype(dtype).itemsize):
+        raise HTTPException(status_code=422, detail=f"Body must hold two {np.dtype(dtype).name} arrays of equal length")
+    operands = np.frombuffer(body, dtype=dtype)
+    n = len(operands) // 2
+    if domain == "complex":
+        try:
+            results = await run_in_threadpool(compute_complex, op_type, operands[:n], operands[n:])
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return Response(
+            content=results.astype("<c16", copy=False).tobytes(), media_type="application/octet-stream",
+            headers={"X-Calculation-Mode": "exact"}
+        )
+    kernel = fast_kernel(op_type) if mode == "fast" else None
+    results = await run_in_threadpool(compute_batch, op_type, operands[:n], operands[n:], fast=kernel is not None)
+    headers = {"X-Calculation-Mode": "exact"}
+    if kernel is not None:
+        headers = {"X-Calculation-Mode": "fast", "X-Max-Error": repr(kernel.max_error), "X-Error-Kind": kernel.error_kind}
+    return Response(
+        content=results.astype("<f8", copy=False).tobytes(), media_type="application/octet-stream", headers=headers
+    )
+
+
+def _nary(op_type: str, operands, persist: bool, db: Session, user: User) -> NaryResult:
+    """
+    Reduce the operands; when persisted, one calculation stores the count in a
+    (b is 0), the result, and the packed operands as its payload.
+    """
+    try:
+        result = reduce_operands(op_type, operands)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    calculation_id = None
+    if persist:
+        calculation = Calculation(a=len(operands), b=0, type=op_type, result=result, user_id=user.id)
+        calculation.payload = CalculationPayload(kind="operands", data=pack_operands(operands))
+        db.add(calculation)
+        db.commit()
+        calculation_id = calculation.id
+    return NaryResult(type=op_type, count=len(operands), result=result, calculation_id=calculation_id)
+
+
+@router.post("/nary", response_model=NaryResult)
+def nary_calculation(calc: NaryCalculation, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """
+    N-ARY: sum, product, mean, min, max or hypot of any number of operands (POST /calculations/nary)
+    Sums are correctly rounded; the operands are stored packed in one payload, not as a row each.
+    """
+    return _nary(calc.type.lower(), calc.operands, calc.persist, db, current_user)
+
+
+@router.post("/nary/binary", response_model=NaryResult)
+async def nary_calculation_binary(
+    type: str,
+    request: Request,
+    persist: bool = True,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    N-ARY (binary): body is the operands as a raw little-endian float64 array.
+    """
+    try:
+        operands = unpack_operands(await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return await run_in_threadpool(_nary, type.lower(), operands, persist, db, current_user)
+
+
+@router.post("/programs", response_model=ProgramResult)
+def run_calculation_program(
+    program: CalculationProgram,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    PROGRAM: Run a multi-step RPN program in one request (POST /calculations/programs)
+    e.g. [3, 4, "power", 2, "divide"]. Every operation step is returned and, when persisted,
+    stored as a calculation with a shared chain id in a single bulk insert and commit.
+    """
+    try:
+        run = run_program(program.steps)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    steps = [ProgramStep(index=s.index, type=s.type, a=s.a, b=s.b, result=s.result) for s in run.steps]
+    chain_id = None
+    if program.persist and steps:
+        chain_id = uuid.uuid4().hex
+        ids = db.scalars(
+            insert(Calculation).returning(Calculation.id, sort_by_parameter_order=True),
+            [
+                dict(a=s.a, b=s.b, type=s.type, result=s.result, chain_id=chain_id, user_id=current_user.id)
+                for s in steps
+            ]
+        ).all()
+        db.commit()
+        for step, calculation_id in zip(steps, ids):
+            step.calculation_id = calculation_id
+    return ProgramResult(
+        chain_id=chain_id, steps=steps, stack=run.stack, result=run.stack[-1] if run.stack else None
+    )
+
+
+@router.post("/integer", response_model=IntegerCalculationResult)
+def integer_calculation(calc: IntegerCalculation, current_user: User = Depends(get_current_user)):
+    """
+    Exact big-integer number theory (POST /calculations/integer)
+    gcd, lcm, modpow (a^b mod m), modinv, crt, isprime, factorize, factorial, binomial
+    """
+    try:
+        result = evaluate_integer(calc.type, calc.operands, calc.moduli)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if isinstance(result, dict):
+        result = {to_text(prime): exponent for prime, exponent in result.items()}
+    elif not isinstance(result, bool):
+        result = to_text(result)
+    return IntegerCalculationResult(type=calc.type.lower(), result=result)
+
+
+@router.post("/convert", response_model=UnitConversionResult)
+def convert_units(conversion: UnitConversion, current_user: User = Depends(get_current_user)):
+    """
+    CONVERT: Express a value in another unit of the same dimension (POST /calculations/convert)
+    e.g. 100 km/h in m/s. Not stored.
+    """
+    try:
+        factor = conversion_factor(parse_unit(conversion.from_unit), parse_unit(conversion.to_unit))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    result = conversion.value * factor
+    if not math.isfinite(result):
+        raise HTTPException(status_code=400, detail=f"{conversion.value} {conversion.from_unit} in {conversion.to_unit} is not a finite number")
+    return UnitConversionResult(
+        value=conversion.value, from_unit=conversion.from_unit, to_unit=conversion.to_unit,
+        result=result, factor=factor
+    )
+
+
+@router.get("/constants/{name}", response_model=ConstantRead)
+def read_constant(name: str, digits: int = 50, current_user: User = Depends(get_current_user)):
+    """
+    Get a mathematical constant (pi, e, ln2, ln10, sqrt2, phi) truncated to `digits` decimal places
+    """
+    if not 0 <= digits <= MAX_PRECISION:
+        raise HTTPException(status_code=422, detail=f"digits must be between 0 and {MAX_PRECISION}")
+    try:
+        value = constant_text(name.lower(), digits)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return ConstantRead(name=name.lower(), digits=digits, value=value)
+
+
 @router.put("/{calculation_id}", response_model=CalculationRead)
-def edit_calculation(calculation_id: int, calc: CalculationCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def edit_calculation(
+    calculation_id: int,
+    calc: CalculationCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    functions: FunctionLibrary = Depends(get_user_functions)
+):
     """
     EDIT: Update an existing calculation (PUT /calculations/{id})
+    The type may also be one of your own functions, as for ADD.
     """
     # Find existing calculation
     db_calc = db.query(Calculation).filter(Calculation.id == calculation_id, Calculation.user_id == current_user.id).first()
     if not db_calc:
         raise HTTPException(status_code=404, detail="Calculation not found")
+    # worksheets, stored operands and program steps belong to their own endpoints
+    if db_calc.type == "worksheet":
+        raise HTTPException(status_code=409, detail="Worksheets are edited with PATCH /calculations/worksheets/{id}")
+    if db_calc.payload is not None:
+        raise HTTPException(status_code=409, detail="Calculations with stored operands cannot be edited")
+    if db_calc.chain_id is not None:
+        raise HTTPException(status_code=409, detail="Steps of a program cannot be edited")
     
     # Validate operation type
-    valid_types = ["add", "subtract", "multiply", "divide", "power", "modulus", "sqrt"]
+    valid_types = available_operations()
     op_type = calc.type.lower()
     
-    if op_type not in valid_types:
+    if calc.type in functions.definitions:
+        op_type = calc.type  # user function names are case-sensitive
+    elif op_type not in valid_types:
         raise HTTPException(
             status_code=422,
             detail=f"Invalid operation type '{calc.type}'. Must be one of: {valid_types}"
         )
     
     # Recalculate
-    try:
-        if op_type == "add":
-            result = calc.a + calc.b
-        elif op_type == "subtract":
-            result = calc.a - calc.b
-        elif op_type == "multiply":
-            result = calc.a * calc.b
-        elif op_type == "divide":
-            if calc.b == 0:
-                raise HTTPException(status_code=400, detail="Cannot divide by zero")
-            result = calc.a / calc.b
-        elif op_type == "power":
-            result = calc.a ** calc.b
-        elif op_type == "modulus":
-            if calc.b == 0:
-                raise HTTPException(status_code=400, detail="Cannot perform modulus with zero")
-            result = calc.a % calc.b
-        elif op_type == "sqrt":
-            if calc.a < 0:
-                raise HTTPException(status_code=400, detail="Cannot calculate square root of negative number")
-            result = math.sqrt(calc.a)
-    except ZeroDivisionError:
-        raise HTTPException(status_code=400, detail="Cannot divide by zero")
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    result_text = None
+    units = dict(a_unit=None, b_unit=None, result_unit=None)
+    parts = dict(a_imag=None, b_imag=None, result_imag=None)
+    if calc.type in functions.definitions:
+        result = _compute_user_function(calc, functions)
+    elif calc.domain == "complex":
+        result, imag = _compute_complex(calc)
+        parts = dict(a_imag=calc.a_imag, b_imag=calc.b_imag, result_imag=imag)
+    elif _has_units(calc):
+        result, units = _compute_with_units(calc)
+    elif calc.precision is not None:
+        if op_type not in PRECISE_OPERATIONS:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Precision mode supports: {list(PRECISE_OPERATIONS)}"
+            )
+        precise = compute_precise(op_type, calc.a, calc.b, calc.precision)
+        result_text = str(precise)
+        result = to_float(precise)
+    else:
+        result = _compute_real(op_type, calc.a, calc.b)
     
     # Update fields
     db_calc.a = calc.a
     db_calc.b = calc.b
     db_calc.type = op_type
     db_calc.result = result
+    db_calc.precision = calc.precision
+    db_calc.result_text = result_text
+    for column, value in {**units, **parts}.items():
+        setattr(db_calc, column, value)
     
     db.commit()
     db.refresh(db_calc)
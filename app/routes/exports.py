@@ -0,0 +1,56 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.models.calculation import Calculation
+from app.models.user import User
+from app.operations.exporter import EXPORT_COLUMNS, MEDIA_TYPES, encode, parquet_available
+from app.routes.calculations import get_current_user
+
+router = APIRouter(prefix="/calculations", tags=["exports"])
+
+EXPORT_BATCH_SIZE = 10_000
+
+
+def _batches(bind, user_id: int, op_type: Optional[str], batch_size: int):
+    """Rows in id order from a server-side cursor, one partition at a time."""
+    # a session of its own: the request's session is closed before the response body is streamed
+    with Session(bind) as session:
+        table = Calculation.__table__
+        statement = select(*(table.c[name] for name in EXPORT_COLUMNS)).where(table.c.user_id == user_id)
+        if op_type is not None:
+            statement = statement.where(table.c.type == op_type.lower())
+        result = session.execute(statement.order_by(table.c.id).execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+
+
+@router.get("/export")
+def export_calculations(
+    format: Literal["csv", "ndjson", "parquet"] = "csv",
+    compression: Literal["none", "gzip"] = "none",
+    type: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    EXPORT: Stream your calculation history (GET /calculations/export?format=csv|ndjson|parquet)
+    Rows are read through a server-side cursor and encoded batch by batch, so histories of
+    any size are never held in memory. compression=gzip gzips CSV and NDJSON and uses gzip
+    pages in Parquet. Parquet needs pyarrow on the server. Optionally filter by operation type.
+    """
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=400, detail="Parquet export is not available on this server (pyarrow is not installed)")
+    codec = None if compression == "none" else compression
+    media_type, filename = MEDIA_TYPES[format], f"calculations.{format}"
+    if codec and format != "parquet":
+        media_type, filename = "application/gzip", filename + ".gz"
+    batches = _batches(db.get_bind(), current_user.id, type, EXPORT_BATCH_SIZE)
+    return StreamingResponse(
+        encode(format, batches, codec), media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
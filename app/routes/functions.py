@@ -0,0 +1,86 @@
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.models.user import User
+from app.models.user_function import UserFunction
+from app.operations.schemas.function_schemas import FunctionDefine, FunctionEvaluate, FunctionEvaluation, FunctionRead
+from app.operations.user_functions import (
+    FunctionLibrary, callers, check_definition, libraries, parse_definition, MAX_FUNCTIONS,
+)
+from app.routes.calculations import get_current_user, get_user_functions, load_definitions
+
+router = APIRouter(prefix="/calculations", tags=["functions"])
+
+
+def _read(row: UserFunction) -> FunctionRead:
+    return FunctionRead(name=row.name, parameters=row.parameters.split(","), body=row.body)
+
+
+@router.post("/functions", response_model=FunctionRead)
+def define_function(request: FunctionDefine, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """
+    FUNCTIONS: Define or redefine a function, e.g. f(x, y) = x^2 + sqrt(y) (POST /calculations/functions)
+    Functions can be called from expressions and used as a calculation type (one or two parameters).
+    """
+    try:
+        name, parameters, body = parse_definition(request.definition)
+        check_definition(name, parameters, body, load_definitions(db, current_user.id))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    row = db.query(UserFunction).filter(UserFunction.user_id == current_user.id, UserFunction.name == name).first()
+    if row is None:
+        row = UserFunction(user_id=current_user.id, name=name)
+        db.add(row)
+    row.parameters = ",".join(parameters)
+    row.body = body
+    db.commit()
+    libraries.invalidate(current_user.id)
+    return _read(row)
+
+
+@router.get("/functions", response_model=list[FunctionRead])
+def list_functions(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """
+    FUNCTIONS: Your defined functions (GET /calculations/functions)
+    """
+    rows = db.query(UserFunction).filter(UserFunction.user_id == current_user.id).order_by(UserFunction.name)
+    return [_read(row) for row in rows.limit(MAX_FUNCTIONS)]
+
+
+@router.delete("/functions/{name}")
+def delete_function(name: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """
+    FUNCTIONS: Delete a function no other function calls (DELETE /calculations/functions/{name})
+    """
+    row = db.query(UserFunction).filter(UserFunction.user_id == current_user.id, UserFunction.name == name).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Function not found")
+    used_by = callers(name, load_definitions(db, current_user.id))
+    if used_by:
+        raise HTTPException(status_code=400, detail=f"'{name}' is called by: {', '.join(used_by)}")
+    db.delete(row)
+    db.commit()
+    libraries.invalidate(current_user.id)
+    return {"message": "Function deleted successfully", "name": name}
+
+
+@router.post("/functions/{name}/evaluate", response_model=FunctionEvaluation)
+def evaluate_function(name: str, request: FunctionEvaluate, functions: FunctionLibrary = Depends(get_user_functions)):
+    """
+    FUNCTIONS: Call a function (POST /calculations/functions/{name}/evaluate)
+    Arguments may be numbers or equal-length arrays; the compiled function is reused across calls.
+    """
+    if name not in functions.definitions:
+        raise HTTPException(status_code=404, detail="Function not found")
+    try:
+        arguments = [np.asarray(argument, dtype=np.float64) for argument in request.arguments]
+        shape = np.broadcast_shapes(*(argument.shape for argument in arguments))
+        values = np.broadcast_to(functions.functions[name](*arguments), shape)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    values = np.atleast_1d(np.asarray(values, dtype=np.float64))
+    return FunctionEvaluation(
+        name=name, values=[value if np.isfinite(value) else None for value in values.tolist()]
+    )
@@ -0,0 +1,118 @@
+import csv
+import io
+import itertools
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.models.calculation import Calculation
+from app.models.user import User
+from app.operations.importer import CHUNK_ROWS, MAX_ERROR_SAMPLES, CalculationImporter, ImportChunk, LineSplitter
+from app.operations.schemas.import_schemas import ImportRowError, ImportStatus
+from app.routes.calculations import get_current_user
+
+router = APIRouter(prefix="/calculations", tags=["imports"])
+
+# Status of running and recent imports, by import id, for polling while an upload runs
+_STATUS_SIZE = 256
+_statuses: "OrderedDict[str, tuple[int, ImportStatus]]" = OrderedDict()
+_status_lock = threading.Lock()
+
+_COPY = "COPY calculations (a, b, type, result, user_id) FROM STDIN WITH (FORMAT csv)"
+
+
+def _insert_chunk(db: Session, chunk: ImportChunk, user_id: int) -> None:
+    """Insert one chunk in its own transaction: COPY on PostgreSQL, executemany elsewhere."""
+    if not len(chunk):
+        return
+    columns = (chunk.a.tolist(), chunk.b.tolist(), chunk.types, chunk.results.tolist())
+    try:
+        if db.get_bind().dialect.name == "postgresql":
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(zip(*columns, itertools.repeat(user_id)))
+            buffer.seek(0)
+            db.connection().connection.cursor().copy_expert(_COPY, buffer)
+        else:
+            db.execute(insert(Calculation), [
+                dict(a=a, b=b, type=op_type, result=result, user_id=user_id) for a, b, op_type, result in zip(*columns)
+            ])
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+
+
+def _process(db: Session, importer: CalculationImporter, lines: list[bytes], status: ImportStatus, user_id: int):
+    chunk = importer.process(lines)
+    _insert_chunk(db, chunk, user_id)
+    status.rows += chunk.rows
+    status.imported += len(chunk)
+    status.errors += len(chunk.errors)
+    room = MAX_ERROR_SAMPLES - len(status.error_samples)
+    status.error_samples.extend(ImportRowError(line=line, error=error) for line, error in chunk.errors[:room])
+
+
+@router.post("/import", response_model=ImportStatus)
+async def import_calculations(
+    request: Request,
+    format: Literal["csv", "ndjson"] = "csv",
+    import_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    IMPORT: Bulk-load calculation history from a CSV or NDJSON body (POST /calculations/import)
+    Rows need a, type and usually b; a result column, if present, is checked against the
+    recomputed result. The body is read as a stream and committed every 50,000 rows, so an
+    upload of any size runs in constant memory. Invalid rows are counted and sampled.
+    Pass your own import_id to follow progress with GET /calculations/import/{import_id}.
+    """
+    import_id = import_id or uuid.uuid4().hex
+    status = ImportStatus(import_id=import_id, status="running")
+    with _status_lock:
+        if import_id in _statuses and _statuses[import_id][1].status == "running":
+            raise HTTPException(status_code=409, detail=f"Import '{import_id}' is already running")
+        _statuses[import_id] = (current_user.id, status)
+        _statuses.move_to_end(import_id)
+        while len(_statuses) > _STATUS_SIZE:
+            _statuses.popitem(last=False)
+
+    importer = CalculationImporter(format)
+    splitter = LineSplitter()
+    pending: list[bytes] = []
+    try:
+        async for data in request.stream():
+            status.bytes_read += len(data)
+            pending.extend(splitter.feed(data))
+            while len(pending) >= CHUNK_ROWS:
+                lines, pending = pending[:CHUNK_ROWS], pending[CHUNK_ROWS:]
+                await run_in_threadpool(_process, db, importer, lines, status, current_user.id)
+        pending.extend(splitter.close())
+        await run_in_threadpool(_process, db, importer, pending, status, current_user.id)
+    except ValueError as e:
+        status.status, status.detail = "failed", str(e)
+        raise HTTPException(status_code=400, detail=f"{e} (imported {status.imported} rows before stopping)")
+    except BaseException as e:
+        status.status, status.detail = "failed", str(e) or type(e).__name__
+        raise
+    status.status = "done"
+    return status
+
+
+@router.get("/import/{import_id}", response_model=ImportStatus)
+def read_import_status(import_id: str, current_user: User = Depends(get_current_user)):
+    """
+    IMPORT: Progress of a running import, or the outcome of a recent one (GET /calculations/import/{import_id})
+    """
+    with _status_lock:
+        entry = _statuses.get(import_id)
+    if entry is None or entry[0] != current_user.id:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return entry[1]
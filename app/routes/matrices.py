@@ -0,0 +1,104 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+import numpy as np
+
+from app.db import get_db
+from app.models.calculation import Calculation
+from app.models.calculation_payload import CalculationPayload
+from app.models.user import User
+from app.operations.linalg import compute_matrix, pack_matrices, unpack_matrices
+from app.operations.schemas.matrix_schemas import MatrixCalculation, MatrixResult
+from app.routes.calculations import get_current_user
+
+router = APIRouter(prefix="/calculations", tags=["matrix"])
+
+
+def _save_matrix_result(db: Session, op_type: str, result: np.ndarray, user: User) -> Calculation:
+    """
+    Store a matrix result: a and b hold the result shape, result its Frobenius norm
+    (the determinant itself for determinant), and the full matrix goes into the payload.
+    """
+    summary = float(result[0, 0]) if op_type == "determinant" else float(np.linalg.norm(result))
+    calculation = Calculation(
+        a=result.shape[0],
+        b=result.shape[1],
+        type=f"matrix_{op_type}",
+        result=summary,
+        user_id=user.id
+    )
+    calculation.payload = CalculationPayload(kind="matrix", data=pack_matrices([result]))
+    db.add(calculation)
+    db.commit()
+    db.refresh(calculation)
+    return calculation
+
+
+def _run(op_type: str, matrices: list) -> np.ndarray:
+    try:
+        result = compute_matrix(op_type, matrices)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not np.all(np.isfinite(result)):
+        raise HTTPException(status_code=400, detail="Result exceeds the floating point range")
+    return result
+
+
+@router.post("/matrix", response_model=MatrixResult)
+def matrix_calculation(calc: MatrixCalculation, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """
+    MATRIX: multiply, transpose, inverse, determinant, solve (Ax = b), eigenvalues (POST /calculations/matrix)
+    """
+    op_type = calc.type.lower()
+    result = _run(op_type, calc.matrices)
+    calculation_id = None
+    if calc.persist:
+        calculation_id = _save_matrix_result(db, op_type, result, current_user).id
+    return MatrixResult(
+        type=op_type,
+        rows=result.shape[0],
+        cols=result.shape[1],
+        result=result.tolist(),
+        calculation_id=calculation_id
+    )
+
+
+@router.post("/matrix/binary")
+async def matrix_calculation_binary(
+    type: str,
+    request: Request,
+    persist: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    MATRIX (binary): body and response use the compact matrix encoding
+    (uint32 rows, uint32 cols, float64 row-major values per matrix).
+    """
+    op_type = type.lower()
+    try:
+        matrices = unpack_matrices(await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    result = await run_in_threadpool(_run, op_type, matrices)
+    headers = {}
+    if persist:
+        calculation = await run_in_threadpool(_save_matrix_result, db, op_type, result, current_user)
+        headers["X-Calculation-Id"] = str(calculation.id)
+    return Response(content=pack_matrices([result]), media_type="application/octet-stream", headers=headers)
+
+
+@router.get("/{calculation_id}/payload")
+def read_calculation_payload(calculation_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """
+    Download the binary payload stored with a calculation (GET /calculations/{id}/payload)
+    """
+    payload = (
+        db.query(CalculationPayload)
+        .join(Calculation)
+        .filter(CalculationPayload.calculation_id == calculation_id, Calculation.user_id == current_user.id)
+        .first()
+    )
+    if not payload:
+        raise HTTPException(status_code=404, detail="Payload not found")
+    return Response(content=payload.data, media_type="application/octet-stream", headers={"X-Payload-Kind": payload.kind})
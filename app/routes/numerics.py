@@ -0,0 +1,408 @@
+import itertools
+import json
+import math
+import secrets
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.columnar import calculation_columns
+from app.db import get_db
+from app.models.user import User
+from app.operations import optimize, polynomial
+from app.operations.calculus import differentiate, integrate
+from app.operations.distributions import evaluate_distribution
+from app.operations.montecarlo import iterate_simulation
+from app.operations.expressions import compile_expression
+from app.operations.schemas.numerics_schemas import (
+    DifferentiateRequest, DifferentiateResult, DistributionRequest, DistributionResult, IntegrateRequest, IntegrateResult,
+    MinimizeRequest, MinimizeResult, ODERequest, ODEResult, PlotResult,
+    PolynomialFitRequest, PolynomialFitResult, PolynomialRequest, PolynomialResult, SimulationRequest, SimulationResult,
+    SolveRequest, SolveResult, SparseSolveRequest, SparseSolveResult, SweepRequest,
+)
+from app.operations.ode import ODESystem, iterate_ode, solve_ode
+from app.operations.plotting import MAX_PIXELS, sample_adaptively
+from app.operations.sparse import CSRMatrix, iterate_sparse_solve
+from app.operations.sweep import ParameterSweep, axis_values
+from app.operations.user_functions import FunctionLibrary
+from app.routes.calculations import get_current_user, get_user_functions
+
+router = APIRouter(prefix="/calculations", tags=["numerics"])
+
+
+def _ndjson(events):
+    for event in events:
+        yield json.dumps(event) + "\n"
+
+
+def _finite_or_none(values) -> list:
+    return [value if math.isfinite(value) else None for value in values.tolist()]
+
+
+def _bind_expression(expression: str, variable: str, parameters: dict, compiler=compile_expression):
+    """Compiled (and cached) expression as a vectorized function of ``variable``."""
+    if variable in parameters:
+        raise ValueError(f"'{variable}' cannot also be a parameter")
+    compiled = compiler(expression, (variable, *sorted(parameters)))
+    return compiled.bind(variable, parameters)
+
+
+@router.post("/integrate", response_model=IntegrateResult)
+def integrate_expression(request: IntegrateRequest, functions: FunctionLibrary = Depends(get_user_functions)):
+    """
+    CALCULUS: Definite integral of an expression (POST /calculations/integrate)
+    Adaptive Gauss-Kronrod (7/15) by default; infinite bounds are mapped to a finite interval.
+    """
+    try:
+        function = _bind_expression(request.expression, request.variable, request.parameters, functions.compile)
+        result = integrate(
+            function, request.lower, request.upper,
+            method=request.method, abs_tol=request.tol, rel_tol=request.tol
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return IntegrateResult(
+        value=float(result.value), error=float(result.error),
+        evaluations=result.evaluations, converged=bool(result.converged)
+    )
+
+
+@router.post("/differentiate", response_model=DifferentiateResult)
+def differentiate_expression(request: DifferentiateRequest, functions: FunctionLibrary = Depends(get_user_functions)):
+    """
+    CALCULUS: First or second derivative at each point (POST /calculations/differentiate)
+    Central differences with Richardson extrapolation; all points are evaluated together.
+    """
+    try:
+        function = _bind_expression(request.expression, request.variable, request.parameters, functions.compile)
+        result = differentiate(function, request.points, order=request.order)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return DifferentiateResult(
+        values=result.values.tolist(), errors=result.errors.tolist(), evaluations=result.evaluations
+    )
+
+
+def _sparse_result(state) -> SparseSolveResult:
+    # extreme entries can overflow the residual norm or the iterates
+    (residual,) = _finite_or_none(np.array([state.residual]))
+    return SparseSolveResult(
+        converged=state.converged, iterations=state.iteration, residual=residual, x=_finite_or_none(state.x)
+    )
+
+
+@router.post("/sparse/solve", response_model=SparseSolveResult)
+def sparse_solve(request: SparseSolveRequest, current_user: User = Depends(get_current_user)):
+    """
+    SPARSE: Solve Ax = b iteratively (POST /calculations/sparse/solve)
+    With stream=true the response is NDJSON: {"iteration", "residual"} lines, then the final result.
+    """
+    try:
+        if request.format == "coo":
+            matrix = CSRMatrix.from_coo(request.rows, request.cols, request.values, request.shape)
+        else:
+            matrix = CSRMatrix.from_csr(request.values, request.indices, request.indptr, request.shape)
+        options = {"restart": request.restart} if request.method == "gmres" else {}
+        states = iterate_sparse_solve(
+            matrix, request.b,
+            method=request.method,
+            preconditioner=request.preconditioner,
+            tol=request.tol,
+            max_iterations=request.max_iterations,
+            **options
+        )
+        if not request.stream:
+            state = None
+            for state in states:
+                pass
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not request.stream:
+        return _sparse_result(state)
+
+    def events():
+        try:
+            for state in states:
+                if state.done:
+                    yield _sparse_result(state).model_dump()
+                else:
+                    yield {"iteration": state.iteration, "residual": _finite_or_none(np.array([state.residual]))[0]}
+        except ValueError as e:
+            # headers are already sent, so report the failure in-band
+            yield {"error": str(e)}
+
+    return StreamingResponse(_ndjson(events()), media_type="application/x-ndjson")
+
+
+@router.post("/ode", response_model=ODEResult)
+def ode_solve(request: ODERequest, current_user: User = Depends(get_current_user)):
+    """
+    ODE: Integrate a system of ODEs (POST /calculations/ode)
+    Long integrations continue in the worker pool. With stream=true the response is
+    NDJSON: one {"t", "y"} line per sample, then {"steps", "evaluations"}; streams run in the API worker.
+    """
+    options = dict(
+        method=request.method, t_eval=request.t_eval,
+        rtol=request.rtol, atol=request.atol, max_steps=request.max_steps
+    )
+    try:
+        system = ODESystem(request.equations, request.state, request.time, request.parameters)
+        if request.stream:
+            samples = iterate_ode(system, request.t_span, request.y0, **options)
+            first = next(samples)  # surface input errors before the response starts
+        else:
+            solution = solve_ode(system, request.t_span, request.y0, **options)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not request.stream:
+        return ODEResult(
+            t=solution.t.tolist(), y=solution.y.tolist(),
+            steps=solution.steps, evaluations=solution.evaluations
+        )
+
+    def events():
+        step = None
+        try:
+            for times, states, step in itertools.chain([first], samples):
+                for t, y in zip(times.tolist(), states.tolist()):
+                    yield {"t": t, "y": y}
+            yield {"steps": step.index, "evaluations": step.evaluations}
+        except ValueError as e:
+            yield {"error": str(e)}
+
+    return StreamingResponse(_ndjson(events()), media_type="application/x-ndjson")
+
+
+@router.post("/solve", response_model=SolveResult)
+def solve_equation(request: SolveRequest, functions: FunctionLibrary = Depends(get_user_functions)):
+    """
+    SOLVE: Roots of an expression or polynomial (POST /calculations/solve)
+    brent takes brackets, newton takes starting points; every start is iterated together.
+    """
+    try:
+        if request.method == "polynomial":
+            roots = optimize.polynomial_roots(request.coefficients)
+            real = roots[np.abs(roots.imag) <= 1e-9 * np.maximum(1.0, np.abs(roots))].real
+            return SolveResult(
+                method=request.method, roots=real.tolist(), converged=[True] * len(real),
+                iterations=0, evaluations=0,
+                complex_roots=[(root.real, root.imag) for root in roots.tolist()]
+            )
+        function = _bind_expression(request.expression, request.variable, request.parameters, functions.compile)
+        if request.method == "brent":
+            result = optimize.brent(function, request.brackets, request.tol, request.max_iterations)
+        else:
+            result = optimize.newton(function, request.starts, request.tol, request.max_iterations)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SolveResult(
+        method=request.method, roots=_finite_or_none(result.roots), converged=result.converged.tolist(),
+        iterations=result.iterations, evaluations=result.evaluations
+    )
+
+
+@router.post("/minimize", response_model=MinimizeResult)
+def minimize_expression(request: MinimizeRequest, functions: FunctionLibrary = Depends(get_user_functions)):
+    """
+    MINIMIZE: Local minima of an expression (POST /calculations/minimize)
+    nelder-mead and bfgs (optionally bounded) take starting points, golden takes brackets.
+    """
+    options = {}
+    if request.tol is not None:
+        options["tol"] = request.tol
+    if request.max_iterations is not None:
+        options["max_iterations"] = request.max_iterations
+    try:
+        function = optimize.expression_function(
+            request.expression, request.variables, request.parameters, functions.compile
+        )
+        if request.method == "golden":
+            result = optimize.golden_section(lambda x: function(x[..., None]), request.brackets, **options)
+        elif request.method == "bfgs":
+            result = optimize.bfgs(function, request.starts, request.bounds, **options)
+        else:
+            result = optimize.nelder_mead(function, request.starts, **options)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # an objective unbounded below drives its simplex or iterates to inf/nan: those are null
+    finite_values = np.where(np.isfinite(result.values), result.values, np.inf)
+    return MinimizeResult(
+        method=request.method, points=[_finite_or_none(point) for point in result.points],
+        values=_finite_or_none(result.values), converged=result.converged.tolist(), best=int(np.argmin(finite_values)),
+        iterations=result.iterations, evaluations=result.evaluations
+    )
+
+
+@router.post("/polynomial", response_model=PolynomialResult)
+def polynomial_operation(request: PolynomialRequest, current_user: User = Depends(get_current_user)):
+    """
+    POLYNOMIAL: evaluate (Horner, all points at once), multiply (FFT for high degree),
+    derivative or integral (POST /calculations/polynomial)
+    """
+    try:
+        if request.type == "evaluate":
+            values = polynomial.evaluate(request.coefficients, request.points)
+            return PolynomialResult(type=request.type, values=_finite_or_none(values))
+        if request.type == "multiply":
+            coefficients = polynomial.multiply(request.coefficients, request.other)
+        elif request.type == "derivative":
+            coefficients = polynomial.derivative(request.coefficients)
+        else:
+            coefficients = polynomial.integral(request.coefficients, request.constant)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return PolynomialResult(type=request.type, coefficients=_finite_or_none(coefficients))
+
+
+@router.post("/polynomial/fit", response_model=PolynomialFitResult)
+def polynomial_fit(request: PolynomialFitRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """
+    POLYNOMIAL: Least-squares fit of result against a over your stored calculations
+    (POST /calculations/polynomial/fit). History is read as columns, not ORM objects.
+    """
+    a, result = calculation_columns(db, current_user.id, "a", "result", op_type=request.type)
+    try:
+        fitted = polynomial.fit(a, result, request.degree)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    rms_error, r_squared = _finite_or_none(np.array([fitted.rms_error, fitted.r_squared]))
+    return PolynomialFitResult(
+        degree=request.degree, coefficients=_finite_or_none(fitted.coefficients), count=fitted.count,
+        rms_error=rms_error, r_squared=r_squared
+    )
+
+
+@router.post("/distribution", response_model=DistributionResult)
+def distribution_function(request: DistributionRequest, current_user: User = Depends(get_current_user)):
+    """
+    STATISTICS: pdf/pmf, cdf or quantile of a distribution at every point (POST /calculations/distribution)
+    normal, t, chi2, exponential, poisson, binomial; all points are evaluated in one vectorized call.
+    """
+    try:
+        values = evaluate_distribution(request.distribution, request.function, request.x, request.parameters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return DistributionResult(
+        distribution=request.distribution, function=request.function, values=_finite_or_none(values)
+    )
+
+
+def _simulation_result(request: SimulationRequest, seed: int, summary) -> SimulationResult:
+    low, high = summary.confidence_interval(request.confidence)
+    values = np.array([
+        summary.mean, summary.sd, summary.standard_error, low, high, summary.minimum, summary.maximum
+    ]) if summary.count else np.full(7, np.nan)
+    mean, sd, standard_error, low, high, minimum, maximum = _finite_or_none(values)
+    quantiles = summary.quantiles(request.quantiles) if summary.count else np.full(len(request.quantiles), np.nan)
+    return SimulationResult(
+        samples=request.samples, seed=seed, count=summary.count, non_finite=summary.non_finite,
+        mean=mean, sd=sd, standard_error=standard_error, confidence=request.confidence, interval=[low, high],
+        minimum=minimum, maximum=maximum, probabilities=request.quantiles, quantiles=_finite_or_none(quantiles)
+    )
+
+
+@router.post("/simulate", response_model=SimulationResult)
+def simulate_expression(request: SimulationRequest, current_user: User = Depends(get_current_user)):
+    """
+    MONTE CARLO: Evaluate an expression over random draws of its variables (POST /calculations/simulate)
+    Chunks of 1M samples run across all cores; a fixed seed gives the same result on any machine.
+    With stream=true the response is NDJSON: {"samples", "mean", "standard_error"} after each chunk, then the result.
+    """
+    seed = secrets.randbits(63) if request.seed is None else request.seed
+    variables = {name: (variable.distribution, variable.parameters) for name, variable in request.variables.items()}
+    try:
+        summaries = iterate_simulation(request.expression, variables, request.samples, seed)
+        summary = next(summaries)  # surface input errors before the response starts
+        if not request.stream:
+            for summary in summaries:
+                pass
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not request.stream:
+        return _simulation_result(request, seed, summary)
+
+    def events():
+        current = summary
+        try:
+            for current in itertools.chain([summary], summaries):
+                mean, standard_error = _finite_or_none(np.array([
+                    current.mean if current.count else np.nan, current.standard_error if current.count > 1 else np.nan
+                ]))
+                yield {"samples": current.count + current.non_finite, "mean": mean, "standard_error": standard_error}
+            yield _simulation_result(request, seed, current).model_dump()
+        except ValueError as e:
+            yield {"error": str(e)}
+
+    return StreamingResponse(_ndjson(events()), media_type="application/x-ndjson")
+
+
+def _sweep_lines(sweep: ParameterSweep, chunks):
+    """One NDJSON line per grid row: the leading variables' values, then the row of results."""
+    leading = sweep.names[:-1]
+    for row_start, values in chunks:
+        coordinates = sweep.leading_values(row_start, row_start + len(values))
+        finite = np.isfinite(values).all()
+        for i, row in enumerate(values):
+            line = {name: float(axis[i]) for name, axis in zip(leading, coordinates)}
+            line["values"] = row.tolist() if finite else _finite_or_none(row)
+            yield json.dumps(line) + "\n"
+
+
+@router.post("/sweep")
+def sweep_grid(request: SweepRequest, functions: FunctionLibrary = Depends(get_user_functions)):
+    """
+    SWEEP: Evaluate an operation or expression over the Cartesian grid of its variables (POST /calculations/sweep)
+    Rows of the grid are computed in vectorized chunks and streamed; undefined cells are null (NaN in binary).
+    format=binary streams raw little-endian float64 in row-major order, with the grid in X-Sweep-Shape.
+    """
+    try:
+        axes = {name: axis_values(axis.values, axis.start, axis.stop, axis.num) for name, axis in request.variables.items()}
+        sweep = ParameterSweep(axes, expression=request.expression, op_type=request.type, compiler=functions.compile)
+        chunks = sweep.chunks()
+        first = next(chunks)  # surface input errors before the response starts
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    chunks = itertools.chain([first], chunks)
+
+    if request.format == "ndjson":
+        return StreamingResponse(_sweep_lines(sweep, chunks), media_type="application/x-ndjson")
+    headers = {"X-Sweep-Shape": ",".join(map(str, sweep.shape)), "X-Sweep-Variables": ",".join(sweep.names)}
+    return StreamingResponse(
+        (values.astype("<f8", copy=False).tobytes() for _, values in chunks),
+        media_type="application/octet-stream", headers=headers,
+    )
+
+
+@router.get("/plot", response_model=PlotResult)
+def plot_expression(
+    expr: str = Query(..., min_length=1, max_length=2000),
+    x0: float = Query(...),
+    x1: float = Query(...),
+    px: int = Query(800, ge=1, le=MAX_PIXELS, description="Chart width in pixels"),
+    py: int = Query(400, ge=1, le=MAX_PIXELS, description="Chart height in pixels"),
+    variable: str = "x",
+    functions: FunctionLibrary = Depends(get_user_functions),
+):
+    """
+    PLOT: Adaptive samples of an expression for charting (GET /calculations/plot)
+    Points are denser where the curve bends, at most 2 per horizontal pixel; y is null where
+    the expression is undefined and a null point is inserted at every detected jump.
+    """
+    try:
+        function = _bind_expression(expr, variable, {}, functions.compile)
+        samples = sample_adaptively(function, x0, x1, px, py)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # break the line at jumps: a null point sorted in at each discontinuity
+    x = np.concatenate([samples.x, samples.discontinuities])
+    y = np.concatenate([samples.y, np.full(len(samples.discontinuities), np.nan)])
+    order = np.argsort(x, kind="stable")
+    return PlotResult(
+        x=x[order].tolist(), y=_finite_or_none(y[order]),
+        discontinuities=samples.discontinuities.tolist(), y_range=list(samples.y_range)
+    )
@@ -0,0 +1,137 @@
+import tempfile
+from contextlib import ExitStack
+from typing import Optional
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.models.calculation import Calculation
+from app.models.calculation_payload import CalculationPayload
+from app.models.user import User
+from app.operations.schemas.signal_schemas import SeriesCalculation, SeriesResult
+from app.operations.signal import (
+    MAX_KERNEL_LENGTH, SeriesDecoder, compute_series, encode_series, get_series_operation,
+)
+from app.routes.calculations import get_current_user
+
+router = APIRouter(prefix="/calculations", tags=["signal"])
+
+# Streamed filter output is kept in memory up to this size, then spills to disk
+SPOOL_SIZE = 16 * 1024 * 1024
+READ_SIZE = 1 << 16
+
+
+def _save_series_result(db: Session, op_type: str, input_length: int, result: np.ndarray, user: User) -> Calculation:
+    """Store a series result: a is the input length, b the output length, result the output's L2 norm."""
+    calculation = Calculation(
+        a=input_length,
+        b=len(result),
+        type=f"signal_{op_type}",
+        result=float(np.linalg.norm(result)),
+        user_id=user.id
+    )
+    calculation.payload = CalculationPayload(kind="series", data=encode_series(result, "binary"))
+    db.add(calculation)
+    db.commit()
+    db.refresh(calculation)
+    return calculation
+
+
+def _parse_kernel(kernel: Optional[str]) -> Optional[np.ndarray]:
+    if kernel is None:
+        return None
+    try:
+        values = np.array([float(value) for value in kernel.split(",")])
+    except ValueError:
+        raise ValueError("kernel must be comma-separated numbers")
+    if len(values) > MAX_KERNEL_LENGTH or not np.all(np.isfinite(values)):
+        raise ValueError(f"kernel must be at most {MAX_KERNEL_LENGTH} finite numbers")
+    return values
+
+
+@router.post("/signal", response_model=SeriesResult)
+def signal_calculation(calc: SeriesCalculation, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """
+    SIGNAL: FFT, inverse FFT, power spectrum, convolution and moving-window filters (POST /calculations/signal)
+    """
+    op_type = calc.type.lower()
+    try:
+        result = compute_series(op_type, calc.series, kernel=calc.kernel, window=calc.window, n=calc.n)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    calculation_id = None
+    if calc.persist:
+        calculation_id = _save_series_result(db, op_type, len(calc.series), result, current_user).id
+    values = np.column_stack([result.real, result.imag]).tolist() if np.iscomplexobj(result) else result.tolist()
+    return SeriesResult(type=op_type, length=len(result), result=values, calculation_id=calculation_id)
+
+
+def _read_spool(spool, format: str):
+    spool.seek(0)
+    try:
+        while chunk := spool.read(READ_SIZE * 8):
+            yield chunk if format == "binary" else encode_series(np.frombuffer(chunk, dtype="<f8"), format)
+    finally:
+        spool.close()
+
+
+@router.post("/signal/upload")
+async def signal_upload(
+    type: str,
+    request: Request,
+    window: Optional[int] = None,
+    n: Optional[int] = None,
+    kernel: Optional[str] = None,
+    persist: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    SIGNAL (upload): the body is raw little-endian float64 values, or NDJSON
+    (Content-Type: application/x-ndjson) with a number or list of numbers per line.
+    The response uses the same format. Filters are applied block by block as the
+    body arrives (overlap-add), so memory does not grow with the series;
+    transforms read the whole series first. kernel is comma-separated.
+    """
+    op_type = type.lower()
+    format = "ndjson" if "ndjson" in request.headers.get("content-type", "") else "binary"
+    with ExitStack() as cleanup:
+        try:
+            operation = get_series_operation(op_type)
+            kernel_values = _parse_kernel(kernel)
+            decoder = SeriesDecoder(format)
+            if operation.streaming:
+                stream = operation.stream(kernel=kernel_values, window=window)
+                spool = cleanup.enter_context(tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE))
+                async for chunk in request.stream():
+                    spool.write(encode_series(await run_in_threadpool(stream.feed, decoder.feed(chunk)), "binary"))
+                spool.write(encode_series(stream.feed(decoder.finish()), "binary"))
+                if not decoder.count:
+                    raise ValueError("The series is empty")
+                spool.write(encode_series(stream.finish(), "binary"))
+                input_length = decoder.count
+            else:
+                chunks = [decoder.feed(chunk) async for chunk in request.stream()]
+                chunks.append(decoder.finish())
+                series = np.concatenate(chunks)
+                result = await run_in_threadpool(compute_series, op_type, series, n=n)
+                input_length = len(series)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        headers = {}
+        if persist:
+            if operation.streaming:
+                spool.seek(0)
+                result = np.frombuffer(spool.read(), dtype="<f8")
+            calculation = await run_in_threadpool(_save_series_result, db, op_type, input_length, result, current_user)
+            headers["X-Calculation-Id"] = str(calculation.id)
+        media_type = "application/x-ndjson" if format == "ndjson" else "application/octet-stream"
+        if operation.streaming and not persist:
+            cleanup.pop_all()  # the response closes the spool once it has been sent
+            return StreamingResponse(_read_spool(spool, format), media_type=media_type)
+        return StreamingResponse(iter([encode_series(result, format)]), media_type=media_type, headers=headers)
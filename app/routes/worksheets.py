@@ -0,0 +1,189 @@
+import threading
+from collections import OrderedDict
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import bindparam, delete, insert, update
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.models.calculation import Calculation
+from app.models.user import User
+from app.models.worksheet_cell import WorksheetCell
+from app.operations.schemas.worksheet_schemas import (
+    CellRead, CellState, WorksheetCreate, WorksheetDelta, WorksheetRead, WorksheetUpdate
+)
+from app.operations.worksheet import WorksheetGraph, normalize_formula
+from app.routes.calculations import get_current_user
+
+router = APIRouter(prefix="/calculations", tags=["worksheets"])
+
+# Dependency graphs of recently edited worksheets: calculation id -> (version, graph).
+# A cached graph is used only while its version matches the stored one, so edits
+# made through another process are picked up by reloading.
+_CACHE_SIZE = 16
+_graphs: "OrderedDict[int, tuple[int, WorksheetGraph]]" = OrderedDict()
+_IN_CLAUSE_SIZE = 500  # names per DELETE, under SQLite's bound-parameter limit
+# edits are applied to a shared graph and then written, one at a time
+_edit_lock = threading.Lock()
+
+
+def _cache(calculation_id: int, version: int, graph: WorksheetGraph):
+    _graphs[calculation_id] = (version, graph)
+    _graphs.move_to_end(calculation_id)
+    while len(_graphs) > _CACHE_SIZE:
+        _graphs.popitem(last=False)
+
+
+def _load_graph(db: Session, calculation: Calculation) -> WorksheetGraph:
+    cached = _graphs.get(calculation.id)
+    if cached is not None and cached[0] == int(calculation.b):
+        _graphs.move_to_end(calculation.id)
+        return cached[1]
+    rows = db.query(
+        WorksheetCell.name, WorksheetCell.formula, WorksheetCell.refs, WorksheetCell.value, WorksheetCell.error
+    ).filter(WorksheetCell.calculation_id == calculation.id)
+    graph = WorksheetGraph.load(
+        (name, formula, tuple(refs.split()), value, error) for name, formula, refs, value, error in rows
+    )
+    _cache(calculation.id, int(calculation.b), graph)
+    return graph
+
+
+def _cell_rows(calculation_id: int, graph: WorksheetGraph, names) -> list[dict]:
+    rows = []
+    for name in names:
+        value, error = graph.states[name]
+        rows.append(dict(
+            calculation_id=calculation_id, name=name, formula=graph.formulas[name],
+            refs=" ".join(graph.references[name]), value=value, error=error,
+        ))
+    return rows
+
+
+def _get_worksheet(db: Session, calculation_id: int, user: User) -> Calculation:
+    calculation = db.query(Calculation).filter(
+        Calculation.id == calculation_id, Calculation.user_id == user.id, Calculation.type == "worksheet"
+    ).first()
+    if not calculation:
+        raise HTTPException(status_code=404, detail="Worksheet not found")
+    return calculation
+
+
+@router.post("/worksheets", response_model=WorksheetRead)
+def create_worksheet(sheet: WorksheetCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """
+    WORKSHEET: Create a worksheet of cells (POST /calculations/worksheets)
+    Stored as a calculation of type "worksheet": a is the cell count, b the version and
+    result the number of cells evaluated by the last change; the cells are linked rows.
+    """
+    graph = WorksheetGraph()
+    try:
+        _, recalculated = graph.update({name: normalize_formula(formula) for name, formula in sheet.cells.items()})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    calculation = Calculation(
+        a=len(graph.formulas), b=0, type="worksheet", result=recalculated, user_id=current_user.id
+    )
+    db.add(calculation)
+    db.flush()
+    if graph.formulas:
+        db.execute(insert(WorksheetCell), _cell_rows(calculation.id, graph, graph.formulas))
+    db.commit()
+    with _edit_lock:
+        _cache(calculation.id, 0, graph)
+    return WorksheetRead(
+        calculation_id=calculation.id, version=0,
+        cells={
+            name: CellRead(formula=formula, value=graph.states[name][0], error=graph.states[name][1])
+            for name, formula in graph.formulas.items()
+        }
+    )
+
+
+@router.get("/worksheets/{calculation_id}", response_model=WorksheetRead)
+def read_worksheet(calculation_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """
+    WORKSHEET: Read every cell (GET /calculations/worksheets/{id})
+    """
+    calculation = _get_worksheet(db, calculation_id, current_user)
+    rows = db.query(WorksheetCell.name, WorksheetCell.formula, WorksheetCell.value, WorksheetCell.error).filter(
+        WorksheetCell.calculation_id == calculation.id
+    ).order_by(WorksheetCell.id)
+    return WorksheetRead(
+        calculation_id=calculation.id, version=int(calculation.b),
+        cells={name: CellRead(formula=formula, value=value, error=error) for name, formula, value, error in rows}
+    )
+
+
+@router.patch("/worksheets/{calculation_id}", response_model=WorksheetDelta)
+def edit_worksheet(
+    calculation_id: int,
+    edit: WorksheetUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    WORKSHEET: Change or delete cells (PATCH /calculations/worksheets/{id})
+    Only the cells downstream of the edit are recalculated, and only those whose value
+    or error changed are written and returned.
+    """
+    calculation = _get_worksheet(db, calculation_id, current_user)
+    try:
+        changes = {
+            name: None if formula is None else normalize_formula(formula) for name, formula in edit.cells.items()
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    with _edit_lock:
+        graph = _load_graph(db, calculation)
+        deleted = [name for name, formula in changes.items() if formula is None and name in graph.formulas]
+        try:
+            changed, recalculated = graph.update(changes)
+        except BaseException as e:
+            # a failure partway through evaluation can leave the graph half updated: reload it next time
+            _graphs.pop(calculation.id, None)
+            if isinstance(e, ValueError):
+                raise HTTPException(status_code=400, detail=str(e))
+            raise
+        version = int(calculation.b)
+        try:
+            # optimistic check: another process may have edited the sheet since it was loaded
+            bumped = db.execute(
+                update(Calculation)
+                .where(Calculation.id == calculation.id, Calculation.b == version)
+                .values(b=version + 1, a=len(graph.formulas), result=recalculated)
+                .execution_options(synchronize_session=False)
+            )
+            if bumped.rowcount != 1:
+                raise HTTPException(status_code=409, detail="Worksheet was changed concurrently; retry the edit")
+            edited = [name for name, formula in changes.items() if formula is not None]
+            replaced = deleted + edited
+            for start in range(0, len(replaced), _IN_CLAUSE_SIZE):
+                db.execute(delete(WorksheetCell).where(
+                    WorksheetCell.calculation_id == calculation.id,
+                    WorksheetCell.name.in_(replaced[start:start + _IN_CLAUSE_SIZE])
+                ))
+            if edited:
+                db.execute(insert(WorksheetCell), _cell_rows(calculation.id, graph, edited))
+            recomputed = [name for name in changed if name not in changes]
+            if recomputed:
+                table = WorksheetCell.__table__
+                db.execute(
+                    update(table)
+                    .where(table.c.calculation_id == calculation.id, table.c.name == bindparam("cell"))
+                    .values(value=bindparam("new_value"), error=bindparam("new_error")),
+                    [{"cell": name, "new_value": changed[name][0], "new_error": changed[name][1]} for name in recomputed]
+                )
+            db.commit()
+        except BaseException:
+            db.rollback()
+            _graphs.pop(calculation.id, None)  # the graph is ahead of the database
+            raise
+        _cache(calculation.id, version + 1, graph)
+
+    return WorksheetDelta(
+        calculation_id=calculation.id, version=version + 1, recalculated=recalculated,
+        changed={name: CellState(value=value, error=error) for name, (value, error) in changed.items()},
+        deleted=deleted
+    )
@@ -2,9 +2,11 @@ import sys
 import os
 import pytest
 import asyncio
+import uuid
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
+from fastapi.testclient import TestClient
 
 # Ensure project root is on sys.path so "app" package is found
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -57,3 +59,16 @@ def event_loop():
     loop = asyncio.new_event_loop()
     yield loop
     loop.close()
+
+
+@pytest.fixture(scope="function")
+def auth_headers(db_session):
+    """Register a fresh user and return its bearer token headers."""
+    unique_id = str(uuid.uuid4())[:8]
+    response = TestClient(app).post("/users/register", json={
+        "username": f"user_{unique_id}",
+        "email": f"user_{unique_id}@example.com",
+        "password": "testpass123"
+    })
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -3,6 +3,7 @@ Integration tests for user profile management, advanced calculations, and statis
 """
 import pytest
 import uuid
+import numpy as np
 from fastapi.testclient import TestClient
 from app.main import app
 
@@ -341,3 +342,366 @@ class TestAuthenticationRequired:
         """Test that statistics endpoint requires authentication"""
         response = client.get("/calculations/stats/summary")
         assert response.status_code == 403
+
+
+class TestBatchCalculations:
+    """Test element-wise batch computation endpoints"""
+
+    def test_batch_json(self, db_session, auth_headers):
+        response = client.post("/calculations/batch", json={
+            "type": "power",
+            "a": [2, 3, 4],
+            "b": [3, 2, 0.5]
+        }, headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 3
+        assert data["results"] == [8, 9, 2]
+
+    def test_batch_length_mismatch(self, db_session, auth_headers):
+        response = client.post("/calculations/batch", json={
+            "type": "add",
+            "a": [1, 2],
+            "b": [1]
+        }, headers=auth_headers)
+        assert response.status_code == 422
+
+    def test_batch_invalid_type(self, db_session, auth_headers):
+        response = client.post("/calculations/batch", json={
+            "type": "foo",
+            "a": [1],
+            "b": [1]
+        }, headers=auth_headers)
+        assert response.status_code == 422
+
+    @pytest.mark.parametrize("op_type, a, b", [("power", [2, 10], [3, 400]), ("divide", [1e308], [1e-10])])
+    def test_batch_overflow(self, db_session, auth_headers, op_type, a, b):
+        response = client.post("/calculations/batch", json={
+            "type": op_type, "a": a, "b": b
+        }, headers=auth_headers)
+        assert response.status_code == 400
+
+    def test_batch_binary(self, db_session, auth_headers):
+        import numpy as np
+        a = np.array([1.0, 2.0, 3.0])
+        b = np.array([2.0, 4.0, 8.0])
+        response = client.post(
+            "/calculations/batch/binary?type=divide",
+            content=np.concatenate([a, b]).astype("<f8").tobytes(),
+            headers={**auth_headers, "Content-Type": "application/octet-stream"}
+        )
+        assert response.status_code == 200
+        assert np.frombuffer(response.content, dtype="<f8").tolist() == [0.5, 0.5, 0.375]
+
+
+    def test_batch_fast_mode(self, db_session, auth_headers):
+        response = client.post("/calculations/batch", json={
+            "type": "sin", "a": [0.0, 1.0, 2.0], "b": [0.0, 0.0, 0.0], "mode": "fast"
+        }, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["mode"] == "fast" and data["error_kind"] == "absolute"
+        assert np.abs(np.array(data["results"]) - np.sin([0.0, 1.0, 2.0])).max() <= data["max_error"]
+
+    def test_batch_fast_mode_falls_back_to_exact(self, db_session, auth_headers):
+        response = client.post("/calculations/batch", json={
+            "type": "add", "a": [1.0], "b": [2.0], "mode": "fast"
+        }, headers=auth_headers)
+        assert response.json()["mode"] == "exact"
+        assert response.json()["max_error"] is None
+
+    def test_batch_binary_fast_mode(self, db_session, auth_headers):
+        body = np.array([0.0, 10.0, 0.0, 0.0], dtype="<f8").tobytes()
+        response = client.post(
+            "/calculations/batch/binary?type=normal_cdf&mode=fast", content=body, headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.headers["X-Calculation-Mode"] == "fast"
+        assert float(response.headers["X-Max-Error"]) > 0
+        assert np.allclose(np.frombuffer(response.content, dtype="<f8"), [0.5, 1.0], rtol=0, atol=1e-7)
+
+
+class TestPrecisionCalculations:
+    """Test the opt-in arbitrary-precision mode"""
+
+    def test_precise_sqrt_is_stored(self, db_session, auth_headers):
+        response = client.post("/calculations", json={
+            "a": 2,
+            "b": 0,
+            "type": "sqrt",
+            "precision": 30
+        }, headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["precision"] == 30
+        assert data["result_text"] == "1.41421356237309504880168872421"
+        assert data["result"] == pytest.approx(1.4142135623730951)
+
+        stored = client.get(f"/calculations/{data['id']}", headers=auth_headers).json()
+        assert stored["result_text"] == data["result_text"]
+
+    def test_default_mode_has_no_result_text(self, db_session, auth_headers):
+        response = client.post("/calculations", json={
+            "a": 1,
+            "b": 2,
+            "type": "add"
+        }, headers=auth_headers)
+        assert response.json()["result_text"] is None
+
+    def test_precision_out_of_range(self, db_session, auth_headers):
+        response = client.post("/calculations", json={
+            "a": 1,
+            "b": 2,
+            "type": "add",
+            "precision": 0
+        }, headers=auth_headers)
+        assert response.status_code == 422
+
+    def test_read_constant(self, db_session, auth_headers):
+        response = client.get("/calculations/constants/pi?digits=10", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json() == {"name": "pi", "digits": 10, "value": "3.1415926535"}
+
+    def test_read_unknown_constant(self, db_session, auth_headers):
+        response = client.get("/calculations/constants/tau", headers=auth_headers)
+        assert response.status_code == 404
+
+
+class TestScientificCalculations:
+    """Test scientific functions via the calculations API"""
+
+    def test_sin_operation(self, db_session, auth_headers):
+        response = client.post("/calculations", json={
+            "a": 0.5,
+            "b": 0,
+            "type": "sin"
+        }, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()["result"] == pytest.approx(0.479425538604203)
+
+    def test_log_of_negative(self, db_session, auth_headers):
+        response = client.post("/calculations", json={
+            "a": -1,
+            "b": 0,
+            "type": "log"
+        }, headers=auth_headers)
+        assert response.status_code == 400
+        assert "logarithm" in response.json()["detail"].lower()
+
+    def test_precision_rejects_scientific_function(self, db_session, auth_headers):
+        response = client.post("/calculations", json={
+            "a": 1,
+            "b": 0,
+            "type": "gamma",
+            "precision": 20
+        }, headers=auth_headers)
+        assert response.status_code == 422
+
+
+class TestIntegerCalculations:
+    """Test the exact big-integer endpoint"""
+
+    def test_modpow_with_huge_exponent(self, db_session, auth_headers):
+        response = client.post("/calculations/integer", json={
+            "type": "modpow",
+            "operands": [3, "1000000000000000000000000000000", 1000000007]
+        }, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()["result"] == str(pow(3, 10 ** 30, 1000000007))
+
+    def test_factorize(self, db_session, auth_headers):
+        response = client.post("/calculations/integer", json={
+            "type": "factorize",
+            "operands": [360]
+        }, headers=auth_headers)
+        assert response.json()["result"] == {"2": 3, "3": 2, "5": 1}
+
+    def test_isprime(self, db_session, auth_headers):
+        response = client.post("/calculations/integer", json={
+            "type": "isprime",
+            "operands": [2147483647]
+        }, headers=auth_headers)
+        assert response.json()["result"] is True
+
+    def test_invalid_inverse(self, db_session, auth_headers):
+        response = client.post("/calculations/integer", json={
+            "type": "modinv",
+            "operands": [6, 9]
+        }, headers=auth_headers)
+        assert response.status_code == 400
+
+
+class TestNaryCalculations:
+    """Test n-ary operations over packed operands"""
+
+    def test_sum_is_one_stored_calculation(self, db_session, auth_headers):
+        operands = [0.1] * 10000
+        response = client.post("/calculations/nary", json={"type": "sum", "operands": operands}, headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 10000
+        assert data["result"] == 1000.0
+        payload = client.get(f"/calculations/{data['calculation_id']}/payload", headers=auth_headers)
+        assert payload.headers["X-Payload-Kind"] == "operands"
+        assert np.array_equal(np.frombuffer(payload.content, dtype="<f8"), operands)
+        response = client.put(f"/calculations/{data['calculation_id']}", json={"a": 1, "b": 2, "type": "add"}, headers=auth_headers)
+        assert response.status_code == 409
+
+    def test_binary_body_without_persisting(self, db_session, auth_headers):
+        response = client.post(
+            "/calculations/nary/binary?type=hypot&persist=false",
+            content=np.array([3.0, 4.0, 12.0], dtype="<f8").tobytes(),
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["result"] == 13.0
+        assert response.json()["calculation_id"] is None
+
+    def test_invalid_type(self, db_session, auth_headers):
+        response = client.post("/calculations/nary", json={"type": "median", "operands": [1.0]}, headers=auth_headers)
+        assert response.status_code == 400
+
+    def test_product_overflow(self, db_session, auth_headers):
+        response = client.post("/calculations/nary", json={"type": "product", "operands": [1e300, 1e300]}, headers=auth_headers)
+        assert response.status_code == 400
+
+    def test_sum_overflow(self, db_session, auth_headers):
+        response = client.post("/calculations/nary", json={"type": "sum", "operands": [1e308, 1e308]}, headers=auth_headers)
+        assert response.status_code == 400
+        response = client.post("/calculations/nary", json={"type": "mean", "operands": [1e308, 1e308]}, headers=auth_headers)
+        assert response.json()["result"] == 1e308
+
+
+class TestCalculationPrograms:
+    """Test multi-step RPN programs"""
+
+    def test_program_steps_share_a_chain(self, db_session, auth_headers):
+        response = client.post("/calculations/programs", json={
+            "steps": [3, 4, "power", 2, "divide"]
+        }, headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["result"] == 40.5
+        assert [step["result"] for step in data["steps"]] == [81.0, 40.5]
+        chain = client.get(f"/calculations?chain_id={data['chain_id']}", headers=auth_headers).json()
+        assert [c["id"] for c in chain] == [step["calculation_id"] for step in data["steps"]]
+        assert [(c["type"], c["a"], c["b"]) for c in chain] == [("power", 3.0, 4.0), ("divide", 81.0, 2.0)]
+        response = client.put(f"/calculations/{chain[0]['id']}", json={"a": 1, "b": 2, "type": "add"}, headers=auth_headers)
+        assert response.status_code == 409
+
+    def test_failing_program_stores_nothing(self, db_session, auth_headers):
+        before = len(client.get("/calculations", headers=auth_headers).json())
+        response = client.post("/calculations/programs", json={
+            "steps": [1, 2, "add", 0, "divide"]
+        }, headers=auth_headers)
+
+        assert response.status_code == 400
+        assert "Step 4" in response.json()["detail"]
+        assert len(client.get("/calculations", headers=auth_headers).json()) == before
+
+
+class TestUnitCalculations:
+    """Test unit-aware calculations and conversions"""
+
+    def test_speed_in_requested_unit(self, db_session, auth_headers):
+        response = client.post("/calculations", json={
+            "a": 5, "a_unit": "km", "b": 20, "b_unit": "min", "type": "divide", "result_unit": "km/h"
+        }, headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["result"] == pytest.approx(15.0)
+        assert (data["a_unit"], data["b_unit"], data["result_unit"]) == ("km", "min", "km/h")
+
+    def test_result_unit_derived_from_operands(self, db_session, auth_headers):
+        response = client.post("/calculations", json={
+            "a": 2, "a_unit": "m", "b": 3, "b_unit": "m", "type": "multiply"
+        }, headers=auth_headers)
+        assert response.json()["result_unit"] == "m^2"
+
+    def test_incompatible_units(self, db_session, auth_headers):
+        response = client.post("/calculations", json={
+            "a": 1, "a_unit": "km", "b": 1, "b_unit": "kg", "type": "add"
+        }, headers=auth_headers)
+        assert response.status_code == 400
+
+    def test_edit_drops_units(self, db_session, auth_headers):
+        created = client.post("/calculations", json={
+            "a": 1, "a_unit": "km", "b": 500, "b_unit": "m", "type": "add"
+        }, headers=auth_headers).json()
+        assert created["result"] == 1.5
+        edited = client.put(f"/calculations/{created['id']}", json={"a": 1, "b": 500, "type": "add"}, headers=auth_headers)
+        assert edited.json()["result"] == 501
+        assert edited.json()["result_unit"] is None
+
+    def test_convert(self, db_session, auth_headers):
+        response = client.post("/calculations/convert", json={
+            "value": 100, "from_unit": "km/h", "to_unit": "m/s"
+        }, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["result"] == pytest.approx(27.777777777777)
+
+    def test_unit_exponent_limits(self, db_session, auth_headers):
+        response = client.post("/calculations/convert", json={
+            "value": 1, "from_unit": "km^12", "to_unit": "km^12"
+        }, headers=auth_headers)
+        assert response.json()["result"] == 1
+        response = client.post("/calculations", json={
+            "a": 2, "a_unit": "m", "b": 1e5, "type": "power"
+        }, headers=auth_headers)
+        assert response.status_code == 400
+        assert "limited to" in response.json()["detail"]
+
+    def test_convert_overflow(self, db_session, auth_headers):
+        response = client.post("/calculations/convert", json={
+            "value": 1e308, "from_unit": "km", "to_unit": "mm"
+        }, headers=auth_headers)
+        assert response.status_code == 400
+
+
+class TestComplexCalculations:
+    """Test the opt-in complex domain"""
+
+    def test_sqrt_of_negative_is_stored_as_parts(self, db_session, auth_headers):
+        response = client.post("/calculations", json={
+            "a": -4, "b": 0, "type": "sqrt", "domain": "complex"
+        }, headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["result"], data["result_imag"]) == (0.0, 2.0)
+        assert data["a_imag"] == 0.0
+
+    def test_real_fractional_power_of_negative(self, db_session, auth_headers):
+        response = client.post("/calculations", json={"a": -8, "b": 0.5, "type": "power"}, headers=auth_headers)
+        assert response.status_code == 400
+        assert "complex" in response.json()["detail"]
+
+    def test_unsupported_operation(self, db_session, auth_headers):
+        response = client.post("/calculations", json={
+            "a": 4, "b": 6, "type": "gcd", "domain": "complex"
+        }, headers=auth_headers)
+        assert response.status_code == 400
+
+    def test_complex_batch(self, db_session, auth_headers):
+        response = client.post("/calculations/batch", json={
+            "type": "multiply", "domain": "complex",
+            "a": [1.0, 0.0], "a_imag": [2.0, 1.0], "b": [3.0, 0.0], "b_imag": [-1.0, 1.0]
+        }, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["results"] == [5.0, -1.0]
+        assert response.json()["results_imag"] == [5.0, 0.0]
+
+    def test_complex_batch_binary(self, db_session, auth_headers):
+        body = np.array([-4, -9, 0, 0], dtype="<c16").tobytes()
+        response = client.post(
+            "/calculations/batch/binary?type=sqrt&domain=complex", content=body, headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert np.frombuffer(response.content, dtype="<c16").tolist() == [2j, 3j]
@@ -96,6 +96,20 @@ def test_calculate_divide_by_zero(db_session):
     assert "divide" in detail or "division" in detail or "zero" in detail
 
 
+def test_calculate_overflow(db_session):
+    """Test results beyond the float range return 400, on create and on update"""
+    headers = auth_headers()
+    for body in ({"a": 10, "b": 400, "type": "power"}, {"a": 1e308, "b": 10, "type": "multiply"}):
+        response = client.post("/calculations", json=body, headers=headers)
+        assert response.status_code == 400
+        assert "floating point range" in response.json()["detail"]
+
+    calc_id = client.post("/calculations", json={"a": 2, "b": 3, "type": "power"}, headers=headers).json()["id"]
+    response = client.put(f"/calculations/{calc_id}", json={"a": 10, "b": 400, "type": "power"}, headers=headers)
+    assert response.status_code == 400
+    assert client.get(f"/calculations/{calc_id}", headers=headers).json()["result"] == 8
+
+
 def test_calculate_invalid_type(db_session):
     """Test invalid calculation type returns error"""
     headers = auth_headers()
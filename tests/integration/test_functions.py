@@ -0,0 +1,109 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+def define(headers, definition: str):
+    return client.post("/calculations/functions", json={"definition": definition}, headers=headers)
+
+
+def test_define_list_and_evaluate(db_session, auth_headers):
+    response = define(auth_headers, "f(x, y) = x^2 + sqrt(y)")
+    assert response.status_code == 200
+    assert response.json() == {"name": "f", "parameters": ["x", "y"], "body": "x^2 + sqrt(y)"}
+    assert [f["name"] for f in client.get("/calculations/functions", headers=auth_headers).json()] == ["f"]
+
+    response = client.post("/calculations/functions/f/evaluate", json={"arguments": [[1, 2, 3], 4]}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == {"name": "f", "values": [3.0, 6.0, 11.0]}
+    response = client.post("/calculations/functions/f/evaluate", json={"arguments": [1, -1]}, headers=auth_headers)
+    assert response.json()["values"] == [None]
+
+
+def test_redefinition_takes_effect(db_session, auth_headers):
+    define(auth_headers, "g(x) = x + 1")
+    url = "/calculations/functions/g/evaluate"
+    assert client.post(url, json={"arguments": [1]}, headers=auth_headers).json()["values"] == [2.0]
+    define(auth_headers, "g(x) = x * 10")
+    assert client.post(url, json={"arguments": [1]}, headers=auth_headers).json()["values"] == [10.0]
+
+
+def test_functions_in_calculations_and_expressions(db_session, auth_headers):
+    define(auth_headers, "hyp(a, b) = sqrt(a^2 + b^2)")
+    define(auth_headers, "twice(v) = 2 * v")
+    response = client.post("/calculations", json={"a": 3, "b": 4, "type": "hyp"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["result"] == 5.0
+    assert response.json()["type"] == "hyp"
+    response = client.post("/calculations", json={"a": 3, "b": 0, "type": "twice"}, headers=auth_headers)
+    assert response.json()["result"] == 6.0
+
+    response = client.post("/calculations/integrate", json={
+        "expression": "twice(x)", "lower": 0, "upper": 1
+    }, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["value"] == pytest.approx(1.0)
+    response = client.post("/calculations/solve", json={
+        "expression": "hyp(x, 3) - 5", "brackets": [[0, 10]]
+    }, headers=auth_headers)
+    assert response.json()["roots"] == [pytest.approx(4.0)]
+
+
+def test_user_function_calculation_errors_and_edits(db_session, auth_headers):
+    define(auth_headers, "ratio(x, y) = x / y")
+    response = client.post("/calculations", json={"a": 1, "b": 0, "type": "ratio"}, headers=auth_headers)
+    assert response.status_code == 400
+    response = client.post("/calculations", json={"a": 6, "b": 3, "type": "ratio"}, headers=auth_headers)
+    calculation_id = response.json()["id"]
+    response = client.put(f"/calculations/{calculation_id}", json={"a": 9, "b": 3, "type": "ratio"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert (response.json()["type"], response.json()["result"]) == ("ratio", 3.0)
+    response = client.put(f"/calculations/{calculation_id}", json={"a": 9, "b": 0, "type": "ratio"}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_user_function_rejects_complex_domain(db_session, auth_headers):
+    define(auth_headers, "ratio(x, y) = x / y")
+    payload = {"a": 1, "b": 2, "type": "ratio", "domain": "complex", "a_imag": 1}
+    response = client.post("/calculations", json=payload, headers=auth_headers)
+    assert response.status_code == 422
+    calculation_id = client.post("/calculations", json={"a": 1, "b": 2, "type": "add"}, headers=auth_headers).json()["id"]
+    assert client.put(f"/calculations/{calculation_id}", json=payload, headers=auth_headers).status_code == 422
+
+
+def test_user_function_rejects_units(db_session, auth_headers):
+    define(auth_headers, "ratio(x, y) = x / y")
+    response = client.post(
+        "/calculations", json={"a": 1, "a_unit": "km", "b": 2, "b_unit": "m", "type": "ratio"}, headers=auth_headers
+    )
+    assert response.status_code == 422
+
+
+def test_function_errors(db_session, auth_headers):
+    assert define(auth_headers, "sin(x) = x").status_code == 400
+    assert define(auth_headers, "k(x) = x + y").status_code == 400
+    assert define(auth_headers, "k(x) = sin()").status_code == 400
+    define(auth_headers, "base(x) = x")
+    define(auth_headers, "user(x) = base(x) + 1")
+    assert define(auth_headers, "base(x) = user(x)").status_code == 400
+    response = client.delete("/calculations/functions/base", headers=auth_headers)
+    assert response.status_code == 400
+    assert "user" in response.json()["detail"]
+    assert client.delete("/calculations/functions/user", headers=auth_headers).status_code == 200
+    assert client.delete("/calculations/functions/user", headers=auth_headers).status_code == 404
+    response = client.post("/calculations/functions/missing/evaluate", json={"arguments": [1]}, headers=auth_headers)
+    assert response.status_code == 404
+    response = client.post("/calculations/functions/base/evaluate", json={"arguments": [1, 2]}, headers=auth_headers)
+    assert response.status_code == 400
+    # functions are private to their owner
+    other = client.post("/users/register", json={
+        "username": f"other_{uuid.uuid4().hex[:8]}", "email": f"other_{uuid.uuid4().hex[:8]}@example.com",
+        "password": "testpass123"
+    }).json()["access_token"]
+    response = client.post("/calculations", json={"a": 1, "b": 0, "type": "base"}, headers={"Authorization": f"Bearer {other}"})
+    assert response.status_code == 422
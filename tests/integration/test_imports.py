@@ -0,0 +1,67 @@
+import gzip
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.operations.exporter import parquet_available
+
+client = TestClient(app)
+
+
+def test_csv_import_in_chunks(db_session, auth_headers, monkeypatch):
+    monkeypatch.setattr("app.routes.imports.CHUNK_ROWS", 4)
+    rows = [f"{i},2,multiply" for i in range(10)] + ["1,0,divide", "1,2,unknown"]
+    body = ("a,b,type\n" + "\n".join(rows)).encode()
+
+    response = client.post("/calculations/import?format=csv&import_id=legacy-1", content=body, headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["status"], data["rows"], data["imported"], data["errors"]) == ("done", 12, 10, 2)
+    assert [sample["line"] for sample in data["error_samples"]] == [12, 13]
+    history = client.get("/calculations", headers=auth_headers).json()
+    assert sorted(c["result"] for c in history) == [2.0 * i for i in range(10)]
+    status = client.get("/calculations/import/legacy-1", headers=auth_headers)
+    assert status.json()["imported"] == 10
+
+
+def test_ndjson_import(db_session, auth_headers):
+    body = "\n".join(json.dumps(row) for row in [
+        {"a": 9, "type": "sqrt", "result": 3},
+        {"a": 1, "b": 1, "type": "add"},
+    ]).encode()
+    response = client.post("/calculations/import?format=ndjson", content=body, headers=auth_headers)
+    assert response.json()["imported"] == 2
+
+
+def test_bad_header(db_session, auth_headers):
+    response = client.post("/calculations/import", content=b"x,y\n1,2", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_status_is_private(db_session, auth_headers):
+    client.post("/calculations/import?import_id=private-1", content=b"a,type\n4,sqrt", headers=auth_headers)
+    assert client.get("/calculations/import/private-1").status_code in (401, 403)
+    assert client.get("/calculations/import/missing", headers=auth_headers).status_code == 404
+
+
+def test_export_streams_history(db_session, auth_headers):
+    client.post("/calculations/import", content=b"a,b,type\n1,2,add\n3,4,multiply\n9,,sqrt", headers=auth_headers)
+
+    response = client.get("/calculations/export?format=ndjson", headers=auth_headers)
+    assert response.status_code == 200
+    assert [json.loads(line)["result"] for line in response.text.splitlines()] == [3.0, 12.0, 3.0]
+
+    response = client.get("/calculations/export?format=csv&compression=gzip&type=sqrt", headers=auth_headers)
+    assert response.headers["content-disposition"].endswith('calculations.csv.gz"')
+    lines = gzip.decompress(response.content).decode().splitlines()
+    assert len(lines) == 2 and ",sqrt," in lines[1]
+
+
+def test_parquet_export_needs_pyarrow(db_session, auth_headers):
+    response = client.get("/calculations/export?format=parquet", headers=auth_headers)
+    if parquet_available():
+        assert response.content.startswith(b"PAR1")
+    else:
+        assert response.status_code == 400
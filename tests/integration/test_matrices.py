@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.operations.linalg import pack_matrices, unpack_matrices
+
+client = TestClient(app)
+
+
+def test_solve(db_session, auth_headers):
+    response = client.post("/calculations/matrix", json={
+        "type": "solve",
+        "matrices": [[[3, 1], [1, 2]], [9, 8]]
+    }, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["rows"], data["cols"]) == (2, 1)
+    assert np.ravel(data["result"]) == pytest.approx([2, 3])
+    assert data["calculation_id"] is None
+
+
+def test_singular_matrix(db_session, auth_headers):
+    response = client.post("/calculations/matrix", json={
+        "type": "inverse",
+        "matrices": [[[1, 2], [2, 4]]]
+    }, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_persisted_result_payload(db_session, auth_headers):
+    response = client.post("/calculations/matrix", json={
+        "type": "inverse",
+        "matrices": [[[2, 0], [0, 4]]],
+        "persist": True
+    }, headers=auth_headers)
+    calculation_id = response.json()["calculation_id"]
+    assert calculation_id is not None
+
+    stored = client.get(f"/calculations/{calculation_id}", headers=auth_headers).json()
+    assert stored["type"] == "matrix_inverse"
+
+    payload = client.get(f"/calculations/{calculation_id}/payload", headers=auth_headers)
+    assert payload.status_code == 200
+    assert unpack_matrices(payload.content)[0].tolist() == [[0.5, 0], [0, 0.25]]
+
+    client.delete(f"/calculations/{calculation_id}", headers=auth_headers)
+    assert client.get(f"/calculations/{calculation_id}/payload", headers=auth_headers).status_code == 404
+
+
+def test_binary_multiply(db_session, auth_headers):
+    a = np.arange(6, dtype=float).reshape(2, 3)
+    b = np.ones((3, 2))
+    response = client.post(
+        "/calculations/matrix/binary?type=multiply",
+        content=pack_matrices([a, b]),
+        headers={**auth_headers, "Content-Type": "application/octet-stream"}
+    )
+    assert response.status_code == 200
+    assert unpack_matrices(response.content)[0].tolist() == (a @ b).tolist()
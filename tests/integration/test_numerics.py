@@ -0,0 +1,435 @@
+import json
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+SPARSE_SYSTEM = {
+    "shape": [3, 3],
+    "rows": [0, 0, 1, 1, 1, 2, 2],
+    "cols": [0, 1, 0, 1, 2, 1, 2],
+    "values": [4, -1, -1, 4, -1, -1, 4],
+    "b": [3, 2, 3],
+}
+
+
+def test_sparse_solve_coo(db_session, auth_headers):
+    response = client.post("/calculations/sparse/solve", json={**SPARSE_SYSTEM, "preconditioner": "jacobi"}, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["converged"]
+    assert data["x"] == pytest.approx([1, 1, 1])
+
+
+def test_sparse_solve_csr_gmres(db_session, auth_headers):
+    response = client.post("/calculations/sparse/solve", json={
+        "format": "csr",
+        "shape": [2, 2],
+        "values": [2, 1, 3],
+        "indices": [0, 1, 1],
+        "indptr": [0, 2, 3],
+        "b": [5, 6],
+        "method": "gmres"
+    }, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["x"] == pytest.approx([1.5, 2])
+
+
+def test_sparse_solve_stream(db_session, auth_headers):
+    n = 200
+    request = {
+        "shape": [n, n],
+        "rows": list(range(n)) + list(range(1, n)) + list(range(n - 1)),
+        "cols": list(range(n)) + list(range(n - 1)) + list(range(1, n)),
+        "values": [2.5] * n + [-1] * (2 * n - 2),
+        "b": [1] * n,
+        "stream": True
+    }
+    response = client.post("/calculations/sparse/solve", json=request, headers=auth_headers)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert "residual" in lines[0] and "x" not in lines[0]
+    assert lines[-1]["converged"] and len(lines[-1]["x"]) == n
+
+
+def test_sparse_solve_bad_input(db_session, auth_headers):
+    response = client.post("/calculations/sparse/solve", json={**SPARSE_SYSTEM, "b": [1, 2]}, headers=auth_headers)
+    assert response.status_code == 422
+    response = client.post("/calculations/sparse/solve", json={"shape": [1, 1], "values": [1], "b": [1]}, headers=auth_headers)
+    assert response.status_code == 422
+    for body in (
+        {"shape": [10 ** 10, 10 ** 10], "rows": [0], "cols": [0], "values": [1], "b": [1]},
+        {"shape": [-1, -1], "rows": [0], "cols": [0], "values": [1], "b": []},
+        {"shape": [2, 2], "rows": [0, 2], "cols": [0, 1], "values": [1, 1], "b": [1, 1]},
+        {"format": "csr", "shape": [2, 2], "indices": [0, 1], "indptr": [0, 2], "values": [1, 1], "b": [1, 1]},
+    ):
+        response = client.post("/calculations/sparse/solve", json=body, headers=auth_headers)
+        assert response.status_code == 422
+
+
+def test_sparse_solve_extreme_entries(db_session, auth_headers):
+    body = {"shape": [3, 3], "rows": [0, 1, 2], "cols": [0, 1, 2], "values": [1e308, 1e-308, 1], "b": [1e308, 1, 1]}
+    response = client.post("/calculations/sparse/solve", json=body, headers=auth_headers)
+    assert response.status_code == 200
+    assert not response.json()["converged"]
+    assert response.json()["residual"] is None
+    response = client.post("/calculations/sparse/solve", json={**body, "stream": True}, headers=auth_headers)
+    assert response.status_code == 200
+    assert json.loads(response.text.splitlines()[-1])["residual"] is None
+
+
+def test_integrate_expression(db_session, auth_headers):
+    response = client.post("/calculations/integrate", json={
+        "expression": "exp(-a*x^2)", "lower": "-inf", "upper": "inf", "parameters": {"a": 1}
+    }, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["converged"]
+    assert data["value"] == pytest.approx(1.7724538509055159)
+
+    response = client.post("/calculations/integrate", json={
+        "expression": "t^2", "variable": "t", "lower": 0, "upper": 3, "method": "simpson"
+    }, headers=auth_headers)
+    assert response.json()["value"] == pytest.approx(9.0)
+
+
+def test_deeply_nested_expression_is_rejected(db_session, auth_headers):
+    response = client.post("/calculations/integrate", json={
+        "expression": "+".join(["x"] * 999), "lower": 0, "upper": 1
+    }, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_integrate_expression_errors(db_session, auth_headers):
+    for body in (
+        {"expression": "__import__('os')", "lower": 0, "upper": 1},
+        {"expression": "a*x", "lower": 0, "upper": 1},
+        {"expression": "1/x", "lower": -1, "upper": 1},
+        {"expression": "sin()", "lower": 0, "upper": 1},
+        {"expression": "sin(x, x)", "lower": 0, "upper": 1},
+    ):
+        response = client.post("/calculations/integrate", json=body, headers=auth_headers)
+        assert response.status_code == 400
+
+
+def test_differentiate_expression(db_session, auth_headers):
+    response = client.post("/calculations/differentiate", json={
+        "expression": "x^3", "points": [1, 2], "order": 2
+    }, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["values"] == pytest.approx([6, 12])
+    response = client.post("/calculations/differentiate", json={
+        "expression": "x", "points": [1], "order": 3
+    }, headers=auth_headers)
+    assert response.status_code == 422
+
+
+ODE_REQUEST = {
+    "equations": ["v", "-k*x"],
+    "state": ["x", "v"],
+    "t_span": [0, 3],
+    "y0": [1, 0],
+    "parameters": {"k": 4},
+}
+
+
+def test_ode_dense_output(db_session, auth_headers):
+    response = client.post("/calculations/ode", json={**ODE_REQUEST, "t_eval": [0, 1, 2, 3]}, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["t"] == [0, 1, 2, 3]
+    assert [y[0] for y in data["y"]] == pytest.approx([1, -0.4161468, -0.6536436, 0.9601703], abs=1e-5)
+    assert data["steps"] > 0
+
+
+def test_ode_stream(db_session, auth_headers):
+    response = client.post("/calculations/ode", json={**ODE_REQUEST, "method": "rosenbrock", "stream": True}, headers=auth_headers)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0] == {"t": 0, "y": [1, 0]}
+    assert lines[-2]["t"] == 3
+    assert lines[-1]["steps"] == len(lines) - 2
+
+
+def test_ode_errors(db_session, auth_headers):
+    response = client.post("/calculations/ode", json={**ODE_REQUEST, "y0": [1]}, headers=auth_headers)
+    assert response.status_code == 422
+    response = client.post("/calculations/ode", json={**ODE_REQUEST, "parameters": {}}, headers=auth_headers)
+    assert response.status_code == 400
+    response = client.post("/calculations/ode", json={**ODE_REQUEST, "t_span": [3, 0], "stream": True}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_solve_endpoint(db_session, auth_headers):
+    response = client.post("/calculations/solve", json={
+        "method": "brent", "expression": "cos(x) - x", "brackets": [[0, 1], [-2, 2]]
+    }, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["roots"] == pytest.approx([0.7390851332151607] * 2)
+
+    response = client.post("/calculations/solve", json={
+        "method": "newton", "expression": "x^2 - c", "parameters": {"c": 2}, "starts": [1, -1]
+    }, headers=auth_headers)
+    assert response.json()["roots"] == pytest.approx([2 ** 0.5, -(2 ** 0.5)])
+
+    response = client.post("/calculations/solve", json={"method": "polynomial", "coefficients": [1, 0, 1]}, headers=auth_headers)
+    data = response.json()
+    assert data["roots"] == []
+    assert sorted(imag for _, imag in data["complex_roots"]) == pytest.approx([-1, 1])
+
+
+def test_solve_errors(db_session, auth_headers):
+    response = client.post("/calculations/solve", json={"method": "brent", "expression": "x^2 + 1", "brackets": [[0, 1]]}, headers=auth_headers)
+    assert response.status_code == 400
+    response = client.post("/calculations/solve", json={"method": "newton", "expression": "x"}, headers=auth_headers)
+    assert response.status_code == 422
+
+
+def test_minimize_endpoint(db_session, auth_headers):
+    response = client.post("/calculations/minimize", json={
+        "method": "bfgs",
+        "expression": "(x - 1)^2 + (y + 2)^2",
+        "variables": ["x", "y"],
+        "starts": [[0, 0], [5, 5]],
+        "bounds": [[-3, 3], [-1, 3]]
+    }, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert [x for point in data["points"] for x in point] == pytest.approx([1, -1, 1, -1], abs=1e-5)
+    assert data["values"] == pytest.approx([1, 1])
+
+    response = client.post("/calculations/minimize", json={
+        "method": "golden", "expression": "sin(x)", "brackets": [[3, 6]]
+    }, headers=auth_headers)
+    assert response.json()["points"][0][0] == pytest.approx(3 * 3.141592653589793 / 2, abs=1e-6)
+
+    response = client.post("/calculations/minimize", json={
+        "expression": "x^2", "variables": ["x"], "starts": [[1, 2]]
+    }, headers=auth_headers)
+    assert response.status_code == 422
+    # 1000 starts of 100 variables would hold 1000 simplices of 101 x 100 floats
+    variables = [f"x{i}" for i in range(100)]
+    response = client.post("/calculations/minimize", json={
+        "expression": "x0^2", "variables": variables, "starts": [[0.0] * 100] * 1000
+    }, headers=auth_headers)
+    assert response.status_code == 422
+
+
+def test_minimize_unbounded_objective(db_session, auth_headers):
+    response = client.post("/calculations/minimize", json={
+        "method": "nelder-mead", "expression": "x", "variables": ["x"], "starts": [[0]]
+    }, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["converged"] == [False]
+    assert data["values"] == [None]
+
+
+def test_polynomial_operations(db_session, auth_headers):
+    response = client.post("/calculations/polynomial", json={
+        "type": "evaluate", "coefficients": [1, -3, 2], "points": [0, 1, 2]
+    }, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["values"] == [2, 0, 0]
+    response = client.post("/calculations/polynomial", json={
+        "type": "multiply", "coefficients": [1, 1], "other": [1, -1]
+    }, headers=auth_headers)
+    assert response.json()["coefficients"] == [1, 0, -1]
+    response = client.post("/calculations/polynomial", json={"type": "integral", "coefficients": [2]}, headers=auth_headers)
+    assert response.json()["coefficients"] == [2, 0]
+    response = client.post("/calculations/polynomial", json={"type": "evaluate", "coefficients": [1]}, headers=auth_headers)
+    assert response.status_code == 422
+    response = client.post("/calculations/polynomial", json={
+        "type": "evaluate", "coefficients": [1.0] * 10_001, "points": [0.5] * 10_000
+    }, headers=auth_headers)
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("body", [
+    {"type": "derivative", "coefficients": [1e308, 1, 1]},
+    {"type": "multiply", "coefficients": [1e200], "other": [1e200]},
+])
+def test_polynomial_overflow_is_null(db_session, auth_headers, body):
+    response = client.post("/calculations/polynomial", json=body, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["coefficients"][0] is None
+
+
+def test_polynomial_fit_over_history(db_session, auth_headers):
+    for a in range(5):
+        response = client.post("/calculations", json={"a": a, "b": a, "type": "multiply"}, headers=auth_headers)
+        assert response.status_code == 200
+    client.post("/calculations", json={"a": 1, "b": 100, "type": "add"}, headers=auth_headers)
+
+    response = client.post("/calculations/polynomial/fit", json={"degree": 2, "type": "multiply"}, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 5
+    assert data["coefficients"] == pytest.approx([1, 0, 0], abs=1e-9)
+
+    response = client.post("/calculations/polynomial/fit", json={"degree": 3, "type": "divide"}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_distribution_endpoint(db_session, auth_headers):
+    response = client.post("/calculations/distribution", json={
+        "distribution": "t", "function": "quantile", "x": [0.5, 0.975, 1], "parameters": {"df": 10}
+    }, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["values"][:2] == pytest.approx([0, 2.2281388519649385])
+    assert data["values"][2] is None  # +inf
+
+    response = client.post("/calculations/distribution", json={
+        "distribution": "binomial", "function": "pmf", "x": [0, 1, 2], "parameters": {"n": 2, "p": 0.5}
+    }, headers=auth_headers)
+    assert response.json()["values"] == pytest.approx([0.25, 0.5, 0.25])
+
+    response = client.post("/calculations/distribution", json={
+        "distribution": "normal", "x": [0], "parameters": {"sd": -1}
+    }, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_distribution_operations_in_batch(db_session, auth_headers):
+    response = client.post("/calculations/batch", json={
+        "type": "normal_quantile", "a": [0.025, 0.5, 0.975], "b": [0, 0, 0]
+    }, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["results"] == pytest.approx([-1.959963984540054, 0, 1.959963984540054])
+
+    response = client.post("/calculations", json={"a": 3, "b": 2.5, "type": "poisson_cdf"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["result"] == pytest.approx(0.7575761331330659)
+
+    response = client.post("/calculations", json={"a": 0, "b": 0, "type": "normal_quantile"}, headers=auth_headers)
+    assert response.status_code == 400
+    response = client.post("/calculations/batch", json={"type": "normal_quantile", "a": [0], "b": [0]}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+SIMULATION = {
+    "expression": "price * (1 + growth)",
+    "variables": {
+        "price": {"distribution": "normal", "parameters": {"mean": 100, "sd": 10}},
+        "growth": {"distribution": "uniform", "parameters": {"low": 0, "high": 0.2}},
+    },
+    "samples": 20_000,
+    "seed": 11,
+    "quantiles": [0.5, 0.99],
+}
+
+
+def test_simulate_endpoint_is_reproducible(db_session, auth_headers):
+    response = client.post("/calculations/simulate", json=SIMULATION, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["seed"] == 11 and data["count"] == 20_000
+    assert data["mean"] == pytest.approx(110, rel=0.01)
+    assert data["interval"][0] < data["mean"] < data["interval"][1]
+    assert data["probabilities"] == [0.5, 0.99] and data["quantiles"][0] < data["quantiles"][1]
+    again = client.post("/calculations/simulate", json=SIMULATION, headers=auth_headers).json()
+    assert again == data
+
+    unseeded = client.post("/calculations/simulate", json={**SIMULATION, "seed": None}, headers=auth_headers).json()
+    assert isinstance(unseeded["seed"], int)
+
+
+def test_simulate_stream(db_session, auth_headers):
+    response = client.post("/calculations/simulate", json={**SIMULATION, "stream": True}, headers=auth_headers)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0]["samples"] == 20_000
+    assert lines[-1]["mean"] == lines[0]["mean"]
+
+
+def test_simulate_stream_overflowing_mean_is_null(db_session, auth_headers):
+    def reject(constant):
+        raise ValueError(f"invalid JSON constant {constant}")
+
+    body = {**SIMULATION, "expression": "price * 1e306", "stream": True}
+    response = client.post("/calculations/simulate", json=body, headers=auth_headers)
+    lines = [json.loads(line, parse_constant=reject) for line in response.text.splitlines()]
+    assert lines[0]["mean"] is None
+
+
+def test_simulate_errors(db_session, auth_headers):
+    bad_parameters = {**SIMULATION, "variables": {"price": {"distribution": "normal", "parameters": {"sd": 0}}}}
+    response = client.post("/calculations/simulate", json=bad_parameters, headers=auth_headers)
+    assert response.status_code == 400
+    response = client.post("/calculations/simulate", json={**SIMULATION, "expression": "price + missing"}, headers=auth_headers)
+    assert response.status_code == 400
+    response = client.post("/calculations/simulate", json={**SIMULATION, "quantiles": [1.5]}, headers=auth_headers)
+    assert response.status_code == 422
+
+
+SWEEP = {
+    "expression": "a * b",
+    "variables": {"a": {"start": 0, "stop": 1, "num": 3}, "b": {"values": [1, 2, 4, 8]}},
+}
+
+
+def test_sweep_ndjson(db_session, auth_headers):
+    response = client.post("/calculations/sweep", json=SWEEP, headers=auth_headers)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [
+        {"a": 0.0, "values": [0.0, 0.0, 0.0, 0.0]},
+        {"a": 0.5, "values": [0.5, 1.0, 2.0, 4.0]},
+        {"a": 1.0, "values": [1.0, 2.0, 4.0, 8.0]},
+    ]
+
+
+def test_sweep_binary(db_session, auth_headers):
+    response = client.post("/calculations/sweep", json={**SWEEP, "format": "binary"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["x-sweep-shape"] == "3,4"
+    assert response.headers["x-sweep-variables"] == "a,b"
+    values = np.frombuffer(response.content, dtype="<f8").reshape(3, 4)
+    assert values[2].tolist() == [1.0, 2.0, 4.0, 8.0]
+
+
+def test_sweep_operation_with_undefined_cells(db_session, auth_headers):
+    payload = {"type": "divide", "variables": {"a": {"values": [1, 2]}, "b": {"values": [0, 2]}}}
+    response = client.post("/calculations/sweep", json=payload, headers=auth_headers)
+    assert response.status_code == 200
+    assert [json.loads(line)["values"] for line in response.text.splitlines()] == [[None, 0.5], [None, 1.0]]
+
+
+def test_sweep_errors(db_session, auth_headers):
+    response = client.post("/calculations/sweep", json={**SWEEP, "expression": "a + c"}, headers=auth_headers)
+    assert response.status_code == 400
+    response = client.post("/calculations/sweep", json={**SWEEP, "type": "add"}, headers=auth_headers)
+    assert response.status_code == 422
+    bad_axis = {**SWEEP, "variables": {"a": {"values": [1], "num": 3}}}
+    response = client.post("/calculations/sweep", json=bad_axis, headers=auth_headers)
+    assert response.status_code == 422
+
+
+def test_plot_endpoint(db_session, auth_headers):
+    params = {"expr": "floor(x)", "x0": 0.5, "x1": 2.5, "px": 200}
+    response = client.get("/calculations/plot", params=params, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["x"]) == len(data["y"]) <= 401
+    assert data["discontinuities"] == pytest.approx([1, 2], abs=1e-3)
+    # the line is broken at each jump
+    assert data["y"].count(None) == 2
+    response = client.get("/calculations/plot", params={"expr": "x", "x0": 0, "x1": 1e308}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["x"][-1] == 1e308
+
+
+def test_plot_errors(db_session, auth_headers):
+    response = client.get("/calculations/plot", params={"expr": "y", "x0": 0, "x1": 1}, headers=auth_headers)
+    assert response.status_code == 400
+    response = client.get("/calculations/plot", params={"expr": "x", "x0": 1, "x1": 0}, headers=auth_headers)
+    assert response.status_code == 400
+    response = client.get("/calculations/plot", params={"expr": "x", "x0": 0, "x1": 1, "px": 0}, headers=auth_headers)
+    assert response.status_code == 422
+    for params in ({"expr": "1e308", "x0": 0, "x1": 1}, {"expr": "x", "x0": -1e308, "x1": 1e308}):
+        response = client.get("/calculations/plot", params=params, headers=auth_headers)
+        assert response.status_code == 400
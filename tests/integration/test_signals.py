@@ -0,0 +1,84 @@
+import json
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_signal_json(db_session, auth_headers):
+    response = client.post("/calculations/signal", json={
+        "type": "moving_average", "series": [1, 2, 3, 4, 5, 6], "window": 3
+    }, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["result"] == pytest.approx([2, 3, 4, 5])
+
+    response = client.post("/calculations/signal", json={"type": "fft", "series": [1, 0, 0, 0]}, headers=auth_headers)
+    assert response.json()["result"] == [[1, 0], [1, 0], [1, 0]]
+
+
+def test_signal_json_persists_payload(db_session, auth_headers):
+    response = client.post("/calculations/signal", json={
+        "type": "convolve", "series": [1, 2, 3], "kernel": [1, 1], "persist": True
+    }, headers=auth_headers)
+    calculation_id = response.json()["calculation_id"]
+    assert calculation_id is not None
+    payload = client.get(f"/calculations/{calculation_id}/payload", headers=auth_headers)
+    assert payload.headers["X-Payload-Kind"] == "series"
+    assert np.frombuffer(payload.content, dtype="<f8").tolist() == [1, 3, 5, 3]
+
+
+def test_signal_upload_binary_stream(db_session, auth_headers):
+    series = np.random.default_rng(1).normal(size=200_000)
+    kernel = [0.25, 0.5, 0.25]
+    response = client.post(
+        "/calculations/signal/upload?type=convolve&kernel=0.25,0.5,0.25",
+        content=series.astype("<f8").tobytes(),
+        headers={**auth_headers, "Content-Type": "application/octet-stream"}
+    )
+    assert response.status_code == 200
+    assert np.frombuffer(response.content, dtype="<f8") == pytest.approx(np.convolve(series, kernel))
+
+
+def test_signal_upload_ndjson(db_session, auth_headers):
+    response = client.post(
+        "/calculations/signal/upload?type=moving_max&window=2&persist=true",
+        content=b"1\n5\n[2, 7]\n3\n",
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    assert [json.loads(line) for line in response.text.splitlines()] == [5, 5, 7, 7]
+    assert "X-Calculation-Id" in response.headers
+
+    response = client.post(
+        "/calculations/signal/upload?type=power_spectrum",
+        content=b"1\n1\n1\n1\n",
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"}
+    )
+    assert [json.loads(line) for line in response.text.splitlines()] == [4, 0, 0]
+
+
+def test_signal_errors(db_session, auth_headers):
+    response = client.post("/calculations/signal", json={"type": "convolve", "series": [1, 2]}, headers=auth_headers)
+    assert response.status_code == 400
+    response = client.post("/calculations/signal/upload?type=fft", content=b"\x00" * 7, headers=auth_headers)
+    assert response.status_code == 400
+    response = client.post("/calculations/signal/upload?type=convolve&kernel=a,b", content=b"\x00" * 8, headers=auth_headers)
+    assert response.status_code == 400
+    response = client.post("/calculations/signal/upload?type=moving_average&window=2", content=b"", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_signal_upload_closes_spool_on_error(db_session, auth_headers, monkeypatch):
+    import tempfile
+    spools, original = [], tempfile.SpooledTemporaryFile
+
+    def spooled(**kwargs):
+        spools.append(original(**kwargs))
+        return spools[-1]
+
+    monkeypatch.setattr("app.routes.signals.tempfile.SpooledTemporaryFile", spooled)
+    response = client.post("/calculations/signal/upload?type=moving_max&window=5", content=b"\x00" * 7, headers=auth_headers)
+    assert response.status_code == 400
+    assert spools and all(spool.closed for spool in spools)
@@ -0,0 +1,119 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+CELLS = {"price": 120, "quantity": 3, "discount": 0.1, "total": "=price * quantity * (1 - discount)", "note": 7}
+
+
+def create(headers, cells=CELLS) -> dict:
+    response = client.post("/calculations/worksheets", json={"cells": cells}, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_create_and_read_worksheet(db_session, auth_headers):
+    created = create(auth_headers)
+    assert created["version"] == 0
+    assert created["cells"]["total"] == {"formula": "price * quantity * (1 - discount)", "value": 324.0, "error": None}
+    response = client.get(f"/calculations/worksheets/{created['calculation_id']}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == created
+    # the worksheet is a calculation like any other
+    response = client.get(f"/calculations/{created['calculation_id']}", headers=auth_headers)
+    assert response.json()["type"] == "worksheet"
+
+
+def test_edit_returns_only_changed_cells(db_session, auth_headers):
+    sheet_id = create(auth_headers)["calculation_id"]
+    response = client.patch(f"/calculations/worksheets/{sheet_id}", json={"cells": {"quantity": 5}}, headers=auth_headers)
+    assert response.status_code == 200
+    delta = response.json()
+    assert delta["version"] == 1
+    assert delta["changed"] == {"quantity": {"value": 5.0, "error": None}, "total": {"value": 540.0, "error": None}}
+    assert delta["recalculated"] == 2
+
+    response = client.patch(
+        f"/calculations/worksheets/{sheet_id}", json={"cells": {"discount": None, "extra": "total + note"}},
+        headers=auth_headers
+    )
+    delta = response.json()
+    assert delta["deleted"] == ["discount"]
+    assert delta["changed"]["total"] == {"value": None, "error": "Unknown cell 'discount'"}
+    assert delta["changed"]["extra"]["error"] == "Cell 'total' has an error"
+
+    stored = client.get(f"/calculations/worksheets/{sheet_id}", headers=auth_headers).json()
+    assert stored["version"] == 2
+    assert "discount" not in stored["cells"]
+    assert stored["cells"]["quantity"]["value"] == 5.0
+    assert stored["cells"]["total"]["error"] == "Unknown cell 'discount'"
+
+
+def test_edits_survive_a_cold_cache(db_session, auth_headers):
+    from app.routes import worksheets
+    sheet_id = create(auth_headers)["calculation_id"]
+    worksheets._graphs.clear()
+    response = client.patch(f"/calculations/worksheets/{sheet_id}", json={"cells": {"price": 100}}, headers=auth_headers)
+    assert response.json()["changed"]["total"]["value"] == 270.0
+
+
+def test_worksheet_errors(db_session, auth_headers):
+    response = client.post("/calculations/worksheets", json={"cells": {"a": "b", "b": "a"}}, headers=auth_headers)
+    assert response.status_code == 400
+    sheet_id = create(auth_headers)["calculation_id"]
+    response = client.patch(
+        f"/calculations/worksheets/{sheet_id}", json={"cells": {"price": "total"}}, headers=auth_headers
+    )
+    assert response.status_code == 400
+    assert "Circular" in response.json()["detail"]
+    response = client.patch(f"/calculations/worksheets/{sheet_id}", json={"cells": {"a": "1 +"}}, headers=auth_headers)
+    assert response.status_code == 400
+    # a rejected edit changes nothing
+    assert client.get(f"/calculations/worksheets/{sheet_id}", headers=auth_headers).json()["version"] == 0
+    response = client.get("/calculations/worksheets/999999", headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_division_by_zero_edit_keeps_the_sheet_consistent(db_session, auth_headers):
+    response = client.post("/calculations/worksheets", json={"cells": {"a": 1, "b": 0, "c": "=a/b"}}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["cells"]["c"]["error"] is not None
+    sheet_id = response.json()["calculation_id"]
+    response = client.patch(f"/calculations/worksheets/{sheet_id}", json={"cells": {"b": 2}}, headers=auth_headers)
+    assert response.json()["changed"]["c"]["value"] == 0.5
+    response = client.patch(f"/calculations/worksheets/{sheet_id}", json={"cells": {"b": 0}}, headers=auth_headers)
+    assert response.status_code == 200
+    response = client.patch(f"/calculations/worksheets/{sheet_id}", json={"cells": {"d": "=b+10"}}, headers=auth_headers)
+    assert response.json()["changed"]["d"]["value"] == 10
+    cells = client.get(f"/calculations/worksheets/{sheet_id}", headers=auth_headers).json()["cells"]
+    assert cells["b"]["value"] == 0 and cells["d"]["value"] == 10
+
+
+def test_edit_failure_drops_the_cached_graph(db_session, auth_headers, monkeypatch):
+    from app.routes import worksheets
+    sheet_id = create(auth_headers)["calculation_id"]
+
+    def fail(self, changes):
+        self.formulas["half"] = "1"  # partially applied
+        raise RuntimeError("evaluation failed")
+
+    monkeypatch.setattr(worksheets.WorksheetGraph, "update", fail)
+    with pytest.raises(RuntimeError):
+        client.patch(f"/calculations/worksheets/{sheet_id}", json={"cells": {"price": 1}}, headers=auth_headers)
+    assert sheet_id not in worksheets._graphs
+
+
+def test_worksheet_cannot_be_edited_as_a_calculation(db_session, auth_headers):
+    sheet_id = create(auth_headers)["calculation_id"]
+    response = client.put(f"/calculations/{sheet_id}", json={"a": 1, "b": 2, "type": "add"}, headers=auth_headers)
+    assert response.status_code == 409
+    assert client.get(f"/calculations/worksheets/{sheet_id}", headers=auth_headers).json()["cells"]["total"]["value"] == 324.0
+
+
+def test_delete_worksheet(db_session, auth_headers):
+    sheet_id = create(auth_headers)["calculation_id"]
+    assert client.delete(f"/calculations/{sheet_id}", headers=auth_headers).status_code == 200
+    assert client.get(f"/calculations/worksheets/{sheet_id}", headers=auth_headers).status_code == 404
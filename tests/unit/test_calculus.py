@@ -0,0 +1,64 @@
+import math
+import numpy as np
+import pytest
+from app.operations.calculus import differentiate, integrate
+
+
+@pytest.mark.parametrize("method", ["gauss-kronrod", "simpson"])
+def test_integrate_finite(method):
+    result = integrate(np.sin, 0, math.pi, method=method)
+    assert result.converged
+    assert result.value == pytest.approx(2.0, abs=1e-9)
+
+
+def test_integrate_evaluates_whole_levels_at_once():
+    calls = []
+
+    def f(x):
+        calls.append(x.shape)
+        return np.exp(-x ** 2)
+
+    result = integrate(f, -3, 3)
+    assert len(calls) < 10
+    assert all(shape[1] == 15 for shape in calls)
+    assert result.evaluations == sum(shape[0] * shape[1] for shape in calls)
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    (-np.inf, np.inf, math.sqrt(math.pi)),
+    (0, np.inf, math.sqrt(math.pi) / 2),
+    (-np.inf, 0, math.sqrt(math.pi) / 2),
+])
+def test_integrate_infinite_bounds(a, b, expected):
+    result = integrate(lambda x: np.exp(-x ** 2), a, b)
+    assert result.value == pytest.approx(expected, rel=1e-10)
+
+
+def test_integrate_reversed_and_empty_intervals():
+    assert integrate(np.sin, math.pi, 0).value == pytest.approx(-2.0)
+    assert integrate(np.sin, 1, 1).value == 0.0
+
+
+def test_integrate_errors():
+    with pytest.raises(ValueError, match="finite bounds"):
+        integrate(np.sin, 0, np.inf, method="simpson")
+    with pytest.raises(ValueError, match="not finite"):
+        integrate(lambda x: 1 / x, -1, 1)
+    with pytest.raises(ValueError, match="Invalid integration method"):
+        integrate(np.sin, 0, 1, method="trapezoid")
+
+
+def test_differentiate_first_and_second_order():
+    points = np.array([0.0, 1.0, 2.0, 50.0])
+    first = differentiate(np.sin, points)
+    assert first.values == pytest.approx(np.cos(points), abs=1e-10)
+    second = differentiate(np.exp, [0.0, 1.0], order=2)
+    assert second.values == pytest.approx(np.exp([0.0, 1.0]), rel=1e-9)
+    assert np.all(second.errors < 1e-8)
+
+
+def test_differentiate_errors():
+    with pytest.raises(ValueError):
+        differentiate(np.sin, [0.0], order=3)
+    with pytest.raises(ValueError, match="not finite"):
+        differentiate(np.log, [0.0])
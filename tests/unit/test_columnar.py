@@ -0,0 +1,25 @@
+import numpy as np
+from app.columnar import calculation_columns
+from app.models.calculation import Calculation
+from app.models.user import User
+
+
+def test_calculation_columns(db_session):
+    user = User(username="columnar_user", email="columnar@example.com", hashed_password="x")
+    db_session.add(user)
+    db_session.flush()
+    db_session.add_all([
+        Calculation(a=float(i), b=1.0, type="add" if i % 2 else "multiply", result=i + 1.0, user_id=user.id)
+        for i in range(10)
+    ])
+    db_session.flush()
+
+    a, result = calculation_columns(db_session, user.id, "a", "result")
+    assert a.dtype == np.float64
+    assert a.tolist() == list(range(10))
+    assert (result - a).tolist() == [1.0] * 10
+
+    (a,) = calculation_columns(db_session, user.id, "a", op_type="add")
+    assert a.tolist() == [1, 3, 5, 7, 9]
+    assert calculation_columns(db_session, -1, "a")[0].shape == (0,)
+    db_session.rollback()
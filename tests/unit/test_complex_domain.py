@@ -0,0 +1,54 @@
+import cmath
+import math
+
+import numpy as np
+import pytest
+
+from app.operations import get_operation
+from app.operations.complex_domain import complex_gamma, compute_complex, compute_complex_scalar
+
+
+@pytest.mark.parametrize("op_type, a, b, expected", [
+    ("sqrt", -4, 0, 2j),
+    ("power", -8, 1 / 3, cmath.exp(cmath.log(-8) / 3)),
+    ("ln", -1, 0, math.pi * 1j),
+    ("multiply", 1 + 2j, 3 - 1j, 5 + 5j),
+    ("divide", 1j, 1 + 1j, 0.5 + 0.5j),
+    ("asin", 2, 0, cmath.asin(2)),
+    ("abs", 3 + 4j, 0, 5),
+])
+def test_principal_values(op_type, a, b, expected):
+    assert compute_complex_scalar(op_type, a, b) == pytest.approx(expected)
+
+
+def test_vectorized_kernel_matches_scalar_math():
+    rng = np.random.default_rng(0)
+    z = rng.normal(size=1000) + 1j * rng.normal(size=1000)
+    assert np.allclose(compute_complex("exp", z, np.zeros_like(z)), np.exp(z))
+    assert np.allclose(compute_complex("power", z, z[::-1]), [cmath.exp(w * cmath.log(v)) for v, w in zip(z, z[::-1])])
+
+
+def test_gamma_on_the_complex_plane():
+    assert complex_gamma(np.array([1 + 1j]))[0] == pytest.approx(0.4980156681183560 - 0.1549498283018107j)
+    assert complex_gamma(np.array([-2.5 + 0j]))[0] == pytest.approx(math.gamma(-2.5))
+    assert compute_complex_scalar("factorial", 4) == pytest.approx(24)
+
+
+@pytest.mark.parametrize("op_type, a, b, message", [
+    ("divide", 1, 0, "divide by zero"),
+    ("ln", 0, 0, "not a finite"),
+    ("gamma", -3, 0, "not a finite"),
+    ("gcd", 4, 6, "not defined for complex"),
+])
+def test_errors(op_type, a, b, message):
+    with pytest.raises(ValueError, match=message):
+        compute_complex_scalar(op_type, a, b)
+
+
+def test_real_power_of_negative_is_rejected():
+    power = get_operation("power")
+    assert power.compute(-8, 3) == -512
+    with pytest.raises(Exception, match="complex domain"):
+        power.compute(-8, 0.5)
+    with pytest.raises(Exception, match="complex domain"):
+        power.compute_array(np.array([-8.0]), np.array([0.5]))
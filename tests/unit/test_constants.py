@@ -0,0 +1,55 @@
+import pytest
+from app.operations import constants
+from app.operations.constants import constant_text, get_constant, clear_memory_cache
+
+PI_50 = "3.14159265358979323846264338327950288419716939937510"
+E_50 = "2.71828182845904523536028747135266249775724709369995"
+LN2_50 = "0.69314718055994530941723212145817656807550013436025"
+LN10_30 = "2.302585092994045684017991454684"
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    clear_memory_cache()
+    monkeypatch.setattr(constants, "CONSTANTS_CACHE_DIR", str(tmp_path))
+    yield tmp_path
+    clear_memory_cache()
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("pi", PI_50), ("e", E_50), ("ln2", LN2_50), ("ln10", LN10_30),
+])
+def test_known_digits(name, expected):
+    digits = len(expected.split(".")[1])
+    assert constant_text(name, digits) == expected
+
+
+def test_lower_precision_is_truncation():
+    assert constant_text("pi", 5) == "3.14159"
+    assert constant_text("pi", 0) == "3"
+    assert constant_text("sqrt2", 4) == "1.4142"
+    assert constant_text("phi", 4) == "1.6180"
+
+
+def test_digits_are_cached_on_disk(isolated_cache, monkeypatch):
+    constant_text("pi", 20)
+    assert (isolated_cache / "pi.digits").exists()
+    clear_memory_cache()
+    monkeypatch.setitem(constants.CONSTANTS, "pi", lambda digits: pytest.fail("recomputed"))
+    assert constant_text("pi", 50) == PI_50
+
+
+def test_extends_when_more_digits_requested(isolated_cache):
+    constant_text("e", 10)
+    value = constant_text("e", 2500)
+    assert len(value) == 2502
+    assert value.startswith(E_50)
+
+
+def test_get_constant_returns_decimal():
+    assert str(get_constant("pi", 3)) == "3.141"
+
+
+def test_unknown_constant():
+    with pytest.raises(ValueError):
+        constant_text("tau", 5)
@@ -0,0 +1,141 @@
+import math
+import time
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+from app.operations import get_operation
+from app.operations.distributions import (
+    erf, erfc, evaluate_distribution, normal_quantile, regularized_beta, regularized_gamma,
+)
+
+
+def test_erf_and_erfc_match_math():
+    x = np.linspace(-6, 26, 4001)
+    assert erfc(x) == pytest.approx([math.erfc(v) for v in x], rel=1e-14)
+    assert erf(x) == pytest.approx([math.erf(v) for v in x], rel=1e-14, abs=1e-300)
+    assert erfc(np.array([np.inf, -np.inf])).tolist() == [0.0, 2.0]
+
+
+def test_incomplete_gamma_and_beta_special_cases():
+    x = np.array([0.0, 0.5, 2.0, 30.0, np.inf])
+    lower, upper = regularized_gamma(1.0, x)
+    # P(1, x) = 1 - exp(-x)
+    assert lower == pytest.approx(-np.expm1(-x))
+    assert upper == pytest.approx(np.exp(-x))
+    assert upper[3] == pytest.approx(math.exp(-30), rel=1e-13)
+    # I_x(a, 1) = x^a
+    grid = np.linspace(0, 1, 11)
+    assert regularized_beta(2.5, 1.0, grid) == pytest.approx(grid ** 2.5)
+
+
+@pytest.mark.parametrize("p, expected", [
+    (0.5, 0.0), (0.975, 1.959963984540054), (0.025, -1.959963984540054),
+    (1e-10, -6.361340902404056), (1e-300, -37.04709629936),
+])
+def test_normal_quantile(p, expected):
+    assert normal_quantile(np.array([p]))[0] == pytest.approx(expected, rel=1e-12, abs=1e-15)
+
+
+@pytest.mark.parametrize("name, parameters", [
+    ("normal", {"mean": 3, "sd": 2}),
+    ("t", {"df": 1}),
+    ("t", {"df": 7.5}),
+    ("chi2", {"df": 0.7}),
+    ("chi2", {"df": 40}),
+    ("exponential", {"rate": 3}),
+])
+def test_quantile_inverts_cdf(name, parameters):
+    p = np.random.default_rng(0).uniform(size=20_000)
+    x = evaluate_distribution(name, "quantile", p, parameters)
+    assert evaluate_distribution(name, "cdf", x, parameters) == pytest.approx(p, abs=1e-13)
+
+
+def test_known_values():
+    assert evaluate_distribution("t", "quantile", [0.975], {"df": 10})[0] == pytest.approx(2.2281388519649385)
+    assert evaluate_distribution("t", "cdf", [2.0], {"df": 1})[0] == pytest.approx(0.5 + math.atan(2) / math.pi)
+    assert evaluate_distribution("chi2", "quantile", [0.95], {"df": 1})[0] == pytest.approx(3.841458820694124)
+    assert evaluate_distribution("chi2", "pdf", [2.0], {"df": 4})[0] == pytest.approx(math.exp(-1) / 2)
+    assert evaluate_distribution("normal", "pdf", [0.0])[0] == pytest.approx(1 / math.sqrt(2 * math.pi))
+
+
+def test_poisson():
+    k = np.arange(0, 40)
+    pmf = evaluate_distribution("poisson", "pmf", k, {"mean": 6.5})
+    expected = [math.exp(-6.5) * 6.5 ** i / math.factorial(i) for i in range(40)]
+    assert pmf == pytest.approx(expected, rel=1e-12)
+    assert evaluate_distribution("poisson", "cdf", k + 0.5, {"mean": 6.5}) == pytest.approx(np.cumsum(expected), rel=1e-12)
+    assert evaluate_distribution("poisson", "pmf", [2.5, -1], {"mean": 6.5}).tolist() == [0, 0]
+
+    p = np.random.default_rng(1).uniform(size=5_000)
+    q = evaluate_distribution("poisson", "quantile", p, {"mean": 250})
+    assert np.all(evaluate_distribution("poisson", "cdf", q, {"mean": 250}) >= p)
+    assert np.all(evaluate_distribution("poisson", "cdf", q - 1, {"mean": 250}) < p)
+
+
+def test_binomial():
+    n, p = 20, 0.3
+    k = np.arange(0, n + 1)
+    expected = [math.comb(n, i) * p ** i * (1 - p) ** (n - i) for i in range(n + 1)]
+    assert evaluate_distribution("binomial", "pmf", k, {"n": n, "p": p}) == pytest.approx(expected, rel=1e-12)
+    assert evaluate_distribution("binomial", "cdf", k, {"n": n, "p": p}) == pytest.approx(np.cumsum(expected), rel=1e-12)
+    assert evaluate_distribution("binomial", "quantile", [0, 0.5, 1], {"n": n, "p": p}).tolist() == [0, 6, 20]
+    assert evaluate_distribution("binomial", "pmf", [0, 20], {"n": n, "p": [0, 1]}) == pytest.approx([1, 1])
+
+
+def test_parameters_broadcast_against_points():
+    values = evaluate_distribution("t", "quantile", [0.975, 0.975, 0.975], {"df": [1, 10, 1e6]})
+    assert values == pytest.approx([12.706204736174698, 2.2281388519649385, 1.959966])
+
+
+def test_quantile_endpoints():
+    assert evaluate_distribution("normal", "quantile", [0, 1]).tolist() == [-np.inf, np.inf]
+    assert evaluate_distribution("chi2", "quantile", [0, 1], {"df": 3}).tolist() == [0, np.inf]
+    assert evaluate_distribution("binomial", "quantile", [0, 1], {"n": 5, "p": 0.5}).tolist() == [0, 5]
+
+
+@pytest.mark.parametrize("name, function, x, parameters, message", [
+    ("gamma", "cdf", [1], {}, "Invalid distribution"),
+    ("normal", "mode", [1], {}, "Invalid function"),
+    ("normal", "cdf", [1], {"sd": 0}, "sd > 0"),
+    ("t", "cdf", [1], {}, "needs parameters"),
+    ("t", "cdf", [1], {"df": 1, "mean": 0}, "Unknown parameters"),
+    ("binomial", "pmf", [1], {"n": 2.5, "p": 0.5}, "whole number"),
+    ("poisson", "quantile", [1.5], {"mean": 1}, "between 0 and 1"),
+    ("normal", "cdf", [float("nan")], {}, "must be numbers"),
+])
+def test_validation(name, function, x, parameters, message):
+    with pytest.raises(ValueError, match=message):
+        evaluate_distribution(name, function, x, parameters)
+
+
+def test_registered_operations():
+    assert get_operation("normal_cdf").compute(1.96, 0) == pytest.approx(0.9750021048517795)
+    assert get_operation("t_quantile").compute(0.975, 10) == pytest.approx(2.2281388519649385)
+    assert get_operation("poisson_pmf").compute(2, 3) == pytest.approx(4.5 * math.exp(-3))
+    a = np.linspace(0.01, 0.99, 1000)
+    out = np.empty_like(a)
+    get_operation("chi2_quantile").compute_array(a, np.full_like(a, 5.0), out=out)
+    assert get_operation("chi2_cdf").compute_array(out, np.full_like(a, 5.0)) == pytest.approx(a)
+    with pytest.raises(HTTPException) as exc:
+        get_operation("exponential_pdf").compute(1, -2)
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.parametrize("op_type, p", [("normal_quantile", 0), ("normal_quantile", 1), ("chi2_quantile", 1)])
+def test_registered_quantiles_reject_infinite_results(op_type, p):
+    with pytest.raises(HTTPException) as exc:
+        get_operation(op_type).compute(p, 3)
+    assert exc.value.status_code == 400
+    assert get_operation("exponential_quantile").compute(0, 2) == 0
+
+
+def test_discrete_quantile_at_the_shape_limit():
+    # a bracketing search: a handful of cdf evaluations even for the largest mean
+    start = time.perf_counter()
+    q = evaluate_distribution("poisson", "quantile", [1e-9, 0.5, 0.999999], {"mean": 1e7})
+    assert time.perf_counter() - start < 10
+    assert np.all(np.abs(q - 1e7) < 4e4)
+    cdf = evaluate_distribution("poisson", "cdf", np.r_[q, q - 1], {"mean": 1e7})
+    assert np.all(cdf[:3] >= [1e-9, 0.5, 0.999999]) and np.all(cdf[3:] < [1e-9, 0.5, 0.999999])
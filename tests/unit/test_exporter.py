@@ -0,0 +1,41 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+
+from app.operations.exporter import EXPORT_COLUMNS, encode
+
+ROW = (1, 2.0, 3.0, "add", 5.0, None, None, None, None, None, None, None, None, None,
+       datetime(2024, 1, 2, 3, 4, 5), datetime(2024, 1, 2, 3, 4, 5))
+
+
+def batches():
+    yield [ROW, (2, *ROW[1:])]
+    yield [(3, *ROW[1:])]
+
+
+def test_csv_is_encoded_batch_by_batch():
+    chunks = list(encode("csv", batches()))
+    assert len(chunks) == 2
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+    assert rows[0] == list(EXPORT_COLUMNS)
+    assert [row[0] for row in rows[1:]] == ["1", "2", "3"]
+    assert rows[1][EXPORT_COLUMNS.index("created_at")] == "2024-01-02T03:04:05"
+
+
+def test_empty_csv_has_a_header():
+    assert b"".join(encode("csv", iter([]))).decode().strip() == ",".join(EXPORT_COLUMNS)
+
+
+def test_gzipped_ndjson():
+    data = gzip.decompress(b"".join(encode("ndjson", batches(), "gzip")))
+    records = [json.loads(line) for line in data.decode().splitlines()]
+    assert [record["id"] for record in records] == [1, 2, 3]
+    assert records[0]["result"] == 5.0 and records[0]["a_unit"] is None
+
+
+def test_parquet_row_groups():
+    import pyarrow.parquet as pq
+    table = pq.read_table(io.BytesIO(b"".join(encode("parquet", batches()))))
+    assert table.column("id").to_pylist() == [1, 2, 3]
@@ -0,0 +1,91 @@
+import math
+import numpy as np
+import pytest
+from app.operations.expressions import build, compile_expression, parse
+
+
+def test_vectorized_evaluation():
+    f = compile_expression("x^2 + sin(a*x)")
+    assert f.variables == ("x", "a")
+    x = np.linspace(0, 1, 5)
+    assert f(x, 2.0) == pytest.approx(x ** 2 + np.sin(2 * x))
+
+
+def test_constants_and_functions():
+    f = compile_expression("2*pi + ln(e) + log(100) + gamma(5) + factorial(3)")
+    assert f.variables == ()
+    assert f() == pytest.approx(2 * math.pi + 1 + 2 + 24 + 6)
+
+
+def test_compiled_expressions_are_cached():
+    assert compile_expression("x + 1") is compile_expression("x + 1")
+
+
+def test_explicit_variables_and_bind():
+    f = build("a*x + b", ("x", "a", "b"))
+    g = f.bind("x", {"a": 2, "b": 1})
+    assert g(np.array([0.0, 1.0, 2.0])).tolist() == [1.0, 3.0, 5.0]
+    # a constant expression broadcasts to the shape of the input
+    assert compile_expression("3").bind("x")(np.zeros(4)).tolist() == [3.0] * 4
+    with pytest.raises(ValueError, match="Missing"):
+        f.bind("x", {"a": 2})
+    with pytest.raises(ValueError, match="Unknown variable"):
+        build("x + y", ("x",))
+    with pytest.raises(ValueError, match="reserved"):
+        build("x", ("x", "sin"))
+
+
+def test_domain_errors_become_nan_and_large_powers_overflow():
+    f = compile_expression("sqrt(x)")
+    assert np.isnan(f(-1.0))
+    assert np.isinf(compile_expression("10^400")())
+
+
+def test_extra_functions():
+    def double(x):
+        return 2 * x
+    f = build("double(x) + 1", functions={"double": double})
+    assert f(3.0) == 7.0
+    double.arity = 1
+    with pytest.raises(ValueError, match="takes 1 argument"):
+        build("double(x, x)", functions={"double": double})
+
+
+@pytest.mark.parametrize("source", [
+    "__import__('os')",
+    "x.real",
+    "(lambda: 1)()",
+    "[1, 2]",
+    "x if x else 1",
+    "open('f')",
+    "sin",
+    "'text'",
+    "x == 1",
+    "sin(x=1)",
+    "1 +",
+    "x" * 2001,
+])
+def test_rejects_unsafe_or_invalid_syntax(source):
+    with pytest.raises(ValueError):
+        parse(source)
+
+
+@pytest.mark.parametrize("source, message", [
+    ("sin()", "takes 1 argument"),
+    ("atan2(x)", "takes 2 argument"),
+    ("sin(x, x)", "takes 1 argument"),
+    ("min(x, 1, 2)", "takes 2 argument"),
+    ("gamma(x, 2)", "takes 1 argument"),
+])
+def test_rejects_wrong_number_of_arguments(source, message):
+    with pytest.raises(ValueError, match=message):
+        parse(source)
+
+
+@pytest.mark.parametrize("source", [
+    "+".join(["x"] * 999), "-" * 1990 + "x", "sin(" * 300 + "x" + ")" * 300,
+], ids=["long-sum", "unary-chain", "nested-calls"])
+def test_rejects_deeply_nested_expressions(source):
+    with pytest.raises(ValueError):
+        build(source)
+    assert build("+".join(["x"] * 150))(2.0) == 300.0
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from app.operations import get_operation
+from app.operations.fast_math import compute_fast, fast_kernel
+from app.operations.parallel import compute_batch
+
+
+@pytest.mark.parametrize("op_type, a", [
+    ("sin", np.linspace(-2e6, 2e6, 400_001)),
+    ("cos", np.random.default_rng(0).uniform(-50, 50, 200_000)),
+    ("sin", np.array([1e300, -3e7, 0.0, np.pi])),
+    ("normal_cdf", np.linspace(-12, 12, 500_001)),
+])
+def test_fast_kernels_stay_within_declared_error(op_type, a):
+    b = np.zeros_like(a)
+    exact = get_operation(op_type).compute_array(a, b)
+    results, kernel = compute_fast(op_type, a, b)
+    assert not kernel.relative
+    assert np.abs(results - exact).max() <= kernel.max_error
+
+
+def test_operations_without_fast_kernel_use_exact_path():
+    a, b = np.array([2.0, 3.0]), np.array([5.0, 7.0])
+    results, kernel = compute_fast("multiply", a, b)
+    assert kernel is None and fast_kernel("multiply") is None
+    assert results.tolist() == [10.0, 21.0]
+
+
+def test_fast_kernels_skip_validation():
+    results, _ = compute_fast("normal_cdf", np.array([np.nan, np.inf, 0.0]), np.zeros(3))
+    assert np.isnan(results[0]) and results[1] == pytest.approx(1.0) and results[2] == pytest.approx(0.5)
+
+
+def test_fast_batch_in_parallel_chunks():
+    a = np.linspace(-10, 10, 1000)
+    results = compute_batch("sin", a, np.zeros_like(a), chunk_size=250, workers=2, threshold=1, fast=True)
+    assert np.abs(results - np.sin(a)).max() <= fast_kernel("sin").max_error
@@ -0,0 +1,41 @@
+import pytest
+
+from app.operations.importer import CalculationImporter, LineSplitter
+
+
+def split(data: bytes, block: int) -> list[bytes]:
+    splitter = LineSplitter()
+    lines = []
+    for start in range(0, len(data), block):
+        lines.extend(splitter.feed(data[start:start + block]))
+    return lines + splitter.close()
+
+
+def test_lines_split_across_blocks():
+    data = b"a,b,type\r\n1,2,add\n3,4,multiply"
+    assert split(data, 3) == split(data, 1000) == [b"a,b,type\r", b"1,2,add", b"3,4,multiply"]
+
+
+def test_csv_rows_are_recomputed_and_checked():
+    importer = CalculationImporter("csv")
+    data = b"type,a,b,result\nadd,1,2,3\nsqrt,16,,\nsqrt,-1,,\ndivide,1,0,\nadd,x,1,\npower,2,3,9\nnope,1,2,\n\nmultiply,5,5,25"
+    chunk = importer.process(split(data, 7))
+    assert chunk.types == ["add", "sqrt", "multiply"]
+    assert chunk.results.tolist() == [3.0, 4.0, 25.0]
+    assert chunk.rows == 8
+    assert [line for line, _ in chunk.errors] == [4, 5, 6, 7, 8]
+    assert "does not match" in dict(chunk.errors)[7]
+
+
+def test_line_numbers_continue_across_chunks():
+    importer = CalculationImporter("ndjson")
+    first = importer.process([b'{"a": 1, "b": 2, "type": "add"}', b"[1]"])
+    second = importer.process([b'{"a": true, "type": "add"}', b"not json", b'{"a": 9, "type": "sqrt"}'])
+    assert first.errors == [(2, "each line must be a JSON object")]
+    assert [line for line, _ in second.errors] == [3, 4]
+    assert second.results.tolist() == [3.0]
+
+
+def test_header_must_name_required_columns():
+    with pytest.raises(ValueError, match="type"):
+        CalculationImporter("csv").process([b"a,b,op", b"1,2,add"])
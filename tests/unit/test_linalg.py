@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from app.operations import linalg
+from app.operations.linalg import compute_matrix, pack_matrices, unpack_matrices
+from app.operations.parallel import shutdown_process_pool
+
+A = [[4.0, 1.0], [2.0, 3.0]]
+
+
+def test_multiply_and_chain():
+    assert compute_matrix("multiply", [A, [[1], [1]]]).tolist() == [[5], [5]]
+    identity = np.eye(2)
+    assert np.allclose(compute_matrix("multiply", [A, identity, identity, A]), np.array(A) @ np.array(A))
+
+
+def test_transpose_inverse_determinant():
+    assert compute_matrix("transpose", [[[1, 2, 3]]]).tolist() == [[1], [2], [3]]
+    assert np.allclose(compute_matrix("inverse", [A]) @ np.array(A), np.eye(2))
+    assert compute_matrix("determinant", [A])[0, 0] == pytest.approx(10)
+
+
+def test_solve_with_vector():
+    x = compute_matrix("solve", [A, [9, 13]])
+    assert x.ravel() == pytest.approx([1.4, 3.4])
+
+
+def test_eigenvalues_real_and_complex():
+    real = compute_matrix("eigenvalues", [[[2, 0], [0, 3]]])
+    assert sorted(real[0]) == pytest.approx([2, 3])
+    rotation = compute_matrix("eigenvalues", [[[0, -1], [1, 0]]])
+    assert sorted(rotation[1]) == pytest.approx([-1, 1])
+
+
+@pytest.mark.parametrize("op_type, matrices", [
+    ("multiply", [[[1, 2]], [[1, 2]]]),
+    ("inverse", [[[1, 2], [2, 4]]]),
+    ("determinant", [[[1, 2, 3]]]),
+    ("solve", [A]),
+    ("cholesky", [A]),
+])
+def test_invalid_input(op_type, matrices):
+    with pytest.raises(ValueError):
+        compute_matrix(op_type, matrices)
+
+
+def test_large_inputs_run_in_process_pool(monkeypatch):
+    monkeypatch.setattr(linalg, "POOL_THRESHOLD", 0)
+    try:
+        rng = np.random.default_rng(0)
+        m = rng.standard_normal((50, 50)) + 50 * np.eye(50)
+        assert np.allclose(compute_matrix("inverse", [m]) @ m, np.eye(50))
+        with pytest.raises(ValueError):
+            compute_matrix("inverse", [np.zeros((3, 3))])
+    finally:
+        shutdown_process_pool()
+
+
+def test_binary_roundtrip():
+    matrices = [np.arange(6, dtype=float).reshape(2, 3), np.eye(4)]
+    unpacked = unpack_matrices(pack_matrices(matrices))
+    assert [m.tolist() for m in unpacked] == [m.tolist() for m in matrices]
+    with pytest.raises(ValueError):
+        unpack_matrices(pack_matrices(matrices)[:-8])
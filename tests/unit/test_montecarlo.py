@@ -0,0 +1,87 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.operations.montecarlo import SampleSummary, iterate_simulation, sampler_parameters
+from app.operations.parallel import shutdown_process_pool
+
+
+@pytest.fixture(scope="module", autouse=True)
+def stop_pool():
+    yield
+    shutdown_process_pool()
+
+
+def run(*args, **kwargs) -> SampleSummary:
+    summary = None
+    for summary in iterate_simulation(*args, **kwargs):
+        pass
+    return summary
+
+
+VARIABLES = {"x": ("normal", {"mean": 1, "sd": 2}), "u": ("uniform", {"low": 0, "high": 3})}
+
+
+def test_same_seed_same_result_for_any_worker_count():
+    inline = run("x * u", VARIABLES, 50_000, seed=7, chunk_size=10_000, workers=1)
+    parallel = run("x * u", VARIABLES, 50_000, seed=7, chunk_size=10_000, workers=2)
+    assert (inline.count, inline.mean, inline.m2) == (parallel.count, parallel.mean, parallel.m2)
+    assert np.array_equal(inline.sketch, parallel.sketch)
+    other = run("x * u", VARIABLES, 50_000, seed=8, chunk_size=10_000, workers=1)
+    assert other.mean != inline.mean
+
+
+def test_statistics_converge():
+    summary = run("x + u", VARIABLES, 400_000, seed=1, chunk_size=50_000, workers=1)
+    assert summary.count == 400_000
+    assert summary.mean == pytest.approx(2.5, abs=0.02)
+    assert summary.sd == pytest.approx(math.sqrt(4 + 0.75), rel=0.01)
+    low, high = summary.confidence_interval(0.95)
+    assert low < summary.mean < high
+    assert high - low == pytest.approx(2 * 1.959963984540054 * summary.standard_error)
+    assert summary.quantiles([0.5])[0] == pytest.approx(2.5, abs=0.03)
+
+
+def test_running_summaries_grow_chunk_by_chunk():
+    counts = [s.count for s in iterate_simulation("x", VARIABLES, 25_000, seed=3, chunk_size=10_000, workers=1)]
+    assert counts == [10_000, 20_000, 25_000]
+
+
+def test_merge_matches_direct_summary():
+    values = np.random.default_rng(0).exponential(size=300_000)
+    merged = None
+    for part in np.array_split(values, 7):
+        summary = SampleSummary.of(part)
+        merged = summary if merged is None else merged.merge(summary)
+    assert merged.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert merged.sd == pytest.approx(values.std(ddof=1), rel=1e-12)
+    assert (merged.minimum, merged.maximum) == (values.min(), values.max())
+    probabilities = [0.01, 0.25, 0.5, 0.75, 0.99]
+    assert merged.quantiles(probabilities) == pytest.approx(np.quantile(values, probabilities), rel=2e-3, abs=1e-4)
+
+
+def test_non_finite_results_are_counted_not_summarized():
+    summary = run("1 / floor(u)", VARIABLES, 30_000, seed=5, chunk_size=10_000, workers=1)
+    assert summary.non_finite + summary.count == 30_000
+    assert 0 < summary.non_finite < 30_000
+    assert summary.maximum == 1.0
+
+
+@pytest.mark.parametrize("distribution, parameters, message", [
+    ("cauchy", {}, "Invalid distribution"),
+    ("uniform", {"low": 1, "high": 0}, "low < high"),
+    ("normal", {"sd": -1}, "sd > 0"),
+    ("poisson", {}, "needs parameters"),
+    ("t", {"df": 3, "scale": 2}, "Unknown parameters"),
+])
+def test_sampler_validation(distribution, parameters, message):
+    with pytest.raises(ValueError, match=message):
+        sampler_parameters(distribution, parameters)
+
+
+def test_simulation_validation():
+    with pytest.raises(ValueError, match="samples"):
+        run("x", VARIABLES, 0, seed=1)
+    with pytest.raises(ValueError):
+        run("x + unknown", VARIABLES, 10, seed=1)
@@ -0,0 +1,111 @@
+import math
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from app.operations import get_operation, perform_operation
+from app.operations.number_theory import (
+    PrimeTable, binomial, crt, evaluate_integer, factorial, factorize, is_prime, mod_inverse, to_text
+)
+
+
+def test_prime_table_extends_lazily():
+    table = PrimeTable()
+    assert table.primes_up_to(30).tolist() == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    limit = table.limit
+    assert table.primes_up_to(20).tolist() == [2, 3, 5, 7, 11, 13, 17, 19]
+    assert table.limit == limit
+    assert len(table.primes_up_to(1_000_000)) == 78498
+    assert table.limit > 1_000_000
+
+
+@pytest.mark.parametrize("n", [0, 1, 19, 20, 33, 100, 1000, 4321])
+def test_factorial_matches_math(n):
+    assert factorial(n) == math.factorial(n)
+
+
+@pytest.mark.parametrize("n, k", [(10, 3), (100, 50), (1000, 333), (5000, 4990), (10, 11), (7, 0)])
+def test_binomial_matches_math(n, k):
+    assert binomial(n, k) == math.comb(n, k)
+
+
+@pytest.mark.parametrize("n, expected", [
+    (2, True), (1, False), (561, False), (3215031751, False),
+    (2 ** 61 - 1, True), (2 ** 89 - 1, True), (2 ** 89 + 1, False), (2 ** 127 - 1, True),
+    (2 ** 521 - 1, True), ((2 ** 89 - 1) * (2 ** 127 - 1), False), ((2 ** 107 - 1) ** 2, False),
+])
+def test_is_prime(n, expected):
+    assert is_prime(n) is expected
+
+
+def test_strong_lucas_test_matches_known_pseudoprimes():
+    from app.operations.number_theory import _is_strong_lucas_probable_prime
+    passing = [n for n in range(5, 20000, 2) if _is_strong_lucas_probable_prime(n) and not is_prime(n)]
+    assert passing == [5459, 5777, 10877, 16109, 18971]
+
+
+def test_factorize():
+    assert factorize(600851475143) == {71: 1, 839: 1, 1471: 1, 6857: 1}
+    assert factorize(2 ** 10 * 3 ** 4) == {2: 10, 3: 4}
+    assert factorize((2 ** 61 - 1) * (10 ** 12 + 39)) == {10 ** 12 + 39: 1, 2 ** 61 - 1: 1}
+    assert factorize(1) == {}
+
+
+def test_mod_inverse_and_crt():
+    assert mod_inverse(3, 11) == 4
+    with pytest.raises(ValueError):
+        mod_inverse(6, 9)
+    assert crt([2, 3, 2], [3, 5, 7]) == (23, 105)
+    assert crt([1, 3], [4, 6]) == (9, 12)
+    with pytest.raises(ValueError):
+        crt([1, 2], [4, 6])
+
+
+def test_evaluate_modpow_is_exact():
+    big = 10 ** 30
+    assert evaluate_integer("modpow", [3, big, 1_000_000_007]) == pow(3, big, 1_000_000_007)
+    assert evaluate_integer("modpow", [3, -1, 11]) == 4
+    with pytest.raises(ValueError):
+        evaluate_integer("modpow", [3, 4])
+
+
+def test_to_text_beyond_str_limit():
+    assert to_text(10 ** 5000) == "1" + "0" * 5000
+
+
+def test_registered_integer_operations():
+    assert perform_operation(12, 18, "gcd") == 6
+    assert perform_operation(4, 6, "lcm") == 12
+    assert perform_operation(3, 11, "modinv") == 4
+    assert perform_operation(10, 3, "binomial") == 120
+    assert perform_operation(97, 0, "isprime") == 1
+    a = np.array([12.0, 35.0, 0.0])
+    b = np.array([18.0, 14.0, 5.0])
+    assert get_operation("gcd").compute_array(a, b).tolist() == [6, 7, 5]
+    with pytest.raises(HTTPException):
+        perform_operation(2.5, 3, "gcd")
+    with pytest.raises(HTTPException):
+        perform_operation(6, 9, "modinv")
+
+
+@pytest.mark.parametrize("a, b", [(math.inf, 3), (4, -math.inf), (math.nan, 2)])
+def test_integer_operations_reject_non_finite(a, b):
+    with pytest.raises(HTTPException) as exc_info:
+        perform_operation(a, b, "gcd")
+    assert exc_info.value.status_code == 400
+    with pytest.raises(HTTPException):
+        get_operation("lcm").compute_array(np.array([a]), np.array([b]))
+
+
+@pytest.mark.parametrize("a, b, message", [
+    (2e8, 100, "floating point range"),
+    (3e8, 60, "floating point range"),
+    (2e7, 50, "limited to n"),
+])
+def test_binomial_operation_rejects_before_sieving(a, b, message, monkeypatch):
+    from app.operations import number_theory
+    monkeypatch.setattr(number_theory, "PRIME_TABLE", PrimeTable())
+    with pytest.raises(HTTPException, match=message):
+        perform_operation(a, b, "binomial")
+    assert number_theory.PRIME_TABLE.limit == 2
+    assert perform_operation(1e9, 2, "binomial") == math.comb(10 ** 9, 2)
+    assert perform_operation(1000, 500, "binomial") == pytest.approx(math.comb(1000, 500))
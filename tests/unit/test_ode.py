@@ -0,0 +1,69 @@
+import pickle
+import numpy as np
+import pytest
+from app.operations.ode import ODESystem, iterate_ode, solve_ode
+
+
+@pytest.fixture
+def oscillator():
+    return ODESystem(["v", "-w^2*x"], ["x", "v"], parameters={"w": 2})
+
+
+def test_system_evaluates_state_columns_at_once(oscillator):
+    states = np.array([[1.0, 0.0], [0.0, 1.0]])
+    assert oscillator(0.0, states).tolist() == [[0.0, 1.0], [-4.0, -0.0]]
+    jacobian, f_t = oscillator.jacobian(0.0, np.array([1.0, 0.0]), oscillator(0.0, np.array([1.0, 0.0])))
+    assert jacobian == pytest.approx(np.array([[0, 1], [-4, 0]]), abs=1e-6)
+    assert f_t == pytest.approx([0, 0])
+
+
+def test_system_pickles_by_source(oscillator):
+    clone = pickle.loads(pickle.dumps(oscillator))
+    assert clone(0.5, np.array([1.0, 2.0])).tolist() == oscillator(0.5, np.array([1.0, 2.0])).tolist()
+
+
+@pytest.mark.parametrize("method, tolerance", [("rk45", 1e-5), ("rosenbrock", 1e-3)])
+def test_dense_output_matches_exact_solution(oscillator, method, tolerance):
+    t_eval = np.linspace(0, 5, 11)
+    solution = solve_ode(oscillator, (0, 5), [1, 0], method=method, t_eval=t_eval, inline_steps=None)
+    assert solution.t.tolist() == t_eval.tolist()
+    assert solution.y[:, 0] == pytest.approx(np.cos(2 * t_eval), abs=tolerance)
+    assert solution.y[:, 1] == pytest.approx(-2 * np.sin(2 * t_eval), abs=2 * tolerance)
+
+
+def test_stiff_system_needs_fewer_steps_with_rosenbrock():
+    system = ODESystem(["-1000*(y - cos(t))"], ["y"])
+    options = dict(t_eval=[10.0], rtol=1e-4, atol=1e-6, inline_steps=None)
+    explicit = solve_ode(system, (0, 10), [0], method="rk45", **options)
+    implicit = solve_ode(system, (0, 10), [0], method="rosenbrock", **options)
+    expected = (1e6 * np.cos(10) + 1e3 * np.sin(10)) / (1e6 + 1)
+    assert implicit.y[0, 0] == pytest.approx(expected, abs=1e-4)
+    assert implicit.steps * 2 < explicit.steps
+
+
+def test_iterate_yields_every_step_without_t_eval(oscillator):
+    chunks = list(iterate_ode(oscillator, (0, 1), [1, 0]))
+    assert chunks[0][0].tolist() == [0.0]
+    assert chunks[-1][2].t == 1.0
+    assert all(len(times) == 1 for times, _, _ in chunks)
+
+
+def test_long_integration_continues_in_worker_pool(oscillator):
+    inline = solve_ode(oscillator, (0, 20), [1, 0], inline_steps=None)
+    handed_off = solve_ode(oscillator, (0, 20), [1, 0], inline_steps=10)
+    assert handed_off.steps == inline.steps
+    assert handed_off.t.tolist() == inline.t.tolist()
+    assert handed_off.y == pytest.approx(inline.y)
+
+
+def test_invalid_input(oscillator):
+    with pytest.raises(ValueError, match="one equation per state"):
+        ODESystem(["x"], ["x", "y"])
+    with pytest.raises(ValueError, match="t_span"):
+        solve_ode(oscillator, (1, 0), [1, 0])
+    with pytest.raises(ValueError, match="t_eval"):
+        solve_ode(oscillator, (0, 1), [1, 0], t_eval=[0.5, 0.2])
+    with pytest.raises(ValueError, match="Exceeded"):
+        solve_ode(oscillator, (0, 100), [1, 0], max_steps=5)
+    with pytest.raises(ValueError, match="not finite|underflow"):
+        solve_ode(ODESystem(["y^2"], ["y"]), (0, 2), [1], inline_steps=None)
@@ -0,0 +1,90 @@
+import math
+import numpy as np
+import pytest
+from app.operations.optimize import (
+    bfgs, brent, expression_function, golden_section, nelder_mead, newton, polynomial_roots,
+)
+
+ROSENBROCK = expression_function("(1 - x)^2 + 100*(y - x^2)^2", ["x", "y"])
+
+
+def cubic(x):
+    return x ** 3 - 2 * x - 5
+
+
+def test_brent_batches_brackets_in_lockstep():
+    calls = []
+
+    def f(x):
+        calls.append(len(x))
+        return cubic(x)
+
+    result = brent(f, [[2, 3], [-10, 10], [3, 2]])
+    assert result.converged.all()
+    assert result.roots == pytest.approx([2.0945514815423265] * 3, abs=1e-12)
+    assert len(calls) == result.iterations + 1
+    assert result.evaluations == sum(calls)
+
+
+def test_brent_requires_sign_change():
+    with pytest.raises(ValueError, match="sign change"):
+        brent(cubic, [[3, 4]])
+
+
+def test_newton_from_many_starts():
+    result = newton(np.cos, [1.0, 4.0, 7.0])
+    assert result.converged.all()
+    assert result.roots == pytest.approx([math.pi / 2, 3 * math.pi / 2, 5 * math.pi / 2])
+    flat = newton(lambda x: x * 0 + 1.0, [0.0])
+    assert not flat.converged[0] and np.isnan(flat.roots[0])
+
+
+def test_polynomial_roots():
+    roots = polynomial_roots([1, -6, 11, -6])
+    assert sorted(roots.real) == pytest.approx([1, 2, 3])
+    roots = polynomial_roots([0, 1, 0, 1, 0])  # x^3 + x = x (x^2 + 1)
+    assert sorted(roots.tolist(), key=lambda z: z.imag) == pytest.approx([-1j, 0, 1j])
+    with pytest.raises(ValueError):
+        polynomial_roots([0, 0])
+
+
+def test_golden_section():
+    f = expression_function("(x - a)^2 + 1", ["x"], {"a": 2})
+    result = golden_section(lambda x: f(x[..., None]), [[0, 5], [5, 1]])
+    assert result.points[:, 0] == pytest.approx([2, 2], abs=1e-6)
+    assert result.values == pytest.approx([1, 1])
+    assert result.converged.all()
+
+
+@pytest.mark.parametrize("minimizer", [nelder_mead, bfgs])
+def test_rosenbrock_from_several_starts(minimizer):
+    result = minimizer(ROSENBROCK, [[-1.2, 1], [0, 0], [3, 3]])
+    assert result.converged.all()
+    assert result.points == pytest.approx(np.ones((3, 2)), abs=1e-4)
+
+
+def test_bfgs_respects_bounds():
+    result = bfgs(ROSENBROCK, [[-1.2, 1], [0, 0]], bounds=[[-2, 0.5], [-1, 2]])
+    assert result.points == pytest.approx(np.array([[0.5, 0.25]] * 2), abs=1e-5)
+    with pytest.raises(ValueError, match="bounds"):
+        bfgs(ROSENBROCK, [[0, 0]], bounds=[[1, 0], [0, 1]])
+
+
+def test_nan_outside_domain_is_treated_as_uphill():
+    f = expression_function("sqrt(x) + 1/x", ["x"])  # minimum at x = 2^(2/3)
+    result = nelder_mead(f, [[3.0]])
+    assert result.points[0, 0] == pytest.approx(2 ** (2 / 3), rel=1e-5)
+
+
+def test_unbounded_objective_is_not_converged():
+    with np.errstate(all="ignore"):
+        result = nelder_mead(expression_function("x", ["x"]), [[0.0]])
+    assert not result.converged[0]
+    assert result.values[0] == -np.inf
+
+
+def test_expression_function_validation():
+    with pytest.raises(ValueError):
+        expression_function("x + a", ["x"], {"x": 1})
+    with pytest.raises(ValueError):
+        brent(cubic, [[0, np.inf]])
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from app.operations import get_operation, parallel
+from app.operations.parallel import compute_batch, shutdown_process_pool
+
+
+@pytest.fixture(scope="module", autouse=True)
+def stop_pool():
+    yield
+    shutdown_process_pool()
+
+
+@pytest.mark.parametrize("op_type, expected", [
+    ("add", lambda a, b: a + b),
+    ("subtract", lambda a, b: a - b),
+    ("multiply", lambda a, b: a * b),
+    ("divide", lambda a, b: a / b),
+    ("power", lambda a, b: a ** b),
+    ("modulus", lambda a, b: a % b),
+])
+def test_compute_array_matches_scalar(op_type, expected):
+    a = np.array([1.5, 2.0, 3.0, 10.0])
+    b = np.array([2.0, 4.0, 0.5, 3.0])
+    result = get_operation(op_type).compute_array(a, b)
+    assert result == pytest.approx(expected(a, b))
+
+
+def test_compute_array_divide_by_zero():
+    with pytest.raises(HTTPException) as exc_info:
+        get_operation("divide").compute_array(np.array([1.0, 2.0]), np.array([1.0, 0.0]))
+    assert exc_info.value.status_code == 400
+
+
+def test_compute_batch_inline():
+    result = compute_batch("add", [1, 2, 3], [4, 5, 6])
+    assert result.tolist() == [5, 7, 9]
+
+
+def test_compute_batch_parallel_chunks():
+    a = np.arange(10_001, dtype=np.float64)
+    b = np.full(10_001, 2.0)
+    result = compute_batch("multiply", a, b, chunk_size=1_000, workers=2, threshold=0)
+    assert np.array_equal(result, a * 2)
+
+
+def test_compute_batch_limits_tasks_to_workers(monkeypatch):
+    pool = parallel.get_process_pool()
+    submitted = []
+
+    class RecordingPool:
+        def submit(self, *args):
+            submitted.append(args)
+            return pool.submit(*args)
+
+    monkeypatch.setattr(parallel, "get_process_pool", lambda: RecordingPool())
+    a = np.arange(10_001, dtype=np.float64)
+    result = compute_batch("add", a, a, chunk_size=1_000, workers=3, threshold=0)
+    assert np.array_equal(result, a * 2)
+    assert len(submitted) == 3
+    assert sorted(r for task in submitted for r in task[6]) == [(s, min(s + 1_000, 10_001)) for s in range(0, 10_001, 1_000)]
+
+
+def test_compute_batch_parallel_error_propagates():
+    a = np.arange(5_000, dtype=np.float64)
+    b = np.ones(5_000)
+    b[4_321] = 0
+    with pytest.raises(HTTPException) as exc_info:
+        compute_batch("divide", a, b, chunk_size=1_000, workers=2, threshold=0)
+    assert "divide by zero" in exc_info.value.detail.lower()
+
+
+def test_compute_batch_length_mismatch():
+    with pytest.raises(ValueError):
+        compute_batch("add", [1, 2], [1])
@@ -0,0 +1,65 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.operations.plotting import POINTS_PER_PIXEL, sample_adaptively
+
+
+def test_smooth_curve_stays_coarse_and_accurate():
+    samples = sample_adaptively(np.sin, 0, 20, width=800, height=400)
+    assert len(samples.x) <= POINTS_PER_PIXEL * 800
+    assert np.all(np.diff(samples.x) > 0)
+    assert samples.y == pytest.approx(np.sin(samples.x))
+    assert len(samples.discontinuities) == 0
+    # linear interpolation between samples is within a pixel of the curve
+    fine = np.linspace(0, 20, 100_001)
+    y_pixel = (samples.y_range[1] - samples.y_range[0]) / 400
+    assert np.max(np.abs(np.interp(fine, samples.x, samples.y) - np.sin(fine))) < y_pixel
+
+
+def test_points_concentrate_where_the_curve_bends():
+    samples = sample_adaptively(lambda x: np.exp(-x * x * 400), -1, 1, width=400, height=300)
+    near_peak = np.sum(np.abs(samples.x) < 0.2)
+    far = np.sum(np.abs(samples.x) > 0.8)
+    assert near_peak > 2 * far
+
+
+def test_jumps_are_found_and_steep_curves_are_not():
+    steps = sample_adaptively(np.floor, 0, 5.3, width=800)
+    assert steps.discontinuities == pytest.approx([1, 2, 3, 4, 5], abs=1e-3)
+    tan = sample_adaptively(np.tan, -3, 3, width=800)
+    assert tan.discontinuities == pytest.approx([-math.pi / 2, math.pi / 2], abs=1e-3)
+    steep = sample_adaptively(lambda x: np.arctan(1000 * x), -1, 1, width=800)
+    assert len(steep.discontinuities) == 0
+
+
+def test_domain_edges_are_located():
+    samples = sample_adaptively(np.sqrt, -1, 1, width=800)
+    defined = samples.x[np.isfinite(samples.y)]
+    assert defined.min() < 1e-4
+    assert np.isnan(samples.y[0])
+
+
+def test_pixel_budget_holds_for_wild_functions():
+    samples = sample_adaptively(lambda x: np.sin(1 / x), -1, 1, width=300)
+    assert len(samples.x) <= POINTS_PER_PIXEL * 300
+
+
+def test_range_up_to_the_float_limit():
+    samples = sample_adaptively(lambda x: x, 0, 1e308)
+    assert np.isfinite(samples.x).all() and samples.x[-1] == 1e308
+    samples = sample_adaptively(lambda x: np.where(x < 5e307, 0.0, 1.0), 0, 1.7e308)
+    assert np.isfinite(samples.x).all() and np.isfinite(samples.discontinuities).all()
+    assert len(samples.discontinuities) == 1
+
+
+def test_validation():
+    with pytest.raises(ValueError, match="x0 < x1"):
+        sample_adaptively(np.sin, 1, 1)
+    with pytest.raises(ValueError, match="pixels"):
+        sample_adaptively(np.sin, 0, 1, width=0)
+    with pytest.raises(ValueError, match="floating point range"):
+        sample_adaptively(np.sin, -1e308, 1e308)
+    with pytest.raises(ValueError, match="floating point range"):
+        sample_adaptively(lambda x: np.full_like(x, 1e308), 0, 1)
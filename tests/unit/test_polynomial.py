@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from app.operations.polynomial import FFT_THRESHOLD, derivative, evaluate, fit, integral, multiply
+
+
+def test_evaluate_many_points():
+    x = np.linspace(-2, 2, 1001)
+    assert evaluate([2, -3, 0, 5], x) == pytest.approx(2 * x ** 3 - 3 * x ** 2 + 5)
+    assert evaluate([7], [1, 2]).tolist() == [7, 7]
+
+
+def test_multiply_direct_and_fft_agree():
+    assert multiply([1, 1], [1, -1]).tolist() == [1, 0, -1]
+    rng = np.random.default_rng(1)
+    p, q = rng.normal(size=FFT_THRESHOLD * 4), rng.normal(size=FFT_THRESHOLD * 2)
+    assert multiply(p, q) == pytest.approx(np.convolve(p, q), abs=1e-10)
+
+
+def test_derivative_and_integral():
+    assert derivative([3, 2, 1]).tolist() == [6, 2]
+    assert derivative([5]).tolist() == [0]
+    assert integral([3, 2, 1], constant=4).tolist() == [1, 1, 1, 4]
+    assert derivative(integral([4, 0, -1])).tolist() == [4, 0, -1]
+
+
+def test_fit_recovers_polynomial_far_from_origin():
+    x = np.linspace(1000, 1010, 500)
+    y = 0.5 * x ** 2 - 3 * x + 2
+    result = fit(x, y, 2)
+    assert result.coefficients == pytest.approx([0.5, -3, 2], rel=1e-6, abs=1e-4)
+    assert result.count == 500
+    assert result.r_squared == pytest.approx(1.0)
+
+
+def test_fit_reports_noise_and_skips_non_finite_points():
+    rng = np.random.default_rng(0)
+    x = rng.uniform(-1, 1, 10_000)
+    y = 2 * x + 1 + rng.normal(scale=0.1, size=x.size)
+    y[0] = np.nan
+    result = fit(x, y, 1)
+    assert result.count == 9_999
+    assert result.rms_error == pytest.approx(0.1, rel=0.05)
+    assert result.coefficients == pytest.approx([2, 1], abs=0.01)
+
+
+def test_fit_validation():
+    with pytest.raises(ValueError, match="at least 3"):
+        fit([1, 2], [1, 2], 2)
+    with pytest.raises(ValueError, match="degree"):
+        fit([1, 2], [1, 2], 21)
+    with pytest.raises(ValueError):
+        evaluate([], [1])
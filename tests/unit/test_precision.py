@@ -0,0 +1,69 @@
+from decimal import Decimal
+import pytest
+from fastapi import HTTPException
+from app.operations.precision import compute_precise, get_context, to_float
+
+
+def test_sqrt_two_to_many_digits():
+    result = compute_precise("sqrt", 2, 0, 50)
+    assert str(result) == "1.4142135623730950488016887242096980785696718753769"
+
+
+def test_sqrt_perfect_square_and_fraction():
+    assert compute_precise("sqrt", 144, 0, 20) == 12
+    assert str(compute_precise("sqrt", 0.25, 0, 10)) == "0.5000000000"
+
+
+def test_sqrt_1000_digits_squares_back():
+    root = compute_precise("sqrt", 3, 0, 1000)
+    assert len(root.as_tuple().digits) == 1000
+    with_guard = get_context(1005)
+    assert abs(with_guard.multiply(root, root) - 3) < Decimal("1e-995")
+
+
+def test_exact_integer_power():
+    result = compute_precise("power", 2, 100, 40)
+    assert result == Decimal(2 ** 100)
+    assert compute_precise("power", 2, -2, 10) == Decimal("0.25")
+
+
+def test_power_negative_base_fractional_exponent():
+    with pytest.raises(HTTPException) as exc_info:
+        compute_precise("power", -8, 0.5, 20)
+    assert exc_info.value.status_code == 400
+
+
+def test_power_exponent_overflow():
+    with pytest.raises(HTTPException) as exc_info:
+        compute_precise("power", 10, 1e9, 10)
+    assert exc_info.value.status_code == 400
+
+
+def test_power_underflow_is_plain_zero():
+    assert str(compute_precise("power", 1e-300, 1e7, 10)) == "0"
+
+
+def test_decimal_operands_are_exact():
+    assert compute_precise("add", 0.1, 0.2, 30) == Decimal("0.3")
+    assert str(compute_precise("divide", 1, 3, 25)) == "0.3333333333333333333333333"
+
+
+@pytest.mark.parametrize("a, b", [(10, 3), (-10, 3), (10, -3), (5.5, 2), (-5.5, 2)])
+def test_modulus_matches_float_semantics(a, b):
+    assert float(compute_precise("modulus", a, b, 20)) == pytest.approx(a % b)
+
+
+def test_zero_divisors():
+    with pytest.raises(HTTPException):
+        compute_precise("divide", 1, 0, 10)
+    with pytest.raises(HTTPException):
+        compute_precise("modulus", 1, 0, 10)
+
+
+def test_context_is_cached():
+    assert get_context(500) is get_context(500)
+
+
+def test_to_float_overflow():
+    with pytest.raises(HTTPException):
+        to_float(Decimal("1e400"))
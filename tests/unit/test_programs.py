@@ -0,0 +1,33 @@
+import pytest
+
+from app.operations.programs import run_program
+
+
+def test_rpn_program_records_each_operation():
+    run = run_program([3, 4, "power", "push 2", "divide", "sqrt"])
+    assert [(s.index, s.type, s.a, s.b, s.result) for s in run.steps] == [
+        (2, "power", 3.0, 4.0, 81.0),
+        (4, "divide", 81.0, 2.0, 40.5),
+        (5, "sqrt", 40.5, 0.0, 40.5 ** 0.5),
+    ]
+    assert run.stack == [40.5 ** 0.5]
+
+
+def test_stack_instructions():
+    run = run_program([2, "dup", "multiply", 10, "swap", "subtract", 7, "drop"])
+    assert [s.result for s in run.steps] == [4.0, 6.0]
+    assert run.stack == [6.0]
+
+
+@pytest.mark.parametrize("steps, message", [
+    ([1, 0, "divide"], r"Step 2 \(divide\)"),
+    ([1, "add"], "needs 2 value"),
+    (["push x"], "not a number"),
+    ([1, "frobnicate"], "unknown instruction"),
+    ([1, "dup 2"], "only push"),
+    ([10, 400, "power"], r"Step 2 \(power\)"),
+    ([], "between 1 and"),
+])
+def test_errors_name_the_step(steps, message):
+    with pytest.raises(ValueError, match=message):
+        run_program(steps)
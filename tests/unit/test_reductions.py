@@ -0,0 +1,51 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.operations.reductions import pack_operands, reduce_operands, unpack_operands
+
+
+def test_sum_is_correctly_rounded():
+    assert reduce_operands("sum", [1e16, 1.0, -1e16]) == 1.0
+    values = np.random.default_rng(0).normal(size=100_000) * 1e8
+    assert reduce_operands("sum", values) == math.fsum(values)
+    assert reduce_operands("mean", [0.1] * 10) == 0.1
+
+
+def test_product_avoids_intermediate_overflow():
+    assert reduce_operands("product", [1e200, 1e200, 1e-300]) == pytest.approx(1e100)
+    assert reduce_operands("product", [2.0] * 1000 + [0.5] * 1000) == 1.0
+    assert reduce_operands("product", [-2.0, 3.0, 0.0]) == 0.0
+    with pytest.raises(ValueError):
+        reduce_operands("product", [1e300, 1e300])
+
+
+def test_sum_overflow_and_mean_of_huge_operands():
+    with pytest.raises(ValueError, match="floating point range"):
+        reduce_operands("sum", [1e308, 1e308])
+    assert reduce_operands("mean", [1e308, 1e308]) == 1e308
+    assert reduce_operands("mean", [1.7e308, 1.7e308, -1.7e308]) == pytest.approx(1.7e308 / 3)
+
+
+@pytest.mark.parametrize("op_type, expected", [("min", -4.0), ("max", 12.0), ("hypot", 13.0)])
+def test_other_reductions(op_type, expected):
+    assert reduce_operands(op_type, [3.0, -4.0, 12.0]) == expected
+
+
+@pytest.mark.parametrize("op_type, operands", [
+    ("median", [1.0]),
+    ("sum", []),
+    ("sum", [1.0, float("nan")]),
+    ("hypot", [1e308] * 4),
+])
+def test_invalid_input(op_type, operands):
+    with pytest.raises(ValueError):
+        reduce_operands(op_type, operands)
+
+
+def test_pack_round_trip():
+    values = [1.5, -2.0, 1e-300]
+    assert unpack_operands(pack_operands(values)).tolist() == values
+    with pytest.raises(ValueError):
+        unpack_operands(b"\x00" * 9)
@@ -0,0 +1,71 @@
+import math
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from app.operations import get_operation, perform_operation
+from app.operations.parallel import compute_batch
+
+SAMPLES = np.array([-2.5, -0.75, -0.1, 0.0, 0.3, 0.9, 1.5, 4.0, 12.25])
+
+
+@pytest.mark.parametrize("op_type, scalar", [
+    ("sin", math.sin), ("cos", math.cos), ("tan", math.tan), ("atan", math.atan),
+    ("sinh", math.sinh), ("cosh", math.cosh), ("tanh", math.tanh), ("asinh", math.asinh),
+    ("exp", math.exp), ("abs", abs), ("floor", math.floor), ("ceil", math.ceil),
+])
+def test_vector_kernel_matches_scalar(op_type, scalar):
+    vector = get_operation(op_type).compute_array(SAMPLES, np.zeros_like(SAMPLES))
+    assert vector == pytest.approx([scalar(x) for x in SAMPLES], rel=1e-14)
+
+
+@pytest.mark.parametrize("op_type, scalar, inputs", [
+    ("asin", math.asin, [-1, -0.5, 0, 0.99]),
+    ("acos", math.acos, [-1, -0.5, 0, 0.99]),
+    ("acosh", math.acosh, [1, 2.5, 100]),
+    ("atanh", math.atanh, [-0.9, 0, 0.5]),
+    ("log", math.log10, [0.001, 1, 1000]),
+    ("ln", math.log, [0.5, 1, math.e]),
+    ("log2", math.log2, [0.25, 1, 1024]),
+])
+def test_restricted_domain_functions(op_type, scalar, inputs):
+    a = np.array(inputs, dtype=np.float64)
+    assert get_operation(op_type).compute_array(a, a) == pytest.approx([scalar(x) for x in inputs])
+    assert perform_operation(inputs[-1], 0, op_type) == pytest.approx(scalar(inputs[-1]))
+
+
+@pytest.mark.parametrize("op_type, bad", [
+    ("asin", 1.5), ("acos", -2), ("acosh", 0.5), ("atanh", 1),
+    ("log", 0), ("ln", -1), ("log2", -0.5), ("factorial", -1), ("factorial", 2.5), ("gamma", -3),
+])
+def test_domain_errors(op_type, bad):
+    with pytest.raises(HTTPException) as exc_info:
+        perform_operation(bad, 0, op_type)
+    assert exc_info.value.status_code == 400
+    with pytest.raises(HTTPException):
+        get_operation(op_type).compute_array(np.array([1.0, bad]), np.zeros(2))
+
+
+def test_factorial():
+    assert perform_operation(5, 0, "factorial") == 120
+    a = np.array([0, 1, 10, 20], dtype=np.float64)
+    assert get_operation("factorial").compute_array(a, a).tolist() == [1, 1, 3628800, 2432902008176640000]
+
+
+def test_gamma_matches_math():
+    a = np.concatenate([np.linspace(-4.5, -0.01, 40), np.linspace(0.01, 170.5, 400)])
+    a = np.concatenate([a[a != np.floor(a)], [1.0, 5.0, 171.0]])
+    vector = get_operation("gamma").compute_array(a, np.zeros_like(a))
+    assert vector == pytest.approx([math.gamma(x) for x in a], rel=1e-12)
+
+
+@pytest.mark.parametrize("op_type, value", [("exp", 1000), ("cosh", 800), ("factorial", 171), ("gamma", 200)])
+def test_overflow_is_rejected(op_type, value):
+    with pytest.raises(HTTPException):
+        perform_operation(value, 0, op_type)
+    with pytest.raises(HTTPException):
+        get_operation(op_type).compute_array(np.array([value], dtype=np.float64), np.zeros(1))
+
+
+def test_scientific_operations_in_batches():
+    a = np.linspace(0.1, 10, 1000)
+    assert compute_batch("ln", a, a) == pytest.approx(np.log(a))
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from app.operations.signal import (
+    MovingWindow, OverlapAdd, SeriesDecoder, available_series_operations, compute_series, encode_series,
+)
+
+rng = np.random.default_rng(0)
+SERIES = rng.normal(size=5_000)
+
+
+def test_registry():
+    assert {"fft", "ifft", "power_spectrum", "convolve", "moving_average"} <= set(available_series_operations())
+    with pytest.raises(ValueError, match="Invalid series operation"):
+        compute_series("wavelet", SERIES)
+
+
+def test_fft_round_trip_and_power_spectrum():
+    spectrum = compute_series("fft", SERIES)
+    assert spectrum == pytest.approx(np.fft.rfft(SERIES))
+    restored = compute_series("ifft", spectrum.view(np.float64), n=len(SERIES))
+    assert restored == pytest.approx(SERIES)
+    power = compute_series("power_spectrum", SERIES)
+    # Parseval: the periodogram sums to the signal energy (one-sided, so count interior bins twice)
+    assert power[0] + 2 * power[1:-1].sum() + power[-1] == pytest.approx(np.sum(SERIES ** 2))
+
+
+@pytest.mark.parametrize("kernel_size", [3, 200])
+def test_convolution_matches_numpy(kernel_size):
+    kernel = rng.normal(size=kernel_size)
+    assert compute_series("convolve", SERIES, kernel=kernel) == pytest.approx(np.convolve(SERIES, kernel))
+
+
+def test_overlap_add_in_small_blocks_with_ragged_chunks():
+    kernel = rng.normal(size=100)
+    stream = OverlapAdd(kernel, block_size=256)
+    pieces = [stream.feed(chunk) for chunk in np.array_split(SERIES, 37)]
+    assert np.concatenate(pieces + [stream.finish()]) == pytest.approx(np.convolve(SERIES, kernel))
+
+
+def test_moving_windows():
+    average = compute_series("moving_average", SERIES, window=5)
+    assert average == pytest.approx(np.convolve(SERIES, np.ones(5) / 5, "valid"))
+    views = np.lib.stride_tricks.sliding_window_view(SERIES, 5)
+    assert compute_series("moving_median", SERIES, window=5).tolist() == np.median(views, axis=1).tolist()
+    stream = MovingWindow(np.max, 5, block_size=64)
+    pieces = [stream.feed(chunk) for chunk in np.array_split(SERIES, 13)]
+    assert np.concatenate(pieces).tolist() == views.max(axis=1).tolist()
+    with pytest.raises(ValueError, match="shorter than the window"):
+        compute_series("moving_average", SERIES[:3], window=5)
+    with pytest.raises(ValueError, match="window"):
+        compute_series("moving_min", SERIES)
+
+
+def test_moving_window_slices_scale_with_window():
+    shapes = []
+
+    def reduce(views, axis):
+        shapes.append(views.shape)
+        return np.median(views, axis=axis)
+
+    stream = MovingWindow(reduce, 500, block_size=4_000)
+    result = stream.feed(SERIES)
+    assert result.tolist() == np.median(np.lib.stride_tricks.sliding_window_view(SERIES, 500), axis=1).tolist()
+    assert max(rows * window for rows, window in shapes) <= 4_000
+    with pytest.raises(ValueError, match="limited"):
+        compute_series("moving_max", SERIES, window=10 ** 9)
+
+
+def test_decoder_handles_split_values():
+    raw = np.array([1.5, -2.0, 3.25]).astype("<f8").tobytes()
+    decoder = SeriesDecoder("binary")
+    values = np.concatenate([decoder.feed(raw[:5]), decoder.feed(raw[5:19]), decoder.feed(raw[19:]), decoder.finish()])
+    assert values.tolist() == [1.5, -2.0, 3.25]
+    decoder = SeriesDecoder("binary")
+    decoder.feed(raw[:5])
+    with pytest.raises(ValueError, match="multiple of 8"):
+        decoder.finish()
+
+    decoder = SeriesDecoder("ndjson")
+    values = np.concatenate([decoder.feed(b"1\n[2, 3"), decoder.feed(b"]\n\n4"), decoder.finish()])
+    assert values.tolist() == [1, 2, 3, 4]
+    with pytest.raises(ValueError):
+        SeriesDecoder("ndjson").feed(b'{"a": 1}\n')
+
+
+def test_encode_series():
+    assert encode_series(np.array([1 + 2j]), "ndjson") == b"[1.0, 2.0]\n"
+    assert np.frombuffer(encode_series(np.array([1 + 2j]), "binary"), dtype="<f8").tolist() == [1.0, 2.0]
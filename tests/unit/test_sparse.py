@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from app.operations.sparse import CSRMatrix, iterate_sparse_solve, solve_sparse
+
+
+def poisson(n, shift=0.0):
+    i = np.arange(n)
+    rows = np.r_[i, i[1:], i[:-1]]
+    cols = np.r_[i, i[:-1], i[1:]]
+    values = np.r_[np.full(n, 2.0 + shift), np.full(n - 1, -1.0), np.full(n - 1, -1.0)]
+    return CSRMatrix.from_coo(rows, cols, values, (n, n))
+
+
+def test_from_coo_sums_duplicates_and_matches_dense():
+    matrix = CSRMatrix.from_coo([0, 2, 0, 1, 0], [0, 1, 0, 2, 2], [1.0, 5.0, 2.0, 4.0, 3.0], (3, 3))
+    dense = np.array([[3.0, 0, 3.0], [0, 0, 4.0], [0, 5.0, 0]])
+    x = np.array([1.0, 2.0, 3.0])
+    assert matrix.nnz == 4
+    assert matrix.matvec(x).tolist() == (dense @ x).tolist()
+    assert matrix.diagonal().tolist() == [3.0, 0.0, 0.0]
+
+
+def test_from_csr_validation():
+    with pytest.raises(ValueError):
+        CSRMatrix.from_csr([1.0], [5], [0, 1], (1, 2))
+    with pytest.raises(ValueError):
+        CSRMatrix.from_coo([0, 3], [0, 0], [1.0, 1.0], (2, 2))
+
+
+@pytest.mark.parametrize("method", ["cg", "gmres"])
+@pytest.mark.parametrize("preconditioner", ["none", "jacobi"])
+def test_solvers_converge(method, preconditioner):
+    matrix = poisson(500, shift=0.01)
+    b = np.sin(np.arange(500))
+    state = solve_sparse(matrix, b, method=method, preconditioner=preconditioner, tol=1e-10, max_iterations=5000)
+    assert state.done and state.converged
+    assert np.linalg.norm(matrix.matvec(state.x) - b) / np.linalg.norm(b) < 1e-9
+
+
+def test_gmres_nonsymmetric():
+    n = 300
+    rng = np.random.default_rng(3)
+    rows = np.r_[np.arange(n), np.arange(n - 1), np.arange(1, n)]
+    cols = np.r_[np.arange(n), np.arange(1, n), np.arange(n - 1)]
+    values = np.r_[4.0 + rng.random(n), np.full(n - 1, -1.5), np.full(n - 1, -0.5)]
+    matrix = CSRMatrix.from_coo(rows, cols, values, (n, n))
+    b = rng.random(n)
+    state = solve_sparse(matrix, b, method="gmres", tol=1e-10, restart=10)
+    assert state.converged
+    assert np.allclose(matrix.matvec(state.x), b, atol=1e-8)
+
+
+def test_progress_is_reported_and_iterations_capped():
+    states = list(iterate_sparse_solve(poisson(1000), np.ones(1000), tol=1e-14, max_iterations=50, report_every=10))
+    assert [s.iteration for s in states[:-1]] == [10, 20, 30, 40, 50]
+    assert states[-1].done and not states[-1].converged and states[-1].iteration == 50
+
+
+def test_cg_rejects_indefinite_matrix():
+    matrix = CSRMatrix.from_coo([0, 1], [0, 1], [1.0, -1.0], (2, 2))
+    with pytest.raises(ValueError):
+        solve_sparse(matrix, [1.0, 1.0], method="cg")
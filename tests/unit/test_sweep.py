@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from app.operations.sweep import ParameterSweep, axis_values
+
+
+def collect(sweep: ParameterSweep, chunk_size: int) -> np.ndarray:
+    return np.concatenate([values for _, values in sweep.chunks(chunk_size)]).reshape(sweep.shape)
+
+
+def test_expression_grid_matches_meshgrid():
+    axes = {"a": np.linspace(0, 10, 37), "b": np.arange(1.0, 12.0), "c": np.array([-1.0, 2.0])}
+    sweep = ParameterSweep(axes, expression="a * b - c")
+    a, b, c = np.meshgrid(*axes.values(), indexing="ij")
+    expected = a * b - c
+    for chunk_size in (1, 7, 100, 10_000):
+        assert np.array_equal(collect(sweep, chunk_size), expected)
+
+
+def test_chunks_cover_whole_rows():
+    sweep = ParameterSweep({"a": np.arange(10.0), "b": np.arange(4.0)}, expression="a + b")
+    starts = [(start, values.shape) for start, values in sweep.chunks(9)]
+    assert starts == [(0, (2, 4)), (2, (2, 4)), (4, (2, 4)), (6, (2, 4)), (8, (2, 4))]
+    assert [v.tolist() for v in sweep.leading_values(3, 5)] == [[3.0, 4.0]]
+
+
+def test_single_variable_and_constant_expression():
+    sweep = ParameterSweep({"x": np.arange(5.0)}, expression="2")
+    assert collect(sweep, 2).tolist() == [2.0] * 5
+
+
+def test_operation_sweep_marks_undefined_cells():
+    sweep = ParameterSweep({"a": np.arange(1.0, 4.0), "b": np.array([-1.0, 0.0, 2.0])}, op_type="divide")
+    result = collect(sweep, 100)
+    assert np.isnan(result[:, 1]).all()
+    assert result[:, [0, 2]].tolist() == [[-1.0, 0.5], [-2.0, 1.0], [-3.0, 1.5]]
+    sqrt = ParameterSweep({"a": np.array([-4.0, 4.0, 9.0])}, op_type="sqrt")
+    assert collect(sqrt, 10).tolist() == pytest.approx([np.nan, 2.0, 3.0], nan_ok=True)
+
+
+@pytest.mark.parametrize("op_type, a, b", [
+    ("divide", 1.0, 0.0), ("log", -1.0, 0.0), ("sqrt", -1.0, 0.0), ("factorial", 500.0, 0.0),
+    ("normal_quantile", 1.0, 0.0), ("t_cdf", 0.5, -1.0), ("modinv", 2.0, 4.0), ("binomial", 2000.0, 1000.0),
+])
+def test_all_invalid_grid_is_one_pass(op_type, a, b):
+    import time
+    sweep = ParameterSweep({"a": np.full(200_000, a), "b": np.array([b])}, op_type=op_type)
+    started = time.perf_counter()
+    assert np.isnan(collect(sweep, 1 << 20)).all()
+    assert time.perf_counter() - started < 1.0
+
+
+def test_compute_defined_without_a_mask():
+    from fastapi import HTTPException
+    from app.operations import Operation
+    from app.operations.sweep import compute_defined
+
+    class Reciprocal(Operation):
+        def compute_array(self, a, b, out=None):
+            if not np.all(a):
+                raise HTTPException(status_code=400, detail="zero")
+            return 1 / a
+
+    a = np.arange(1000.0) % 7
+    expected = np.where(a == 0, np.nan, 1 / np.where(a == 0, 1, a))
+    assert compute_defined(Reciprocal(), a, a) == pytest.approx(expected, nan_ok=True)
+
+
+def test_axis_values():
+    assert axis_values(start=0, stop=1, num=5).tolist() == [0, 0.25, 0.5, 0.75, 1]
+    assert axis_values([3, 1]).tolist() == [3, 1]
+    with pytest.raises(ValueError, match="start, stop and num"):
+        axis_values(start=0, num=3)
+    with pytest.raises(ValueError, match="finite"):
+        axis_values([1, float("inf")])
+
+
+@pytest.mark.parametrize("axes, kwargs, message", [
+    ({"a": np.arange(3.0)}, {}, "either an expression"),
+    ({"a": np.arange(3.0)}, {"expression": "a", "op_type": "add"}, "either an expression"),
+    ({"x": np.arange(3.0)}, {"op_type": "add"}, "variables a"),
+    ({"a": np.arange(3.0)}, {"op_type": "unknown"}, "Invalid operation"),
+    ({"a": np.arange(3.0)}, {"expression": "a + z"}, "Unknown variable"),
+    ({"a": np.zeros(20_000), "b": np.zeros(20_000)}, {"expression": "a"}, "cells"),
+])
+def test_validation(axes, kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        ParameterSweep(axes, **kwargs)
@@ -0,0 +1,74 @@
+import math
+
+import pytest
+
+from app.operations.units import Quantity, compute_with_units, conversion_factor, convert, parse_unit, registry
+
+
+def quantity(value, unit=None):
+    return Quantity(value, parse_unit(unit))
+
+
+def test_named_conversions_use_the_compiled_table():
+    assert registry.factor("mi", "m") == 1609.344
+    assert registry.factor("km", "s") is None
+    assert convert(1, "kWh", "J") == 3.6e6
+    assert convert(1, "psi", "lbf/in^2") == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("source, target, factor", [
+    ("km/h", "m/s", 1 / 3.6),
+    ("N m", "J", 1.0),
+    ("L", "m^3", 0.001),
+    ("1/s", "Hz", 1.0),
+    ("kg*m/s^2", "kN", 0.001),
+    ("rev", "rad", 2 * math.pi),
+])
+def test_compound_conversions(source, target, factor):
+    assert conversion_factor(parse_unit(source), parse_unit(target)) == pytest.approx(factor)
+
+
+def test_dimension_mismatch_and_unknown_units():
+    with pytest.raises(ValueError, match="length"):
+        convert(1, "km", "kg")
+    with pytest.raises(ValueError, match="Unknown unit"):
+        parse_unit("furlong")
+    with pytest.raises(ValueError, match="Invalid unit"):
+        parse_unit("m^^2")
+
+
+def test_unit_arithmetic():
+    speed = compute_with_units("divide", quantity(5, "km"), quantity(20, "min"))
+    assert (speed.value, str(speed.unit)) == (0.25, "km/min")
+    assert speed.value * conversion_factor(speed.unit, parse_unit("km/h")) == pytest.approx(15.0)
+
+    total = compute_with_units("add", quantity(1, "km"), quantity(500, "m"))
+    assert (total.value, str(total.unit)) == (1.5, "km")
+    area = compute_with_units("power", quantity(3, "m"), quantity(2))
+    assert (area.value, str(area.unit)) == (9, "m^2")
+    side = compute_with_units("sqrt", area, quantity(0))
+    assert (side.value, str(side.unit)) == (3, "m")
+    assert compute_with_units("sin", quantity(30, "deg"), quantity(0)).value == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize("op_type, a, b", [
+    ("add", ("km",), ("s",)),
+    ("sin", ("m",), (None,)),
+    ("sqrt", ("m",), (None,)),
+    ("power", ("m",), (None,)),
+])
+def test_dimension_errors(op_type, a, b):
+    with pytest.raises(ValueError):
+        compute_with_units(op_type, quantity(2.5, *a), quantity(0.5, *b))
+
+
+def test_exponent_and_overflow_limits():
+    with pytest.raises(ValueError, match="limited to"):
+        parse_unit("km^400")
+    with pytest.raises(ValueError, match="floating point range"):
+        parse_unit("eV^12*mg^12*ns^12")
+    assert conversion_factor(parse_unit("km^12"), parse_unit("km^12")) == 1.0
+    with pytest.raises(ValueError, match="limited to"):
+        compute_with_units("power", quantity(2, "m"), quantity(1e5))
+    with pytest.raises(ValueError, match="^Result exceeds the floating point range$"):
+        compute_with_units("power", quantity(2), quantity(1e5))
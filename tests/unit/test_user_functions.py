@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from app.operations.user_functions import (
+    FunctionLibrary, LibraryCache, callers, check_definition, parse_definition,
+)
+
+
+def test_parse_definition():
+    assert parse_definition("f(x, y) = x^2 + sqrt(y)") == ("f", ("x", "y"), "x^2 + sqrt(y)")
+    assert parse_definition(" area (r)=pi*r^2 ") == ("area", ("r",), "pi*r^2")
+    with pytest.raises(ValueError, match="looks like"):
+        parse_definition("f = x + 1")
+
+
+def test_library_compiles_functions_that_call_each_other():
+    library = FunctionLibrary({
+        "square": (("x",), "x^2"),
+        "norm": (("x", "y"), "sqrt(square(x) + square(y))"),
+    })
+    assert library.functions["norm"](3.0, 4.0) == pytest.approx(5.0)
+    compiled = library.compile("norm(a, 1) * 2", ("a",))
+    assert compiled(np.array([0.0, 1.0])) == pytest.approx([2.0, 2 * np.sqrt(2)])
+    # the compiled expression is reused, not rebuilt
+    assert library.compile("norm(a, 1) * 2", ("a",)) is compiled
+    with pytest.raises(ValueError, match="takes 2 argument"):
+        library.compile("norm(a)", ("a",))(1.0)
+
+
+def test_empty_library_uses_shared_cache():
+    from app.operations.expressions import compile_expression
+    assert FunctionLibrary({}).compile("x + 1", ("x",)) is compile_expression("x + 1", ("x",))
+
+
+@pytest.mark.parametrize("name, parameters, body, message", [
+    ("sin", ("x",), "x", "built-in"),
+    ("add", ("x",), "x", "built-in"),
+    ("_f", ("x",), "x", "Invalid function name"),
+    ("f", (), "1", "between 1 and"),
+    ("f", ("x", "x"), "x", "distinct"),
+    ("f", ("pi",), "pi", "reserved"),
+    ("f", ("x",), "x + y", "Unknown variable"),
+    ("f", ("x",), "h(x)", "Unknown function"),
+    ("f", ("x",), "g(x) + 1", "would call itself"),
+    ("f", ("x",), "f(x)", "would call itself"),
+    ("k", ("x",), "sin()", "takes 1 argument"),
+    ("k", ("x",), "g(x, x)", "takes 1 argument"),
+])
+def test_check_definition(name, parameters, body, message):
+    others = {"g": (("x",), "f(x) * 2"), "f": (("x",), "x")}
+    with pytest.raises(ValueError, match=message):
+        check_definition(name, parameters, body, others)
+
+
+def test_callers():
+    definitions = {"f": (("x",), "x"), "g": (("x",), "f(x) + 1"), "h": (("x",), "x * 2")}
+    assert callers("f", definitions) == ["g"]
+    assert callers("h", definitions) == []
+
+
+def test_library_cache_invalidation():
+    cache = LibraryCache(maxsize=2)
+    loads = []
+
+    def loader(definitions):
+        def load():
+            loads.append(definitions)
+            return definitions
+        return load
+
+    first = cache.get(1, loader({"f": (("x",), "x")}))
+    assert cache.get(1, loader({})) is first
+    cache.invalidate(1)
+    assert cache.get(1, loader({"f": (("x",), "x + 1")})).functions["f"](1.0) == 2.0
+    cache.get(2, loader({}))
+    cache.get(3, loader({}))
+    cache.get(1, loader({}))  # evicted as least recently used
+    assert len(loads) == 5
@@ -0,0 +1,91 @@
+import pytest
+
+from app.operations.worksheet import CycleError, NOT_FINITE, WorksheetGraph, normalize_formula
+
+
+def sheet(cells: dict) -> WorksheetGraph:
+    graph = WorksheetGraph()
+    graph.update({name: normalize_formula(formula) for name, formula in cells.items()})
+    return graph
+
+
+def test_values_follow_references():
+    graph = sheet({"price": 120, "quantity": 3, "total": "=price * quantity", "tax": "total * 0.2"})
+    assert graph.states["total"] == (360.0, None)
+    assert graph.states["tax"] == pytest.approx((72.0, None))
+
+
+def test_edit_recalculates_only_downstream_cells():
+    graph = sheet({"a": 1, "b": 2, "left": "a + 1", "right": "b + 1", "both": "left + right"})
+    changed, recalculated = graph.update({"a": "5"})
+    assert changed == {"a": (5.0, None), "left": (6.0, None), "both": (9.0, None)}
+    assert recalculated == 3
+
+
+def test_unchanged_values_stop_propagation():
+    graph = sheet({"x": 2, "square": "x^2", "next": "square + 1", "last": "next * 2"})
+    changed, recalculated = graph.update({"x": "-2"})
+    assert changed == {"x": (-2.0, None)}
+    assert recalculated == 2
+
+
+def test_long_chain():
+    cells = {"c0": "1", **{f"c{i}": f"c{i - 1} + 1" for i in range(1, 5000)}}
+    graph = WorksheetGraph()
+    graph.update(cells)
+    assert graph.states["c4999"] == (5000.0, None)
+    changed, recalculated = graph.update({"c0": "10"})
+    assert len(changed) == recalculated == 5000
+    assert graph.states["c4999"] == (5009.0, None)
+
+
+def test_cycles_are_rejected_and_leave_the_sheet_unchanged():
+    graph = sheet({"a": 1, "b": "a + 1", "c": "b + 1"})
+    with pytest.raises(CycleError, match="Circular"):
+        graph.update({"a": "c + 1"})
+    with pytest.raises(CycleError, match="itself"):
+        graph.update({"b": "b + 1"})
+    assert graph.formulas["a"] == "1.0"
+    changed, _ = graph.update({"a": "2"})
+    assert changed["c"] == (4.0, None)
+
+
+def test_errors_propagate_and_clear():
+    graph = sheet({"a": 0, "inverse": "1 / a", "scaled": "inverse * 2", "missing": "ghost + 1"})
+    assert graph.states["inverse"] == (None, NOT_FINITE)
+    assert graph.states["scaled"] == (None, "Cell 'inverse' has an error")
+    assert graph.states["missing"] == (None, "Unknown cell 'ghost'")
+    changed, _ = graph.update({"a": "4", "ghost": "1"})
+    assert changed["scaled"] == (0.5, None)
+    assert changed["missing"] == (2.0, None)
+    changed, _ = graph.update({"a": None})
+    assert changed["inverse"] == (None, "Unknown cell 'a'")
+    assert "a" not in graph.states
+
+
+def test_division_of_cells_by_zero_is_a_cell_error():
+    graph = sheet({"a": 1, "b": 0, "c": "a / b", "d": "a % b"})
+    assert graph.states["c"] == (None, NOT_FINITE)
+    assert graph.states["d"] == (None, NOT_FINITE)
+    changed, _ = graph.update({"b": "2"})
+    assert changed["c"] == (0.5, None)
+
+
+def test_loaded_graph_recalculates_incrementally():
+    loaded = WorksheetGraph.load([
+        ("a", "1.0", (), 1.0, None),
+        ("b", "a * 10", ("a",), 10.0, None),
+    ])
+    changed, recalculated = loaded.update({"a": "3"})
+    assert changed == {"a": (3.0, None), "b": (30.0, None)}
+
+
+@pytest.mark.parametrize("cells, message", [
+    ({"sin": "1"}, "reserved"),
+    ({"_x": "1"}, "Invalid variable name"),
+    ({"a": "1 +"}, "Invalid expression"),
+    ({"a": "unknown(1)"}, "Unknown function"),
+])
+def test_validation(cells, message):
+    with pytest.raises(ValueError, match=message):
+        WorksheetGraph().update(cells)